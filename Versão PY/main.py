@@ -17,6 +17,7 @@ Versão: 1.0.0
 
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 # Adicionar o diretório raiz ao path para imports
@@ -109,4 +110,6 @@ def main():
             pass
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Necessário para o pool de processos de renderização no executável Windows
+    multiprocessing.freeze_support()
+    main()
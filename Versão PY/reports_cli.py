@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema DAC - geração de relatórios em lote (linha de comando)
+
+Gera, sem interface gráfica, o relatório geral e um relatório por região,
+estado ou macrorregião (estatísticas, gráficos, PDF e XLSX), distribuindo
+os segmentos entre processos. Pensado para execução agendada, ex.:
+
+    python reports_cli.py --by state --output data/relatorios --workers 4
+"""
+
+import argparse
+import multiprocessing
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path para imports
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+# Renderização sem Tk
+import matplotlib
+matplotlib.use('Agg')
+
+from src.database.database_manager import DatabaseManager
+from src.modules.batch_reports import BatchReportRunner
+from src.utils.logger import setup_logger
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gera relatórios do Sistema DAC sem interface gráfica")
+    parser.add_argument('--db', help="Caminho do banco SQLite (padrão: data/dac_database.db)")
+    parser.add_argument('--output', default=None,
+                        help="Diretório de saída (padrão: data/relatorios/<data>)")
+    parser.add_argument('--by', choices=['region', 'state', 'macro_region'], default='region',
+                        help="Segmentação dos relatórios (padrão: region)")
+    parser.add_argument('--formats', default='pdf,xlsx',
+                        help="Formatos separados por vírgula: pdf, xlsx (padrão: pdf,xlsx)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Processos em paralelo (padrão: número de núcleos; 1 = sequencial)")
+    parser.add_argument('--only', nargs='*', default=None,
+                        help="Gerar apenas os segmentos informados")
+    parser.add_argument('--dpi', type=int, default=100, help="Resolução dos gráficos (padrão: 100)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Executa o lote e imprime os tempos por etapa"""
+    args = parse_args(argv)
+    logger = setup_logger()
+
+    formats = [f.strip().lower() for f in args.formats.split(',') if f.strip()]
+    invalid = [f for f in formats if f not in ('pdf', 'xlsx')]
+    if invalid:
+        print(f"ERRO: formato(s) não suportado(s): {', '.join(invalid)}")
+        return 2
+
+    output = args.output or str(project_root / "data" / "relatorios" / datetime.now().strftime('%Y-%m-%d'))
+
+    db_manager = DatabaseManager(args.db)
+    try:
+        db_manager.initialize_database()
+        runner = BatchReportRunner(db_manager, output, by=args.by, formats=formats,
+                                   workers=args.workers, only=args.only, dpi=args.dpi)
+        results = runner.run()
+    except Exception as e:
+        logger.error(f"Erro na geração de relatórios em lote: {e}", exc_info=True)
+        print(f"ERRO: {e}")
+        return 3
+    finally:
+        db_manager.close()
+
+    failures = [result for result in results if result.get('error')]
+    for result in results:
+        status = f"ERRO: {result['error']}" if result.get('error') else f"{len(result['files'])} arquivo(s)"
+        print(f"{result['name']:<40} {status}")
+    print(f"\nRelatórios gerados em: {output}\n")
+    print(runner.timing_report())
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
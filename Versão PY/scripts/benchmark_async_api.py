@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de concorrência: rotas síncronas (threadpool) x camada assíncrona.
+
+Cria um banco temporário com dados sintéticos e dispara clientes simultâneos
+(httpx.AsyncClient sobre ASGITransport, no mesmo processo) contra a página de
+GET /api/individuos servida de duas formas:
+  - threads: handler `def` com sessão do DatabaseManager (modelo anterior,
+    limitado ao threadpool do Starlette, 40 threads por padrão);
+  - async: a rota atual (`async def` + AsyncDatabase, pool limitado).
+
+Para cada nível de concorrência mostra requisições/s, latência p50/p95 e o
+pico de threads do processo. Sem aiosqlite/greenlet instalados, a rota
+assíncrona usa o modo de threads limitadas da camada (indicado na saída).
+
+Execute pelo terminal: python scripts/benchmark_async_api.py [--individuos 5000] [--clientes 1,50,500]
+"""
+
+import argparse
+import asyncio
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import httpx
+from fastapi import Depends, FastAPI, Query
+
+from scripts.benchmark_web_api import seed
+from src.database.database_manager import DatabaseManager
+from web.backend.app.routers.individuos import router as individuos_router
+from web.backend.app.services.db import get_async_db, get_db_manager
+from web.backend.app.services.individuos import consultas_individuos
+from web.backend.app.services.serialization import FastJSONResponse
+
+
+def build_app(db: DatabaseManager) -> FastAPI:
+    """Aplicação com a rota atual em /async e a versão síncrona equivalente em /threads"""
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.include_router(individuos_router, prefix="/async")
+
+    @app.get("/threads/individuos")
+    def individuos_threads(page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=200),
+                           db = Depends(get_db_manager)):
+        count_query, page_query = consultas_individuos(page, limit, None, None, None)
+        session = db.get_session()
+        try:
+            total = session.execute(count_query).scalar() or 0
+            rows = session.execute(page_query).all()
+            return FastJSONResponse({"data": [list(row[:5]) for row in rows], "total": total})
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db_manager] = lambda: db
+    return app
+
+
+async def run_level(app: FastAPI, path: str, clients: int, requests_per_client: int, pages: int):
+    """Dispara `clients` clientes simultâneos; retorna (req/s, p50, p95, pico de threads, erros)"""
+    latencies: List[float] = []
+    errors = 0
+    peak_threads = threading.active_count()
+    transport = httpx.ASGITransport(app=app)
+
+    async def client(index: int):
+        nonlocal errors, peak_threads
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for i in range(requests_per_client):
+                started = time.perf_counter()
+                response = await http.get(path, params={"page": (index + i) % pages + 1, "limit": 50})
+                latencies.append(time.perf_counter() - started)
+                errors += response.status_code != 200
+                peak_threads = max(peak_threads, threading.active_count())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return len(latencies) / elapsed, statistics.median(latencies), p95, peak_threads, errors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de concorrência: threadpool x camada assíncrona")
+    parser.add_argument('--individuos', type=int, default=5000)
+    parser.add_argument('--clientes', default="1,50,500", help="níveis de concorrência separados por vírgula")
+    parser.add_argument('--requisicoes', type=int, default=4, help="requisições por cliente")
+    args = parser.parse_args(argv)
+
+    temp_dir = tempfile.mkdtemp()
+    db = DatabaseManager(str(Path(temp_dir) / "benchmark.db"))
+    try:
+        db.initialize_database()
+        seed(db, args.individuos)
+        app = build_app(db)
+        adb = get_async_db(db)
+        pages = max(1, args.individuos // 50)
+        print(f"Camada assíncrona: {'AsyncEngine (driver assíncrono)' if adb.is_async else 'threads limitadas'} "
+              f"(pool {adb.pool_size}+{adb.max_overflow})")
+        print(f"{'modelo':<8} {'clientes':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'threads':>8} {'erros':>6}")
+        for clients in (int(value) for value in args.clientes.split(",")):
+            for title, path in (("threads", "/threads/individuos"), ("async", "/async/individuos")):
+                rate, p50, p95, threads, errors = asyncio.run(
+                    run_level(app, path, clients, args.requisicoes, pages))
+                print(f"{title:<8} {clients:>8} {rate:>8.0f} {p50 * 1000:>8.1f} {p95 * 1000:>8.1f} "
+                      f"{threads:>8} {errors:>6}")
+        asyncio.run(adb.dispose())
+        return 0
+    finally:
+        db.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da serialização e compressão da API web (páginas de 200 indivíduos).
+
+Cria um banco temporário com dados sintéticos e mede:
+  1. serialização de uma página: json padrão + jsonable_encoder x FastJSONResponse (orjson);
+  2. tamanho e tempo da compressão gzip/brotli da página;
+  3. requisições/s de GET /api/individuos?limit=200 executando a rota
+     (Cache-Control: no-cache) e servidas do cache HTTP, com e sem gzip.
+
+Execute pelo terminal: python scripts/benchmark_web_api.py [--individuos 5000] [--repeticoes 200]
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import Region, Household, Individual, DeviceUsage, InternetUsage
+from web.backend.app.main import app
+from web.backend.app.services.db import get_db_manager
+from web.backend.app.services.serialization import FastJSONResponse, ORJSON_AVAILABLE
+
+
+def seed(db: DatabaseManager, total: int) -> None:
+    """Insere `total` indivíduos com dispositivos e uso de internet"""
+    random.seed(42)
+    with db.get_session() as session:
+        regions = []
+        for code, name in (('N', 'Norte'), ('NE', 'Nordeste'), ('SE', 'Sudeste'), ('S', 'Sul')):
+            region = session.query(Region).filter_by(name=name).first()
+            if region is None:
+                region = Region(code=f"B{code}", name=name, state='BR', macro_region=name)
+                session.add(region)
+                session.flush()
+            regions.append(region)
+        for i in range(total):
+            household = Household(region_id=random.choice(regions).id, city=f"Cidade {i % 50}",
+                                  area_type='urbana', income_range='1-2 SM', has_internet=random.random() < 0.7)
+            session.add(household)
+            session.flush()
+            individual = Individual(household_id=household.id, age=random.randint(0, 90),
+                                    gender=random.choice(['Masculino', 'Feminino']), has_disability=False)
+            session.add(individual)
+            session.flush()
+            for device_type in ('computer', 'tablet', 'mobile'):
+                session.add(DeviceUsage(individual_id=individual.id, device_type=device_type,
+                                        has_device=random.random() < 0.5))
+            session.add(InternetUsage(individual_id=individual.id, uses_internet=household.has_internet))
+        session.commit()
+
+
+def rate(func, repeat: int) -> float:
+    """Execuções por segundo"""
+    started = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    return repeat / (time.perf_counter() - started)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de serialização/compressão da API web")
+    parser.add_argument('--individuos', type=int, default=5000)
+    parser.add_argument('--repeticoes', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    temp_dir = tempfile.mkdtemp()
+    db = DatabaseManager(str(Path(temp_dir) / "benchmark.db"))
+    try:
+        db.initialize_database()
+        seed(db, args.individuos)
+        app.dependency_overrides[get_db_manager] = lambda: db
+        client = TestClient(app)
+        pages = max(1, args.individuos // 200)
+
+        payload = client.get("/api/individuos", params={"page": 1, "limit": 200},
+                             headers={"Accept-Encoding": "identity"}).json()
+        print(f"orjson disponível: {'sim' if ORJSON_AVAILABLE else 'não'}")
+        print("\n1. Serialização de uma página de 200 linhas")
+        baseline = rate(lambda i: JSONResponse(jsonable_encoder(payload)), args.repeticoes)
+        fast = rate(lambda i: FastJSONResponse(payload), args.repeticoes)
+        print(f"   json + jsonable_encoder: {baseline:10.0f} páginas/s")
+        print(f"   FastJSONResponse:        {fast:10.0f} páginas/s  ({fast / baseline:.1f}x)")
+
+        body = FastJSONResponse(payload).body
+        print("\n2. Compressão da página")
+        print(f"   sem compressão: {len(body):8d} bytes")
+        gzip_body = zlib.compress(body, 6)
+        gzip_rate = rate(lambda i: zlib.compress(body, 6), args.repeticoes)
+        print(f"   gzip (nível 6): {len(gzip_body):8d} bytes  ({len(body) / len(gzip_body):.1f}x menor, "
+              f"{gzip_rate:.0f} páginas/s)")
+        try:
+            import brotli
+            br_body = brotli.compress(body, quality=4)
+            print(f"   brotli (q=4):   {len(br_body):8d} bytes  ({len(body) / len(br_body):.1f}x menor)")
+        except ImportError:
+            print("   brotli: não instalado")
+
+        print("\n3. GET /api/individuos?limit=200")
+        for title, headers in (
+            ("rota executada, sem compressão", {"Cache-Control": "no-cache", "Accept-Encoding": "identity"}),
+            ("rota executada, gzip", {"Cache-Control": "no-cache", "Accept-Encoding": "gzip"}),
+            ("cache HTTP, sem compressão", {"Accept-Encoding": "identity"}),
+            ("cache HTTP, gzip", {"Accept-Encoding": "gzip"}),
+        ):
+            def request(i, headers=headers):
+                client.get("/api/individuos", params={"page": i % pages + 1, "limit": 200}, headers=headers)
+            response = client.get("/api/individuos", params={"page": 1, "limit": 200}, headers=headers)
+            size = int(response.headers.get("content-length", 0))
+            print(f"   {title:<32} {rate(request, args.repeticoes):8.0f} req/s  {size:8d} bytes")
+        etag = client.get("/api/individuos", params={"page": 1, "limit": 200}).headers["etag"]
+        not_modified = rate(lambda i: client.get("/api/individuos", params={"page": 1, "limit": 200},
+                                                 headers={"If-None-Match": etag}), args.repeticoes)
+        print(f"   {'If-None-Match (304)':<32} {not_modified:8.0f} req/s")
+        return 0
+    finally:
+        app.dependency_overrides.pop(get_db_manager, None)
+        db.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+"""
+Teste de carga local da API web, com percentis e histograma de latência.
+
+Cria um banco sintético do tamanho pedido e dispara clientes simultâneos
+(laço fechado, por um tempo fixo) com tráfego misto sobre:
+  - GET /api/individuos (páginas e filtros aleatórios)
+  - GET /api/estatisticas/resumo
+  - GET /api/db/status
+
+Alvos:
+  - inprocess (padrão): a aplicação no mesmo processo, via httpx.ASGITransport;
+  - uvicorn: sobe `uvicorn web.backend.app.main:app` local apontando para o
+    banco sintético (`DAC_DATABASE_PATH`) e mede pela rede;
+  - --url: servidor já em execução (não cria banco).
+
+O resultado (configuração, ambiente e métricas por rota) é salvo em JSON em
+`data/loadtest/` e pode ser comparado com uma execução anterior (--comparar).
+
+Execute pelo terminal:
+  python scripts/load_test_api.py [--individuos 20000] [--clientes 20] [--duracao 10]
+      [--mix individuos=6,resumo=3,status=1] [--alvo inprocess|uvicorn] [--url URL]
+      [--sem-cache-http] [--saida arquivo.json] [--comparar ultimo|arquivo.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import httpx
+from sqlalchemy import insert, select
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import Region, Household, Individual, DeviceUsage, InternetUsage
+
+RESULTS_DIR = project_root / "data" / "loadtest"
+DEFAULT_MIX = "individuos=6,resumo=3,status=1"
+# Limites superiores (ms) das faixas do histograma; a última faixa é "acima"
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+PAGE_LIMITS = (10, 50, 200)
+
+INCOMES = ('Até 1 SM', '1-2 SM', '2-3 SM', '3-5 SM', '5-10 SM', 'Acima de 10 SM', None)
+EDUCATION = ('Fundamental', 'Médio', 'Superior', 'Pós-graduação', None)
+EMPLOYMENT = ('Empregado', 'Desempregado', 'Autônomo', 'Estudante', 'Aposentado', None)
+
+
+def seed_synthetic(db: DatabaseManager, total: int, seed: int = 42, batch: int = 5000) -> None:
+    """Insere `total` indivíduos (com domicílios, dispositivos e uso de internet) em lotes"""
+    rng = random.Random(seed)
+    with db.get_session() as session:
+        region_ids = list(session.execute(select(Region.id)).scalars())
+        households, individuals, devices, internet = [], [], [], []
+
+        def flush():
+            for model, rows in ((Household, households), (Individual, individuals),
+                                (DeviceUsage, devices), (InternetUsage, internet)):
+                if rows:
+                    session.execute(insert(model), rows)
+                    rows.clear()
+
+        household_id = 0
+        for individual_id in range(1, total + 1):
+            if household_id == 0 or rng.random() < 0.35:
+                household_id += 1
+                has_internet = rng.random() < 0.7
+                households.append({
+                    'id': household_id, 'region_id': rng.choice(region_ids), 'city': f"Cidade {rng.randrange(200)}",
+                    'area_type': 'urbana' if rng.random() < 0.8 else 'rural', 'income_range': rng.choice(INCOMES),
+                    'household_size': rng.randint(1, 6), 'has_internet': has_internet,
+                })
+            individuals.append({
+                'id': individual_id, 'household_id': household_id, 'age': rng.randint(0, 95),
+                'gender': rng.choice(('Masculino', 'Feminino')), 'education_level': rng.choice(EDUCATION),
+                'has_disability': rng.random() < 0.08, 'employment_status': rng.choice(EMPLOYMENT),
+            })
+            for device_type in ('computer', 'tablet', 'mobile'):
+                devices.append({'individual_id': individual_id, 'device_type': device_type,
+                                'has_device': rng.random() < 0.5})
+            internet.append({'individual_id': individual_id, 'uses_internet': has_internet and rng.random() < 0.9})
+            if len(individuals) >= batch:
+                flush()
+        flush()
+        session.commit()
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """'individuos=6,resumo=3' -> pesos por rota"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Rota desconhecida no mix: {name} (use {', '.join(ENDPOINTS)})")
+        mix[name] = int(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("O mix precisa de ao menos um peso positivo")
+    return mix
+
+
+def _individuos(rng: random.Random, total: int) -> Tuple[str, Dict[str, Any]]:
+    limit = rng.choice(PAGE_LIMITS)
+    params: Dict[str, Any] = {"page": rng.randint(1, max(1, total // limit)), "limit": limit}
+    if rng.random() < 0.3:
+        params["genero"] = rng.choice(("Masculino", "Feminino"))
+    if rng.random() < 0.2:
+        params["idade"] = rng.randint(0, 95)
+    return "/api/individuos", params
+
+
+ENDPOINTS = {
+    "individuos": _individuos,
+    "resumo": lambda rng, total: ("/api/estatisticas/resumo", {}),
+    "status": lambda rng, total: ("/api/db/status", {}),
+}
+
+
+def histogram(latencies_ms: List[float]) -> List[int]:
+    """Contagem por faixa de HISTOGRAM_BOUNDS_MS (+ faixa final "acima")"""
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for value in latencies_ms:
+        index = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if value <= bound),
+                     len(HISTOGRAM_BOUNDS_MS))
+        counts[index] += 1
+    return counts
+
+
+def summarize(latencies_ms: List[float], errors: int, elapsed: float, rejected: int = 0) -> Dict[str, Any]:
+    """Vazão, percentis e histograma de uma rota (ou do total)"""
+    values = sorted(latencies_ms)
+
+    def pct(p):
+        return round(values[min(len(values) - 1, max(0, -(-len(values) * p // 100) - 1))], 2) if values else None
+
+    return {
+        "requests": len(values),
+        "errors": errors,
+        # 503 do controle de admissão (contadas à parte dos erros)
+        "rejected": rejected,
+        "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values), 2) if values else None,
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": round(values[-1], 2) if values else None,
+        "histogram": histogram(values),
+    }
+
+
+async def drive(client: httpx.AsyncClient, mix: Dict[str, int], clients: int, duration: float,
+                warmup: float, total: int, no_cache: bool, seed: int = 7) -> Dict[str, Any]:
+    """Clientes em laço fechado por `duration` s (após `warmup` s não medidos)"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = dict.fromkeys(names, 0)
+    rejected: Dict[str, int] = dict.fromkeys(names, 0)
+    headers = {"Cache-Control": "no-cache"} if no_cache else {}
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + warmup
+    deadline = measure_from + duration
+
+    async def worker(index: int):
+        rng = random.Random(seed + index)
+        while loop.time() < deadline:
+            name = rng.choices(names, weights)[0]
+            path, params = ENDPOINTS[name](rng, total)
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, params=params, headers=headers)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if loop.time() >= measure_from:
+                latencies[name].append(elapsed_ms)
+                rejected[name] += status == 503
+                errors[name] += status == 0 or (status >= 400 and status != 503)
+
+    started = loop.time()
+    await asyncio.gather(*(worker(i) for i in range(clients)))
+    elapsed = loop.time() - max(started, measure_from)
+
+    routes = {name: summarize(latencies[name], errors[name], elapsed, rejected[name]) for name in names}
+    overall = summarize([value for values in latencies.values() for value in values],
+                        sum(errors.values()), elapsed, sum(rejected.values()))
+    return {"elapsed_s": round(elapsed, 2), "total": overall, "routes": routes}
+
+
+def start_uvicorn(db_path: str, port: int, workers: int) -> subprocess.Popen:
+    """Sobe o servidor local sobre o banco sintético e aguarda /api/health"""
+    env = dict(os.environ, DAC_DATABASE_PATH=db_path)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "web.backend.app.main:app", "--port", str(port),
+         "--workers", str(workers), "--no-access-log", "--log-level", "warning"],
+        cwd=str(project_root), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn encerrou durante a inicialização")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn não respondeu em 60 s")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(project_root),
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"\n{'rota':<12} {'req':>7} {'erros':>6} {'503':>6} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'máx ms':>8}")
+    rows = list(result["routes"].items()) + [("TOTAL", result["total"])]
+    for name, stats in rows:
+        print(f"{name:<12} {stats['requests']:>7} {stats['errors']:>6} {stats.get('rejected', 0):>6} "
+              f"{stats['rps']:>8.1f} "
+              + " ".join(f"{stats[key] if stats[key] is not None else '-':>8}"
+                         for key in ("p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")))
+
+    counts = result["total"]["histogram"]
+    peak = max(counts) or 1
+    labels = [f"<= {bound} ms" for bound in HISTOGRAM_BOUNDS_MS] + [f"> {HISTOGRAM_BOUNDS_MS[-1]} ms"]
+    print("\nHistograma de latência (todas as rotas)")
+    for label, count in zip(labels, counts):
+        if count:
+            print(f"  {label:>11} {count:>7} {'#' * max(1, round(40 * count / peak))}")
+
+
+def _latest_result(exclude: Optional[Path] = None) -> Optional[Path]:
+    files = sorted(path for path in RESULTS_DIR.glob("loadtest_*.json") if path != exclude)
+    return files[-1] if files else None
+
+
+def print_comparison(current: Dict[str, Any], previous: Dict[str, Any], label: str) -> None:
+    print(f"\nComparação com {label} (commit {previous.get('environment', {}).get('commit') or '?'})")
+    print(f"{'rota':<12} {'req/s antes':>12} {'req/s agora':>12} {'Δ':>8} {'p95 antes':>10} {'p95 agora':>10} {'Δ':>8}")
+    before_routes = dict(previous["result"]["routes"], TOTAL=previous["result"]["total"])
+    after_routes = dict(current["result"]["routes"], TOTAL=current["result"]["total"])
+    for name, after in after_routes.items():
+        before = before_routes.get(name)
+        if not before:
+            continue
+
+        def change(old, new):
+            return f"{(new - old) / old * 100:+.0f}%" if old and new is not None else "-"
+
+        print(f"{name:<12} {before['rps']:>12.1f} {after['rps']:>12.1f} {change(before['rps'], after['rps']):>8} "
+              f"{before['p95_ms'] or '-':>10} {after['p95_ms'] or '-':>10} "
+              f"{change(before['p95_ms'], after['p95_ms']):>8}")
+
+
+def _quiet_console() -> None:
+    """Linhas de log por requisição continuam nos arquivos, mas não no terminal"""
+    import logging
+    from src.utils.logger import get_logger
+
+    for handler in get_logger().logger.handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setLevel(logging.WARNING)
+
+
+async def _run_inprocess(db: DatabaseManager, args, mix) -> Dict[str, Any]:
+    from web.backend.app.main import app
+    from web.backend.app.services.db import get_async_db, get_db_manager
+    from src.database.metrics_collector import get_sqlite_collector
+
+    _quiet_console()
+    app.dependency_overrides[get_db_manager] = lambda: db
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await drive(client, mix, args.clientes, args.duracao, args.aquecimento,
+                               args.individuos, args.sem_cache_http)
+    finally:
+        app.dependency_overrides.pop(get_db_manager, None)
+        # Coletor e pool do banco temporário não sobrevivem à remoção do arquivo
+        get_sqlite_collector(db).stop(10)
+        await get_async_db(db).dispose()
+
+
+async def _run_http(url: str, args, mix) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.clientes, max_keepalive_connections=args.clientes)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        return await drive(client, mix, args.clientes, args.duracao, args.aquecimento,
+                           args.individuos, args.sem_cache_http)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga local da API web")
+    parser.add_argument('--individuos', type=int, default=20000, help="tamanho do banco sintético")
+    parser.add_argument('--clientes', type=int, default=20, help="clientes simultâneos")
+    parser.add_argument('--duracao', type=float, default=10.0, help="segundos medidos")
+    parser.add_argument('--aquecimento', type=float, default=1.0, help="segundos iniciais não medidos")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="pesos por rota (individuos, resumo, status)")
+    parser.add_argument('--alvo', choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument('--url', help="servidor já em execução (ignora --alvo e não cria banco)")
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=1, help="workers do uvicorn (--alvo uvicorn)")
+    parser.add_argument('--sem-cache-http', action='store_true',
+                        help="envia Cache-Control: no-cache (executa as rotas a cada requisição)")
+    parser.add_argument('--saida', help="arquivo JSON do resultado (padrão: data/loadtest/loadtest_<data>.json)")
+    parser.add_argument('--comparar', help="'ultimo' ou arquivo JSON de uma execução anterior")
+    args = parser.parse_args(argv)
+    mix = parse_mix(args.mix)
+
+    target = args.url or args.alvo
+    print(f"Alvo: {target} | {args.clientes} clientes | {args.duracao:.0f} s | mix {args.mix}"
+          f"{' | sem cache HTTP' if args.sem_cache_http else ''}")
+
+    temp_dir = None
+    db = None
+    server = None
+    try:
+        if args.url:
+            result = asyncio.run(_run_http(args.url.rstrip("/"), args, mix))
+        else:
+            temp_dir = tempfile.mkdtemp()
+            db_path = str(Path(temp_dir) / "loadtest.db")
+            db = DatabaseManager(db_path)
+            db.initialize_database()
+            started = time.perf_counter()
+            seed_synthetic(db, args.individuos)
+            db.checkpoint()
+            print(f"Banco sintético: {args.individuos} indivíduos em {time.perf_counter() - started:.1f} s")
+            if args.alvo == "uvicorn":
+                server = start_uvicorn(db_path, args.porta, args.workers)
+                result = asyncio.run(_run_http(f"http://127.0.0.1:{args.porta}", args, mix))
+            else:
+                result = asyncio.run(_run_inprocess(db, args, mix))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(30)
+        if db is not None:
+            db.close()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print_report(result)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {"target": target, "individuos": None if args.url else args.individuos,
+                   "clientes": args.clientes, "duracao": args.duracao, "aquecimento": args.aquecimento,
+                   "mix": mix, "sem_cache_http": args.sem_cache_http,
+                   "workers": args.workers if target == "uvicorn" else None},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count(), "commit": _git_commit()},
+        "histogram_bounds_ms": list(HISTOGRAM_BOUNDS_MS),
+        "result": result,
+    }
+    output = Path(args.saida) if args.saida else RESULTS_DIR / f"loadtest_{datetime.now():%Y%m%d_%H%M%S}.json"
+
+    if args.comparar:
+        previous_path = _latest_result(exclude=output) if args.comparar == "ultimo" else Path(args.comparar)
+        if previous_path is None or not previous_path.exists():
+            print("\nNenhuma execução anterior para comparar.")
+        else:
+            previous = json.loads(previous_path.read_text(encoding="utf-8"))
+            print_comparison(report, previous, previous_path.name)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nResultado salvo em: {output}")
+    return 1 if result["total"]["errors"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -59,9 +59,14 @@ class DatabaseManager:
         self._last_cache_update = 0
         self._start_time = 0
         
-    def initialize_database(self):
+    def initialize_database(self, maintenance: bool = True):
         """
         Inicializa o banco de dados e cria as tabelas
+        
+        Args:
+            maintenance (bool): Se False, apenas abre o engine e a sessão, sem
+                criar o esquema, inserir dados iniciais, criar índices nem
+                executar PRAGMA optimize (já feitos por outro processo)
         """
         try:
             # Criar engine SQLite com otimizações avançadas
@@ -95,7 +100,8 @@ class DatabaseManager:
                 
                 # Configurações adicionais para SQLite
                 conn.execute(text("PRAGMA foreign_keys=ON"))  # Habilitar foreign keys
-                conn.execute(text("PRAGMA optimize"))  # Otimizar estatísticas
+                if maintenance:
+                    conn.execute(text("PRAGMA optimize"))  # Otimizar estatísticas
                 
             # Criar sessionmaker com configurações otimizadas
             self.Session = sessionmaker(
@@ -103,14 +109,15 @@ class DatabaseManager:
                 expire_on_commit=False  # Manter objetos válidos após commit
             )
             
-            # Criar todas as tabelas
-            Base.metadata.create_all(self.engine)
-            
-            # Inserir dados iniciais se necessário
-            self._insert_initial_data()
-            
-            # Executar otimização inicial
-            self._optimize_database_structure()
+            if maintenance:
+                # Criar todas as tabelas
+                Base.metadata.create_all(self.engine)
+                
+                # Inserir dados iniciais se necessário
+                self._insert_initial_data()
+                
+                # Executar otimização inicial
+                self._optimize_database_structure()
             
             # Marcar horário de inicialização para cálculo de uptime
             import time
@@ -150,6 +157,117 @@ class DatabaseManager:
                 self.logger.error(f"Erro ao reinicializar banco: {reinit_error}")
                 raise
     
+    def initialize_database_once(self, lock_timeout: float = 120.0, max_age: float = 86400.0) -> bool:
+        """
+        Inicializa o banco com a manutenção executada uma única vez entre processos
+        
+        Vários processos sobre o mesmo arquivo (ex.: workers do uvicorn) passam
+        por uma trava em `<banco>-init.lock`; o primeiro executa esquema, índices
+        e PRAGMA optimize e grava `<banco>-init.json`. Os seguintes só abrem o
+        engine enquanto esse registro for válido: mesmo esquema, mesmo arquivo
+        do banco e idade menor que `max_age` segundos.
+        
+        Returns:
+            bool: True se este processo executou a manutenção
+        """
+        import json
+        import time
+        from src.utils.file_lock import FileLock
+        
+        stamp_path = Path(self.db_path + '-init.json')
+        with FileLock(self.db_path + '-init.lock', timeout=lock_timeout):
+            expected = {'schema': self._schema_fingerprint()}
+            try:
+                stamp = json.loads(stamp_path.read_text(encoding='utf-8'))
+                st = os.stat(self.db_path)
+                expected['file'] = f"{st.st_dev}:{st.st_ino}"
+                valid = (stamp.get('schema') == expected['schema'] and stamp.get('file') == expected['file']
+                         and time.time() - float(stamp.get('created', 0)) < max_age)
+            except (OSError, ValueError):
+                valid = False
+            
+            self.initialize_database(maintenance=not valid)
+            if not valid:
+                st = os.stat(self.db_path)
+                stamp = {'schema': expected['schema'], 'file': f"{st.st_dev}:{st.st_ino}",
+                         'created': time.time(), 'pid': os.getpid()}
+                stamp_path.write_text(json.dumps(stamp), encoding='utf-8')
+            return not valid
+    
+    @staticmethod
+    def _schema_fingerprint() -> str:
+        """Hash das tabelas, colunas e índices declarados nos modelos"""
+        import hashlib
+        
+        schema = [
+            (table.name, [column.name for column in table.columns], sorted(str(index.name) for index in table.indexes))
+            for table in Base.metadata.sorted_tables
+        ]
+        return hashlib.md5(repr(schema).encode()).hexdigest()[:16]
+    
+    def get_data_version(self) -> str:
+        """
+        Retorna um identificador barato da versão atual dos dados.
+        
+        Calculado a partir de tamanho e data de modificação do arquivo do banco
+        e do arquivo WAL, sem consultar o SQLite; muda sempre que há escrita
+        (e eventualmente em checkpoints, o que só provoca recálculo de cache).
+        Um WAL vazio é ignorado, então a versão obtida após `checkpoint()` se
+        mantém entre execuções do programa.
+        
+        Returns:
+            str: Hash curto que identifica a versão dos dados
+        """
+        import hashlib
+        
+        parts = []
+        for suffix in ('', '-wal'):
+            try:
+                st = os.stat(self.db_path + suffix)
+                parts.append(f"{st.st_mtime_ns}:{st.st_size}" if st.st_size else "0:0")
+            except OSError:
+                parts.append("0:0")
+        return hashlib.md5("|".join(parts).encode()).hexdigest()[:16]
+    
+    def get_data_modified(self) -> float:
+        """
+        Retorna o instante (timestamp) da última escrita nos dados
+        
+        Usa os mesmos arquivos de `get_data_version` (banco e WAL não vazio).
+        
+        Returns:
+            float: Data de modificação mais recente, ou 0 se o banco não existir
+        """
+        modified = 0.0
+        for suffix in ('', '-wal'):
+            try:
+                st = os.stat(self.db_path + suffix)
+            except OSError:
+                continue
+            if st.st_size:
+                modified = max(modified, st.st_mtime)
+        return modified
+    
+    def checkpoint(self) -> bool:
+        """
+        Transfere o WAL para o arquivo do banco e o esvazia
+        
+        Usado antes de registrar uma versão dos dados que deve continuar
+        válida depois que o programa for fechado e aberto novamente.
+        
+        Returns:
+            bool: True se o checkpoint foi concluído (sem leitores bloqueando)
+        """
+        if self.engine is None:
+            return False
+        try:
+            with self.engine.connect() as conn:
+                busy = conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)")).fetchone()
+            return not (busy and busy[0])
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Checkpoint do WAL não concluído: {e}")
+            return False
+    
     def check_database_integrity(self):
         """
         Verifica a integridade do banco de dados
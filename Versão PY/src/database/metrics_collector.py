@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Coleta periódica de métricas do banco em segundo plano
+
+Uma única thread por banco amostra status, desempenho e contagem de linhas
+em intervalos fixos e guarda as amostras em um buffer circular. A janela de
+status e o endpoint `/api/db/status` leem a amostra mais recente em O(1) e
+o histórico para os gráficos (sparklines), sem consultar o banco a cada
+atualização.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from ..utils.logger import get_logger
+except ImportError:
+    import logging
+
+    def get_logger(name):
+        return logging.getLogger(name)
+
+DEFAULT_INTERVAL = 5.0
+# 120 amostras de 5 s: 10 minutos de histórico
+DEFAULT_CAPACITY = 120
+
+
+class MetricsCollector:
+    """Executa `sampler()` a cada `interval` segundos e guarda as últimas `capacity` amostras.
+
+    Cada amostra é um dict; as séries numéricas dos gráficos ficam em
+    `amostra['metrics']`. O coletor acrescenta `timestamp` e `sample_ms`.
+    """
+
+    def __init__(self, sampler: Callable[[], Dict[str, Any]], interval: float = DEFAULT_INTERVAL,
+                 capacity: int = DEFAULT_CAPACITY, name: str = "metricas"):
+        self.sampler = sampler
+        self.interval = interval
+        self.name = name
+        self.logger = get_logger(__name__)
+        self._samples: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._sampled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._users = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'MetricsCollector':
+        """Inicia a thread de coleta (daemon), se ainda não estiver rodando"""
+        with self._lock:
+            self._start_locked()
+        return self
+
+    def _start_locked(self) -> None:
+        # Uma thread ainda encerrando (parada sem join) termina sozinha; a nova tem o próprio sinal
+        if not self.running or self._stop.is_set():
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,),
+                                            name=f"coletor-{self.name}", daemon=True)
+            self._thread.start()
+
+    def _signal_stop_locked(self) -> Optional[threading.Thread]:
+        self._stop.set()
+        self._wake.set()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Interrompe a coleta; o histórico já coletado é mantido"""
+        with self._lock:
+            thread = self._signal_stop_locked()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def acquire(self) -> 'MetricsCollector':
+        """Registra um leitor (ex.: janela aberta) e garante a coleta em andamento"""
+        with self._lock:
+            self._users += 1
+            self._start_locked()
+        return self
+
+    def release(self) -> None:
+        """Remove um leitor; a coleta para quando não restar nenhum.
+
+        Só sinaliza a parada, sem aguardar a thread: chamado pela janela na
+        thread do Tk, que não pode esperar uma amostra em andamento.
+        """
+        with self._lock:
+            self._users = max(self._users - 1, 0)
+            if self._users == 0:
+                self._signal_stop_locked()
+
+    def refresh(self) -> None:
+        """Antecipa a próxima amostra (ex.: logo após uma manutenção)"""
+        self._wake.set()
+
+    def sample_now(self) -> Dict[str, Any]:
+        """Coleta uma amostra na thread atual e a adiciona ao histórico"""
+        started = time.perf_counter()
+        sample = dict(self.sampler())
+        sample['timestamp'] = time.time()
+        sample['sample_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        sample.setdefault('metrics', {})['sample_ms'] = sample['sample_ms']
+        with self._lock:
+            self._samples.append(sample)
+        self._sampled.set()
+        return sample
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Aguarda a primeira amostra e retorna a mais recente"""
+        self._sampled.wait(timeout)
+        return self.latest()
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Amostra mais recente, ou None se ainda não houve coleta"""
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def history(self, metric: str, limit: Optional[int] = None) -> List[Optional[float]]:
+        """Valores de `metric` nas amostras guardadas, da mais antiga à mais recente"""
+        with self._lock:
+            samples = list(self._samples)
+        if limit is not None:
+            samples = samples[-limit:]
+        return [sample['metrics'].get(metric) for sample in samples]
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                self.sample_now()
+            except Exception as e:
+                self.logger.warning(f"Falha na coleta de métricas '{self.name}': {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+class SqliteSampler:
+    """Amostrador do DatabaseManager (SQLite)
+
+    As contagens por tabela (COUNT(*) em cada uma) só são refeitas quando a
+    versão dos dados muda; nas demais amostras reaproveita as anteriores.
+    """
+
+    def __init__(self, db_manager, top_limit: int = 5):
+        self.db_manager = db_manager
+        self.top_limit = top_limit
+        self.recounts = 0
+        self._version: Optional[str] = None
+        self._tables: List[Dict[str, Any]] = []
+
+    def _table_counts(self) -> List[Dict[str, Any]]:
+        version = self.db_manager.get_data_version()
+        if version != self._version:
+            self._tables = self.db_manager.get_top_tables_by_rows(limit=1000)
+            self._version = version
+            self.recounts += 1
+        return self._tables
+
+    def _wal_bytes(self) -> int:
+        try:
+            return os.path.getsize(self.db_manager.db_path + '-wal')
+        except OSError:
+            return 0
+
+    def __call__(self) -> Dict[str, Any]:
+        status = self.db_manager.get_server_status()
+        performance = self.db_manager.get_performance_metrics()
+        tables = self._table_counts()
+        wal_bytes = self._wal_bytes()
+        return {
+            'connected': bool(status.get('connected')),
+            'status': status,
+            'performance': performance,
+            'top_tables': tables[:self.top_limit],
+            'metrics': {
+                'database_size_bytes': performance.get('database_size_bytes', 0),
+                'freelist_count': performance.get('freelist_count', 0),
+                'wal_bytes': wal_bytes,
+                'total_rows': sum(table['rows'] for table in tables),
+            },
+        }
+
+
+_collectors: Dict[str, MetricsCollector] = {}
+_collectors_lock = threading.Lock()
+
+
+def get_metrics_collector(key: str, factory: Callable[[], Callable[[], Dict[str, Any]]],
+                          interval: float = DEFAULT_INTERVAL,
+                          capacity: int = DEFAULT_CAPACITY) -> MetricsCollector:
+    """Coletor único do processo para `key` (caminho do banco, URL...)"""
+    with _collectors_lock:
+        collector = _collectors.get(key)
+        if collector is None:
+            collector = _collectors[key] = MetricsCollector(
+                factory(), interval=interval, capacity=capacity, name=os.path.basename(key) or key
+            )
+        return collector
+
+
+def get_sqlite_collector(db_manager, **kwargs) -> MetricsCollector:
+    """Coletor do banco SQLite do DatabaseManager"""
+    return get_metrics_collector(db_manager.db_path, lambda: SqliteSampler(db_manager), **kwargs)
@@ -14,6 +14,11 @@ class OptimizedQueries:
     def __init__(self, db_path: str):
         self.db_path = db_path
     
+    def __repr__(self):
+        # Representação estável: compõe a chave do @cached, que pode ser
+        # compartilhada entre processos
+        return f"OptimizedQueries(db_path='{self.db_path}')"
+    
     @cached(ttl=1800)  # Cache por 30 minutos
     def get_regional_statistics(self, region_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Estatísticas regionais otimizadas"""
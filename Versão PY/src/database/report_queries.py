@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+Agregações para a janela de relatórios do DAC
+
+Calcula no banco (GROUP BY) apenas as contagens de que cada gráfico precisa
+- gênero, faixas etárias, renda, internet, deficiência, dispositivos e
+regiões -, de modo que abrir os relatórios não dependa do número de
+indivíduos. O mesmo formato de resultado é produzido para dados já
+filtrados por `ReportDataset.aggregates` (src/modules/report_dataset.py).
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select, exists
+
+from .models import Individual, Household, Region, DeviceUsage
+from ..utils.intelligent_cache import get_global_cache
+
+try:
+    from ..utils.logger import get_logger
+except ImportError:
+    import logging
+
+    def get_logger(name):
+        return logging.getLogger(name)
+
+
+AGE_BANDS = ('0-17', '18-29', '30-49', '50-64', '65+')
+INCOME_ORDER = ('Até 1 SM', '1-2 SM', '2-3 SM', '3-5 SM', '5-10 SM', 'Acima de 10 SM', 'Não Informado')
+HISTOGRAM_BINS = 10
+
+_MISSING = ('', 'null', 'none', 'nan')
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or str(value).strip().lower() in _MISSING
+
+
+def normalize_gender(value: Any) -> str:
+    """Normaliza valores de gênero ('m', 'masculino', 'male'... -> 'Masculino')"""
+    if _is_missing(value):
+        return 'Não Informado'
+
+    gender_str = str(value).strip().lower()
+    if gender_str in ['m', 'masculino', 'male', 'homem']:
+        return 'Masculino'
+    elif gender_str in ['f', 'feminino', 'female', 'mulher']:
+        return 'Feminino'
+    return str(value).title()
+
+
+def normalize_internet(value: Any) -> str:
+    """Formata o status de acesso à internet"""
+    if _is_missing(value):
+        return 'Não Informado'
+    return 'Com Internet' if value else 'Sem Internet'
+
+
+def normalize_disability(value: Any) -> str:
+    """Formata o status de deficiência"""
+    if _is_missing(value):
+        return 'Não Informado'
+    return 'Sim' if value else 'Não'
+
+
+def valid_age(value: Any) -> Optional[int]:
+    """Retorna a idade como inteiro se estiver entre 0 e 120 anos"""
+    if _is_missing(value):
+        return None
+    try:
+        age = int(float(value))
+    except (ValueError, TypeError):
+        return None
+    return age if 0 <= age <= 120 else None
+
+
+def age_band(age: int) -> str:
+    """Faixa etária correspondente à idade"""
+    if age < 18:
+        return '0-17'
+    elif age < 30:
+        return '18-29'
+    elif age < 50:
+        return '30-49'
+    elif age < 65:
+        return '50-64'
+    return '65+'
+
+
+def new_groups() -> Dict[str, Any]:
+    """Contagens brutas (valores do banco) que alimentam a finalização"""
+    return {
+        'person': Counter(),   # (gênero, idade, deficiência, internet) -> n
+        'income': Counter(),   # faixa de renda -> n
+        'region': Counter(),   # nome da região -> n
+        'devices': Counter(),  # rótulo do dispositivo -> n
+        'without_devices': 0,
+        'device_errors': 0,
+    }
+
+
+def build_aggregates(groups: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte contagens brutas no formato consumido pelos relatórios"""
+    gender: Counter = Counter()
+    internet: Counter = Counter()
+    disability: Counter = Counter()
+    bands = {band: 0 for band in AGE_BANDS}
+    internet_by_band = {band: {'total': 0, 'with_internet': 0} for band in AGE_BANDS}
+    age_points: Counter = Counter()
+    age_counts: Counter = Counter()
+    total = invalid_ages = 0
+
+    for (raw_gender, raw_age, raw_disability, raw_internet), count in groups['person'].items():
+        total += count
+        gender[normalize_gender(raw_gender)] += count
+        internet[normalize_internet(raw_internet)] += count
+        disability[normalize_disability(raw_disability)] += count
+
+        age = valid_age(raw_age)
+        if age is None:
+            invalid_ages += count
+            continue
+        band = age_band(age)
+        has_internet = 1 if raw_internet else 0
+        bands[band] += count
+        internet_by_band[band]['total'] += count
+        internet_by_band[band]['with_internet'] += count * has_internet
+        age_counts[age] += count
+        age_points[(age, has_internet)] += count
+
+    valid_ages = sum(age_counts.values())
+    if age_counts:
+        ages = np.fromiter(age_counts.keys(), dtype=float)
+        weights = np.fromiter(age_counts.values(), dtype=float)
+        hist_counts, hist_edges = np.histogram(ages, bins=HISTOGRAM_BINS, weights=weights)
+        average = float(np.dot(ages, weights) / valid_ages)
+    else:
+        hist_counts, hist_edges, average = np.array([]), np.array([]), 0.0
+
+    # Manter "Não Informado" da internet apenas se houver ocorrências
+    internet_counts = {'Com Internet': internet['Com Internet'], 'Sem Internet': internet['Sem Internet']}
+    if internet['Não Informado']:
+        internet_counts['Não Informado'] = internet['Não Informado']
+
+    # Renda em ordem lógica, seguida de valores não previstos
+    income_counts = {label: groups['income'][label] for label in INCOME_ORDER if groups['income'][label]}
+    for label, count in groups['income'].items():
+        if label not in income_counts:
+            income_counts[label] = count
+
+    return {
+        'total': total,
+        'gender': dict(gender.most_common()),
+        'age': {
+            'valid': valid_ages,
+            'invalid': invalid_ages,
+            'average': average,
+            'under_30': bands['0-17'] + bands['18-29'],
+            'bands': bands,
+            'hist_counts': [int(c) for c in hist_counts],
+            'hist_edges': hist_edges.tolist(),
+        },
+        'internet': internet_counts,
+        'disability': {label: disability[label] for label in ('Sim', 'Não', 'Não Informado')},
+        'income': income_counts,
+        'income_invalid': groups['income']['Não Informado'],
+        'regions': dict(groups['region'].most_common()),
+        'devices': dict(groups['devices'].most_common()),
+        'devices_without': groups['without_devices'],
+        'devices_errors': groups['device_errors'],
+        'internet_by_age_band': internet_by_band,
+        'age_internet_points': sorted((age, flag, n) for (age, flag), n in age_points.items()),
+    }
+
+
+def wilson_interval(successes, totals, z: float = 1.96) -> Tuple[np.ndarray, np.ndarray]:
+    """Intervalo de confiança de Wilson (em %) para proporções binomiais"""
+    successes = np.asarray(successes, dtype=float)
+    totals = np.asarray(totals, dtype=float)
+    safe = np.where(totals > 0, totals, 1.0)
+    p = successes / safe
+    denominator = 1 + z ** 2 / safe
+    center = (p + z ** 2 / (2 * safe)) / denominator
+    margin = z * np.sqrt(p * (1 - p) / safe + z ** 2 / (4 * safe ** 2)) / denominator
+    lower = np.where(totals > 0, np.clip(center - margin, 0.0, 1.0), 0.0)
+    upper = np.where(totals > 0, np.clip(center + margin, 0.0, 1.0), 0.0)
+    return lower * 100, upper * 100
+
+
+def bin_age_internet(points: Sequence[Tuple[int, int, int]], bin_width: int = 5) -> Dict[str, List]:
+    """Agrupa os pontos (idade, internet, n) em faixas de idade de largura fixa.
+
+    Retorna, por faixa, o total de pessoas, quantas têm internet, a taxa (%)
+    e o intervalo de confiança de Wilson - tamanho independente do número
+    de indivíduos.
+    """
+    if not points:
+        return {'edges': [], 'totals': [], 'with_internet': [], 'rate': [], 'lower': [], 'upper': []}
+
+    data = np.asarray(points, dtype=np.int64)
+    bins = data[:, 0] // bin_width
+    first = int(bins.min())
+    index = bins - first
+    size = int(index.max()) + 1
+    totals = np.bincount(index, weights=data[:, 2], minlength=size)
+    with_internet = np.bincount(index, weights=data[:, 2] * data[:, 1], minlength=size)
+    lower, upper = wilson_interval(with_internet, totals)
+    rate = np.divide(with_internet * 100, totals, out=np.zeros(size), where=totals > 0)
+
+    return {
+        'edges': [(first + i) * bin_width for i in range(size + 1)],
+        'totals': totals.astype(int).tolist(),
+        'with_internet': with_internet.astype(int).tolist(),
+        'rate': rate.tolist(),
+        'lower': lower.tolist(),
+        'upper': upper.tolist(),
+    }
+
+
+class ReportAggregator:
+    """Agregações dos relatórios calculadas no banco, com cache por versão dos dados"""
+
+    CACHE_TTL = 3600
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.logger = get_logger(__name__)
+
+    def get_aggregates(self, use_cache: bool = True) -> Dict[str, Any]:
+        """Retorna as agregações de todos os indivíduos do banco"""
+        if not use_cache:
+            return self._compute()
+
+        key = f"report_aggregates:{self.db_manager.get_data_version()}"
+        cache = get_global_cache()
+        aggregates = cache.get(key)
+        if aggregates is None:
+            aggregates = self._compute()
+            cache.set(key, aggregates, self.CACHE_TTL)
+        return aggregates
+
+    def _compute(self) -> Dict[str, Any]:
+        """Executa as consultas agrupadas"""
+        groups = new_groups()
+
+        with self.db_manager.get_session() as session:
+            person_rows = session.execute(
+                select(Individual.gender, Individual.age, Individual.has_disability,
+                       Household.has_internet, func.count())
+                .select_from(Individual)
+                .outerjoin(Household, Individual.household_id == Household.id)
+                .group_by(Individual.gender, Individual.age, Individual.has_disability, Household.has_internet)
+            ).all()
+            for gender, age, has_disability, has_internet, count in person_rows:
+                groups['person'][(gender, age, has_disability, has_internet)] += count
+
+            income_rows = session.execute(
+                select(Household.income_range, func.count())
+                .select_from(Individual)
+                .outerjoin(Household, Individual.household_id == Household.id)
+                .group_by(Household.income_range)
+            ).all()
+            for income, count in income_rows:
+                label = income.strip() if income and income.strip() else 'Não Informado'
+                groups['income'][label] += count
+
+            region_rows = session.execute(
+                select(Region.name, func.count())
+                .select_from(Individual)
+                .outerjoin(Household, Individual.household_id == Household.id)
+                .outerjoin(Region, Household.region_id == Region.id)
+                .group_by(Region.name)
+            ).all()
+            for name, count in region_rows:
+                groups['region'][name or 'Não informado'] += count
+
+            device_rows = session.execute(
+                select(DeviceUsage.device_type, func.count())
+                .select_from(DeviceUsage)
+                .join(Individual, DeviceUsage.individual_id == Individual.id)
+                .group_by(DeviceUsage.device_type)
+            ).all()
+            for device_type, count in device_rows:
+                label = device_type.strip() if device_type and device_type.strip() else 'Não Especificado'
+                groups['devices'][label] += count
+
+            without_devices = session.execute(
+                select(func.count()).select_from(Individual).where(
+                    ~exists().where(DeviceUsage.individual_id == Individual.id)
+                )
+            ).scalar() or 0
+            if without_devices:
+                groups['devices']['Nenhum Dispositivo'] += without_devices
+                groups['without_devices'] = without_devices
+
+        aggregates = build_aggregates(groups)
+        self.logger.info(f"Agregações de relatório calculadas para {aggregates['total']} indivíduos")
+        return aggregates
+
+    # Colunas de segmentação aceitas por iter_region_aggregates
+    SEGMENTS = {'region': Region.name, 'state': Region.state, 'macro_region': Region.macro_region}
+
+    def iter_region_aggregates(self, batch_size: int = 10000, by: str = 'region',
+                               only: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Gera (segmento, agregações) um segmento por vez, em ordem alfabética.
+
+        `by` escolhe o segmento: região (padrão), estado ou macrorregião. As
+        combinações de pessoas são lidas em lotes ordenados pelo segmento, de
+        modo que apenas as contagens do segmento corrente ficam em memória.
+        Com `only`, as consultas se restringem aos segmentos informados.
+        """
+        region_name = func.coalesce(self.SEGMENTS[by], 'Não informado')
+
+        def segments(statement):
+            return statement if only is None else statement.where(region_name.in_(list(only)))
+
+        with self.db_manager.get_session() as session:
+            # Contagens pequenas (região x categoria) carregadas de uma vez
+            income: Dict[str, Counter] = {}
+            for name, value, count in session.execute(segments(
+                select(region_name, Household.income_range, func.count())
+                .select_from(Individual)
+                .outerjoin(Household, Individual.household_id == Household.id)
+                .outerjoin(Region, Household.region_id == Region.id)
+                .group_by(region_name, Household.income_range)
+            )):
+                label = value.strip() if value and value.strip() else 'Não Informado'
+                income.setdefault(name, Counter())[label] += count
+
+            devices: Dict[str, Counter] = {}
+            for name, device_type, count in session.execute(segments(
+                select(region_name, DeviceUsage.device_type, func.count())
+                .select_from(DeviceUsage)
+                .join(Individual, DeviceUsage.individual_id == Individual.id)
+                .outerjoin(Household, Individual.household_id == Household.id)
+                .outerjoin(Region, Household.region_id == Region.id)
+                .group_by(region_name, DeviceUsage.device_type)
+            )):
+                label = device_type.strip() if device_type and device_type.strip() else 'Não Especificado'
+                devices.setdefault(name, Counter())[label] += count
+
+            without: Dict[str, int] = dict(session.execute(segments(
+                select(region_name, func.count())
+                .select_from(Individual)
+                .outerjoin(Household, Individual.household_id == Household.id)
+                .outerjoin(Region, Household.region_id == Region.id)
+                .where(~exists().where(DeviceUsage.individual_id == Individual.id))
+                .group_by(region_name)
+            )).all())
+
+            person_rows = session.execute(segments(
+                select(region_name, Individual.gender, Individual.age, Individual.has_disability,
+                       Household.has_internet, func.count())
+                .select_from(Individual)
+                .outerjoin(Household, Individual.household_id == Household.id)
+                .outerjoin(Region, Household.region_id == Region.id)
+                .group_by(region_name, Individual.gender, Individual.age,
+                          Individual.has_disability, Household.has_internet)
+                .order_by(region_name)
+                .execution_options(yield_per=batch_size)
+            ))
+
+            current, groups = None, None
+            for name, gender, age, has_disability, has_internet, count in person_rows:
+                if name != current:
+                    if current is not None:
+                        yield current, build_aggregates(groups)
+                    current, groups = name, self._region_groups(name, income, devices, without)
+                groups['person'][(gender, age, has_disability, has_internet)] += count
+            if current is not None:
+                yield current, build_aggregates(groups)
+
+    @staticmethod
+    def _region_groups(name: str, income: Dict[str, Counter], devices: Dict[str, Counter],
+                       without: Dict[str, int]) -> Dict[str, Any]:
+        """Contagens brutas de uma região a partir das tabelas já carregadas"""
+        groups = new_groups()
+        groups['income'].update(income.get(name, {}))
+        groups['region'][name] = sum(income.get(name, {}).values())
+        groups['devices'].update(devices.get(name, {}))
+        if without.get(name):
+            groups['devices']['Nenhum Dispositivo'] += without[name]
+            groups['without_devices'] = without[name]
+        return groups
+
+
+def statistics_text(aggregates: Dict[str, Any], title: str = "RELATÓRIO ESTATÍSTICO - SISTEMA DAC") -> str:
+    """Texto do resumo estatístico (aba de estatísticas e exportações)"""
+    total = aggregates['total']
+    age = aggregates['age']
+    disability_count = aggregates['disability']['Sim']
+    internet_count = aggregates['internet']['Com Internet']
+
+    def percent(count):
+        return (count / total) * 100 if total > 0 else 0
+
+    lines = [title, '=' * 50, '', f"TOTAL DE REGISTROS: {total}", '',
+             'DISTRIBUIÇÃO POR GÊNERO:', '-' * 30]
+    for gender, count in aggregates['gender'].items():
+        lines.append(f"{gender}: {count} ({percent(count):.1f}%)")
+
+    lines += [
+        '', 'ESTATÍSTICAS DE IDADE:', '-' * 30,
+        f"Idade média: {age['average']:.1f} anos",
+        f"Total com idade válida: {age['valid']}",
+        f"Total sem idade: {age['invalid']}",
+        '', 'PESSOAS COM DEFICIÊNCIA:', '-' * 30,
+        f"Com deficiência: {disability_count} ({percent(disability_count):.1f}%)",
+        f"Sem deficiência: {total - disability_count} ({percent(total - disability_count):.1f}%)",
+        '', 'ACESSO À INTERNET:', '-' * 30,
+        f"Com internet: {internet_count} ({percent(internet_count):.1f}%)",
+        f"Sem internet: {total - internet_count} ({percent(total - internet_count):.1f}%)",
+        '', 'DISTRIBUIÇÃO POR RENDA:', '-' * 30,
+    ]
+    for income, count in aggregates['income'].items():
+        lines.append(f"{income}: {count} ({percent(count):.1f}%)")
+    return '\n'.join(lines) + '\n'
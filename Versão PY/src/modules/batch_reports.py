@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Geração de relatórios em lote, sem interface gráfica
+
+Calcula uma única vez as agregações gerais e as de cada segmento (região,
+estado ou macrorregião) e distribui a montagem de cada relatório - gráficos,
+PDF e XLSX - entre processos. Os trabalhadores recebem apenas as agregações
+já calculadas e não acessam o banco.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ..database.report_queries import ReportAggregator, statistics_text
+from ..ui.chart_drawing import CHART_TITLES, chart_series
+from ..ui.chart_renderer import dark_style, render_chart_png
+from .streaming_export import add_image_sheet, write_xlsx
+
+try:
+    from ..utils.logger import get_logger
+except ImportError:
+    import logging
+
+    def get_logger(name):
+        return logging.getLogger(name)
+
+
+# Gráficos de cada segmento (a distribuição regional só faz sentido no geral)
+SEGMENT_CHARTS = ('gender', 'age', 'income', 'internet', 'devices', 'correlation')
+OVERALL_CHARTS = SEGMENT_CHARTS[:5] + ('regional', 'correlation')
+
+SUMMARY_COLUMNS = ['Categoria', 'Valor', 'Quantidade', 'Percentual']
+
+
+@dataclass
+class SegmentTask:
+    """Relatório de um segmento (serializável para o pool de processos)"""
+
+    name: str
+    aggregates: Dict[str, Any]
+    output_dir: str
+    formats: Tuple[str, ...] = ('pdf', 'xlsx')
+    charts: Tuple[str, ...] = SEGMENT_CHARTS
+    style: Dict[str, Any] = field(default_factory=dark_style)
+    dpi: int = 100
+    # Nome do arquivo sem extensão (único no lote); vazio usa o nome do segmento
+    filename: str = ''
+
+
+def safe_filename(name: str) -> str:
+    """Nome de arquivo seguro para o segmento"""
+    cleaned = re.sub(r'[^\w\-]+', '_', name.strip(), flags=re.UNICODE).strip('_')
+    return cleaned or 'sem_nome'
+
+
+def unique_filename(name: str, used: Set[str]) -> str:
+    """`safe_filename` com sufixo numérico se o nome já estiver em `used` (que é atualizado).
+
+    A comparação ignora maiúsculas/minúsculas, como nos sistemas de arquivos
+    do Windows e do macOS.
+    """
+    base = safe_filename(name)
+    filename, suffix = base, 2
+    while filename.lower() in used:
+        filename, suffix = f"{base}_{suffix}", suffix + 1
+    used.add(filename.lower())
+    return filename
+
+
+def summary_rows(aggregates: Dict[str, Any]) -> Iterable[List[Any]]:
+    """Linhas categoria / valor / quantidade / percentual da aba de estatísticas"""
+    total = aggregates['total']
+    sections = (
+        ('Gênero', aggregates['gender']),
+        ('Faixa Etária', aggregates['age']['bands']),
+        ('Internet', aggregates['internet']),
+        ('Deficiência', aggregates['disability']),
+        ('Renda', aggregates['income']),
+        ('Dispositivos', aggregates['devices']),
+        ('Região', aggregates['regions']),
+    )
+    for category, counts in sections:
+        for value, count in counts.items():
+            percentage = count / total * 100 if total else 0
+            yield [category, value, count, f'{percentage:.1f}%']
+
+
+def build_segment_report(task: SegmentTask) -> Dict[str, Any]:
+    """Gera gráficos, PDF e XLSX de um segmento; retorna arquivos e tempos por etapa"""
+    timings: Dict[str, float] = {}
+    files: List[str] = []
+    base = os.path.join(task.output_dir, task.filename or safe_filename(task.name))
+
+    started = time.perf_counter()
+    charts = []
+    if task.aggregates['total']:
+        for chart_type in task.charts:
+            png = render_chart_png(chart_type, chart_series(chart_type, task.aggregates),
+                                   (8, 6), dpi=task.dpi, style=task.style)
+            charts.append((CHART_TITLES[chart_type], png))
+    timings['gráficos'] = time.perf_counter() - started
+
+    if 'pdf' in task.formats:
+        from .report_pdf import build_report_pdf
+
+        started = time.perf_counter()
+        title = f"RELATÓRIO ESTATÍSTICO - {task.name}"
+        build_report_pdf(f"{base}.pdf", statistics_text(task.aggregates, title=title), charts=charts,
+                         title=title, generated_at=datetime.now().strftime('%d/%m/%Y às %H:%M'))
+        files.append(f"{base}.pdf")
+        timings['pdf'] = time.perf_counter() - started
+
+    if 'xlsx' in task.formats:
+        started = time.perf_counter()
+        write_xlsx(f"{base}.xlsx", SUMMARY_COLUMNS, summary_rows(task.aggregates),
+                   sheet_name='Estatísticas', before_save=lambda workbook: add_image_sheet(workbook, charts))
+        files.append(f"{base}.xlsx")
+        timings['xlsx'] = time.perf_counter() - started
+
+    return {'name': task.name, 'files': files, 'timings': timings}
+
+
+class BatchReportRunner:
+    """Gera o relatório geral e um relatório por segmento em paralelo"""
+
+    def __init__(self, db_manager, output_dir: str, by: str = 'region',
+                 formats: Sequence[str] = ('pdf', 'xlsx'), workers: Optional[int] = None,
+                 only: Optional[Sequence[str]] = None, dpi: int = 100):
+        self.db_manager = db_manager
+        self.output_dir = output_dir
+        self.by = by
+        self.formats = tuple(formats)
+        self.workers = workers or os.cpu_count() or 1
+        self.only = set(only) if only else None
+        self.dpi = dpi
+        self.logger = get_logger(__name__)
+        # Tempo de parede por etapa e tempo somado dos trabalhadores por subetapa
+        self.timings: Dict[str, float] = {}
+        self.worker_timings: Dict[str, float] = {}
+
+    def _stage(self, name: str, started: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    def prepare_tasks(self) -> List[SegmentTask]:
+        """Calcula as agregações compartilhadas (geral + segmentos) uma única vez"""
+        started = time.perf_counter()
+        aggregator = ReportAggregator(self.db_manager)
+        overall = aggregator.get_aggregates()
+        self._stage('agregações gerais', started)
+
+        started = time.perf_counter()
+        used: Set[str] = set()
+        tasks = [SegmentTask('Geral', overall, self.output_dir, self.formats, OVERALL_CHARTS, dpi=self.dpi,
+                             filename=unique_filename('Geral', used))]
+        # Segmentos fora de --only nem chegam a ser agregados
+        for name, aggregates in aggregator.iter_region_aggregates(by=self.by, only=self.only):
+            tasks.append(SegmentTask(name, aggregates, self.output_dir, self.formats, dpi=self.dpi,
+                                     filename=unique_filename(name, used)))
+        self._stage('agregações por segmento', started)
+        return tasks
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Executa o lote e retorna o resultado de cada relatório"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tasks = self.prepare_tasks()
+
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        if self.workers <= 1:
+            for task in tasks:
+                results.append(self._collect(task.name, lambda task=task: build_segment_report(task)))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as pool:
+                futures = {pool.submit(build_segment_report, task): task.name for task in tasks}
+                for future in as_completed(futures):
+                    results.append(self._collect(futures[future], future.result))
+        self._stage('relatórios (paralelo)', started)
+
+        results.sort(key=lambda result: (result['name'] != 'Geral', result['name']))
+        return results
+
+    def _collect(self, name: str, get_result) -> Dict[str, Any]:
+        """Registra o resultado (ou erro) de um relatório"""
+        try:
+            result = get_result()
+        except Exception as e:
+            self.logger.error(f"Erro ao gerar relatório '{name}': {e}")
+            return {'name': name, 'files': [], 'timings': {}, 'error': str(e)}
+        for stage, seconds in result['timings'].items():
+            self.worker_timings[stage] = self.worker_timings.get(stage, 0.0) + seconds
+        return result
+
+    def timing_report(self) -> str:
+        """Tabela de tempos por etapa"""
+        lines = ['Etapa                              Tempo (s)', '-' * 45]
+        for stage, seconds in self.timings.items():
+            lines.append(f"{stage:<34} {seconds:>10.2f}")
+        for stage, seconds in self.worker_timings.items():
+            lines.append(f"  {stage + ' (soma dos processos)':<32} {seconds:>10.2f}")
+        lines.append(f"{'total':<34} {sum(self.timings.values()):>10.2f}")
+        return '\n'.join(lines)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Tabelas cruzadas (1 a 3 dimensões) sobre indivíduos e domicílios
+
+Um único GROUP BY por todas as dimensões pedidas produz o "cubo": para cada
+combinação de valores, somas aditivas (contagem, numeradores e denominadores
+das taxas). Qualquer medida e os totais de linha/coluna saem desse cubo sem
+nova consulta, então ele pode ser guardado em cache independentemente da
+medida e da ordem das dimensões.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, exists, func, select, true
+
+from ..database.models import Individual, Household, Region, DeviceUsage
+from ..database.report_queries import (
+    AGE_BANDS, INCOME_ORDER, normalize_disability, normalize_gender, normalize_internet
+)
+
+MISSING_LABEL = 'Não Informado'
+MAX_DIMENSIONS = 3
+
+_AGE_BAND = case(
+    (Individual.age.is_(None), MISSING_LABEL),
+    (Individual.age < 18, '0-17'),
+    (Individual.age < 30, '18-29'),
+    (Individual.age < 50, '30-49'),
+    (Individual.age < 65, '50-64'),
+    else_='65+',
+)
+
+
+def _text_label(value: Any) -> str:
+    return str(value).strip() if value is not None and str(value).strip() else MISSING_LABEL
+
+
+# nome na API -> (título, expressão SQL, normalização do valor, ordem preferida)
+DIMENSIONS: Dict[str, Tuple[str, Any, Callable[[Any], str], Sequence[str]]] = {
+    'regiao': ('Região', Region.name, _text_label, ()),
+    'estado': ('Estado', Region.state, _text_label, ()),
+    'macrorregiao': ('Macrorregião', Region.macro_region, _text_label, ()),
+    'area': ('Área', Household.area_type, _text_label, ()),
+    'renda': ('Faixa de renda', Household.income_range, _text_label, INCOME_ORDER),
+    'internet': ('Internet no domicílio', Household.has_internet, normalize_internet,
+                 ('Com Internet', 'Sem Internet')),
+    'genero': ('Gênero', Individual.gender, normalize_gender, ('Masculino', 'Feminino')),
+    'faixa_etaria': ('Faixa etária', _AGE_BAND, _text_label, AGE_BANDS),
+    'escolaridade': ('Escolaridade', Individual.education_level, _text_label, ()),
+    'deficiencia': ('Deficiência', Individual.has_disability, normalize_disability, ('Sim', 'Não')),
+    'ocupacao': ('Ocupação', Individual.employment_status, _text_label, ()),
+}
+
+# Somas aditivas calculadas por célula
+BASE_COLUMNS = ('n', 'internet_sim', 'internet_n', 'deficiencia_sim', 'deficiencia_n',
+                'dispositivo_sim', 'idade_soma', 'idade_n')
+
+
+def _ratio(numerator: str, denominator: str, digits: int = 4):
+    def measure(base: Dict[str, float], total: Dict[str, float]) -> Optional[float]:
+        return round(base[numerator] / base[denominator], digits) if base[denominator] else None
+    return measure
+
+
+# nome na API -> (título, função(base da célula, base do total geral))
+MEASURES: Dict[str, Tuple[str, Callable[[Dict, Dict], Optional[float]]]] = {
+    'contagem': ('Indivíduos', lambda base, total: base['n']),
+    'proporcao': ('Proporção do total',
+                  lambda base, total: round(base['n'] / total['n'], 4) if total['n'] else None),
+    'internet_rate': ('Taxa de acesso à internet', _ratio('internet_sim', 'internet_n')),
+    'deficiencia_rate': ('Taxa de deficiência', _ratio('deficiencia_sim', 'deficiencia_n')),
+    'dispositivo_rate': ('Taxa com algum dispositivo', _ratio('dispositivo_sim', 'n')),
+    'idade_media': ('Idade média', _ratio('idade_soma', 'idade_n', digits=1)),
+}
+
+
+def validate_dimensions(rows: Sequence[str], cols: Sequence[str]) -> None:
+    """Levanta ValueError se as dimensões não formarem uma tabela cruzada válida"""
+    dimensions = list(rows) + list(cols)
+    if not rows:
+        raise ValueError("Informe ao menos uma dimensão nas linhas")
+    if len(dimensions) > MAX_DIMENSIONS:
+        raise ValueError(f"No máximo {MAX_DIMENSIONS} dimensões")
+    if len(set(dimensions)) != len(dimensions):
+        raise ValueError("Dimensões repetidas")
+    unknown = [name for name in dimensions if name not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Dimensões desconhecidas: {', '.join(unknown)}")
+
+
+def grouped_statement(dimensions: Sequence[str]):
+    """GROUP BY único pelas dimensões, com as somas de BASE_COLUMNS"""
+    columns = [DIMENSIONS[name][1].label(name) for name in dimensions]
+    has_device = exists().where(DeviceUsage.individual_id == Individual.id, DeviceUsage.has_device == true())
+    return (
+        select(
+            *columns,
+            func.count().label('n'),
+            func.sum(case((Household.has_internet == true(), 1), else_=0)).label('internet_sim'),
+            func.count(Household.has_internet).label('internet_n'),
+            func.sum(case((Individual.has_disability == true(), 1), else_=0)).label('deficiencia_sim'),
+            func.count(Individual.has_disability).label('deficiencia_n'),
+            func.sum(case((has_device, 1), else_=0)).label('dispositivo_sim'),
+            func.coalesce(func.sum(Individual.age), 0).label('idade_soma'),
+            func.count(Individual.age).label('idade_n'),
+        )
+        .select_from(Individual)
+        .outerjoin(Household, Individual.household_id == Household.id)
+        .outerjoin(Region, Household.region_id == Region.id)
+        .group_by(*columns)
+    )
+
+
+def build_cube(dimensions: Sequence[str], rows) -> List[Tuple[Tuple[str, ...], Dict[str, float]]]:
+    """Normaliza os valores das dimensões e junta as células equivalentes ('m' e 'Masculino')"""
+    normalizers = [DIMENSIONS[name][2] for name in dimensions]
+    cells: Dict[Tuple[str, ...], Dict[str, float]] = defaultdict(lambda: dict.fromkeys(BASE_COLUMNS, 0))
+    size = len(dimensions)
+    for row in rows:
+        key = tuple(normalize(value) for normalize, value in zip(normalizers, row[:size]))
+        base = cells[key]
+        for column, value in zip(BASE_COLUMNS, row[size:]):
+            base[column] += value or 0
+    return list(cells.items())
+
+
+def _sum(bases) -> Dict[str, float]:
+    total = dict.fromkeys(BASE_COLUMNS, 0)
+    for base in bases:
+        for column in BASE_COLUMNS:
+            total[column] += base[column]
+    return total
+
+
+def _ordered(dimension: str, values) -> List[str]:
+    preferred = DIMENSIONS[dimension][3]
+    position = {value: index for index, value in enumerate(preferred)}
+    return sorted(values, key=lambda value: (value == MISSING_LABEL, position.get(value, len(position)), value))
+
+
+def _sorted_keys(keys, dimensions: Sequence[str]) -> List[Tuple[str, ...]]:
+    orders = [_ordered(name, {key[i] for key in keys}) for i, name in enumerate(dimensions)]
+    ranks = [{value: index for index, value in enumerate(order)} for order in orders]
+    return sorted(keys, key=lambda key: tuple(rank[value] for rank, value in zip(ranks, key)))
+
+
+def pivot(cube_dimensions: Sequence[str], cube, rows: Sequence[str], cols: Sequence[str],
+          measure: str) -> Dict[str, Any]:
+    """Monta a tabela (células, totais de linha/coluna e total geral) para a medida.
+
+    `rows` + `cols` devem estar entre as dimensões do cubo (`cube_dimensions`).
+    """
+    compute = MEASURES[measure][1]
+    order = [list(cube_dimensions).index(name) for name in list(rows) + list(cols)]
+    split = len(rows)
+
+    # Dimensões do cubo fora da tabela são somadas (roll-up)
+    grid: Dict[Tuple, Dict[Tuple, Dict[str, float]]] = defaultdict(dict)
+    for key, base in cube:
+        key = tuple(key[i] for i in order)
+        cells = grid[key[:split]]
+        cell = cells.get(key[split:])
+        cells[key[split:]] = base if cell is None else _sum((cell, base))
+
+    row_keys = _sorted_keys(list(grid), rows)
+    col_keys = _sorted_keys({col for cells in grid.values() for col in cells}, cols)
+    total = _sum(base for cells in grid.values() for base in cells.values())
+
+    def value(base: Optional[Dict[str, float]]):
+        return None if base is None else compute(base, total)
+
+    return {
+        'row_keys': [list(key) for key in row_keys],
+        'col_keys': [list(key) for key in col_keys],
+        'cells': [[value(grid[row].get(col)) for col in col_keys] for row in row_keys],
+        'counts': [[grid[row][col]['n'] if col in grid[row] else 0 for col in col_keys] for row in row_keys],
+        'row_totals': [value(_sum(grid[row].values())) for row in row_keys],
+        'col_totals': [value(_sum(grid[row][col] for row in row_keys if col in grid[row])) for col in col_keys],
+        'total': value(total),
+        'n': total['n'],
+    }
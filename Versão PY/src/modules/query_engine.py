@@ -4,15 +4,36 @@
 Módulo de motor de consultas para o sistema DAC
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from sqlalchemy.orm import joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, select
 from datetime import datetime
 import logging
 
 from ..database.models import Individual, Household, Region, DeviceUsage, InternetUsage
 from ..database.database_manager import DatabaseManager
 from ..utils.logger import get_logger
+from .report_dataset import ReportDataset
+
+# Colunas das exportações de resultados
+EXPORT_COLUMNS = ['ID', 'Região', 'Idade', 'Gênero', 'Faixa de Renda',
+                  'Tem Deficiência', 'Tem Internet', 'Dispositivos']
+
+
+def format_export_row(row: Tuple) -> Tuple:
+    """Formata uma linha de QueryEngine.export_statement como nas planilhas exportadas"""
+    row_id, region, age, gender, income, disability, internet, device_list = row
+    return (
+        row_id if row_id is not None else 'N/A',
+        region or 'N/A',
+        age if age is not None else 'N/A',
+        gender or 'N/A',
+        income or 'N/A',
+        'Sim' if disability else 'Não',
+        'N/A' if internet is None else ('Sim' if internet else 'Não'),
+        device_list or 'Nenhum',
+    )
+
 
 class QueryEngine:
     """Motor de consultas para filtrar e buscar dados no sistema DAC"""
@@ -83,6 +104,102 @@ class QueryEngine:
             self.logger.error(f"Erro ao contar resultados: {e}")
             return 0
     
+    def get_report_dataset(self, filters: Dict[str, Any], batch_size: int = 10000) -> Optional[ReportDataset]:
+        """
+        Retorna todos os registros que atendem aos filtros em formato colunar
+        
+        Args:
+            filters: Dicionário com filtros a aplicar
+            batch_size: Linhas lidas por lote do cursor
+            
+        Returns:
+            ReportDataset com os registros filtrados ou None em caso de erro
+        """
+        try:
+            with self.db_manager.get_session() as session:
+                # Apenas as colunas necessárias, sem instanciar objetos ORM
+                rows = session.query(
+                    Individual.id, Individual.age, Individual.gender, Individual.education_level,
+                    Individual.has_disability, Household.income_range, Household.has_internet, Region.name
+                ).join(Household, Individual.household_id == Household.id)\
+                 .join(Region, Household.region_id == Region.id)
+                rows = self._apply_filters(rows, filters).yield_per(batch_size)
+                
+                devices = session.query(DeviceUsage.individual_id, DeviceUsage.device_type)\
+                    .join(Individual, DeviceUsage.individual_id == Individual.id)\
+                    .join(Household, Individual.household_id == Household.id)\
+                    .join(Region, Household.region_id == Region.id)
+                devices = self._apply_filters(devices, filters).yield_per(batch_size)
+                
+                return ReportDataset.from_rows(rows, devices)
+                
+        except Exception as e:
+            self.logger.error(f"Erro ao montar conjunto de dados do relatório: {e}")
+            return None
+    
+    def export_statement(self, filters: Dict[str, Any], ids: Optional[List[int]] = None):
+        """
+        Consulta das linhas de exportação, ordenada por ID
+        
+        Args:
+            filters: Dicionário com filtros a aplicar
+            ids: Restringe aos indivíduos informados (ex.: página atual)
+            
+        Returns:
+            Select com as colunas de EXPORT_COLUMNS, ainda sem formatação
+        """
+        # Dispositivos concatenados por indivíduo no próprio banco
+        devices = select(
+            DeviceUsage.individual_id.label('individual_id'),
+            func.group_concat(DeviceUsage.device_type, ', ').label('devices')
+        ).group_by(DeviceUsage.individual_id).subquery()
+        
+        query = select(
+            Individual.id, Region.name, Individual.age, Individual.gender,
+            Household.income_range, Individual.has_disability, Household.has_internet,
+            devices.c.devices
+        ).select_from(Individual)\
+         .join(Household, Individual.household_id == Household.id)\
+         .join(Region, Household.region_id == Region.id)\
+         .outerjoin(devices, devices.c.individual_id == Individual.id)
+        query = self._apply_filters(query, filters)
+        if ids is not None:
+            query = query.filter(Individual.id.in_(ids))
+        return query.order_by(Individual.id)
+    
+    def iter_export_rows(self, filters: Dict[str, Any], batch_size: int = 5000,
+                         ids: Optional[List[int]] = None) -> Iterator[Tuple]:
+        """
+        Gera as linhas de exportação (EXPORT_COLUMNS) lendo o cursor em lotes
+        
+        Args:
+            filters: Dicionário com filtros a aplicar
+            batch_size: Linhas lidas por lote do cursor
+            ids: Restringe aos indivíduos informados (ex.: página atual)
+            
+        Returns:
+            Iterador de tuplas já formatadas, sem instanciar objetos ORM
+        """
+        statement = self.export_statement(filters, ids).execution_options(yield_per=batch_size)
+        with self.db_manager.get_session() as session:
+            for row in session.execute(statement):
+                yield format_export_row(row)
+    
+    def crosstab_statement(self, dimensions: List[str], filters: Dict[str, Any]):
+        """
+        GROUP BY único de uma tabela cruzada (ver src/modules/crosstab.py)
+        
+        Args:
+            dimensions: Dimensões do cubo (nomes de crosstab.DIMENSIONS)
+            filters: Dicionário com filtros a aplicar
+            
+        Returns:
+            Select com as dimensões e as somas de crosstab.BASE_COLUMNS
+        """
+        from .crosstab import grouped_statement
+        
+        return self._apply_filters(grouped_statement(dimensions), filters)
+    
     def _apply_filters(self, query, filters: Dict[str, Any]):
         """
         Aplica filtros à consulta
@@ -264,12 +381,12 @@ class QueryEngine:
             self.logger.error(f"Erro ao executar consulta avançada: {e}")
             return None
     
-    def _calculate_statistics(self, results: List[Dict]) -> Dict[str, Any]:
+    def _calculate_statistics(self, results) -> Dict[str, Any]:
         """
         Calcula estatísticas dos resultados
         
         Args:
-            results: Lista de resultados
+            results: Lista de resultados ou ReportDataset
             
         Returns:
             Dicionário com estatísticas
@@ -278,48 +395,8 @@ class QueryEngine:
             return {}
         
         try:
-            stats = {
-                'total_individuals': len(results),
-                'age_distribution': {},
-                'gender_distribution': {},
-                'education_distribution': {},
-                'region_distribution': {},
-                'disability_count': 0,
-                'internet_access_count': 0
-            }
-            
-            for result in results:
-                # Distribuição por idade
-                age = result.get('age')
-                if age is not None:
-                    age_group = f"{(age // 10) * 10}-{(age // 10) * 10 + 9}"
-                    stats['age_distribution'][age_group] = stats['age_distribution'].get(age_group, 0) + 1
-                
-                # Distribuição por gênero
-                gender = result.get('gender')
-                if gender:
-                    stats['gender_distribution'][gender] = stats['gender_distribution'].get(gender, 0) + 1
-                
-                # Distribuição por educação
-                education = result.get('education_level')
-                if education:
-                    stats['education_distribution'][education] = stats['education_distribution'].get(education, 0) + 1
-                
-                # Distribuição por região
-                if result.get('household') and result['household'].get('region'):
-                    region = result['household']['region'].get('name')
-                    if region:
-                        stats['region_distribution'][region] = stats['region_distribution'].get(region, 0) + 1
-                
-                # Contagem de deficiências
-                if result.get('has_disability'):
-                    stats['disability_count'] += 1
-                
-                # Contagem de acesso à internet
-                if result.get('household') and result['household'].get('has_internet'):
-                    stats['internet_access_count'] += 1
-            
-            return stats
+            dataset = results if isinstance(results, ReportDataset) else ReportDataset.from_records(results)
+            return dataset.statistics()
             
         except Exception as e:
             self.logger.error(f"Erro ao calcular estatísticas: {e}")
@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+Conjunto de dados colunar para relatórios do DAC
+
+Guarda os campos usados pelos relatórios em arrays NumPy (códigos
+categóricos para texto e dispositivos em formato CSR), em vez de uma lista
+de dicionários aninhados. Estatísticas, histogramas e correlações são
+calculados em uma única passada vetorizada.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..database.report_queries import (
+    new_groups, build_aggregates, normalize_gender
+)
+
+# Códigos dos campos booleanos
+FALSE, TRUE, MISSING = 0, 1, 2
+
+# Situação da lista de dispositivos de cada registro
+DEVICES_LIST, DEVICES_MISSING, DEVICES_ERROR = 0, 1, 2
+
+_MISSING_TEXT = ('', 'null', 'none', 'nan')
+
+
+class _Categories:
+    """Codificador incremental de valores categóricos"""
+
+    def __init__(self):
+        self.index: Dict[Any, int] = {}
+        self.values: List[Any] = []
+
+    def code(self, value: Any) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or str(value).strip().lower() in _MISSING_TEXT:
+        return None
+    return str(value).strip()
+
+
+def _flag(value: Any) -> int:
+    if value is None or str(value).strip().lower() in _MISSING_TEXT:
+        return MISSING
+    return TRUE if value else FALSE
+
+
+def _device_type(device: Any) -> Any:
+    """Tipo do dispositivo: texto, dicionário do QueryEngine ou objeto DeviceUsage"""
+    if isinstance(device, dict):
+        return device.get('device_type')
+    return getattr(device, 'device_type', device)
+
+
+def _age(value: Any) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+@dataclass
+class ReportDataset:
+    """Registros de relatório em formato colunar"""
+
+    ids: np.ndarray
+    age: np.ndarray                 # float64, NaN quando ausente
+    gender: np.ndarray              # códigos em gender_values (None = não informado)
+    education: np.ndarray           # códigos em education_values
+    disability: np.ndarray          # FALSE / TRUE / MISSING
+    internet: np.ndarray            # FALSE / TRUE / MISSING
+    income: np.ndarray              # códigos em income_values
+    region: np.ndarray              # códigos em region_values
+    device_offsets: np.ndarray      # CSR: dispositivos de i em device_codes[off[i]:off[i+1]]
+    device_codes: np.ndarray        # códigos em device_values
+    device_state: np.ndarray        # DEVICES_LIST / DEVICES_MISSING / DEVICES_ERROR
+    gender_values: List[Optional[str]] = field(default_factory=list)
+    education_values: List[Optional[str]] = field(default_factory=list)
+    income_values: List[Optional[str]] = field(default_factory=list)
+    region_values: List[Optional[str]] = field(default_factory=list)
+    device_values: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]],
+                  devices: Iterable[Tuple[int, Any]] = ()) -> 'ReportDataset':
+        """Constrói a partir de tuplas projetadas do banco.
+
+        Cada linha é (id, idade, gênero, escolaridade, deficiência, renda,
+        internet, região); `devices` são pares (id do indivíduo, tipo).
+        """
+        genders, educations, incomes, regions = _Categories(), _Categories(), _Categories(), _Categories()
+        ids, ages, gender, education, disability, internet, income, region = [], [], [], [], [], [], [], []
+
+        for row_id, age, gender_value, education_value, disability_value, income_value, internet_value, region_name in rows:
+            ids.append(row_id)
+            ages.append(_age(age))
+            gender.append(genders.code(_text(gender_value)))
+            education.append(educations.code(_text(education_value)))
+            disability.append(_flag(disability_value))
+            income.append(incomes.code(_text(income_value)))
+            internet.append(_flag(internet_value))
+            region.append(regions.code(_text(region_name)))
+
+        ids_array = np.asarray(ids, dtype=np.int64)
+        device_values = _Categories()
+        owner, codes = [], []
+        for individual_id, device_type in devices:
+            owner.append(individual_id)
+            codes.append(device_values.code(_text(device_type) or 'Não Especificado'))
+
+        # Agrupar dispositivos por indivíduo na ordem de ids (CSR)
+        position = {row_id: i for i, row_id in enumerate(ids)}
+        owner_pos = np.fromiter((position.get(o, -1) for o in owner), dtype=np.int64, count=len(owner))
+        codes_array = np.asarray(codes, dtype=np.int32)
+        keep = owner_pos >= 0
+        owner_pos, codes_array = owner_pos[keep], codes_array[keep]
+        order = np.argsort(owner_pos, kind='stable')
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owner_pos, minlength=len(ids)), out=offsets[1:])
+
+        return cls(
+            ids=ids_array,
+            age=np.asarray(ages, dtype=np.float64),
+            gender=np.asarray(gender, dtype=np.int32),
+            education=np.asarray(education, dtype=np.int32),
+            disability=np.asarray(disability, dtype=np.int8),
+            internet=np.asarray(internet, dtype=np.int8),
+            income=np.asarray(income, dtype=np.int32),
+            region=np.asarray(region, dtype=np.int32),
+            device_offsets=offsets,
+            device_codes=codes_array[order],
+            device_state=np.full(len(ids), DEVICES_LIST, dtype=np.int8),
+            gender_values=genders.values,
+            education_values=educations.values,
+            income_values=incomes.values,
+            region_values=regions.values,
+            device_values=device_values.values,
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> 'ReportDataset':
+        """Constrói a partir de registros (dicionários dos relatórios ou objetos ORM).
+
+        Os dispositivos vêm do indivíduo (`devices` do QueryEngine ou a relação
+        `Individual.device_usage`); `household['devices']` é o formato de
+        `iter_records`.
+        """
+        rows = []
+        devices = []
+        device_state = []
+        record_ids = []
+        for position, record in enumerate(records):
+            record_id = record.get('id') if isinstance(record, dict) else getattr(record, 'id', None)
+            record_ids.append(record_id if record_id is not None else -1)
+            if isinstance(record, dict):
+                household = record.get('household') or {}
+                region = household.get('region_name') or (household.get('region') or {}).get('name')
+                rows.append((
+                    position, record.get('age'), record.get('gender'), record.get('education_level'),
+                    record.get('has_disability'), household.get('income_range'),
+                    household.get('has_internet'), region
+                ))
+                record_devices = record['devices'] if 'devices' in record else household.get('devices')
+            else:
+                household = getattr(record, 'household', None)
+                region = household.region.name if household is not None and household.region else None
+                rows.append((
+                    position, getattr(record, 'age', None), getattr(record, 'gender', None),
+                    getattr(record, 'education_level', None), getattr(record, 'has_disability', None),
+                    getattr(household, 'income_range', None) if household else None,
+                    getattr(household, 'has_internet', None) if household else None,
+                    region
+                ))
+                record_devices = getattr(record, 'device_usage', None)
+
+            try:
+                if isinstance(record_devices, list):
+                    devices.extend((position, _device_type(device)) for device in record_devices)
+                    device_state.append(DEVICES_LIST)
+                elif record_devices and str(record_devices).strip():
+                    devices.append((position, record_devices))
+                    device_state.append(DEVICES_LIST)
+                else:
+                    device_state.append(DEVICES_MISSING)
+            except (AttributeError, KeyError, TypeError):
+                device_state.append(DEVICES_ERROR)
+
+        # Linhas indexadas pela posição (ids podem faltar ou repetir)
+        dataset = cls.from_rows(rows, devices)
+        dataset.ids = np.asarray(record_ids, dtype=np.int64)
+        dataset.device_state = np.asarray(device_state, dtype=np.int8)
+        return dataset
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Gera os registros no formato de dicionário usado pelos relatórios"""
+        flags = {FALSE: False, TRUE: True, MISSING: None}
+        for i in range(len(self)):
+            start, end = self.device_offsets[i], self.device_offsets[i + 1]
+            age = self.age[i]
+            yield {
+                'id': int(self.ids[i]),
+                'age': None if np.isnan(age) else int(age),
+                'gender': self.gender_values[self.gender[i]],
+                'education_level': self.education_values[self.education[i]],
+                'has_disability': flags[int(self.disability[i])],
+                'household': {
+                    'income_range': self.income_values[self.income[i]],
+                    'has_internet': flags[int(self.internet[i])],
+                    'region_name': self.region_values[self.region[i]],
+                    'devices': [self.device_values[c] for c in self.device_codes[start:end]],
+                },
+            }
+
+    def iter_export_rows(self) -> Iterator[Tuple]:
+        """Gera as linhas de exportação no formato de QueryEngine.iter_export_rows"""
+        for i in range(len(self)):
+            start, end = self.device_offsets[i], self.device_offsets[i + 1]
+            age = self.age[i]
+            internet = int(self.internet[i])
+            devices = ', '.join(self.device_values[c] for c in self.device_codes[start:end])
+            yield (
+                int(self.ids[i]),
+                self.region_values[self.region[i]] or 'N/A',
+                'N/A' if np.isnan(age) else int(age),
+                self.gender_values[self.gender[i]] or 'N/A',
+                self.income_values[self.income[i]] or 'N/A',
+                'Sim' if self.disability[i] == TRUE else 'Não',
+                'N/A' if internet == MISSING else ('Sim' if internet == TRUE else 'Não'),
+                devices or 'Nenhum',
+            )
+
+    def take(self, indices: np.ndarray) -> 'ReportDataset':
+        """Subconjunto com as linhas informadas (categorias compartilhadas)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = self.device_offsets[indices]
+        lengths = self.device_offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Posições de cada dispositivo no array original, por faixa CSR
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return ReportDataset(
+            ids=self.ids[indices], age=self.age[indices], gender=self.gender[indices],
+            education=self.education[indices], disability=self.disability[indices],
+            internet=self.internet[indices], income=self.income[indices], region=self.region[indices],
+            device_offsets=offsets, device_codes=self.device_codes[positions],
+            device_state=self.device_state[indices],
+            gender_values=self.gender_values, education_values=self.education_values,
+            income_values=self.income_values, region_values=self.region_values,
+            device_values=self.device_values,
+        )
+
+    def iter_region_aggregates(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Gera (região, agregações) uma região por vez, em ordem alfabética"""
+        if not len(self):
+            return
+        order = np.argsort(self.region, kind='stable')
+        codes, starts = np.unique(self.region[order], return_index=True)
+        bounds = list(starts) + [len(order)]
+        names = [(self.region_values[code] or 'Não informado', i) for i, code in enumerate(codes.tolist())]
+        for name, i in sorted(names):
+            yield name, self.take(order[bounds[i]:bounds[i + 1]]).aggregates()
+
+    def _valid_ages(self) -> np.ndarray:
+        """Idades truncadas (como int(float())) com -1 fora de 0..120"""
+        ages = np.trunc(np.nan_to_num(self.age, nan=-1.0))
+        ages[(ages < 0) | (ages > 120)] = -1
+        return ages.astype(np.int16)
+
+    @staticmethod
+    def _counts(codes: np.ndarray, values: Sequence[Any]) -> List[Tuple[Any, int]]:
+        counts = np.bincount(codes, minlength=len(values))
+        return [(values[i], int(c)) for i, c in enumerate(counts) if c]
+
+    def aggregates(self) -> Dict[str, Any]:
+        """Agregações no mesmo formato de ReportAggregator.get_aggregates"""
+        groups = new_groups()
+        if not len(self):
+            return build_aggregates(groups)
+
+        # Gênero normalizado por categoria (poucas categorias, não por linha)
+        normalized = _Categories()
+        gender_map = np.asarray([normalized.code(normalize_gender(v)) for v in self.gender_values], dtype=np.int32)
+
+        # Combinações (gênero, idade, deficiência, internet) em uma passada,
+        # codificadas em um único inteiro: ((gênero * 122 + idade + 1) * 3 + deficiência) * 3 + internet
+        keys = gender_map[self.gender].astype(np.int64) * 122 + (self._valid_ages() + 1)
+        keys = (keys * 3 + self.disability) * 3 + self.internet
+        combos, counts = np.unique(keys, return_counts=True)
+        flags = {FALSE: False, TRUE: True, MISSING: None}
+        for key, count in zip(combos.tolist(), counts.tolist()):
+            key, internet = divmod(key, 3)
+            key, disability = divmod(key, 3)
+            gender_code, age = divmod(key, 122)
+            groups['person'][(normalized.values[gender_code], age - 1 if age else None,
+                              flags[disability], flags[internet])] += count
+
+        for value, count in self._counts(self.income, self.income_values):
+            groups['income'][value or 'Não Informado'] += count
+        for value, count in self._counts(self.region, self.region_values):
+            groups['region'][value or 'Não informado'] += count
+        for value, count in self._counts(self.device_codes, self.device_values):
+            groups['devices'][value] += count
+
+        lengths = np.diff(self.device_offsets)
+        without = int(np.count_nonzero((self.device_state == DEVICES_LIST) & (lengths == 0)))
+        missing = int(np.count_nonzero(self.device_state == DEVICES_MISSING))
+        errors = int(np.count_nonzero(self.device_state == DEVICES_ERROR))
+        if without:
+            groups['devices']['Nenhum Dispositivo'] += without
+        if missing:
+            groups['devices']['Não Informado'] += missing
+        if errors:
+            groups['devices']['Erro nos Dados'] += errors
+        groups['without_devices'] = without + missing
+        groups['device_errors'] = errors
+
+        return build_aggregates(groups)
+
+    def statistics(self) -> Dict[str, Any]:
+        """Estatísticas resumidas (formato de QueryEngine._calculate_statistics)"""
+        if not len(self):
+            return {}
+
+        ages = self.age[~np.isnan(self.age)].astype(np.int64)
+        decades, decade_counts = np.unique((ages // 10) * 10, return_counts=True)
+
+        return {
+            'total_individuals': len(self),
+            'age_distribution': {f"{d}-{d + 9}": int(c) for d, c in zip(decades.tolist(), decade_counts.tolist())},
+            'gender_distribution': {v: c for v, c in self._counts(self.gender, self.gender_values) if v},
+            'education_distribution': {v: c for v, c in self._counts(self.education, self.education_values) if v},
+            'region_distribution': {v: c for v, c in self._counts(self.region, self.region_values) if v},
+            'disability_count': int(np.count_nonzero(self.disability == TRUE)),
+            'internet_access_count': int(np.count_nonzero(self.internet == TRUE)),
+        }
+
+    def memory_usage(self) -> int:
+        """Bytes ocupados pelos arrays"""
+        return sum(getattr(self, name).nbytes for name in (
+            'ids', 'age', 'gender', 'education', 'disability', 'internet', 'income',
+            'region', 'device_offsets', 'device_codes', 'device_state'))
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Geração do relatório PDF do DAC
+
+O documento é montado a partir de um gerador de flowables: o reportlab
+consome a história aos poucos (uma região por vez), então a memória não
+cresce com o número de regiões. O progresso e o cancelamento são
+integrados a uma `BackgroundJob`.
+"""
+
+import os
+from io import BytesIO
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak, Preformatted
+)
+
+from ..utils.background_job import BackgroundJob
+
+
+class _FlowableStream(list):
+    """Lista de flowables reabastecida sob demanda a partir de um gerador.
+
+    `BaseDocTemplate.build` consome a lista pela frente (len / [0] / del),
+    então basta manter uma pequena janela de itens carregados.
+    """
+
+    def __init__(self, flowables: Iterable[Any], window: int = 16):
+        super().__init__()
+        self._source = iter(flowables)
+        self._window = window
+        self._exhausted = False
+
+    def _fill(self):
+        if not self._exhausted and list.__len__(self) < self._window:
+            chunk = list(islice(self._source, self._window))
+            if len(chunk) < self._window:
+                self._exhausted = True
+            self.extend(chunk)
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+class _ReportDocTemplate(SimpleDocTemplate):
+    """Documento que publica páginas concluídas e atende ao cancelamento"""
+
+    def __init__(self, filename: str, job: Optional[BackgroundJob] = None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.job = job
+        self.pages_done = 0
+
+    def afterPage(self):
+        self.pages_done += 1
+        if self.job is not None:
+            self.job.check_cancelled()
+
+
+def _counts_table(title: str, counts: Dict[str, int], total: int) -> Table:
+    """Tabela categoria / quantidade / percentual"""
+    rows = [[title, 'Quantidade', '%']]
+    for label, count in counts.items():
+        rows.append([str(label), f"{count:,}", f"{count / total * 100:.1f}%" if total else "0.0%"])
+    table = Table(rows, colWidths=[3 * inch, 1.2 * inch, 0.8 * inch], hAlign='LEFT')
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#238CF5')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F0F4F8')]),
+    ]))
+    return table
+
+
+def region_flowables(name: str, aggregates: Dict[str, Any], styles) -> List[Any]:
+    """Seção com as contagens de uma região"""
+    total = aggregates['total']
+    age = aggregates['age']
+    story = [
+        Paragraph(escape(name), styles['Heading2']),
+        Paragraph(f"Indivíduos: {total:,} &nbsp;&nbsp; Idade média: {age['average']:.1f} anos", styles['Normal']),
+        Spacer(1, 8),
+    ]
+    for title, counts in (
+        ('Gênero', aggregates['gender']),
+        ('Faixa etária', age['bands']),
+        ('Acesso à internet', aggregates['internet']),
+        ('Renda', aggregates['income']),
+        ('Deficiência', aggregates['disability']),
+        ('Dispositivos', aggregates['devices']),
+    ):
+        if counts:
+            story.append(_counts_table(title, counts, total))
+            story.append(Spacer(1, 6))
+    return story
+
+
+def build_report_pdf(filename: str, summary_text: str,
+                     charts: Sequence[Tuple[str, bytes]] = (),
+                     regions: Iterable[Tuple[str, Dict[str, Any]]] = (),
+                     region_count: int = 0,
+                     job: Optional[BackgroundJob] = None,
+                     title: str = "RELATÓRIO ESTATÍSTICO - SISTEMA DAC",
+                     generated_at: str = "") -> int:
+    """Gera o PDF e retorna o número de páginas.
+
+    O arquivo é escrito em `<filename>.part` e renomeado ao final, de modo
+    que um cancelamento não deixa um PDF incompleto no destino.
+    """
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=18,
+                                 spaceAfter=30, alignment=1)
+    date_style = ParagraphStyle('DateStyle', parent=styles['Normal'], fontSize=10, alignment=1)
+    content_style = ParagraphStyle('ContentStyle', parent=styles['Code'], fontSize=9, leading=11)
+    total_steps = 1 + len(charts) + region_count
+
+    def report(done: int, message: str):
+        if job is not None:
+            job.check_cancelled()
+            job.report(done, total_steps, f"{message} (página {doc.pages_done + 1})")
+
+    def story() -> Iterator[Any]:
+        report(0, "Resumo estatístico")
+        yield Paragraph(escape(title), title_style)
+        if generated_at:
+            yield Paragraph(f"Gerado em: {generated_at}", date_style)
+        yield Spacer(1, 20)
+        # Um único bloco pré-formatado (quebrado entre páginas pelo reportlab)
+        yield Preformatted(summary_text, content_style)
+
+        step = 1
+        if charts:
+            yield PageBreak()
+            yield Paragraph("GRÁFICOS", styles['Heading2'])
+            for chart_title, png in charts:
+                report(step, f"Gráfico: {chart_title}")
+                yield Paragraph(escape(chart_title), styles['Heading3'])
+                yield Image(BytesIO(png), width=6 * inch, height=4.5 * inch)
+                yield Spacer(1, 12)
+                step += 1
+
+        first_region = True
+        for name, aggregates in regions:
+            report(step, f"Região: {name}")
+            yield PageBreak()
+            if first_region:
+                yield Paragraph("DETALHAMENTO POR REGIÃO", styles['Heading1'])
+                first_region = False
+            yield from region_flowables(name, aggregates, styles)
+            step += 1
+        report(total_steps, "Finalizando documento")
+
+    partial = f"{filename}.part"
+    doc = _ReportDocTemplate(partial, job=job, pagesize=A4, pageCompression=1,
+                             title=title, author="Sistema DAC")
+    try:
+        doc.build(_FlowableStream(story()))
+        os.replace(partial, filename)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return doc.pages_done
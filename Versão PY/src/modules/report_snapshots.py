@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshots dos relatórios padrão
+
+Após cada importação, as agregações gerais, as de cada região e os gráficos
+do conjunto padrão de relatórios (visão geral, demografia, acesso digital e
+regional) são calculados uma única vez e gravados em disco, identificados
+pela versão dos dados. A janela de relatórios e a API web abrem a partir do
+snapshot da versão atual; consultas com filtros continuam sendo calculadas
+na hora.
+
+Estrutura: `<pasta do banco>/snapshots/<nome do banco>/<versão>/` com
+`manifest.json`, `aggregates.json`, `segments.json` e `charts/<tipo>.png`.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..database.report_queries import ReportAggregator
+from ..ui.chart_drawing import chart_series
+from ..ui.chart_renderer import dark_style, get_chart_render_service
+from ..utils.background_job import BackgroundJob
+
+try:
+    from ..utils.logger import get_logger
+except ImportError:
+    import logging
+
+    def get_logger(name):
+        return logging.getLogger(name)
+
+
+# Relatórios padrão: dados (chaves das agregações) e gráficos de cada um
+REPORT_SETS = {
+    'visao-geral': {
+        'titulo': 'Visão Geral',
+        'dados': ('total', 'gender', 'age', 'internet', 'regions'),
+        'graficos': ('overview',),
+    },
+    'demografia': {
+        'titulo': 'Perfil Demográfico',
+        'dados': ('total', 'gender', 'age', 'disability', 'income', 'income_invalid'),
+        'graficos': ('gender', 'age', 'income'),
+    },
+    'acesso-digital': {
+        'titulo': 'Acesso Digital',
+        'dados': ('total', 'internet', 'devices', 'devices_without', 'internet_by_age_band'),
+        'graficos': ('internet', 'devices', 'correlation'),
+    },
+    'regional': {
+        'titulo': 'Distribuição Regional',
+        'dados': ('total', 'regions'),
+        'graficos': ('regional',),
+    },
+}
+
+SNAPSHOT_CHARTS = ('overview', 'gender', 'age', 'income', 'internet', 'devices', 'regional', 'correlation')
+
+# Mesma paleta padrão da janela de relatórios (as imagens são reaproveitadas lá)
+SNAPSHOT_PALETTE = ('#00D4FF', '#8B5CF6', '#EC4899', '#F59E0B', '#10B981')
+SNAPSHOT_FIGSIZE = (8, 6)
+
+# Campos guardados para cada região no relatório regional
+SEGMENT_KEYS = ('total', 'gender', 'internet', 'income', 'devices')
+
+
+def report_data(name: str, aggregates: Dict[str, Any],
+                segments: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Dados de um relatório padrão a partir das agregações (snapshot ou cálculo na hora)"""
+    report = REPORT_SETS[name]
+    data = {key: aggregates.get(key) for key in report['dados']}
+    if name == 'regional' and segments is not None:
+        data['segments'] = segments
+    return data
+
+
+def segment_summary(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Resumo de uma região guardado no snapshot"""
+    summary = {key: aggregates[key] for key in SEGMENT_KEYS}
+    summary['age_average'] = aggregates['age']['average']
+    return summary
+
+
+@dataclass
+class ReportSnapshot:
+    """Relatórios padrão pré-calculados para uma versão dos dados"""
+
+    version: str
+    created_at: str
+    path: str
+    aggregates: Dict[str, Any]
+    segments: Dict[str, Dict[str, Any]]
+    charts: Tuple[str, ...] = ()
+    palette: Tuple[str, ...] = SNAPSHOT_PALETTE
+    _images: Dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    def chart_png(self, chart_type: str) -> Optional[bytes]:
+        """Imagem PNG de um gráfico (lida do disco na primeira vez)"""
+        if chart_type not in self.charts:
+            return None
+        png = self._images.get(chart_type)
+        if png is None:
+            try:
+                png = Path(self.path, 'charts', f'{chart_type}.png').read_bytes()
+            except OSError:
+                return None
+            self._images[chart_type] = png
+        return png
+
+    def report(self, name: str) -> Dict[str, Any]:
+        """Dados de um relatório padrão"""
+        return report_data(name, self.aggregates, self.segments)
+
+
+class ReportSnapshotStore:
+    """Grava e carrega snapshots dos relatórios padrão de um banco"""
+
+    def __init__(self, base_dir: str, keep: int = 3):
+        self.base_dir = Path(base_dir)
+        self.keep = keep
+        self.logger = get_logger(__name__)
+        self._loaded: Dict[str, ReportSnapshot] = {}
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @classmethod
+    def for_database(cls, db_manager, **kwargs) -> 'ReportSnapshotStore':
+        """Loja de snapshots ao lado do arquivo do banco"""
+        db_path = Path(db_manager.db_path)
+        return cls(str(db_path.parent / 'snapshots' / db_path.stem), **kwargs)
+
+    def is_building(self) -> bool:
+        return self._build_lock.locked()
+
+    def load(self, version: str) -> Optional[ReportSnapshot]:
+        """Snapshot da versão informada, ou None se não existir"""
+        with self._lock:
+            snapshot = self._loaded.get(version)
+        if snapshot is not None:
+            return snapshot
+
+        path = self.base_dir / version
+        try:
+            manifest = json.loads((path / 'manifest.json').read_text(encoding='utf-8'))
+            aggregates = json.loads((path / 'aggregates.json').read_text(encoding='utf-8'))
+            segments = json.loads((path / 'segments.json').read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+        # JSON não tem tuplas
+        aggregates['age_internet_points'] = [tuple(point) for point in aggregates['age_internet_points']]
+        snapshot = ReportSnapshot(version, manifest['created_at'], str(path), aggregates, segments,
+                                  tuple(manifest.get('charts', ())), tuple(manifest.get('palette', ())))
+        with self._lock:
+            # Apenas as versões mais recentes ficam em memória
+            if len(self._loaded) >= self.keep:
+                self._loaded.pop(next(iter(self._loaded)))
+            self._loaded[version] = snapshot
+        return snapshot
+
+    def current(self, db_manager) -> Optional[ReportSnapshot]:
+        """Snapshot da versão atual dos dados"""
+        return self.load(db_manager.get_data_version())
+
+    def build(self, db_manager, job: Optional[BackgroundJob] = None, dpi: int = 100) -> ReportSnapshot:
+        """Calcula e grava o snapshot da versão atual dos dados.
+
+        O WAL é esvaziado antes, para que a versão registrada continue válida
+        em execuções futuras. Os arquivos são gravados em uma pasta temporária
+        renomeada ao final.
+        """
+        with self._build_lock:
+            db_manager.checkpoint()
+            version = db_manager.get_data_version()
+            existing = self.load(version)
+            if existing is not None:
+                return existing
+
+            started = time.perf_counter()
+            steps = 2 + len(SNAPSHOT_CHARTS)
+            self._report(job, 0, steps, "Calculando agregações")
+            aggregator = ReportAggregator(db_manager)
+            aggregates = aggregator.get_aggregates()
+
+            self._report(job, 1, steps, "Calculando regiões")
+            segments = {name: segment_summary(region)
+                        for name, region in aggregator.iter_region_aggregates(by='region')}
+
+            images: List[Tuple[str, Optional[bytes]]] = []
+            if aggregates['total']:
+                self._report(job, 2, steps, "Renderizando gráficos")
+                charts = [(chart_type, chart_series(chart_type, aggregates)) for chart_type in SNAPSHOT_CHARTS]
+                images = get_chart_render_service().render_many(
+                    charts, SNAPSHOT_FIGSIZE, dpi=dpi, palette=SNAPSHOT_PALETTE, style=dark_style())
+            self._report(job, steps, steps, "Gravando snapshot")
+
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            target = self.base_dir / version
+            partial = self.base_dir / f".{version}.{os.getpid()}.tmp"
+            try:
+                (partial / 'charts').mkdir(parents=True, exist_ok=True)
+                charts_written = []
+                for chart_type, png in images:
+                    if png:
+                        (partial / 'charts' / f'{chart_type}.png').write_bytes(png)
+                        charts_written.append(chart_type)
+                (partial / 'aggregates.json').write_text(json.dumps(aggregates, ensure_ascii=False),
+                                                         encoding='utf-8')
+                (partial / 'segments.json').write_text(json.dumps(segments, ensure_ascii=False),
+                                                       encoding='utf-8')
+                manifest = {
+                    'version': version,
+                    'created_at': datetime.now().isoformat(timespec='seconds'),
+                    'charts': charts_written,
+                    'palette': list(SNAPSHOT_PALETTE),
+                    'reports': list(REPORT_SETS),
+                }
+                (partial / 'manifest.json').write_text(json.dumps(manifest, ensure_ascii=False, indent=2),
+                                                       encoding='utf-8')
+                if target.exists():
+                    shutil.rmtree(target)
+                os.replace(partial, target)
+            finally:
+                if partial.exists():
+                    shutil.rmtree(partial, ignore_errors=True)
+
+            self.logger.info(f"Snapshot de relatórios {version} gerado em "
+                             f"{time.perf_counter() - started:.2f}s ({len(charts_written)} gráficos)")
+            self.prune(keep_version=version)
+            return self.load(version)
+
+    @staticmethod
+    def _report(job: Optional[BackgroundJob], done: int, total: int, message: str) -> None:
+        if job is not None:
+            job.check_cancelled()
+            job.report(done, total, message)
+
+    def prune(self, keep_version: Optional[str] = None) -> None:
+        """Remove os snapshots mais antigos, mantendo os `keep` mais recentes"""
+        try:
+            entries = [entry for entry in self.base_dir.iterdir()
+                       if entry.is_dir() and not entry.name.startswith('.')]
+        except OSError:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[self.keep:]:
+            if entry.name == keep_version:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            with self._lock:
+                self._loaded.pop(entry.name, None)
+
+
+_stores: Dict[str, ReportSnapshotStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(db_manager) -> ReportSnapshotStore:
+    """Loja de snapshots compartilhada do banco informado"""
+    with _stores_lock:
+        key = os.path.abspath(db_manager.db_path)
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ReportSnapshotStore.for_database(db_manager)
+        return store
+
+
+def build_snapshot_job(db_manager) -> BackgroundJob:
+    """Gera o snapshot da versão atual em segundo plano"""
+    store = get_snapshot_store(db_manager)
+    return BackgroundJob(lambda job: store.build(db_manager, job=job), name="snapshot-relatorios").start()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação em fluxo (CSV e XLSX) para grandes volumes de registros
+
+As linhas chegam de um iterador (normalmente um cursor do banco lido em
+lotes) e são gravadas à medida que são lidas, sem montar um DataFrame: a
+memória usada não depende do número de registros. No XLSX é usado o modo
+write-only do openpyxl, com uma nova aba a cada 1.048.576 linhas; Parquet
+é opcional (requer pyarrow) e gravado em grupos de linhas.
+"""
+
+import csv
+import os
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple
+
+# Limite de linhas por planilha do Excel (inclui o cabeçalho)
+EXCEL_MAX_ROWS = 1_048_576
+
+# Frequência (em linhas) das chamadas de progresso
+PROGRESS_EVERY = 5000
+
+ProgressCallback = Callable[[int], None]
+
+
+def _notify(progress: Optional[ProgressCallback], written: int) -> None:
+    if progress is not None:
+        progress(written)
+
+
+@contextmanager
+def _replace_when_done(path: str):
+    """Grava em `<path>.part` e só substitui o destino se a escrita terminar"""
+    partial = f"{path}.part"
+    try:
+        yield partial
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    os.replace(partial, path)
+
+
+def write_csv(path: str, columns: Sequence[str], rows: Iterable[Sequence[Any]],
+              progress: Optional[ProgressCallback] = None, encoding: str = 'utf-8-sig') -> int:
+    """Grava as linhas em CSV e retorna quantas foram escritas.
+
+    `progress(n)` é chamado a cada PROGRESS_EVERY linhas; se levantar uma
+    exceção (ex.: cancelamento), a escrita é interrompida e o arquivo
+    parcial é descartado.
+    """
+    written = 0
+    with _replace_when_done(path) as partial:
+        with open(partial, 'w', newline='', encoding=encoding) as handle:
+            writer = csv.writer(handle)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(row)
+                written += 1
+                if written % PROGRESS_EVERY == 0:
+                    _notify(progress, written)
+        _notify(progress, written)
+    return written
+
+
+def write_xlsx(path: str, columns: Sequence[str], rows: Iterable[Sequence[Any]],
+               sheet_name: str = 'Dados', progress: Optional[ProgressCallback] = None,
+               max_rows: int = EXCEL_MAX_ROWS, before_save: Optional[Callable[[Any], None]] = None) -> int:
+    """Grava as linhas em XLSX (modo write-only) e retorna quantas foram escritas.
+
+    Ao atingir `max_rows` linhas em uma aba (cabeçalho incluído), a escrita
+    continua em "<sheet_name> (2)", "<sheet_name> (3)"... `before_save(workbook)`
+    permite acrescentar abas (ex.: gráficos) antes de salvar.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheets = 1
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(list(columns))
+    sheet_rows = 1
+    written = 0
+
+    for row in rows:
+        if sheet_rows >= max_rows:
+            sheets += 1
+            sheet = workbook.create_sheet(f"{sheet_name} ({sheets})")
+            sheet.append(list(columns))
+            sheet_rows = 1
+        sheet.append(list(row))
+        sheet_rows += 1
+        written += 1
+        if written % PROGRESS_EVERY == 0:
+            _notify(progress, written)
+
+    if before_save is not None:
+        before_save(workbook)
+    with _replace_when_done(path) as partial:
+        workbook.save(partial)
+    _notify(progress, written)
+    return written
+
+
+def add_image_sheet(workbook, images: Sequence[Tuple[str, bytes]], title: str = 'Gráficos') -> None:
+    """Adiciona ao workbook (inclusive write-only) uma aba com imagens PNG e seus títulos"""
+    from io import BytesIO
+    from openpyxl.drawing.image import Image
+
+    if not images:
+        return
+    sheet = workbook.create_sheet(title)
+    row = 1
+    for caption, png in images:
+        sheet.append([caption])
+        image = Image(BytesIO(png))
+        sheet.add_image(image, f'A{row + 1}')
+        # Cerca de 20 px por linha
+        spacing = image.height // 20 + 2
+        for _ in range(spacing):
+            sheet.append([])
+        row += spacing + 1
+
+
+def xlsx_available() -> bool:
+    """Indica se o openpyxl está instalado"""
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def parquet_available() -> bool:
+    """Indica se o pyarrow (opcional) está instalado"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def write_parquet(path: str, columns: Sequence[str], rows: Iterable[Sequence[Any]],
+                  progress: Optional[ProgressCallback] = None, row_group_size: int = 50000) -> int:
+    """Grava as linhas em Parquet (um grupo de linhas por lote) e retorna quantas foram escritas.
+
+    Os valores são gravados como texto, como no CSV ("N/A" convive com números).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    iterator = iter(rows)
+    written = 0
+    with _replace_when_done(path) as partial:
+        with pq.ParquetWriter(partial, schema, compression='snappy') as writer:
+            while True:
+                batch = list(islice(iterator, row_group_size))
+                if not batch:
+                    break
+                data = {column: [None if row[i] is None else str(row[i]) for row in batch]
+                        for i, column in enumerate(columns)}
+                writer.write_table(pa.Table.from_pydict(data, schema=schema))
+                written += len(batch)
+                _notify(progress, written)
+        _notify(progress, written)
+    return written
+
+
+def write_rows(path: str, columns: Sequence[str], rows: Iterable[Sequence[Any]],
+               progress: Optional[ProgressCallback] = None, **kwargs) -> int:
+    """Escolhe o formato pela extensão do arquivo (.xlsx, .parquet ou CSV)"""
+    if path.lower().endswith('.xlsx'):
+        return write_xlsx(path, columns, rows, progress=progress, **kwargs)
+    if path.lower().endswith('.parquet'):
+        return write_parquet(path, columns, rows, progress=progress)
+    return write_csv(path, columns, rows, progress=progress)
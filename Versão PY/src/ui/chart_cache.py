@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de gráficos da janela de relatórios
+
+Guarda, por versão do conjunto de dados, as séries agregadas de cada gráfico
+e as imagens PNG já renderizadas (chave: tipo de gráfico, versão, faixa de
+tamanho e paleta), evitando recontar os dados a cada redesenho.
+"""
+
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from ..utils.intelligent_cache import IntelligentCache
+
+
+class ChartCache:
+    """Cache de séries agregadas e imagens renderizadas dos gráficos"""
+
+    # Granularidade (em polegadas) das faixas de tamanho
+    SIZE_STEP = 0.5
+
+    def __init__(self, max_series: int = 64, max_bitmaps: int = 48):
+        self.series = IntelligentCache(max_size=max_series)
+        self.bitmaps = IntelligentCache(max_size=max_bitmaps)
+
+    @classmethod
+    def size_bucket(cls, figsize: Tuple[float, float]) -> Tuple[float, float]:
+        """Arredonda o tamanho da figura para a faixa correspondente"""
+        step = cls.SIZE_STEP
+        return (round(figsize[0] / step) * step, round(figsize[1] / step) * step)
+
+    @staticmethod
+    def bitmap_key(chart_type: str, version: str, figsize: Tuple[float, float],
+                   palette: Sequence[str]) -> Tuple:
+        """Monta a chave (tipo, versão, faixa de tamanho, paleta) de um bitmap"""
+        return (chart_type, version, ChartCache.size_bucket(figsize), tuple(palette or ()))
+
+    def get_series(self, chart_type: str, version: str,
+                   compute: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Retorna a série agregada do gráfico, calculando apenas na primeira vez"""
+        key = (chart_type, version)
+        series = self.series.get(key)
+        if series is None:
+            series = compute()
+            if series is not None:
+                self.series.set(key, series)
+        return series
+
+    def get_bitmap(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Retorna a imagem renderizada ({'png', 'width', 'height'})"""
+        return self.bitmaps.get(key)
+
+    def set_bitmap(self, key: Tuple, png: bytes) -> None:
+        """Armazena a imagem PNG renderizada"""
+        # Dimensões lidas do cabeçalho IHDR do PNG
+        width = int.from_bytes(png[16:20], 'big') if len(png) >= 24 else 0
+        height = int.from_bytes(png[20:24], 'big') if len(png) >= 24 else 0
+        self.bitmaps.set(key, {'png': png, 'width': width, 'height': height})
+
+    def clear(self) -> None:
+        """Descarta séries e bitmaps"""
+        self.series.clear()
+        self.bitmaps.clear()
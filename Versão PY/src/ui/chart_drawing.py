@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""
+Funções de desenho dos gráficos de relatório
+
+Cada função recebe uma `matplotlib.figure.Figure` vazia e a série agregada
+do gráfico e desenha apenas com a API orientada a objetos (sem pyplot nem
+Tk), de modo que possa ser executada em threads ou processos de
+renderização. As séries são extraídas das agregações dos relatórios
+(`ReportAggregator.get_aggregates` / `ReportDataset.aggregates`) por
+`chart_series`.
+"""
+
+from typing import Any, Dict, Sequence
+
+import numpy as np
+from matplotlib import colormaps
+
+from ..database.report_queries import bin_age_internet, wilson_interval
+
+
+def draw_gender(fig, series, palette: Sequence[str] = ()):
+    gender_counts = series['counts']
+    ax = fig.add_subplot(111)
+    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
+    wedges, texts, autotexts = ax.pie(gender_counts.values(), labels=gender_counts.keys(), 
+                                    autopct='%1.1f%%', colors=colors[:len(gender_counts)],
+                                    startangle=90, textprops={'fontsize': 10})
+
+    # Melhorar aparência do título
+    ax.set_title('Distribuição por Gênero', fontweight='bold', fontsize=14, pad=20)
+
+    # Adicionar legenda interna para evitar overflow lateral
+    legend_labels = [f'{gender}: {count:,} pessoas' for gender, count in gender_counts.items()]
+    ax.legend(wedges, legend_labels, title="Detalhes", loc="upper right")
+
+
+def draw_age(fig, series, palette: Sequence[str] = ()):
+    age_ranges = series['ranges']
+    ax = fig.add_subplot(111)
+    bars = ax.bar(age_ranges.keys(), age_ranges.values(), color='#45B7D1', alpha=0.8)
+
+    # Melhorar aparência
+    ax.set_title('Distribuição por Faixa Etária', fontweight='bold', fontsize=14, pad=20)
+    ax.set_xlabel('Faixa Etária (anos)', fontsize=12)
+    ax.set_ylabel('Quantidade de Pessoas', fontsize=12)
+    ax.grid(True, alpha=0.3, axis='y')
+
+    # Adicionar valores nas barras com formatação melhorada
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
+               f'{int(height):,}', ha='center', va='bottom', fontweight='bold')
+
+    # Adicionar informações sobre qualidade dos dados
+    total_records = series['total']
+    valid_percentage = (series['valid'] / total_records) * 100
+
+    info_text = f"Dados válidos: {series['valid']:,}/{total_records:,} ({valid_percentage:.1f}%)"
+    if series['invalid'] > 0:
+        info_text += f"\nDados inválidos: {series['invalid']:,}"
+
+    ax.text(0.02, 0.98, info_text, transform=ax.transAxes, 
+           verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+    ax.tick_params(axis='x', labelrotation=0)
+
+
+def draw_income(fig, series, palette: Sequence[str] = ()):
+    sorted_income = series['counts']
+    total_records = series['total']
+    ax = fig.add_subplot(111)
+    colors = colormaps['Set3'](range(len(sorted_income)))
+    bars = ax.bar(range(len(sorted_income)), list(sorted_income.values()), color=colors, alpha=0.8)
+
+    # Melhorar aparência
+    ax.set_title('Distribuição por Faixa de Renda Familiar', fontweight='bold', fontsize=14, pad=20)
+    ax.set_xlabel('Faixa de Renda (Salários Mínimos)', fontsize=12)
+    ax.set_ylabel('Quantidade de Famílias', fontsize=12)
+    ax.set_xticks(range(len(sorted_income)))
+    ax.set_xticklabels(list(sorted_income.keys()), rotation=45, ha='right')
+    ax.grid(True, alpha=0.3, axis='y')
+
+    # Adicionar valores nas barras com formatação melhorada
+    for bar in bars:
+        height = bar.get_height()
+        percentage = (height / total_records) * 100
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
+               f'{int(height):,}\n({percentage:.1f}%)', ha='center', va='bottom', fontweight='bold')
+
+    # Adicionar informações sobre qualidade dos dados
+    valid_records = total_records - series['invalid']
+    valid_percentage = (valid_records / total_records) * 100
+
+    info_text = f'Dados válidos: {valid_records:,}/{total_records:,} ({valid_percentage:.1f}%)'
+    if series['invalid'] > 0:
+        info_text += f"\nDados não informados: {series['invalid']:,}"
+
+    ax.text(0.02, 0.98, info_text, transform=ax.transAxes, 
+           verticalalignment='top', bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+
+
+def draw_internet(fig, series, palette: Sequence[str] = ()):
+    internet_counts = series['counts']
+    ax = fig.add_subplot(111)
+    colors = ['#4ECDC4', '#FF6B6B', '#FFA500'][:len(internet_counts)]
+    wedges, texts, autotexts = ax.pie(internet_counts.values(), labels=internet_counts.keys(), 
+                                    autopct='%1.1f%%', colors=colors,
+                                    startangle=90, textprops={'fontsize': 10})
+
+    # Melhorar aparência do título
+    ax.set_title('Acesso à Internet', fontweight='bold', fontsize=14, pad=20)
+
+    # Adicionar legenda interna para evitar overflow
+    legend_labels = [f'{status}: {count:,} pessoas' for status, count in internet_counts.items()]
+    ax.legend(wedges, legend_labels, title="Detalhes", loc="upper right")
+
+
+def draw_devices(fig, series, palette: Sequence[str] = ()):
+    sorted_devices = series['counts']
+    total_records = series['total']
+    ax = fig.add_subplot(111)
+    colors = colormaps['tab20'](range(len(sorted_devices)))
+    bars = ax.bar(range(len(sorted_devices)), list(sorted_devices.values()), color=colors, alpha=0.8)
+
+    # Melhorar aparência
+    ax.set_title('Distribuição de Dispositivos por Domicílio', fontweight='bold', fontsize=14, pad=20)
+    ax.set_xlabel('Tipo de Dispositivo', fontsize=12)
+    ax.set_ylabel('Quantidade de Domicílios', fontsize=12)
+    ax.set_xticks(range(len(sorted_devices)))
+    ax.set_xticklabels(list(sorted_devices.keys()), rotation=45, ha='right')
+    ax.grid(True, alpha=0.3, axis='y')
+
+    # Adicionar valores nas barras com formatação melhorada
+    for bar in bars:
+        height = bar.get_height()
+        percentage = (height / total_records) * 100
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
+               f'{int(height):,}\n({percentage:.1f}%)', ha='center', va='bottom', fontweight='bold', fontsize=9)
+
+    # Adicionar informações sobre qualidade dos dados
+    valid_records = total_records - series['errors']
+    valid_percentage = (valid_records / total_records) * 100
+
+    info_text = f'Total de domicílios: {total_records:,}\n'
+    info_text += f'Dados válidos: {valid_records:,} ({valid_percentage:.1f}%)'
+    if series['without_devices'] > 0:
+        info_text += f"\nSem dispositivos: {series['without_devices']:,}"
+    if series['errors'] > 0:
+        info_text += f"\nErros nos dados: {series['errors']:,}"
+
+    ax.text(0.02, 0.98, info_text, transform=ax.transAxes, 
+           verticalalignment='top', bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
+
+
+def draw_regional(fig, series, palette: Sequence[str] = ()):
+    regional_counts = series['counts']
+    ax = fig.add_subplot(111)
+    bars = ax.bar(range(len(regional_counts)), list(regional_counts.values()), color='#A8E6CF')
+    ax.set_title('Distribuição por Região')
+    ax.set_xlabel('Região')
+    ax.set_ylabel('Quantidade de Pessoas')
+    ax.set_xticks(range(len(regional_counts)))
+    ax.set_xticklabels(list(regional_counts.keys()), rotation=45, ha='right')
+
+    # Adicionar valores nas barras
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{int(height)}', ha='center', va='bottom')
+
+
+def draw_overview(fig, series, palette: Sequence[str] = ()):
+    ((ax1, ax2), (ax3, ax4)) = fig.subplots(2, 2)
+
+    # Gráfico 1: Distribuição por gênero com formatação melhorada
+    gender_counts = series['gender']
+    if gender_counts:
+        # Garantir que color_palette seja uma lista válida
+        color_palette = list(palette) or ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#592E83']
+
+        # Usar apenas as cores necessárias
+        colors_needed = min(len(gender_counts), len(color_palette))
+        chart_colors = color_palette[:colors_needed] if colors_needed > 0 else ['#2E86AB']
+
+        # Formatação melhorada do gráfico de pizza
+        wedges, texts, autotexts = ax1.pie(gender_counts.values(), labels=gender_counts.keys(), 
+                                          autopct='%1.1f%%', colors=chart_colors,
+                                          startangle=90, textprops={'fontsize': 9})
+        ax1.set_title('Distribuição por Gênero', fontweight='bold', pad=20)
+
+    # Gráfico 2: Acesso à Internet com formatação melhorada
+    internet_counts = series['internet']
+    bars = ax2.bar(internet_counts.keys(), internet_counts.values(), 
+                  color=['#4ECDC4', '#FF6B6B', '#FFA500'][:len(internet_counts)])
+    ax2.set_title('Acesso à Internet', fontweight='bold', pad=20)
+    ax2.set_ylabel('Quantidade de Pessoas')
+
+    # Adicionar valores nas barras
+    for bar in bars:
+        height = bar.get_height()
+        ax2.text(bar.get_x() + bar.get_width()/2., height + 0.5,
+                f'{int(height)}', ha='center', va='bottom', fontsize=9)
+
+    # Gráfico 3: Faixas etárias (histograma pré-calculado na série)
+    if series['hist_counts']:
+        edges = series['hist_edges']
+        ax3.hist(edges[:-1], bins=edges, weights=series['hist_counts'], color='#45B7D1', alpha=0.7,
+                 edgecolor='black', linewidth=0.5)
+        ax3.set_title('Distribuição de Idades', fontweight='bold', pad=20)
+        ax3.set_xlabel('Idade (anos)')
+        ax3.grid(True, alpha=0.3)
+        ax3.set_ylabel('Frequência')
+
+    # Gráfico 4: Pessoas com deficiência
+    disability_counts = series['disability']
+    ax4.bar(disability_counts.keys(), disability_counts.values(), color=['#FFA07A', '#98FB98'])
+    ax4.set_title('Pessoas com Deficiência')
+    ax4.set_ylabel('Quantidade')
+    ax4.tick_params(axis='x', labelrotation=45)
+
+
+def draw_correlation(fig, series, palette: Sequence[str] = ()):
+    ax1 = fig.add_subplot(111)
+    bins = series['bins']
+    if not bins['totals']:
+        return
+
+    # Taxa por faixa de idade com banda de confiança; contagens ao fundo.
+    # O número de artistas depende só do número de faixas, não de indivíduos.
+    edges = np.asarray(bins['edges'], dtype=float)
+    centers = (edges[:-1] + edges[1:]) / 2
+    has_people = np.asarray(bins['totals']) > 0
+
+    ax_counts = ax1.twinx()
+    ax_counts.bar(centers, bins['totals'], width=np.diff(edges) * 0.9, color='#C9D6DF', alpha=0.5)
+    ax_counts.set_ylabel('Pessoas na faixa')
+    ax1.set_zorder(ax_counts.get_zorder() + 1)
+    ax1.patch.set_visible(False)
+
+    ax1.fill_between(centers[has_people], np.asarray(bins['lower'])[has_people],
+                     np.asarray(bins['upper'])[has_people], color='#4ECDC4', alpha=0.3,
+                     label='IC 95% (Wilson)')
+    ax1.plot(centers[has_people], np.asarray(bins['rate'])[has_people], marker='o',
+             color='#1B998B', label='% com internet')
+    ax1.set_xlabel('Idade')
+    ax1.set_ylabel('% com Acesso à Internet')
+    ax1.set_ylim(0, 100)
+    ax1.set_title('Relação entre Idade e Acesso à Internet')
+    ax1.grid(True, alpha=0.3)
+    ax1.legend(loc='lower left', fontsize=8)
+
+
+def draw_trends(fig, series, palette: Sequence[str] = ()):
+    ax2 = fig.add_subplot(111)
+    labels = series['labels']
+    internet_percentages = series['percentages']
+
+    if internet_percentages:
+        errors = [
+            np.asarray(internet_percentages) - np.asarray(series['lower']),
+            np.asarray(series['upper']) - np.asarray(internet_percentages),
+        ]
+        bars = ax2.bar(labels, internet_percentages, color='#45B7D1',
+                       yerr=errors, capsize=4, ecolor='#2C3E50')
+        ax2.set_xlabel('Faixa Etária')
+        ax2.set_ylabel('% com Acesso à Internet')
+        ax2.set_title('Acesso à Internet por Faixa Etária (IC 95%)')
+        ax2.set_ylim(0, 105)
+
+        # Adicionar valores nas barras
+        for bar, percentage, upper in zip(bars, internet_percentages, series['upper']):
+            ax2.text(bar.get_x() + bar.get_width()/2., min(upper, 100) + 1,
+                   f'{percentage:.1f}%', ha='center', va='bottom')
+
+
+# Tipo de gráfico -> função de desenho
+DRAWERS = {
+    'gender': draw_gender,
+    'age': draw_age,
+    'income': draw_income,
+    'internet': draw_internet,
+    'devices': draw_devices,
+    'regional': draw_regional,
+    'overview': draw_overview,
+    'correlation': draw_correlation,
+    'trends': draw_trends,
+}
+
+
+def series_gender(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Contagens por gênero (valores normalizados)"""
+    return {'counts': aggregates['gender']}
+
+
+def series_age(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Faixas etárias, histograma e idade média"""
+    age = aggregates['age']
+    return {
+        'ranges': age['bands'],
+        'valid': age['valid'],
+        'invalid': age['invalid'],
+        'total': aggregates['total'],
+        'average': age['average'],
+        'hist_counts': age['hist_counts'],
+        'hist_edges': age['hist_edges'],
+    }
+
+
+def series_income(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Contagens por faixa de renda em ordem lógica"""
+    return {
+        'counts': aggregates['income'],
+        'invalid': aggregates['income_invalid'],
+        'total': aggregates['total'],
+    }
+
+
+def series_internet(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Contagens de acesso à internet"""
+    return {'counts': aggregates['internet']}
+
+
+def series_devices(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Contagens por tipo de dispositivo"""
+    return {
+        'counts': aggregates['devices'],
+        'without_devices': aggregates['devices_without'],
+        'errors': aggregates['devices_errors'],
+        'total': aggregates['total'],
+    }
+
+
+def series_regional(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Contagens por região"""
+    return {'counts': aggregates['regions']}
+
+
+def series_overview(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Séries do resumo 2x2"""
+    disability = aggregates['disability']
+    return {
+        'gender': aggregates['gender'],
+        'internet': aggregates['internet'],
+        'hist_counts': aggregates['age']['hist_counts'],
+        'hist_edges': aggregates['age']['hist_edges'],
+        'disability': {
+            'Com Deficiência': disability['Sim'],
+            'Sem Deficiência': disability['Não'] + disability['Não Informado'],
+        },
+    }
+
+
+def series_correlation(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Taxas de acesso à internet por idade, já agrupadas em faixas com IC de 95%"""
+    by_band = aggregates['internet_by_age_band']
+    labels = [band for band, counts in by_band.items() if counts['total']]
+    totals = [by_band[band]['total'] for band in labels]
+    with_internet = [by_band[band]['with_internet'] for band in labels]
+    lower, upper = wilson_interval(with_internet, totals)
+
+    return {
+        'bins': bin_age_internet(aggregates['age_internet_points']),
+        'labels': labels,
+        'percentages': [w / t * 100 for w, t in zip(with_internet, totals)],
+        'lower': lower.tolist(),
+        'upper': upper.tolist(),
+    }
+
+
+# Gráficos incluídos nas exportações, com seus títulos
+CHART_TITLES = {
+    'gender': 'Distribuição por Gênero',
+    'age': 'Distribuição por Faixa Etária',
+    'income': 'Distribuição por Renda',
+    'internet': 'Acesso à Internet',
+    'devices': 'Dispositivos',
+    'regional': 'Distribuição Regional',
+    'correlation': 'Idade x Acesso à Internet',
+}
+
+
+# Tipo de gráfico -> série a partir das agregações ('trends' usa a de correlação)
+SERIES = {
+    'gender': series_gender,
+    'age': series_age,
+    'income': series_income,
+    'internet': series_internet,
+    'devices': series_devices,
+    'regional': series_regional,
+    'overview': series_overview,
+    'correlation': series_correlation,
+    'trends': series_correlation,
+}
+
+
+def chart_series(chart_type: str, aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """Série do gráfico calculada a partir das agregações"""
+    return SERIES[chart_type](aggregates)
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Serviço de renderização de gráficos fora da thread do Tk
+
+Os gráficos são desenhados com o backend Agg (Figure + FigureCanvasAgg, sem
+pyplot) em um pool de processos - ou de threads, quando não há mais de um
+núcleo ou o pool de processos não pode ser usado - e devolvidos como PNG.
+A janela de relatórios apenas exibe a imagem pronta; as exportações em PDF
+e Excel reaproveitam o mesmo serviço.
+"""
+
+import io
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .chart_drawing import DRAWERS
+
+try:
+    from ..utils.logger import get_logger
+except ImportError:
+    import logging
+
+    def get_logger(name):
+        return logging.getLogger(name)
+
+
+# Cores do tema escuro usadas nos gráficos (mesmas de ReportsWindow.colors)
+DARK_COLORS = {
+    'bg_card': '#21262D',
+    'border': '#30363D',
+    'text_primary': '#F0F6FC',
+    'text_secondary': '#8B949E',
+}
+
+
+def dark_style(colors: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Estilo dos gráficos (base 'dark_background' + rcParams do tema)"""
+    colors = colors or DARK_COLORS
+    return {'base': 'dark_background', 'rc': {
+        'figure.facecolor': colors['bg_card'],
+        'axes.facecolor': colors['bg_card'],
+        'axes.edgecolor': colors['border'],
+        'axes.linewidth': 1,
+        'axes.grid': True,
+        'grid.color': colors['border'],
+        'grid.alpha': 0.3,
+        'text.color': colors['text_primary'],
+        'axes.labelcolor': colors['text_primary'],
+        'xtick.color': colors['text_secondary'],
+        'ytick.color': colors['text_secondary'],
+        'font.size': 10,
+        'axes.titlesize': 12,
+        'axes.labelsize': 10,
+        'xtick.labelsize': 9,
+        'ytick.labelsize': 9,
+        'legend.fontsize': 9
+    }}
+
+
+# Estilo aplicado no processo atual: (estilo base, parâmetros rc)
+_applied_style: Optional[Tuple] = None
+_style_lock = threading.Lock()
+
+
+def _apply_style(style: Optional[Dict[str, Any]]) -> None:
+    """Aplica o estilo (base + rcParams) uma vez por processo"""
+    global _applied_style
+    if not style:
+        return
+    key = (style.get('base'), tuple(sorted((style.get('rc') or {}).items())))
+    if key == _applied_style:
+        return
+
+    import matplotlib
+    import matplotlib.style
+
+    with _style_lock:
+        if key == _applied_style:
+            return
+        if style.get('base'):
+            try:
+                matplotlib.style.use(style['base'])
+            except OSError:
+                matplotlib.style.use('default')
+        matplotlib.rcParams.update(style.get('rc') or {})
+        _applied_style = key
+
+
+def render_chart_png(chart_type: str, series: Dict[str, Any], figsize: Tuple[float, float],
+                     dpi: int = 80, palette: Sequence[str] = (),
+                     style: Optional[Dict[str, Any]] = None) -> bytes:
+    """Desenha o gráfico com Agg e retorna a imagem em PNG"""
+    _apply_style(style)
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    DRAWERS[chart_type](fig, series, palette)
+    try:
+        fig.tight_layout()
+    except Exception:
+        pass
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, facecolor=fig.get_facecolor())
+    return buffer.getvalue()
+
+
+def _copy_result(source: Future, target: Future) -> None:
+    error = source.exception()
+    if error is None:
+        target.set_result(source.result())
+    else:
+        target.set_exception(error)
+
+
+class ChartRenderService:
+    """Pool de renderização de gráficos (processos ou threads)"""
+
+    def __init__(self, max_workers: Optional[int] = None, use_processes: Optional[bool] = None):
+        self.logger = get_logger(__name__)
+        cpus = os.cpu_count() or 1
+        self.max_workers = max_workers or max(1, min(4, cpus))
+        self.use_processes = cpus > 1 if use_processes is None else use_processes
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='chart-render')
+            return self._executor
+
+    def _fallback_to_threads(self, error: Exception) -> None:
+        """Troca o pool de processos por threads (ex.: pool quebrado ou série não serializável)"""
+        self.logger.warning(f"Renderização em processos indisponível, usando threads: {error}")
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self.use_processes = False
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, chart_type: str, series: Dict[str, Any], figsize: Tuple[float, float],
+               dpi: int = 80, palette: Sequence[str] = (),
+               style: Optional[Dict[str, Any]] = None) -> Future:
+        """Agenda a renderização; o Future resulta nos bytes PNG"""
+        args = (chart_type, series, tuple(figsize), dpi, tuple(palette or ()), style)
+        try:
+            future = self._get_executor().submit(render_chart_png, *args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            if not self.use_processes:
+                raise
+            self._fallback_to_threads(e)
+            return self._get_executor().submit(render_chart_png, *args)
+
+        if not self.use_processes:
+            return future
+
+        # Reenviar para threads só se o pool quebrar ou a série não for serializável;
+        # erros do próprio desenho chegam a quem pediu o gráfico
+        result: Future = Future()
+
+        def _done(done: Future):
+            error = done.exception()
+            if error is None:
+                result.set_result(done.result())
+            elif isinstance(error, (BrokenProcessPool, pickle.PicklingError)) and self.use_processes:
+                self._fallback_to_threads(error)
+                self._get_executor().submit(render_chart_png, *args).add_done_callback(
+                    lambda retry: _copy_result(retry, result))
+            else:
+                result.set_exception(error)
+
+        future.add_done_callback(_done)
+        return result
+
+    def render_many(self, charts: Iterable[Tuple[str, Dict[str, Any]]], figsize: Tuple[float, float],
+                    dpi: int = 100, palette: Sequence[str] = (),
+                    style: Optional[Dict[str, Any]] = None) -> List[Tuple[str, Optional[bytes]]]:
+        """Renderiza vários gráficos em paralelo (exportações), mantendo a ordem.
+
+        Gráficos que falharem retornam None no lugar da imagem.
+        """
+        futures = [(chart_type, self.submit(chart_type, series, figsize, dpi, palette, style))
+                   for chart_type, series in charts]
+        images = []
+        for chart_type, future in futures:
+            try:
+                images.append((chart_type, future.result()))
+            except Exception as e:
+                self.logger.error(f"Erro ao renderizar gráfico '{chart_type}': {e}")
+                images.append((chart_type, None))
+        return images
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Encerra o pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_render_service: Optional[ChartRenderService] = None
+_service_lock = threading.Lock()
+
+
+def get_chart_render_service() -> ChartRenderService:
+    """Serviço de renderização compartilhado pela aplicação"""
+    global _render_service
+    with _service_lock:
+        if _render_service is None:
+            _render_service = ChartRenderService()
+        return _render_service
@@ -43,9 +43,10 @@ class ModernCard(ttk.Frame):
 class ProgressDialog:
     """Diálogo de progresso moderno"""
     
-    def __init__(self, parent, title: str = "Processando..."):
+    def __init__(self, parent, title: str = "Processando...", on_cancel=None):
         self.parent = parent
         self.title = title
+        self.on_cancel = on_cancel
         self.window = None
         self.progress_var = None
         self.status_var = None
@@ -98,6 +99,8 @@ class ProgressDialog:
     
     def cancel(self):
         """Cancela operação"""
+        if self.on_cancel:
+            self.on_cancel()
         self.window.destroy()
     
     def close(self):
@@ -1,14 +1,19 @@
 # -*- coding: utf-8 -*-
 """
 Janela de Status do Banco de Dados (SQLite) com monitoramento e manutenção básica.
+
+As métricas vêm do coletor em segundo plano (`metrics_collector`): a janela
+só lê a amostra mais recente e o histórico, sem consultar o banco na thread
+da interface.
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox
 
 from ..database.database_manager import DatabaseManager
+from ..database.metrics_collector import get_sqlite_collector
 from .modern_theme import theme
-from .modern_components import ModernButton, KPICard, ModernCard, StatusBadge, ModernTooltip
+from .modern_components import ModernButton, KPICard, ModernCard, StatusBadge, ModernTooltip, Sparkline
 from .icons import get_icon
 
 
@@ -37,12 +42,16 @@ class DbStatusWindow:
         self.window.configure(bg=theme.bg_root)
         self.window.transient(parent)
 
-        self.refresh_interval_ms = 5000
+        # Leitura da amostra mais recente (barata); a coleta segue o intervalo do coletor
+        self.refresh_interval_ms = 1000
+        self.collector = get_sqlite_collector(db_manager).acquire()
+        self._last_sample = None
 
         # Estado de layout atual (wide/stacked)
         self._layout_mode = None
 
         self._build_ui()
+        self.window.bind('<Destroy>', self._on_destroy, add='+')
         self._schedule_refresh()
 
     def _build_ui(self):
@@ -173,6 +182,23 @@ class DbStatusWindow:
         self.tables_tree.column("linhas", width=160, anchor='e', stretch=True)
         self.tables_tree.pack(fill='both', expand=True, padx=10, pady=10)
 
+        # History panel (sparklines)
+        self.history_frame = ModernCard(self.container, title="📈 Histórico")
+        self.history_frame.content.columnconfigure(1, weight=1)
+        self.history_series = [
+            ("Tamanho (bytes)", 'database_size_bytes'),
+            ("Registros", 'total_rows'),
+            ("WAL (bytes)", 'wal_bytes'),
+            ("Coleta (ms)", 'sample_ms'),
+        ]
+        self.sparklines = {}
+        for i, (label, key) in enumerate(self.history_series):
+            ttk.Label(self.history_frame.content, text=label, style='KPILabel.TLabel').grid(
+                row=i, column=0, sticky='w', padx=theme.spacing_sm, pady=theme.spacing_xs)
+            spark = Sparkline(self.history_frame.content)
+            spark.grid(row=i, column=1, sticky='ew', padx=theme.spacing_sm, pady=theme.spacing_xs)
+            self.sparklines[key] = spark
+
         # Controls panel
         self.controls = ttk.Frame(self.container, style='Header.TFrame')
 
@@ -206,7 +232,7 @@ class DbStatusWindow:
         self._layout_mode = 'stacked' if stacked else 'wide'
 
         # Limpa grids atuais
-        for w in [self.metrics_frame, self.perf_frame, self.tables_frame, self.controls]:
+        for w in [self.metrics_frame, self.perf_frame, self.tables_frame, self.history_frame, self.controls]:
             try:
                 w.grid_forget()
             except Exception:
@@ -217,12 +243,14 @@ class DbStatusWindow:
             self.metrics_frame.grid(row=1, column=0, columnspan=2, sticky='nsew', padx=(0, 0), pady=(0, 10))
             self.perf_frame.grid(row=2, column=0, columnspan=2, sticky='nsew', padx=(0, 0), pady=(0, 10))
             self.tables_frame.grid(row=3, column=0, columnspan=2, sticky='nsew', pady=(10, 10))
-            self.controls.grid(row=4, column=0, columnspan=2, sticky='ew', pady=(10, 0))
+            self.history_frame.grid(row=4, column=0, columnspan=2, sticky='nsew', pady=(0, 10))
+            self.controls.grid(row=5, column=0, columnspan=2, sticky='ew', pady=(10, 0))
         else:
             # Lado a lado para telas largas
             self.metrics_frame.grid(row=1, column=0, sticky='nsew', padx=(0, 10), pady=(0, 10))
             self.perf_frame.grid(row=1, column=1, sticky='nsew', pady=(0, 10))
-            self.tables_frame.grid(row=2, column=0, columnspan=2, sticky='nsew', pady=(10, 10))
+            self.tables_frame.grid(row=2, column=0, sticky='nsew', padx=(0, 10), pady=(10, 10))
+            self.history_frame.grid(row=2, column=1, sticky='nsew', pady=(10, 10))
             self.controls.grid(row=3, column=0, columnspan=2, sticky='ew', pady=(10, 0))
 
         # Reconfigura colunas do container (mínimos já definidos)
@@ -230,14 +258,20 @@ class DbStatusWindow:
         self.container.columnconfigure(1, weight=1)
 
     def _schedule_refresh(self):
+        if self.collector is None:
+            return
         self._refresh()
         self.window.after(self.refresh_interval_ms, self._schedule_refresh)
 
     def _refresh(self):
         try:
-            status = self.db_manager.get_server_status()
-            metrics = self.db_manager.get_performance_metrics()
-            top_tables = self.db_manager.get_top_tables_by_rows()
+            sample = self.collector.latest()
+            if sample is None or sample is self._last_sample:
+                return
+            self._last_sample = sample
+            status = sample['status']
+            metrics = sample['performance']
+            top_tables = sample['top_tables']
 
             # Atualiza badge de status
             connected = bool(status.get('connected'))
@@ -272,6 +306,9 @@ class DbStatusWindow:
                 self.tables_tree.delete(item)
             for row in top_tables:
                 self.tables_tree.insert('', 'end', values=(row.get('name'), row.get('rows')))
+
+            for key, spark in self.sparklines.items():
+                spark.update_series(self.collector.history(key))
         except Exception as e:
             # Não interromper o loop; exibir estado de erro leve no badge
             try:
@@ -295,7 +332,8 @@ class DbStatusWindow:
             ok = self.db_manager.run_maintenance(action)
             if ok:
                 messagebox.showinfo("Manutenção", f"Operação {action} executada com sucesso.")
-                self._refresh()
+                # Nova amostra já, lida no próximo ciclo
+                self.collector.refresh()
             else:
                 messagebox.showwarning("Manutenção", f"Operação {action} não executada.")
         except Exception as e:
@@ -308,6 +346,12 @@ class DbStatusWindow:
         except Exception as e:
             messagebox.showerror("Erro", f"Falha ao limpar cache: {e}")
 
+    def _on_destroy(self, event):
+        """Libera o coletor ao fechar a janela (o evento chega também dos filhos)"""
+        if event.widget is self.window and self.collector is not None:
+            self.collector.release()
+            self.collector = None
+
     def _copy_db_path(self):
         """Copia o caminho do banco para a área de transferência."""
         try:
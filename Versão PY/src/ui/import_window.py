@@ -997,6 +997,16 @@ class ImportWindow:
                             self.import_stats['error_count'] == 0)
             self.window.after(100, lambda: self.import_finished(import_success, "PDFs"))
     
+    def _start_snapshot_build(self):
+        """Gera em segundo plano o snapshot dos relatórios padrão"""
+        try:
+            from ..modules.report_snapshots import build_snapshot_job
+            
+            build_snapshot_job(self.db_manager)
+            self.log_message("📊 Pré-calculando relatórios padrão em segundo plano", 'info')
+        except Exception as e:
+            self.logger.error(f"Erro ao iniciar snapshot de relatórios: {e}")
+    
     def import_finished(self, success=True, import_type="arquivos"):
         """Finaliza o processo de importação com feedback detalhado"""
         try:
@@ -1072,6 +1082,10 @@ class ImportWindow:
                 messagebox.showerror("❌ Falha na Importação", message)
                 self.log_message("❌ Importação falhou completamente", 'error')
             
+            # Pré-calcular os relatórios padrão para a nova versão dos dados
+            if success_count > 0:
+                self._start_snapshot_build()
+            
             # Atualizar estatísticas na janela principal
             if self.callback and success_count > 0:
                 try:
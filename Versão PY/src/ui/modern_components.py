@@ -302,6 +302,35 @@ class ModernProgressBar(ttk.Progressbar):
         self.configure(length=300)
 
 
+class Sparkline(tk.Canvas):
+    """Mini gráfico de linha para o histórico de uma métrica"""
+
+    def __init__(self, parent, width=220, height=36, color=None, **kwargs):
+        super().__init__(parent, width=width, height=height, background=theme.bg_secondary,
+                         highlightthickness=0, borderwidth=0, **kwargs)
+        self.color = color or theme.accent_primary
+        self.values = []
+
+    def update_series(self, values):
+        """Redesenha a linha com os valores (None é ignorado)"""
+        self.values = [float(v) for v in values if v is not None]
+        self.delete('all')
+        width = int(self.cget('width'))
+        height = int(self.cget('height'))
+        pad = 3
+        if len(self.values) < 2:
+            return
+        low, high = min(self.values), max(self.values)
+        span = (high - low) or 1.0
+        step = (width - 2 * pad) / (len(self.values) - 1)
+        points = []
+        for i, value in enumerate(self.values):
+            points.extend((pad + i * step, height - pad - (value - low) / span * (height - 2 * pad)))
+        self.create_line(*points, fill=self.color, width=2, smooth=True)
+        x, y = points[-2], points[-1]
+        self.create_oval(x - 2, y - 2, x + 2, y + 2, fill=self.color, outline=self.color)
+
+
 class IconLabel(ttk.Label):
     """Label com ícone"""
     
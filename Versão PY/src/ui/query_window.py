@@ -5,13 +5,14 @@ Janela de consulta e filtragem de dados
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
 from typing import Dict, List, Optional
 
 from ..utils.logger import get_logger
 from ..database.models import Region, Household, Individual, DeviceUsage, InternetUsage
 from .icons import get_icon, get_icon_color
 from .modern_components import ModernScrollableFrame
+from .components import ProgressDialog
+from ..utils.background_job import BackgroundJob
 
 class QueryWindow:
     """Janela para consulta e filtragem de dados"""
@@ -21,6 +22,12 @@ class QueryWindow:
         self.master = master
         self.db_manager = db_manager
         self.current_results = []
+        # Filtros da última consulta (chaves de QueryEngine._apply_filters)
+        self.current_filters: Dict = {}
+        # Exportação de todos os resultados em segundo plano
+        self.export_job: Optional[BackgroundJob] = None
+        # Conjunto de dados do relatório montado em segundo plano
+        self.report_job: Optional[BackgroundJob] = None
         self.total_records = 0
         self.current_page = 1
         self.records_per_page = 100
@@ -279,6 +286,18 @@ class QueryWindow:
             # Atualizar página atual
             self.current_page = page
             
+            # Guardar filtros aplicados para relatórios sobre todos os resultados
+            excluded = ['Todas', 'Todos', 'Sem dados', 'Erro ao carregar']
+            self.current_filters = {
+                'region': self.region_var.get() if self.region_var.get() not in excluded else None,
+                'age_min': min_age,
+                'age_max': max_age,
+                'gender': self.gender_var.get() if self.gender_var.get() not in excluded else None,
+                'income': self.income_var.get() if self.income_var.get() not in excluded else None,
+                'disability': self.disability_var.get() if self.disability_var.get() not in excluded else None,
+                'internet': self.internet_var.get() if self.internet_var.get() not in excluded else None,
+            }
+            
             with self.db_manager.get_session() as session:
                 try:
                     # Construir consulta base com joins seguros
@@ -412,9 +431,11 @@ class QueryWindow:
         
         self.results_info_label.config(text="Nenhuma consulta realizada")
         self.current_results = []
+        self.current_filters = {}
+        self.total_records = 0
     
     def export_results(self):
-        """Exporta os resultados filtrados para CSV com validação robusta"""
+        """Exporta os resultados filtrados para CSV ou Excel com validação robusta"""
         try:
             # Verificar se há resultados para exportar
             if not hasattr(self, 'current_results') or not self.current_results:
@@ -429,7 +450,7 @@ class QueryWindow:
             # Solicitar local para salvar o arquivo
             filename = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+                filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("All files", "*.*")],
                 title="Salvar resultados como..."
             )
             
@@ -451,77 +472,27 @@ class QueryWindow:
                 return
             
             try:
-                # Converter resultados para DataFrame com tratamento de erros
-                data = []
-                success_count = 0
-                error_count = 0
+                from ..modules.query_engine import QueryEngine, EXPORT_COLUMNS
+                from ..modules.streaming_export import write_rows
                 
-                for individual in self.current_results:
-                    try:
-                        # Acessar dados com segurança
-                        region_name = 'N/A'
-                        if individual.household and individual.household.region:
-                            region_name = individual.household.region.name or 'N/A'
-                        
-                        devices = 'Nenhum'
-                        if individual.device_usage:
-                            device_list = [d.device_type for d in individual.device_usage if d.device_type]
-                            devices = ', '.join(device_list) if device_list else 'Nenhum'
-                        
-                        income_range = 'N/A'
-                        if individual.household:
-                            income_range = individual.household.income_range or 'N/A'
-                        
-                        has_internet = 'N/A'
-                        if individual.household:
-                            has_internet = 'Sim' if individual.household.has_internet else 'Não'
-                        
-                        data.append({
-                            'ID': individual.id or 'N/A',
-                            'Região': region_name,
-                            'Idade': individual.age or 'N/A',
-                            'Gênero': individual.gender or 'N/A',
-                            'Faixa de Renda': income_range,
-                            'Tem Deficiência': 'Sim' if individual.has_disability else 'Não',
-                            'Tem Internet': has_internet,
-                            'Dispositivos': devices
-                        })
-                        success_count += 1
-                        
-                    except Exception as e:
-                        self.logger.error(f"Erro ao processar registro {individual.id} para exportação: {e}")
-                        error_count += 1
+                # Linhas lidas do banco em lotes e gravadas em fluxo (CSV ou XLSX)
+                ids = [individual.id for individual in self.current_results]
+                rows = QueryEngine(self.db_manager).iter_export_rows({}, ids=ids)
+                written = write_rows(filename, EXPORT_COLUMNS, rows)
                 
-                if not data:
+                if written == 0:
                     messagebox.showerror("Erro", "Nenhum registro válido encontrado para exportação.")
                     return
                 
-                # Criar DataFrame e exportar
-                df = pd.DataFrame(data)
-                
-                # Tentar salvar o arquivo
-                try:
-                    df.to_csv(filename, index=False, encoding='utf-8-sig')
-                    
-                    # Verificar se o arquivo foi criado com sucesso
-                    if os.path.exists(filename) and os.path.getsize(filename) > 0:
-                        success_msg = f"Resultados exportados com sucesso para {filename}\n\n"
-                        success_msg += f"Registros exportados: {success_count}"
-                        if error_count > 0:
-                            success_msg += f"\nRegistros com problemas: {error_count}"
-                        
-                        messagebox.showinfo("Sucesso", success_msg)
-                        self.logger.info(f"Exportação concluída: {success_count} registros, {error_count} erros")
-                    else:
-                        raise Exception("Arquivo não foi criado ou está vazio")
-                        
-                except PermissionError:
-                    messagebox.showerror("Erro", "Arquivo está sendo usado por outro programa. Feche o arquivo e tente novamente.")
-                except Exception as e:
-                    messagebox.showerror("Erro", f"Erro ao salvar arquivo: {e}")
+                success_msg = f"Resultados exportados com sucesso para {filename}\n\n"
+                success_msg += f"Registros exportados: {written}"
+                messagebox.showinfo("Sucesso", success_msg)
+                self.logger.info(f"Exportação concluída: {written} registros")
                 
+            except PermissionError:
+                messagebox.showerror("Erro", "Arquivo está sendo usado por outro programa. Feche o arquivo e tente novamente.")
             except ImportError:
-                messagebox.showerror("Erro", "Biblioteca pandas não está disponível para exportação.")
+                messagebox.showerror("Erro", "Biblioteca openpyxl não está disponível para exportação em Excel.")
             except Exception as e:
                 self.logger.error(f"Erro durante a exportação: {e}")
                 messagebox.showerror("Erro", f"Erro durante a exportação: {e}")
@@ -530,25 +501,164 @@ class QueryWindow:
             self.logger.error(f"Erro crítico na exportação: {e}")
             messagebox.showerror("Erro Crítico", f"Erro crítico na exportação: {e}")
     
+    def export_all_results(self):
+        """Exporta todos os registros que atendem aos filtros (não só a página atual).
+
+        A consulta é lida em lotes e gravada em fluxo (CSV, XLSX ou Parquet)
+        em segundo plano, com progresso e cancelamento.
+        """
+        try:
+            if not self.total_records:
+                messagebox.showwarning("Aviso", "Nenhum resultado para exportar. Execute uma consulta primeiro.")
+                return
+            
+            if self.export_job is not None and not self.export_job.done():
+                messagebox.showinfo("Aviso", "Já existe uma exportação em andamento.")
+                return
+            
+            from ..modules.query_engine import QueryEngine, EXPORT_COLUMNS
+            from ..modules.streaming_export import write_rows, parquet_available
+            
+            filetypes = [("CSV files", "*.csv"), ("Excel files", "*.xlsx")]
+            if parquet_available():
+                filetypes.append(("Parquet files", "*.parquet"))
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=filetypes + [("All files", "*.*")],
+                title=f"Exportar todos os {self.total_records} resultados como..."
+            )
+            
+            if not filename:
+                return  # Usuário cancelou
+            
+            if filename.lower().endswith('.parquet') and not parquet_available():
+                messagebox.showerror("Erro", "Exportação em Parquet requer pyarrow.\nInstale com: pip install pyarrow")
+                return
+            
+            filters = dict(self.current_filters)
+            engine = QueryEngine(self.db_manager)
+            
+            def export(job: BackgroundJob) -> int:
+                total = engine.count_results(filters)
+                
+                def progress(written: int):
+                    job.check_cancelled()
+                    job.report(written, total, f"{written:,} de {total:,} registros")
+                
+                return write_rows(filename, EXPORT_COLUMNS, engine.iter_export_rows(filters), progress=progress)
+            
+            self.export_job = BackgroundJob(export, name="exportar-resultados").start()
+            dialog = ProgressDialog(self.window, "Exportando resultados...", on_cancel=self.export_job.cancel)
+            self._poll_export_job(self.export_job, dialog, filename)
+            
+        except Exception as e:
+            self.logger.error(f"Erro crítico na exportação: {e}")
+            messagebox.showerror("Erro Crítico", f"Erro crítico na exportação: {e}")
+    
+    def _poll_export_job(self, job: BackgroundJob, dialog: ProgressDialog, filename: str):
+        """Atualiza o diálogo de progresso até a exportação terminar"""
+        if not job.done():
+            _, _, message = job.progress
+            try:
+                dialog.progress_var.set(job.percent)
+                if message:
+                    dialog.status_var.set(message)
+            except tk.TclError:
+                # Diálogo fechado (cancelamento já solicitado)
+                pass
+            self.window.after(100, lambda: self._poll_export_job(job, dialog, filename))
+            return
+        
+        try:
+            dialog.close()
+        except tk.TclError:
+            pass
+        
+        if job.status == BackgroundJob.DONE:
+            self.logger.info(f"Exportação completa concluída: {job.result} registros em {filename}")
+            messagebox.showinfo("Sucesso", f"Resultados exportados com sucesso para {filename}\n\nRegistros exportados: {job.result}")
+        elif job.status == BackgroundJob.CANCELLED:
+            self.logger.info("Exportação de resultados cancelada")
+        elif isinstance(job.error, PermissionError):
+            messagebox.showerror("Erro", "Arquivo está sendo usado por outro programa. Feche o arquivo e tente novamente.")
+        else:
+            messagebox.showerror("Erro", f"Erro durante a exportação: {job.error}")
+    
     def generate_report(self):
-        """Gera relatório com os dados filtrados"""
+        """Gera relatório com todos os registros filtrados (não só a página atual).
+
+        O conjunto de dados é montado em segundo plano; a janela de relatórios
+        abre quando ele fica pronto.
+        """
         if not self.current_results:
             messagebox.showwarning("Aviso", "Nenhum dado disponível para gerar relatório.")
             return
         
+        if self.report_job is not None and not self.report_job.done():
+            messagebox.showinfo("Aviso", "O relatório já está sendo preparado.")
+            return
+        
         try:
-            # Importar a janela de relatórios
-            from .reports_window import ReportsWindow
+            from ..modules.query_engine import QueryEngine
             
-            # Abrir janela de relatórios com dados filtrados
-            reports_window = ReportsWindow(self.master, self.db_manager, filtered_data=self.current_results)
+            filters = dict(self.current_filters)
+            engine = QueryEngine(self.db_manager)
             
-            self.logger.info(f"Relatório gerado com {len(self.current_results)} registros filtrados")
+            def build(job: BackgroundJob):
+                job.report(0, 0, "Carregando registros filtrados...")
+                dataset = engine.get_report_dataset(filters)
+                if dataset is None:
+                    raise RuntimeError("Falha ao carregar os registros filtrados")
+                job.check_cancelled()
+                return dataset
+            
+            self.report_job = BackgroundJob(build, name="relatorio-filtrado").start()
+            dialog = ProgressDialog(self.window, "Preparando relatório...", on_cancel=self.report_job.cancel)
+            self._poll_report_job(self.report_job, dialog)
             
         except Exception as e:
             self.logger.error(f"Erro ao gerar relatório: {e}")
             messagebox.showerror("Erro", f"Erro ao gerar relatório: {e}")
+    
+    def _poll_report_job(self, job: BackgroundJob, dialog: ProgressDialog):
+        """Aguarda o conjunto de dados do relatório e abre a janela de relatórios"""
+        if not job.done():
+            _, _, message = job.progress
+            try:
+                if message:
+                    dialog.status_var.set(message)
+            except tk.TclError:
+                pass
+            self.window.after(100, lambda: self._poll_report_job(job, dialog))
+            return
+        
+        try:
+            dialog.close()
+        except tk.TclError:
+            pass
+        
+        if job.status == BackgroundJob.CANCELLED:
+            self.logger.info("Preparação do relatório cancelada")
+            return
+        if job.status != BackgroundJob.DONE:
+            self.logger.error(f"Erro ao gerar relatório: {job.error}")
+            messagebox.showerror("Erro", f"Erro ao gerar relatório: {job.error}")
+            return
+        
+        filtered_data = job.result
+        if not filtered_data:
+            messagebox.showinfo("Relatório", "Nenhum registro atende aos filtros atuais; não há dados para o relatório.")
+            return
         
+        try:
+            from .reports_window import ReportsWindow
+            
+            ReportsWindow(self.master, self.db_manager, filtered_data=filtered_data)
+            self.logger.info(f"Relatório gerado com {len(filtered_data)} registros filtrados")
+        except Exception as e:
+            self.logger.error(f"Erro ao gerar relatório: {e}")
+            messagebox.showerror("Erro", f"Erro ao gerar relatório: {e}")
+    
     def center_window(self):
         """Centraliza a janela na tela"""
         self.window.update_idletasks()
@@ -570,6 +680,9 @@ class QueryWindow:
         """Trata o fechamento da janela"""
         try:
             self.logger.info("Fechando janela de consulta")
+            for job in (self.export_job, self.report_job):
+                if job is not None:
+                    job.cancel()
             self.window.destroy()
         except Exception as e:
             self.logger.error(f"Erro ao fechar janela de consulta: {e}")
@@ -891,14 +1004,16 @@ class QueryWindow:
         action_frame = ttk.Frame(buttons_frame)
         action_frame.grid(row=1, column=0, columnspan=3)
         
-        ttk.Button(action_frame, text="Exportar Resultados", 
+        ttk.Button(action_frame, text="Exportar Página", 
                   command=self.export_results).grid(row=0, column=0, padx=(0, 10))
+        ttk.Button(action_frame, text="Exportar Todos", 
+                  command=self.export_all_results).grid(row=0, column=1, padx=10)
         ttk.Button(action_frame, text="Gerar Relatório", 
-                  command=self.generate_report).grid(row=0, column=1, padx=10)
+                  command=self.generate_report).grid(row=0, column=2, padx=10)
         ttk.Button(action_frame, text="Atualizar (F5)", 
-                  command=self.refresh_data).grid(row=0, column=2, padx=10)
+                  command=self.refresh_data).grid(row=0, column=3, padx=10)
         ttk.Button(action_frame, text="Fechar", 
-                  command=self.window.destroy).grid(row=0, column=3, padx=(10, 0))
+                  command=self.window.destroy).grid(row=0, column=4, padx=(10, 0))
         
         # Inicializar estado dos botões
         self.update_pagination_buttons()
@@ -7,8 +7,6 @@ Versão aprimorada com visualizações interativas e análises avançadas
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import matplotlib.patches as mpatches
 import pandas as pd
 import numpy as np
@@ -16,14 +14,29 @@ import seaborn as sns
 from datetime import datetime
 import json
 import os
+import base64
 from typing import Dict, List, Optional, Any, Tuple
 from ..utils.logger import get_logger
-from ..database.models import Individual, Household, Region, DeviceUsage
+from ..database.models import Region, DeviceUsage
+from ..database.report_queries import ReportAggregator, statistics_text
+from ..modules.report_dataset import ReportDataset
+from ..modules.query_engine import QueryEngine, EXPORT_COLUMNS
+from ..modules.report_snapshots import ReportSnapshot, get_snapshot_store
 from .icons import get_icon, get_icon_color
+from .chart_cache import ChartCache
+from .chart_drawing import chart_series, CHART_TITLES
+from .chart_renderer import get_chart_render_service, dark_style
+from .components import ProgressDialog
+from ..utils.background_job import BackgroundJob
 
 class ReportsWindow:
     """Janela para geração de relatórios com visualizações avançadas e análises interativas"""
     
+    # Gráficos incluídos nas exportações PDF/Excel, com seus títulos
+    EXPORT_CHARTS = CHART_TITLES
+    # Tamanho (polegadas) dos gráficos nas exportações
+    EXPORT_FIGSIZE = (8, 6)
+    
     def __init__(self, parent, db_manager, filtered_data: Optional[List] = None):
         self.parent = parent
         self.db_manager = db_manager
@@ -58,9 +71,34 @@ class ReportsWindow:
         # Cache de dados processados
         self.processed_data: Dict[str, Any] = {}
         self.statistics: Dict[str, Any] = {}
+        # Contagens agregadas que alimentam estatísticas e gráficos
+        self.aggregates: Dict[str, Any] = {}
+        
+        # Cache de séries/bitmaps e figuras reaproveitadas por gráfico
+        self.chart_cache = ChartCache()
+        self.dataset_version = ""
+        self._dataset_source = None
+        self._filtered_generation = 0
+        # Relatórios padrão pré-calculados para a versão atual do banco
+        self.snapshot: Optional[ReportSnapshot] = None
+        # Gráficos são rasterizados pelo serviço de renderização e exibidos como imagem
+        self.render_service = get_chart_render_service()
+        self.chart_style: Dict[str, Any] = {}
+        self._chart_labels: Dict[str, tk.Label] = {}
+        self._chart_images: Dict[str, tk.PhotoImage] = {}
+        self._chart_states: Dict[str, Tuple] = {}
+        self._render_jobs: Dict[str, str] = {}
+        # Exportações de PDF e Excel em segundo plano
+        self._pdf_job: Optional[BackgroundJob] = None
+        self._excel_job: Optional[BackgroundJob] = None
+        self._resize_jobs: Dict[str, str] = {}
+        # Abas geradas sob demanda: aba -> (versão dos dados, paleta) desenhada
+        self._tab_versions: Dict[str, Tuple] = {}
+        self._precompute_job: Optional[str] = None
         
         # Variáveis de controle
-        self.data: List = []
+        # Dados filtrados em formato colunar (vazio: agregações do banco)
+        self.data: Any = []
         self.export_format = tk.StringVar(value="PDF")
         self.chart_type = tk.StringVar(value="bar")
         
@@ -98,18 +136,40 @@ class ReportsWindow:
         # Carregar dados e gerar relatórios
         self.load_data_and_generate_reports()
 
-    def _bind_resize_redraw(self, frame, redraw_fn):
-        """Associa evento de redimensionamento para redesenhar o gráfico no frame."""
-        try:
-            def _on_resize(event):
-                # Regerar gráfico ao mudar tamanho, mantendo funcionalidades
-                for widget in frame.winfo_children():
-                    widget.destroy()
+    def _bind_resize_redraw(self, frame, redraw_fn, delay_ms: int = 200):
+        """Associa redimensionamento do frame ao redesenho do gráfico.
+
+        Os eventos <Configure> são agrupados (debounce) e o redesenho só
+        acontece quando o tamanho muda de faixa; o gráfico reaproveita a
+        figura existente em vez de recriar o canvas.
+        """
+        job_key = str(frame)
+        last_size = {'value': None}
+
+        def _redraw():
+            self._resize_jobs.pop(job_key, None)
+            try:
+                redraw_fn()
+            except Exception:
+                # Evitar quebra em resize
+                pass
+
+        def _on_resize(event):
+            if event.widget is not frame:
+                return
+            size = (event.width // 40, event.height // 40)
+            if size == last_size['value']:
+                return
+            last_size['value'] = size
+            pending = self._resize_jobs.pop(job_key, None)
+            if pending:
                 try:
-                    redraw_fn()
+                    self.window.after_cancel(pending)
                 except Exception:
-                    # Evitar quebra em resize
                     pass
+            self._resize_jobs[job_key] = self.window.after(delay_ms, _redraw)
+
+        try:
             frame.bind("<Configure>", _on_resize)
         except Exception:
             pass
@@ -230,32 +290,17 @@ class ReportsWindow:
                            ('active', 'white')])
     
     def setup_matplotlib_style(self):
-        """Configura o estilo do matplotlib com tema escuro"""
+        """Configura o estilo do matplotlib com tema escuro.
+
+        O mesmo estilo é repassado ao serviço de renderização, que o aplica
+        nos processos de desenho.
+        """
+        self.chart_style = dark_style(self.colors)
         try:
-            plt.style.use('dark_background')
+            plt.style.use(self.chart_style['base'])
         except OSError:
             plt.style.use('default')
-        
-        # Configurações globais para tema escuro
-        plt.rcParams.update({
-            'figure.facecolor': self.colors['bg_card'],
-            'axes.facecolor': self.colors['bg_card'],
-            'axes.edgecolor': self.colors['border'],
-            'axes.linewidth': 1,
-            'axes.grid': True,
-            'grid.color': self.colors['border'],
-            'grid.alpha': 0.3,
-            'text.color': self.colors['text_primary'],
-            'axes.labelcolor': self.colors['text_primary'],
-            'xtick.color': self.colors['text_secondary'],
-            'ytick.color': self.colors['text_secondary'],
-            'font.size': 10,
-            'axes.titlesize': 12,
-            'axes.labelsize': 10,
-            'xtick.labelsize': 9,
-            'ytick.labelsize': 9,
-            'legend.fontsize': 9
-        })
+        plt.rcParams.update(self.chart_style['rc'])
     
     def setup_keyboard_shortcuts(self):
         """Configura atalhos de teclado"""
@@ -267,7 +312,23 @@ class ReportsWindow:
     def on_closing(self):
         """Trata o fechamento da janela"""
         try:
-            # Limpar figuras matplotlib para liberar memória
+            # Cancelar redesenhos pendentes e liberar figuras/caches
+            for job in self._resize_jobs.values():
+                self.window.after_cancel(job)
+            self._resize_jobs.clear()
+            if self._precompute_job:
+                self.window.after_cancel(self._precompute_job)
+                self._precompute_job = None
+            for job in self._render_jobs.values():
+                self.window.after_cancel(job)
+            self._render_jobs.clear()
+            self._chart_labels.clear()
+            self._chart_images.clear()
+            self._chart_states.clear()
+            for job in (self._pdf_job, self._excel_job):
+                if job is not None:
+                    job.cancel()
+            self.chart_cache.clear()
             plt.close('all')
             self.window.destroy()
         except Exception as e:
@@ -356,6 +417,9 @@ class ReportsWindow:
         self.create_regional_tab()
         self.create_analysis_tab()
         
+        # Gráficos gerados apenas ao exibir a aba
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        
         # Frame de botões com mais espaço
         buttons_frame = ttk.Frame(main_frame)
         buttons_frame.grid(row=3, column=0, pady=(8, 0))
@@ -485,27 +549,67 @@ class ReportsWindow:
     def refresh_current_tab(self):
         """Atualiza apenas a aba atual"""
         try:
-            current_tab = self.notebook.select()
-            tab_text = self.notebook.tab(current_tab, "text")
-            
-            if "Visão Geral" in tab_text:
-                self.generate_overview_chart()
-            elif "Estatísticas" in tab_text:
-                self.generate_gender_chart()
-            elif "Demografia" in tab_text:
-                self.generate_age_chart()
-                self.generate_income_chart()
-            elif "Acesso Digital" in tab_text:
-                self.generate_internet_chart()
-                self.generate_devices_chart()
-            elif "Regional" in tab_text:
-                self.generate_regional_chart()
-            elif "Análise" in tab_text:
-                self.generate_correlation_analysis()
-                
+            self._render_tab(self.notebook.select(), force=True)
         except Exception as e:
             self.logger.error(f"Erro ao atualizar aba atual: {e}")
     
+    def _tab_renderers(self, tab_text: str) -> List:
+        """Funções que geram o conteúdo de cada aba"""
+        if "Visão Geral" in tab_text:
+            return [self.generate_overview_chart]
+        elif "Estatísticas" in tab_text:
+            return [self.generate_gender_chart]
+        elif "Demografia" in tab_text:
+            return [self.generate_age_chart, self.generate_income_chart]
+        elif "Acesso Digital" in tab_text:
+            return [self.generate_internet_chart, self.generate_devices_chart]
+        elif "Regional" in tab_text:
+            return [self.generate_regional_chart]
+        elif "Análise" in tab_text:
+            return [self.generate_correlation_analysis]
+        return []
+    
+    def _tab_render_key(self) -> Tuple:
+        return (self.dataset_version, tuple(self.chart_config.get('color_palette') or ()))
+    
+    def _render_tab(self, tab_id: str, force: bool = False):
+        """Gera os gráficos da aba se ainda não refletem os dados/paleta atuais"""
+        if not tab_id or not self._has_data():
+            return
+        key = self._tab_render_key()
+        if not force and self._tab_versions.get(tab_id) == key:
+            return
+        for render in self._tab_renderers(self.notebook.tab(tab_id, "text")):
+            render()
+        self._tab_versions[tab_id] = key
+    
+    def _on_tab_changed(self, event=None):
+        """Gera a aba selecionada na primeira exibição ou após mudança dos dados"""
+        try:
+            self._render_tab(self.notebook.select())
+        except Exception as e:
+            self.logger.error(f"Erro ao gerar aba selecionada: {e}")
+    
+    def _schedule_precompute(self):
+        """Agenda a geração das abas ocultas para quando a interface estiver ociosa"""
+        if self._precompute_job:
+            self.window.after_cancel(self._precompute_job)
+        self._precompute_job = self.window.after_idle(self._precompute_next_tab)
+    
+    def _precompute_next_tab(self):
+        """Gera uma aba oculta pendente por vez, devolvendo o controle ao loop do Tk"""
+        self._precompute_job = None
+        key = self._tab_render_key()
+        for tab_id in self.notebook.tabs():
+            if self._tab_versions.get(tab_id) != key:
+                try:
+                    self._render_tab(tab_id)
+                except Exception as e:
+                    self.logger.error(f"Erro ao pré-gerar aba: {e}")
+                    self._tab_versions[tab_id] = key
+                self._precompute_job = self.window.after(50, self._schedule_precompute)
+                return
+    
     def show_settings(self):
         """Mostra janela de configurações com estilo moderno"""
         settings_window = tk.Toplevel(self.window)
@@ -754,103 +858,42 @@ class ReportsWindow:
             
             if filtered_data:
                 # Usar dados filtrados passados como parâmetro
-                self.data = filtered_data
+                self.data = self._as_dataset(filtered_data)
+                self._set_dataset_version(filtered_data)
                 self.logger.info(f"Carregados {len(filtered_data)} registros filtrados")
             elif self.filtered_data:
                 # Usar dados filtrados da instância
-                self.data = self.filtered_data
+                self.data = self._as_dataset(self.filtered_data)
+                self._set_dataset_version(self.filtered_data)
             else:
-                # Carregar todos os dados do banco com eager loading
-                try:
-                    with self.db_manager.get_session() as session:
-                        from sqlalchemy.orm import joinedload
-                        query_result = session.query(Individual)\
-                            .options(joinedload(Individual.household)\
-                                    .joinedload(Household.region))\
-                            .options(joinedload(Individual.household)\
-                                    .joinedload(Household.region))\
-                            .options(joinedload(Individual.device_usage))\
-                            .all()
-                        
-                        if not query_result:
-                            self.logger.warning("Nenhum dado encontrado no banco")
-                            messagebox.showwarning("Aviso", "Nenhum dado encontrado no banco de dados.")
-                            self.data = []
-                            return
-                        
-                        # Fazer uma cópia dos dados para uso fora da sessão
-                        data_copy = []
-                        errors_count = 0
-                        
-                        for individual in query_result:
-                            try:
-                                # Acessar todos os atributos necessários enquanto na sessão
-                                household_data = {
-                                    'income_range': None,
-                                    'has_internet': False,
-                                    'region_name': 'N/A',
-                                    'devices': []
-                                }
-                                
-                                if hasattr(individual, 'household') and individual.household:
-                                    household_data['income_range'] = getattr(individual.household, 'income_range', None)
-                                    household_data['has_internet'] = getattr(individual.household, 'has_internet', False)
-                                    
-                                    # Região
-                                    if hasattr(individual.household, 'region') and individual.household.region:
-                                        household_data['region_name'] = getattr(individual.household.region, 'name', 'N/A')
-                                    
-                                    # Dispositivos do indivíduo
-                                    if hasattr(individual, 'device_usage') and individual.device_usage:
-                                        try:
-                                            devices = [d.device_type for d in individual.device_usage if hasattr(d, 'device_type')]
-                                            household_data['devices'] = devices
-                                        except Exception:
-                                            household_data['devices'] = []
-                                
-                                individual_data = {
-                                    'id': getattr(individual, 'id', None),
-                                    'age': getattr(individual, 'age', None),
-                                    'gender': getattr(individual, 'gender', None),
-                                    'has_disability': getattr(individual, 'has_disability', False),
-                                    'household': household_data
-                                }
-                                data_copy.append(individual_data)
-                                
-                            except Exception as process_error:
-                                self.logger.error(f"Erro ao processar registro individual: {process_error}")
-                                errors_count += 1
-                                continue
-                        
-                        self.data = data_copy
-                        self.logger.info(f"Carregados {len(data_copy)} registros do banco")
-                        
-                        if errors_count > 0:
-                            self.logger.warning(f"{errors_count} registros tiveram problemas no processamento")
-                            messagebox.showwarning("Aviso", f"{errors_count} registros tiveram problemas e foram ignorados.")
-                        
-                except Exception as db_error:
-                    self.logger.error(f"Erro ao consultar banco de dados: {db_error}")
-                    messagebox.showerror("Erro", f"Erro ao acessar banco de dados: {db_error}")
-                    return
-            
-            if not self.data:
+                # Todos os dados: apenas contagens agregadas calculadas no banco
+                self.data = []
+                self._set_dataset_version(None)
+            
+            try:
+                self.aggregates = self.chart_cache.get_series(
+                    'aggregates', self.dataset_version, self._compute_aggregates
+                ) or {}
+            except Exception as db_error:
+                self.logger.error(f"Erro ao consultar banco de dados: {db_error}")
+                messagebox.showerror("Erro", f"Erro ao acessar banco de dados: {db_error}")
+                return
+            
+            if not self._has_data():
                 self.logger.warning("Nenhum dado válido para gerar relatórios")
                 messagebox.showwarning("Aviso", "Nenhum dado válido encontrado para gerar relatórios.")
                 # Desabilitar exportações
                 self._update_export_buttons(enabled=False)
                 return
             
-            # Gerar estatísticas e gráficos
+            self.logger.info(f"Relatórios com {self.aggregates['total']} registros agregados")
+            
+            # Gerar estatísticas e a aba visível; demais abas em segundo plano
             self.logger.info("Iniciando geração de relatórios")
             try:
                 self.generate_statistics()
-                self.generate_gender_chart()
-                self.generate_age_chart()
-                self.generate_income_chart()
-                self.generate_internet_chart()
-                self.generate_devices_chart()
-                self.generate_regional_chart()
+                self._render_tab(self.notebook.select())
+                self._schedule_precompute()
                 self.logger.info("Relatórios gerados com sucesso")
                 # Habilitar exportações pois há dados carregados e gráficos gerados
                 self._update_export_buttons(enabled=True)
@@ -863,6 +906,65 @@ class ReportsWindow:
             messagebox.showerror("Erro", f"Erro ao carregar dados: {e}")
             self._update_export_buttons(enabled=False)
 
+    def _as_dataset(self, data) -> ReportDataset:
+        """Converte dados filtrados (lista de registros) para o formato colunar"""
+        if isinstance(data, ReportDataset):
+            return data
+        # Mesma lista já convertida em uma atualização anterior
+        if data is self._dataset_source and isinstance(self.data, ReportDataset):
+            return self.data
+        return ReportDataset.from_records(data)
+
+    def _compute_aggregates(self) -> Dict[str, Any]:
+        """Agrega os dados filtrados ou usa o snapshot / consulta as agregações do banco"""
+        if self.data:
+            return self.data.aggregates()
+        snapshot = self._current_snapshot()
+        if snapshot is not None:
+            self.logger.info(f"Relatórios abertos a partir do snapshot {snapshot.version}")
+            return snapshot.aggregates
+        return ReportAggregator(self.db_manager).get_aggregates()
+
+    def _current_snapshot(self) -> Optional[ReportSnapshot]:
+        """Snapshot da versão exibida (apenas para todos os dados do banco)"""
+        self.snapshot = None
+        if self.data or not self.dataset_version.startswith('db:'):
+            return None
+        try:
+            self.snapshot = get_snapshot_store(self.db_manager).load(self.dataset_version[3:])
+        except Exception as e:
+            self.logger.warning(f"Snapshot de relatórios indisponível: {e}")
+        return self.snapshot
+
+    def _snapshot_png(self, chart_type: str) -> Optional[bytes]:
+        """Imagem do snapshot, se corresponder aos dados e à paleta exibidos"""
+        snapshot = self.snapshot
+        if snapshot is None or f"db:{snapshot.version}" != self.dataset_version:
+            return None
+        if tuple(self.chart_config.get('color_palette') or ()) != snapshot.palette:
+            return None
+        return snapshot.chart_png(chart_type)
+
+    def _has_data(self) -> bool:
+        """Indica se há registros agregados para exibir"""
+        return bool(self.aggregates.get('total'))
+
+    def _set_dataset_version(self, source: Optional[List]):
+        """Define a versão do conjunto exibido (chave dos caches de gráficos).
+
+        Dados do banco usam a versão do arquivo de dados; dados filtrados
+        recebem uma nova geração sempre que a lista recebida muda.
+        """
+        if source is None:
+            try:
+                self.dataset_version = f"db:{self.db_manager.get_data_version()}"
+            except Exception:
+                self.dataset_version = f"db:{datetime.now().timestamp()}"
+        elif source is not self._dataset_source:
+            self._filtered_generation += 1
+            self.dataset_version = f"filtered:{self._filtered_generation}"
+        self._dataset_source = source
+
     def _update_export_buttons(self, enabled: bool):
         """Ativa ou desativa botões de exportação conforme disponibilidade de dados."""
         state = 'normal' if enabled else 'disabled'
@@ -881,173 +983,19 @@ class ReportsWindow:
     
     def generate_statistics(self):
         """Gera estatísticas dos dados com tratamento robusto de erros"""
-        if not self.data:
+        if not self._has_data():
             self.logger.warning("Nenhum dado disponível para gerar estatísticas")
             self.stats_text.delete(1.0, tk.END)
             self.stats_text.insert(1.0, "Nenhum dado disponível para gerar estatísticas.")
             return
         
         try:
-            total = len(self.data)
-            errors_count = 0
-            
-            # Estatísticas por gênero
-            gender_counts = {}
-            for individual in self.data:
-                try:
-                    if isinstance(individual, dict):
-                        gender = individual.get('gender') or 'Não informado'
-                    else:
-                        gender = getattr(individual, 'gender', None) or 'Não informado'
-                    gender_counts[gender] = gender_counts.get(gender, 0) + 1
-                except Exception as e:
-                    self.logger.error(f"Erro ao processar gênero: {e}")
-                    errors_count += 1
-                    gender_counts['Não informado'] = gender_counts.get('Não informado', 0) + 1
-            
-            # Estatísticas por idade
-            ages = []
-            for individual in self.data:
-                try:
-                    if isinstance(individual, dict):
-                        age = individual.get('age')
-                    else:
-                        age = getattr(individual, 'age', None)
-                    
-                    if age is not None and isinstance(age, (int, float)) and 0 <= age <= 150:
-                        ages.append(age)
-                except Exception as e:
-                    self.logger.error(f"Erro ao processar idade: {e}")
-                    errors_count += 1
-            
-            avg_age = sum(ages) / len(ages) if ages else 0
-            
-            # Estatísticas por deficiência
-            disability_count = 0
-            for individual in self.data:
-                try:
-                    if isinstance(individual, dict):
-                        has_disability = individual.get('has_disability', False)
-                    else:
-                        has_disability = getattr(individual, 'has_disability', False)
-                    
-                    if has_disability:
-                        disability_count += 1
-                except Exception as e:
-                    self.logger.error(f"Erro ao processar deficiência: {e}")
-                    errors_count += 1
-            
-            # Estatísticas de internet
-            internet_count = 0
-            for individual in self.data:
-                try:
-                    if isinstance(individual, dict):
-                        has_internet = individual.get('household', {}).get('has_internet', False)
-                    else:
-                        household = getattr(individual, 'household', None)
-                        has_internet = getattr(household, 'has_internet', False) if household else False
-                    
-                    if has_internet:
-                        internet_count += 1
-                except Exception as e:
-                    self.logger.error(f"Erro ao processar internet: {e}")
-                    errors_count += 1
-            
-            # Estatísticas por renda
-            income_counts = {}
-            for individual in self.data:
-                try:
-                    if isinstance(individual, dict):
-                        income = individual.get('household', {}).get('income_range') or 'Não informado'
-                    else:
-                        household = getattr(individual, 'household', None)
-                        income = getattr(household, 'income_range', None) if household else None
-                        income = income or 'Não informado'
-                    
-                    income_counts[income] = income_counts.get(income, 0) + 1
-                except Exception as e:
-                    self.logger.error(f"Erro ao processar renda: {e}")
-                    errors_count += 1
-                    income_counts['Não informado'] = income_counts.get('Não informado', 0) + 1
-            
-            # Montar texto das estatísticas
-            stats_text = f"""RELATÓRIO ESTATÍSTICO - SISTEMA DAC
-{'='*50}
-
-TOTAL DE REGISTROS: {total}
-"""
-            
-            if errors_count > 0:
-                stats_text += f"REGISTROS COM PROBLEMAS: {errors_count}\n"
-            
-            stats_text += f"""\nDISTRIBUIÇÃO POR GÊNERO:
-{'-'*30}
-"""
-            
-            for gender, count in gender_counts.items():
-                try:
-                    percentage = (count / total) * 100 if total > 0 else 0
-                    stats_text += f"{gender}: {count} ({percentage:.1f}%)\n"
-                except Exception as e:
-                    self.logger.error(f"Erro ao calcular percentual de gênero: {e}")
-                    stats_text += f"{gender}: {count} (erro no cálculo)\n"
-            
-            stats_text += f"""\nESTATÍSTICAS DE IDADE:
-{'-'*30}
-Idade média: {avg_age:.1f} anos
-Total com idade válida: {len(ages)}
-Total sem idade: {total - len(ages)}
-
-PESSOAS COM DEFICIÊNCIA:
-{'-'*30}"""
-            
-            try:
-                disability_percentage = (disability_count/total)*100 if total > 0 else 0
-                no_disability_percentage = ((total-disability_count)/total)*100 if total > 0 else 0
-                stats_text += f"""Com deficiência: {disability_count} ({disability_percentage:.1f}%)
-Sem deficiência: {total-disability_count} ({no_disability_percentage:.1f}%)
-"""
-            except Exception as e:
-                self.logger.error(f"Erro ao calcular percentuais de deficiência: {e}")
-                stats_text += f"""Com deficiência: {disability_count}
-Sem deficiência: {total-disability_count}
-"""
-            
-            stats_text += f"""\nACESSO À INTERNET:
-{'-'*30}"""
-            
-            try:
-                internet_percentage = (internet_count/total)*100 if total > 0 else 0
-                no_internet_percentage = ((total-internet_count)/total)*100 if total > 0 else 0
-                stats_text += f"""Com internet: {internet_count} ({internet_percentage:.1f}%)
-Sem internet: {total-internet_count} ({no_internet_percentage:.1f}%)
-"""
-            except Exception as e:
-                self.logger.error(f"Erro ao calcular percentuais de internet: {e}")
-                stats_text += f"""Com internet: {internet_count}
-Sem internet: {total-internet_count}
-"""
-            
-            stats_text += f"""\nDISTRIBUIÇÃO POR RENDA:
-{'-'*30}
-"""
-            
-            for income, count in income_counts.items():
-                try:
-                    percentage = (count / total) * 100 if total > 0 else 0
-                    stats_text += f"{income}: {count} ({percentage:.1f}%)\n"
-                except Exception as e:
-                    self.logger.error(f"Erro ao calcular percentual de renda: {e}")
-                    stats_text += f"{income}: {count} (erro no cálculo)\n"
+            stats_text = statistics_text(self.aggregates)
             
             # Atualizar o widget de texto
             self.stats_text.delete(1.0, tk.END)
             self.stats_text.insert(1.0, stats_text)
-            
-            if errors_count > 0:
-                self.logger.warning(f"Estatísticas geradas com {errors_count} erros")
-            else:
-                self.logger.info("Estatísticas geradas com sucesso")
+            self.logger.info("Estatísticas geradas com sucesso")
                 
         except Exception as e:
             self.logger.error(f"Erro geral ao gerar estatísticas: {e}")
@@ -1062,38 +1010,161 @@ Verifique os logs para mais detalhes."""
             self.stats_text.insert(1.0, error_text)
             messagebox.showerror("Erro", f"Erro ao gerar estatísticas: {e}")
     
+    def _series(self, chart_type: str) -> Optional[Dict[str, Any]]:
+        """Retorna a série agregada de um gráfico para a versão atual dos dados"""
+        return self.chart_cache.get_series(chart_type, self.dataset_version,
+                                           lambda: chart_series(chart_type, self.aggregates))
+
+    def _get_chart_label(self, chart_key: str, frame) -> tk.Label:
+        """Retorna o rótulo que exibe a imagem do gráfico, reaproveitando o existente no frame"""
+        label = self._chart_labels.get(chart_key)
+        if label is not None:
+            try:
+                if label.winfo_exists():
+                    return label
+            except tk.TclError:
+                pass
+
+        # Primeira renderização (ou rótulo removido por mensagem de erro/sem dados)
+        for widget in frame.winfo_children():
+            widget.destroy()
+        label = tk.Label(frame, bg=self.colors['bg_card'], fg=self.colors['text_secondary'],
+                         font=('Segoe UI', 10))
+        label.pack(fill=tk.BOTH, expand=True)
+        self._chart_labels[chart_key] = label
+        self._chart_states.pop(chart_key, None)
+        return label
+
+    def _render_chart(self, chart_key: str, frame, figsize: Tuple[float, float], series):
+        """Renderiza o gráfico fora da thread do Tk e exibe a imagem quando pronta.
+
+        - mesma versão, paleta e faixa de tamanho: nada a fazer;
+        - imagem já renderizada no cache: exibida imediatamente;
+        - caso contrário o desenho é enviado ao serviço de renderização e o
+          resultado é consultado com `after`, sem bloquear a interface.
+        """
+        palette = tuple(self.chart_config.get('color_palette') or ())
+        state = (self.dataset_version, palette, ChartCache.size_bucket(figsize))
+        label = self._get_chart_label(chart_key, frame)
+        if self._chart_states.get(chart_key) == state:
+            return
+        self._chart_states[chart_key] = state
+
+        key = ChartCache.bitmap_key(chart_key, self.dataset_version, figsize, palette)
+        cached = self.chart_cache.get_bitmap(key)
+        if cached is not None:
+            self._show_chart_image(chart_key, cached['png'])
+            return
+
+        if chart_key not in self._chart_images:
+            # Imagem do snapshot exibida enquanto o tamanho exato é renderizado
+            placeholder = self._snapshot_png(chart_key)
+            if placeholder is not None:
+                dpi = plt.rcParams.get('figure.dpi', 100)
+                self._show_chart_image(chart_key, placeholder, fit=(figsize[0] * dpi, figsize[1] * dpi))
+            else:
+                label.configure(text="Gerando gráfico...")
+        future = self.render_service.submit(
+            chart_key, series, figsize, dpi=int(plt.rcParams.get('figure.dpi', 100)),
+            palette=palette, style=self.chart_style
+        )
+        self._poll_chart_render(chart_key, state, key, future)
+
+    def _poll_chart_render(self, chart_key: str, state: Tuple, key: Tuple, future):
+        """Aguarda a renderização sem bloquear e exibe a imagem se ainda for atual"""
+        self._render_jobs.pop(chart_key, None)
+        if not future.done():
+            self._render_jobs[chart_key] = self.window.after(
+                30, lambda: self._poll_chart_render(chart_key, state, key, future))
+            return
+
+        try:
+            png = future.result()
+        except Exception as e:
+            self.logger.error(f"Erro ao renderizar gráfico '{chart_key}': {e}")
+            if self._chart_states.get(chart_key) == state:
+                self._chart_states.pop(chart_key, None)
+                label = self._chart_labels.get(chart_key)
+                if label is not None and label.winfo_exists():
+                    self._show_error_message(label.master, f"Erro ao gerar gráfico: {e}")
+            return
+
+        self.chart_cache.set_bitmap(key, png)
+        # Descartar resultados de dados/tamanhos que já foram substituídos
+        if self._chart_states.get(chart_key) == state:
+            self._show_chart_image(chart_key, png)
+
+    def _show_chart_image(self, chart_key: str, png: bytes, fit: Optional[Tuple[float, float]] = None):
+        """Exibe a imagem PNG no rótulo do gráfico (reduzida para caber em `fit`, em pixels)"""
+        label = self._chart_labels.get(chart_key)
+        if label is None:
+            return
+        try:
+            image = tk.PhotoImage(data=base64.b64encode(png))
+            if fit:
+                factor = int(np.ceil(max(image.width() / fit[0], image.height() / fit[1])))
+                if factor > 1:
+                    image = image.subsample(factor)
+            label.configure(image=image, text="")
+            # Manter referência para a imagem não ser coletada
+            self._chart_images[chart_key] = image
+        except tk.TclError as e:
+            self.logger.error(f"Erro ao exibir gráfico '{chart_key}': {e}")
+
+    def _export_chart_images(self, dpi: int = 120) -> List[Tuple[str, bytes]]:
+        """Imagens (PNG) dos gráficos incluídos nas exportações.
+
+        Reaproveita as imagens do snapshot ou as já exibidas na janela para a
+        versão atual dos dados, com a paleta atual e no tamanho da exportação,
+        e renderiza em paralelo apenas as que faltam.
+        """
+        version = self.dataset_version
+        palette = tuple(self.chart_config.get('color_palette') or ())
+        images: Dict[str, bytes] = {}
+        charts = []
+        for chart_type in self.EXPORT_CHARTS:
+            snapshot_png = self._snapshot_png(chart_type)
+            if snapshot_png is not None:
+                images[chart_type] = snapshot_png
+                continue
+            cached = self.chart_cache.get_bitmap(
+                ChartCache.bitmap_key(chart_type, version, self.EXPORT_FIGSIZE, palette))
+            if cached is not None:
+                images[chart_type] = cached['png']
+                continue
+            try:
+                series = self._series(chart_type)
+            except Exception as e:
+                self.logger.error(f"Erro ao preparar série '{chart_type}' para exportação: {e}")
+                continue
+            if series:
+                charts.append((chart_type, series))
+
+        for chart_type, png in self.render_service.render_many(charts, self.EXPORT_FIGSIZE, dpi=dpi,
+                                                               palette=palette, style=self.chart_style):
+            if png:
+                images[chart_type] = png
+        return [(chart_type, images[chart_type]) for chart_type in self.EXPORT_CHARTS if chart_type in images]
+
+    def _add_chart_sheet(self, workbook):
+        """Adiciona ao workbook openpyxl uma aba com os gráficos renderizados"""
+        from ..modules.streaming_export import add_image_sheet
+
+        add_image_sheet(workbook, [(self.EXPORT_CHARTS[chart_type], png)
+                                   for chart_type, png in self._export_chart_images()])
+
     def generate_gender_chart(self):
         """Gera gráfico de distribuição por gênero com formatação melhorada"""
-        if not self.data:
+        if not self._has_data():
             return
         
-        # Usar método de formatação padronizada
-        gender_counts = {}
-        for individual in self.data:
-            gender = self._format_gender_value(individual)
-            gender_counts[gender] = gender_counts.get(gender, 0) + 1
-        
-        if gender_counts:
+        series = self._series('gender')
+        if series and series['counts']:
             # Figsize dinâmico e formato quadrado para pizza
             w, h = self._get_dynamic_figsize(self.stats_chart_frame, base=(8, 6))
             size = min(w, h)
-            fig, ax = plt.subplots(figsize=(size, size))
-            colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
-            wedges, texts, autotexts = ax.pie(gender_counts.values(), labels=gender_counts.keys(), 
-                                            autopct='%1.1f%%', colors=colors[:len(gender_counts)],
-                                            startangle=90, textprops={'fontsize': 10})
-            
-            # Melhorar aparência do título
-            ax.set_title('Distribuição por Gênero', fontweight='bold', fontsize=14, pad=20)
-            
-            # Adicionar legenda interna para evitar overflow lateral
-            legend_labels = [f'{gender}: {count:,} pessoas' for gender, count in gender_counts.items()]
-            ax.legend(wedges, legend_labels, title="Detalhes", loc="upper right")
-            
-            canvas = FigureCanvasTkAgg(fig, self.stats_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
+            self._render_chart('gender', self.stats_chart_frame, (size, size), series)
+
     def _show_no_data_message(self, parent_frame, message):
         """Exibe mensagem quando não há dados disponíveis"""
         for widget in parent_frame.winfo_children():
@@ -1123,352 +1194,96 @@ Verifique os logs para mais detalhes."""
     def generate_age_chart(self):
         """Gera gráfico de distribuição por faixa etária com tratamento de erros"""
         try:
-            if not self.data:
+            if not self._has_data():
                 self._show_no_data_message(self.age_chart_frame, "Nenhum dado disponível para análise de idades")
                 return
             
-            # Usar método de validação melhorado
-            ages = []
-            invalid_ages = 0
-            
-            for individual in self.data:
-                age = self._get_valid_age(individual)
-                if age is not None:
-                    ages.append(age)
-                else:
-                    invalid_ages += 1
-            
-            if not ages:
+            series = self._series('age')
+            if not series['valid']:
                 self._show_no_data_message(self.age_chart_frame, 
-                    f"Dados de idade não disponíveis ou inválidos\n({invalid_ages} registros com idades inválidas)")
+                    f"Dados de idade não disponíveis ou inválidos\n({series['invalid']} registros com idades inválidas)")
                 return
             
-            # Limpar frame anterior
-            for widget in self.age_chart_frame.winfo_children():
-                widget.destroy()
-            
-            # Definir faixas etárias
-            age_ranges = {'0-17': 0, '18-29': 0, '30-49': 0, '50-64': 0, '65+': 0}
-            
-            for age in ages:
-                if age < 18:
-                    age_ranges['0-17'] += 1
-                elif age < 30:
-                    age_ranges['18-29'] += 1
-                elif age < 50:
-                    age_ranges['30-49'] += 1
-                elif age < 65:
-                    age_ranges['50-64'] += 1
-                else:
-                    age_ranges['65+'] += 1
-            
             figsize = self._get_dynamic_figsize(self.age_chart_frame, base=(8, 6))
-            fig, ax = plt.subplots(figsize=figsize)
-            bars = ax.bar(age_ranges.keys(), age_ranges.values(), color='#45B7D1', alpha=0.8)
-            
-            # Melhorar aparência
-            ax.set_title('Distribuição por Faixa Etária', fontweight='bold', fontsize=14, pad=20)
-            ax.set_xlabel('Faixa Etária (anos)', fontsize=12)
-            ax.set_ylabel('Quantidade de Pessoas', fontsize=12)
-            ax.grid(True, alpha=0.3, axis='y')
-            
-            # Adicionar valores nas barras com formatação melhorada
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                       f'{int(height):,}', ha='center', va='bottom', fontweight='bold')
-            
-            # Adicionar informações sobre qualidade dos dados
-            total_records = len(self.data)
-            valid_percentage = (len(ages) / total_records) * 100
-            
-            info_text = f'Dados válidos: {len(ages):,}/{total_records:,} ({valid_percentage:.1f}%)'
-            if invalid_ages > 0:
-                info_text += f'\nDados inválidos: {invalid_ages:,}'
-            
-            ax.text(0.02, 0.98, info_text, transform=ax.transAxes, 
-                   verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
-            
-            plt.xticks(rotation=0)
-            fig.tight_layout()
-            
-            canvas = FigureCanvasTkAgg(fig, self.age_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self._render_chart('age', self.age_chart_frame, figsize, series)
             
         except Exception as e:
             self.logger.error(f"Erro ao gerar gráfico de idades: {e}")
             self._show_error_message(self.age_chart_frame, f"Erro ao gerar gráfico: {str(e)}")
-    
+
     def generate_income_chart(self):
         """Gera gráfico de distribuição por renda com tratamento de erros"""
         try:
-            if not self.data:
+            if not self._has_data():
                 self._show_no_data_message(self.income_chart_frame, "Nenhum dado disponível para análise de renda")
                 return
             
-            income_counts = {}
-            invalid_income = 0
-            
-            for individual in self.data:
-                try:
-                    if isinstance(individual, dict):
-                        income = individual.get('household', {}).get('income_range')
-                    else:
-                        income = getattr(individual.household, 'income_range', None) if hasattr(individual, 'household') and individual.household else None
-                    
-                    if income and income.strip():
-                        income_counts[income] = income_counts.get(income, 0) + 1
-                    else:
-                        income_counts['Não Informado'] = income_counts.get('Não Informado', 0) + 1
-                        invalid_income += 1
-                except (AttributeError, KeyError):
-                    income_counts['Não Informado'] = income_counts.get('Não Informado', 0) + 1
-                    invalid_income += 1
-            
-            if not income_counts:
+            series = self._series('income')
+            if not series['counts']:
                 self._show_no_data_message(self.income_chart_frame, "Dados de renda não disponíveis")
                 return
             
-            # Limpar frame anterior
-            for widget in self.income_chart_frame.winfo_children():
-                widget.destroy()
-            
-            # Ordenar por ordem lógica de renda (se possível)
-            income_order = ['Até 1 SM', '1-2 SM', '2-3 SM', '3-5 SM', '5-10 SM', 'Acima de 10 SM', 'Não Informado']
-            sorted_income = {}
-            
-            # Primeiro, adicionar itens na ordem preferida
-            for income in income_order:
-                if income in income_counts:
-                    sorted_income[income] = income_counts[income]
-            
-            # Depois, adicionar qualquer item restante
-            for income, count in income_counts.items():
-                if income not in sorted_income:
-                    sorted_income[income] = count
-            
             figsize = self._get_dynamic_figsize(self.income_chart_frame, base=(10, 6))
-            fig, ax = plt.subplots(figsize=figsize)
-            colors = plt.cm.Set3(range(len(sorted_income)))
-            bars = ax.bar(range(len(sorted_income)), list(sorted_income.values()), color=colors, alpha=0.8)
-            
-            # Melhorar aparência
-            ax.set_title('Distribuição por Faixa de Renda Familiar', fontweight='bold', fontsize=14, pad=20)
-            ax.set_xlabel('Faixa de Renda (Salários Mínimos)', fontsize=12)
-            ax.set_ylabel('Quantidade de Famílias', fontsize=12)
-            ax.set_xticks(range(len(sorted_income)))
-            ax.set_xticklabels(list(sorted_income.keys()), rotation=45, ha='right')
-            ax.grid(True, alpha=0.3, axis='y')
-            
-            # Adicionar valores nas barras com formatação melhorada
-            for i, bar in enumerate(bars):
-                height = bar.get_height()
-                percentage = (height / len(self.data)) * 100
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                       f'{int(height):,}\n({percentage:.1f}%)', ha='center', va='bottom', fontweight='bold')
-            
-            # Adicionar informações sobre qualidade dos dados
-            total_records = len(self.data)
-            valid_records = total_records - invalid_income
-            valid_percentage = (valid_records / total_records) * 100
-            
-            info_text = f'Dados válidos: {valid_records:,}/{total_records:,} ({valid_percentage:.1f}%)'
-            if invalid_income > 0:
-                info_text += f'\nDados não informados: {invalid_income:,}'
-            
-            ax.text(0.02, 0.98, info_text, transform=ax.transAxes, 
-                   verticalalignment='top', bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
-            
-            fig.tight_layout()
-            
-            canvas = FigureCanvasTkAgg(fig, self.income_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self._render_chart('income', self.income_chart_frame, figsize, series)
             
         except Exception as e:
             self.logger.error(f"Erro ao gerar gráfico de renda: {e}")
             self._show_error_message(self.income_chart_frame, f"Erro ao gerar gráfico: {str(e)}")
-    
+
     def generate_internet_chart(self):
         """Gera gráfico de acesso à internet com formatação melhorada"""
-        if not self.data:
+        if not self._has_data():
             return
         
-        # Usar método de formatação padronizada
-        internet_counts = {'Com Internet': 0, 'Sem Internet': 0, 'Não Informado': 0}
-        for individual in self.data:
-            internet_status = self._format_internet_access(individual)
-            internet_counts[internet_status] += 1
-        
-        # Remover categoria "Não Informado" se for zero
-        if internet_counts['Não Informado'] == 0:
-            del internet_counts['Não Informado']
+        series = self._series('internet')
         
         # Figsize dinâmico e formato quadrado para pizza
         w, h = self._get_dynamic_figsize(self.internet_chart_frame, base=(7, 5))
         size = min(w, h)
-        fig, ax = plt.subplots(figsize=(size, size))
-        colors = ['#4ECDC4', '#FF6B6B', '#FFA500'][:len(internet_counts)]
-        wedges, texts, autotexts = ax.pie(internet_counts.values(), labels=internet_counts.keys(), 
-                                        autopct='%1.1f%%', colors=colors,
-                                        startangle=90, textprops={'fontsize': 10})
-        
-        # Melhorar aparência do título
-        ax.set_title('Acesso à Internet', fontweight='bold', fontsize=14, pad=20)
-        
-        # Adicionar legenda interna para evitar overflow
-        legend_labels = [f'{status}: {count:,} pessoas' for status, count in internet_counts.items()]
-        ax.legend(wedges, legend_labels, title="Detalhes", loc="upper right")
-        
-        canvas = FigureCanvasTkAgg(fig, self.internet_chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
+        self._render_chart('internet', self.internet_chart_frame, (size, size), series)
+
     def generate_devices_chart(self):
         """Gera gráfico de dispositivos com tratamento de erros"""
         try:
-            if not self.data:
+            if not self._has_data():
                 self._show_no_data_message(self.devices_chart_frame, "Nenhum dado disponível para análise de dispositivos")
                 return
             
-            device_counts = {}
-            households_without_devices = 0
-            households_with_errors = 0
-            
-            for individual in self.data:
-                try:
-                    if isinstance(individual, dict):
-                        devices = individual.get('household', {}).get('devices')
-                    else:
-                        devices = getattr(individual.household, 'devices', None) if hasattr(individual, 'household') and individual.household else None
-                    
-                    # Tratar dispositivos como lista ou string
-                    if isinstance(devices, list):
-                        if devices:
-                            # Se é uma lista, contar cada dispositivo
-                            for device in devices:
-                                if device and str(device).strip():
-                                    device_str = str(device).strip()
-                                    device_counts[device_str] = device_counts.get(device_str, 0) + 1
-                                else:
-                                    device_counts['Não Especificado'] = device_counts.get('Não Especificado', 0) + 1
-                        else:
-                            device_counts['Nenhum Dispositivo'] = device_counts.get('Nenhum Dispositivo', 0) + 1
-                            households_without_devices += 1
-                    elif devices and str(devices).strip():
-                        # Se é string válida
-                        device_str = str(devices).strip()
-                        device_counts[device_str] = device_counts.get(device_str, 0) + 1
-                    else:
-                        # Se é None ou string vazia
-                        device_counts['Não Informado'] = device_counts.get('Não Informado', 0) + 1
-                        households_without_devices += 1
-                        
-                except (AttributeError, KeyError, TypeError) as e:
-                    device_counts['Erro nos Dados'] = device_counts.get('Erro nos Dados', 0) + 1
-                    households_with_errors += 1
-            
-            if not device_counts:
+            series = self._series('devices')
+            if not series['counts']:
                 self._show_no_data_message(self.devices_chart_frame, "Dados de dispositivos não disponíveis")
                 return
             
-            # Limpar frame anterior
-            for widget in self.devices_chart_frame.winfo_children():
-                widget.destroy()
-            
-            # Ordenar dispositivos por quantidade (decrescente)
-            sorted_devices = dict(sorted(device_counts.items(), key=lambda x: x[1], reverse=True))
-            
             figsize = self._get_dynamic_figsize(self.devices_chart_frame, base=(12, 8))
-            fig, ax = plt.subplots(figsize=figsize)
-            colors = plt.cm.tab20(range(len(sorted_devices)))
-            bars = ax.bar(range(len(sorted_devices)), list(sorted_devices.values()), color=colors, alpha=0.8)
-            
-            # Melhorar aparência
-            ax.set_title('Distribuição de Dispositivos por Domicílio', fontweight='bold', fontsize=14, pad=20)
-            ax.set_xlabel('Tipo de Dispositivo', fontsize=12)
-            ax.set_ylabel('Quantidade de Domicílios', fontsize=12)
-            ax.set_xticks(range(len(sorted_devices)))
-            ax.set_xticklabels(list(sorted_devices.keys()), rotation=45, ha='right')
-            ax.grid(True, alpha=0.3, axis='y')
-            
-            # Adicionar valores nas barras com formatação melhorada
-            for i, bar in enumerate(bars):
-                height = bar.get_height()
-                percentage = (height / len(self.data)) * 100
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                       f'{int(height):,}\n({percentage:.1f}%)', ha='center', va='bottom', fontweight='bold', fontsize=9)
-            
-            # Adicionar informações sobre qualidade dos dados
-            total_records = len(self.data)
-            valid_records = total_records - households_with_errors
-            valid_percentage = (valid_records / total_records) * 100
-            
-            info_text = f'Total de domicílios: {total_records:,}\n'
-            info_text += f'Dados válidos: {valid_records:,} ({valid_percentage:.1f}%)'
-            if households_without_devices > 0:
-                info_text += f'\nSem dispositivos: {households_without_devices:,}'
-            if households_with_errors > 0:
-                info_text += f'\nErros nos dados: {households_with_errors:,}'
-            
-            ax.text(0.02, 0.98, info_text, transform=ax.transAxes, 
-                   verticalalignment='top', bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
-            
-            fig.tight_layout()
-            
-            canvas = FigureCanvasTkAgg(fig, self.devices_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self._render_chart('devices', self.devices_chart_frame, figsize, series)
             
         except Exception as e:
             self.logger.error(f"Erro ao gerar gráfico de dispositivos: {e}")
             self._show_error_message(self.devices_chart_frame, f"Erro ao gerar gráfico: {str(e)}")
-    
+
     def generate_regional_chart(self):
         """Gera gráfico de distribuição regional"""
-        if not self.data:
+        if not self._has_data():
             return
         
-        regional_counts = {}
-        for individual in self.data:
-            if isinstance(individual, dict):
-                region = individual.get('household', {}).get('region_name') or 'Não informado'
-            else:
-                region = individual.household.region.name if individual.household.region else 'Não informado'
-            regional_counts[region] = regional_counts.get(region, 0) + 1
-        
-        if regional_counts:
+        series = self._series('regional')
+        if series and series['counts']:
             figsize = self._get_dynamic_figsize(self.regional_chart_frame, base=(10, 6))
-            fig, ax = plt.subplots(figsize=figsize)
-            bars = ax.bar(range(len(regional_counts)), list(regional_counts.values()), color='#A8E6CF')
-            ax.set_title('Distribuição por Região')
-            ax.set_xlabel('Região')
-            ax.set_ylabel('Quantidade de Pessoas')
-            ax.set_xticks(range(len(regional_counts)))
-            ax.set_xticklabels(list(regional_counts.keys()), rotation=45, ha='right')
-            
-            # Adicionar valores nas barras
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{int(height)}', ha='center', va='bottom')
-            
-            fig.tight_layout()
-            
-            canvas = FigureCanvasTkAgg(fig, self.regional_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
+            self._render_chart('regional', self.regional_chart_frame, figsize, series)
+
     def export_pdf_report(self):
-        """Exporta relatório em PDF com tratamento robusto de erros"""
+        """Exporta relatório em PDF em segundo plano, com gráficos e detalhamento por região"""
         try:
             # Verificar se há dados para exportar
-            if not self.data:
+            if not self._has_data():
                 self.logger.warning("Tentativa de exportar PDF sem dados")
                 messagebox.showwarning("Aviso", "Nenhum dado disponível para exportar.")
                 return
             
+            if self._pdf_job is not None and not self._pdf_job.done():
+                messagebox.showinfo("Aviso", "Já existe uma exportação de PDF em andamento.")
+                return
+            
             # Verificar se as estatísticas foram geradas
             stats_content = self.stats_text.get(1.0, tk.END).strip()
             if not stats_content or stats_content == "Nenhum dado disponível para gerar estatísticas.":
@@ -1486,202 +1301,83 @@ Verifique os logs para mais detalhes."""
                 self.logger.info("Exportação de PDF cancelada pelo usuário")
                 return
             
-            # Criar PDF usando reportlab
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.lib import colors
-            from datetime import datetime
-            import tempfile
-            import os
-            
             try:
-                doc = SimpleDocTemplate(filename, pagesize=A4)
-                styles = getSampleStyleSheet()
-                story = []
-                
-                # Título do relatório
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=18,
-                    spaceAfter=30,
-                    alignment=1  # Center
-                )
-                story.append(Paragraph("RELATÓRIO ESTATÍSTICO - SISTEMA DAC", title_style))
-                story.append(Spacer(1, 12))
-                
-                # Data de geração
-                date_style = ParagraphStyle(
-                    'DateStyle',
-                    parent=styles['Normal'],
-                    fontSize=10,
-                    alignment=1
-                )
-                story.append(Paragraph(f"Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}", date_style))
-                story.append(Spacer(1, 20))
-                
-                # Conteúdo das estatísticas
-                content_style = ParagraphStyle(
-                    'ContentStyle',
-                    parent=styles['Normal'],
-                    fontSize=10,
-                    fontName='Courier'
-                )
-                
-                # Dividir o conteúdo em parágrafos
-                stats_lines = stats_content.split('\n')
-                for line in stats_lines:
-                    if line.strip():
-                        story.append(Paragraph(line.replace(' ', '&nbsp;'), content_style))
-                    else:
-                        story.append(Spacer(1, 6))
-                
-                # Construir o PDF
-                doc.build(story)
-                
-                self.logger.info(f"Relatório PDF exportado com sucesso: {filename}")
-                messagebox.showinfo("Sucesso", f"Relatório exportado com sucesso!\n{filename}")
-                
+                from ..modules.report_pdf import build_report_pdf
             except ImportError as import_error:
                 self.logger.error(f"Biblioteca reportlab não encontrada: {import_error}")
                 messagebox.showerror("Erro", "Biblioteca reportlab não está instalada.\nInstale com: pip install reportlab")
-            except Exception as pdf_error:
-                self.logger.error(f"Erro ao criar PDF: {pdf_error}")
-                messagebox.showerror("Erro", f"Erro ao criar PDF: {pdf_error}")
-                
-        except Exception as e:
-            self.logger.error(f"Erro geral na exportação de PDF: {e}")
-            messagebox.showerror("Erro", f"Erro ao exportar relatório: {e}")
-    
-    def export_excel_report(self):
-        """Exporta relatório em Excel com tratamento robusto de erros"""
-        try:
-            # Verificar se há dados para exportar
-            if not self.data:
-                self.logger.warning("Tentativa de exportar Excel sem dados")
-                messagebox.showwarning("Aviso", "Nenhum dado disponível para exportar.")
                 return
             
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                title="Salvar relatório como"
-            )
-            
-            if not filename:
-                self.logger.info("Exportação de Excel cancelada pelo usuário")
-                return
+            region_count = len(self.aggregates.get('regions', {}))
+            generated_at = datetime.now().strftime('%d/%m/%Y às %H:%M')
+            
+            def build(job: BackgroundJob):
+                charts = [(self.EXPORT_CHARTS[chart_type], png)
+                          for chart_type, png in self._export_chart_images()]
+                job.check_cancelled()
+                return build_report_pdf(
+                    filename, stats_content, charts=charts,
+                    regions=self._iter_region_aggregates(), region_count=region_count,
+                    job=job, generated_at=generated_at
+                )
             
-            try:
-                import pandas as pd
-                
-                # Preparar dados para exportação
-                export_data = []
-                for individual in self.data:
-                    try:
-                        if isinstance(individual, dict):
-                            row = {
-                                'ID': individual.get('id', ''),
-                                'Idade': individual.get('age', ''),
-                                'Gênero': individual.get('gender', ''),
-                                'Tem Deficiência': 'Sim' if individual.get('has_disability', False) else 'Não',
-                                'Faixa de Renda': individual.get('household', {}).get('income_range', ''),
-                                'Tem Internet': 'Sim' if individual.get('household', {}).get('has_internet', False) else 'Não',
-                                'Região': individual.get('household', {}).get('region_name', '')
-                            }
-                        else:
-                            row = {
-                                'ID': getattr(individual, 'id', ''),
-                                'Idade': getattr(individual, 'age', ''),
-                                'Gênero': getattr(individual, 'gender', ''),
-                                'Tem Deficiência': 'Sim' if getattr(individual, 'has_disability', False) else 'Não',
-                                'Faixa de Renda': getattr(individual.household, 'income_range', '') if hasattr(individual, 'household') and individual.household else '',
-                                'Tem Internet': 'Sim' if (hasattr(individual, 'household') and individual.household and getattr(individual.household, 'has_internet', False)) else 'Não',
-                                'Região': getattr(individual.household.region, 'name', '') if (hasattr(individual, 'household') and individual.household and hasattr(individual.household, 'region') and individual.household.region) else ''
-                            }
-                        export_data.append(row)
-                    except Exception as row_error:
-                        self.logger.error(f"Erro ao processar linha para exportação: {row_error}")
-                        continue
-                
-                # Criar DataFrame e exportar
-                df = pd.DataFrame(export_data)
-                
-                with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                    # Aba com dados brutos
-                    df.to_excel(writer, sheet_name='Dados', index=False)
-                    
-                    # Aba com estatísticas resumidas
-                    stats_data = []
-                    
-                    # Estatísticas por gênero
-                    gender_counts = df['Gênero'].value_counts()
-                    for gender, count in gender_counts.items():
-                        percentage = (count / len(df)) * 100
-                        stats_data.append(['Gênero', gender, count, f'{percentage:.1f}%'])
-                    
-                    # Estatísticas por faixa etária
-                    age_ranges = {'0-17': 0, '18-29': 0, '30-49': 0, '50-64': 0, '65+': 0}
-                    for age in df['Idade'].dropna():
-                        try:
-                            age = int(age)
-                            if age < 18:
-                                age_ranges['0-17'] += 1
-                            elif age < 30:
-                                age_ranges['18-29'] += 1
-                            elif age < 50:
-                                age_ranges['30-49'] += 1
-                            elif age < 65:
-                                age_ranges['50-64'] += 1
-                            else:
-                                age_ranges['65+'] += 1
-                        except:
-                            continue
-                    
-                    for age_range, count in age_ranges.items():
-                        percentage = (count / len(df)) * 100 if len(df) > 0 else 0
-                        stats_data.append(['Faixa Etária', age_range, count, f'{percentage:.1f}%'])
-                    
-                    # Outras estatísticas
-                    internet_counts = df['Tem Internet'].value_counts()
-                    for status, count in internet_counts.items():
-                        percentage = (count / len(df)) * 100
-                        stats_data.append(['Internet', status, count, f'{percentage:.1f}%'])
-                    
-                    disability_counts = df['Tem Deficiência'].value_counts()
-                    for status, count in disability_counts.items():
-                        percentage = (count / len(df)) * 100
-                        stats_data.append(['Deficiência', status, count, f'{percentage:.1f}%'])
-                    
-                    stats_df = pd.DataFrame(stats_data, columns=['Categoria', 'Valor', 'Quantidade', 'Percentual'])
-                    stats_df.to_excel(writer, sheet_name='Estatísticas', index=False)
-                
-                self.logger.info(f"Relatório Excel exportado com sucesso: {filename}")
-                messagebox.showinfo("Sucesso", f"Relatório exportado com sucesso!\n{filename}")
-                
-            except ImportError as import_error:
-                self.logger.error(f"Bibliotecas pandas/openpyxl não encontradas: {import_error}")
-                messagebox.showerror("Erro", "Bibliotecas necessárias não estão instaladas.\nInstale com: pip install pandas openpyxl")
-            except Exception as excel_error:
-                self.logger.error(f"Erro ao criar Excel: {excel_error}")
-                messagebox.showerror("Erro", f"Erro ao criar Excel: {excel_error}")
+            self._pdf_job = BackgroundJob(build, name="exportar-pdf").start()
+            dialog = ProgressDialog(self.window, "Exportando PDF...", on_cancel=self._pdf_job.cancel)
+            self._poll_job(self._pdf_job, dialog, lambda job: self._finish_pdf_job(job, filename))
                 
         except Exception as e:
-            self.logger.error(f"Erro geral na exportação de Excel: {e}")
+            self.logger.error(f"Erro geral na exportação de PDF: {e}")
             messagebox.showerror("Erro", f"Erro ao exportar relatório: {e}")
     
+    def _iter_export_rows(self):
+        """Linhas de exportação (dados filtrados ou cursor do banco em lotes)"""
+        if self.data:
+            return self._as_dataset(self.data).iter_export_rows()
+        return QueryEngine(self.db_manager).iter_export_rows({})
+    
+    def _iter_region_aggregates(self):
+        """Agregações por região, uma por vez (dados filtrados ou banco)"""
+        if self.data:
+            return self._as_dataset(self.data).iter_region_aggregates()
+        return ReportAggregator(self.db_manager).iter_region_aggregates()
+    
+    def _poll_job(self, job: BackgroundJob, dialog: ProgressDialog, on_finished):
+        """Atualiza o diálogo de progresso até a exportação terminar e chama `on_finished(job)`"""
+        if not job.done():
+            _, _, message = job.progress
+            try:
+                dialog.progress_var.set(job.percent)
+                if message:
+                    dialog.status_var.set(message)
+            except tk.TclError:
+                # Diálogo fechado (cancelamento já solicitado)
+                pass
+            self.window.after(100, lambda: self._poll_job(job, dialog, on_finished))
+            return
+        
+        try:
+            dialog.close()
+        except tk.TclError:
+            pass
+        on_finished(job)
+    
+    def _finish_pdf_job(self, job: BackgroundJob, filename: str):
+        """Resultado da exportação de PDF"""
+        if job.status == BackgroundJob.DONE:
+            self.logger.info(f"Relatório PDF exportado com sucesso: {filename} ({job.result} páginas)")
+            messagebox.showinfo("Sucesso", f"Relatório exportado com sucesso!\n{filename}\n\nPáginas: {job.result}")
+        elif job.status == BackgroundJob.CANCELLED:
+            self.logger.info("Exportação de PDF cancelada durante a geração")
+        else:
+            self.logger.error(f"Erro ao criar PDF: {job.error}")
+            messagebox.showerror("Erro", f"Erro ao criar PDF: {job.error}")
+    
     def generate_overview_chart(self):
         """Gera gráfico de visão geral com formatação melhorada"""
         try:
-            if not self.data:
+            if not self._has_data():
                 return
             
-            # Limpar frame anterior
-            for widget in self.overview_chart_frame.winfo_children():
-                widget.destroy()
-            
             # Atualizar cards de métricas
             self.update_metric_cards()
             
@@ -1690,205 +1386,38 @@ Verifique os logs para mais detalhes."""
             w, h = self._get_dynamic_figsize(self.overview_chart_frame, base=base_size)
             # Para grid 2x2, garantir altura suficiente
             h = max(h, w * 0.75)
-            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(w, h))
-            
-            # Gráfico 1: Distribuição por gênero com formatação melhorada
-            gender_counts = {}
-            for individual in self.data:
-                gender = self._format_gender_value(individual)
-                gender_counts[gender] = gender_counts.get(gender, 0) + 1
-            
-            if gender_counts:
-                # Garantir que color_palette seja uma lista válida
-                color_palette = self.chart_config.get('color_palette', ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#592E83'])
-                if not isinstance(color_palette, list):
-                    color_palette = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#592E83']
-                
-                # Usar apenas as cores necessárias
-                colors_needed = min(len(gender_counts), len(color_palette))
-                chart_colors = color_palette[:colors_needed] if colors_needed > 0 else ['#2E86AB']
-                
-                # Formatação melhorada do gráfico de pizza
-                wedges, texts, autotexts = ax1.pie(gender_counts.values(), labels=gender_counts.keys(), 
-                                                  autopct='%1.1f%%', colors=chart_colors,
-                                                  startangle=90, textprops={'fontsize': 9})
-                ax1.set_title('Distribuição por Gênero', fontweight='bold', pad=20)
-            
-            # Gráfico 2: Acesso à Internet com formatação melhorada
-            internet_counts = {'Com Internet': 0, 'Sem Internet': 0, 'Não Informado': 0}
-            for individual in self.data:
-                internet_status = self._format_internet_access(individual)
-                internet_counts[internet_status] += 1
-            
-            # Remover categoria "Não Informado" se for zero
-            if internet_counts['Não Informado'] == 0:
-                del internet_counts['Não Informado']
-            
-            bars = ax2.bar(internet_counts.keys(), internet_counts.values(), 
-                          color=['#4ECDC4', '#FF6B6B', '#FFA500'][:len(internet_counts)])
-            ax2.set_title('Acesso à Internet', fontweight='bold', pad=20)
-            ax2.set_ylabel('Quantidade de Pessoas')
-            
-            # Adicionar valores nas barras
-            for bar in bars:
-                height = bar.get_height()
-                ax2.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                        f'{int(height)}', ha='center', va='bottom', fontsize=9)
-            
-            # Gráfico 3: Faixas etárias com formatação melhorada
-            ages = []
-            for individual in self.data:
-                age = self._get_valid_age(individual)
-                if age is not None:
-                    ages.append(age)
-            
-            if ages:
-                n, bins, patches = ax3.hist(ages, bins=10, color='#45B7D1', alpha=0.7, 
-                                          edgecolor='black', linewidth=0.5)
-                ax3.set_title('Distribuição de Idades', fontweight='bold', pad=20)
-                ax3.set_xlabel('Idade (anos)')
-                ax3.set_ylabel('Quantidade de Pessoas')
-                ax3.grid(True, alpha=0.3)
-                ax3.set_ylabel('Frequência')
-            
-            # Gráfico 4: Pessoas com deficiência
-            disability_counts = {'Com Deficiência': 0, 'Sem Deficiência': 0}
-            for individual in self.data:
-                has_disability = individual.get('has_disability', False) if isinstance(individual, dict) else getattr(individual, 'has_disability', False)
-                disability_counts['Com Deficiência' if has_disability else 'Sem Deficiência'] += 1
-            
-            ax4.bar(disability_counts.keys(), disability_counts.values(), color=['#FFA07A', '#98FB98'])
-            ax4.set_title('Pessoas com Deficiência')
-            ax4.set_ylabel('Quantidade')
-            plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
-            
-            plt.tight_layout()
-            
-            # Adicionar ao frame
-            fig.tight_layout()
-            canvas = FigureCanvasTkAgg(fig, self.overview_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            series = self._series('overview')
+            self._render_chart('overview', self.overview_chart_frame, (w, h), series)
             
             # Gerar insights automáticos
             self.generate_insights()
             
         except Exception as e:
             self.logger.error(f"Erro ao gerar gráfico de visão geral: {e}")
-    
-    def _format_gender_value(self, individual):
-        """Formata o valor de gênero com tratamento de dados incompletos"""
-        if isinstance(individual, dict):
-            gender = individual.get('gender', '')
-        else:
-            gender = getattr(individual, 'gender', '')
-        
-        # Normalizar valores de gênero
-        if not gender or str(gender).strip().lower() in ['', 'null', 'none', 'nan']:
-            return 'Não Informado'
-        
-        gender_str = str(gender).strip().lower()
-        if gender_str in ['m', 'masculino', 'male', 'homem']:
-            return 'Masculino'
-        elif gender_str in ['f', 'feminino', 'female', 'mulher']:
-            return 'Feminino'
-        else:
-            return gender.title() if gender else 'Não Informado'
-    
-    def _format_internet_access(self, individual):
-        """Formata o status de acesso à internet"""
-        if isinstance(individual, dict):
-            has_internet = individual.get('household', {}).get('has_internet')
-        else:
-            has_internet = (getattr(individual.household, 'has_internet', None) 
-                          if hasattr(individual, 'household') and individual.household 
-                          else None)
-        
-        if has_internet is None or str(has_internet).lower() in ['null', 'none', 'nan', '']:
-            return 'Não Informado'
-        
-        return 'Com Internet' if has_internet else 'Sem Internet'
-    
-    def _get_valid_age(self, individual):
-        """Obtém idade válida com validação"""
-        if isinstance(individual, dict):
-            age = individual.get('age')
-        else:
-            age = getattr(individual, 'age', None)
-        
-        if age is None or str(age).lower() in ['null', 'none', 'nan', '']:
-            return None
-        
-        try:
-            age_int = int(float(age))
-            # Validar faixa etária razoável
-            if 0 <= age_int <= 120:
-                return age_int
-        except (ValueError, TypeError):
-            pass
-        
-        return None
-    
-    def _format_disability_status(self, individual):
-        """Formata o status de deficiência"""
-        if isinstance(individual, dict):
-            has_disability = individual.get('has_disability')
-        else:
-            has_disability = getattr(individual, 'has_disability', None)
-        
-        if has_disability is None or str(has_disability).lower() in ['null', 'none', 'nan', '']:
-            return 'Não Informado'
-        
-        return 'Sim' if has_disability else 'Não'
-    
+
     def update_metric_cards(self):
         """Atualiza os cards de métricas principais com formatação melhorada"""
         try:
-            if not self.data:
+            if not self._has_data():
                 return
             
-            total = len(self.data)
+            aggregates = self.aggregates
             
             # Total de registros com formatação
-            self.total_value.config(text=f"{total:,}")
-            
-            # Percentual com internet com tratamento de dados incompletos
-            internet_count = 0
-            valid_internet_data = 0
+            self.total_value.config(text=f"{aggregates['total']:,}")
             
-            for individual in self.data:
-                internet_status = self._format_internet_access(individual)
-                if internet_status != 'Não Informado':
-                    valid_internet_data += 1
-                    if internet_status == 'Com Internet':
-                        internet_count += 1
-            
-            internet_percentage = (internet_count / valid_internet_data * 100) if valid_internet_data > 0 else 0
+            # Percentuais calculados apenas sobre registros informados
+            internet = aggregates['internet']
+            valid_internet_data = internet['Com Internet'] + internet['Sem Internet']
+            internet_percentage = (internet['Com Internet'] / valid_internet_data * 100) if valid_internet_data > 0 else 0
             self.internet_value.config(text=f"{internet_percentage:.1f}%")
             
-            # Percentual com deficiência com tratamento melhorado
-            disability_count = 0
-            valid_disability_data = 0
-            
-            for individual in self.data:
-                disability_status = self._format_disability_status(individual)
-                if disability_status != 'Não Informado':
-                    valid_disability_data += 1
-                    if disability_status == 'Sim':
-                        disability_count += 1
-            
-            disability_percentage = (disability_count / valid_disability_data * 100) if valid_disability_data > 0 else 0
+            disability = aggregates['disability']
+            valid_disability_data = disability['Sim'] + disability['Não']
+            disability_percentage = (disability['Sim'] / valid_disability_data * 100) if valid_disability_data > 0 else 0
             self.disability_value.config(text=f"{disability_percentage:.1f}%")
             
-            # Idade média com validação melhorada
-            ages = []
-            for individual in self.data:
-                age = self._get_valid_age(individual)
-                if age is not None:
-                    ages.append(age)
-            
-            avg_age = sum(ages) / len(ages) if ages else 0
-            self.age_value.config(text=f"{avg_age:.1f} anos")
+            self.age_value.config(text=f"{aggregates['age']['average']:.1f} anos")
             
         except Exception as e:
             self.logger.error(f"Erro ao atualizar cards de métricas: {e}")
@@ -1896,28 +1425,24 @@ Verifique os logs para mais detalhes."""
     def generate_insights(self):
         """Gera insights automáticos baseados nos dados"""
         try:
-            if not self.data:
+            if not self._has_data():
                 self.insights_text.delete(1.0, tk.END)
                 self.insights_text.insert(1.0, "Nenhum dado disponível para gerar insights.")
                 return
             
             insights = []
-            total = len(self.data)
+            aggregates = self.aggregates
+            total = aggregates['total']
             
             # Análise de gênero
-            gender_counts = {}
-            for individual in self.data:
-                gender = individual.get('gender', 'Não informado') if isinstance(individual, dict) else getattr(individual, 'gender', 'Não informado')
-                gender_counts[gender] = gender_counts.get(gender, 0) + 1
-            
+            gender_counts = aggregates['gender']
             if gender_counts:
                 dominant_gender = max(gender_counts, key=gender_counts.get)
                 percentage = (gender_counts[dominant_gender] / total) * 100
                 insights.append(f"• O gênero predominante é {dominant_gender} ({percentage:.1f}% dos registros).")
             
             # Análise de internet
-            internet_count = sum(1 for ind in self.data if (ind.get('household', {}).get('has_internet', False) if isinstance(ind, dict) else getattr(ind.household, 'has_internet', False) if hasattr(ind, 'household') and ind.household else False))
-            internet_percentage = (internet_count / total) * 100 if total > 0 else 0
+            internet_percentage = (aggregates['internet']['Com Internet'] / total) * 100 if total > 0 else 0
             
             if internet_percentage > 70:
                 insights.append(f"• Boa conectividade: {internet_percentage:.1f}% da população tem acesso à internet.")
@@ -1927,15 +1452,11 @@ Verifique os logs para mais detalhes."""
                 insights.append(f"• Conectividade moderada: {internet_percentage:.1f}% da população tem acesso à internet.")
             
             # Análise de idade
-            ages = [ind.get('age') if isinstance(ind, dict) else getattr(ind, 'age', None) for ind in self.data]
-            valid_ages = [age for age in ages if age is not None and isinstance(age, (int, float))]
-            
-            if valid_ages:
-                avg_age = sum(valid_ages) / len(valid_ages)
-                young_count = sum(1 for age in valid_ages if age < 30)
-                young_percentage = (young_count / len(valid_ages)) * 100
+            age = aggregates['age']
+            if age['valid']:
+                young_percentage = (age['under_30'] / age['valid']) * 100
                 
-                insights.append(f"• A idade média da população é {avg_age:.1f} anos.")
+                insights.append(f"• A idade média da população é {age['average']:.1f} anos.")
                 
                 if young_percentage > 50:
                     insights.append(f"• População jovem: {young_percentage:.1f}% tem menos de 30 anos.")
@@ -1943,8 +1464,7 @@ Verifique os logs para mais detalhes."""
                     insights.append(f"• População envelhecida: apenas {young_percentage:.1f}% tem menos de 30 anos.")
             
             # Análise de deficiência
-            disability_count = sum(1 for ind in self.data if (ind.get('has_disability', False) if isinstance(ind, dict) else getattr(ind, 'has_disability', False)))
-            disability_percentage = (disability_count / total) * 100 if total > 0 else 0
+            disability_percentage = (aggregates['disability']['Sim'] / total) * 100 if total > 0 else 0
             
             if disability_percentage > 15:
                 insights.append(f"• Alta incidência de deficiência: {disability_percentage:.1f}% da população.")
@@ -1952,11 +1472,7 @@ Verifique os logs para mais detalhes."""
                 insights.append(f"• {disability_percentage:.1f}% da população possui alguma deficiência.")
             
             # Análise regional (se disponível)
-            regional_counts = {}
-            for individual in self.data:
-                region = individual.get('household', {}).get('region_name', 'Não informado') if isinstance(individual, dict) else getattr(individual.household.region, 'name', 'Não informado') if hasattr(individual, 'household') and individual.household and hasattr(individual.household, 'region') and individual.household.region else 'Não informado'
-                regional_counts[region] = regional_counts.get(region, 0) + 1
-            
+            regional_counts = aggregates['regions']
             if len(regional_counts) > 1 and 'Não informado' not in regional_counts:
                 dominant_region = max(regional_counts, key=regional_counts.get)
                 percentage = (regional_counts[dominant_region] / total) * 100
@@ -1972,119 +1488,34 @@ Verifique os logs para mais detalhes."""
             self.insights_text.delete(1.0, tk.END)
             self.insights_text.insert(1.0, f"Erro ao gerar insights: {e}")
     
+
     def generate_correlation_analysis(self):
         """Gera análise de correlação avançada"""
         try:
-            if not self.data:
+            if not self._has_data():
                 return
             
-            # Limpar frames anteriores
-            for widget in self.correlation_chart_frame.winfo_children():
-                widget.destroy()
-            for widget in self.trends_chart_frame.winfo_children():
-                widget.destroy()
-            
-            # Preparar dados para análise
-            analysis_data = []
-            for individual in self.data:
-                try:
-                    if isinstance(individual, dict):
-                        row = {
-                            'age': individual.get('age', 0) if individual.get('age') is not None else 0,
-                            'has_disability': 1 if individual.get('has_disability', False) else 0,
-                            'has_internet': 1 if individual.get('household', {}).get('has_internet', False) else 0,
-                            'gender_numeric': 1 if individual.get('gender') == 'Masculino' else 0
-                        }
-                    else:
-                        row = {
-                            'age': getattr(individual, 'age', 0) if getattr(individual, 'age', None) is not None else 0,
-                            'has_disability': 1 if getattr(individual, 'has_disability', False) else 0,
-                            'has_internet': 1 if (hasattr(individual, 'household') and individual.household and getattr(individual.household, 'has_internet', False)) else 0,
-                            'gender_numeric': 1 if getattr(individual, 'gender', None) == 'Masculino' else 0
-                        }
-                    analysis_data.append(row)
-                except Exception as row_error:
-                    self.logger.error(f"Erro ao processar linha para análise: {row_error}")
-                    continue
-            
-            if not analysis_data:
+            series = self._series('correlation')
+            if not series:
                 return
             
-            # Gráfico de correlação
-            fig1, ax1 = plt.subplots(figsize=(6, 5))
-            
-            # Análise simples de correlação idade vs internet
-            ages = [row['age'] for row in analysis_data if row['age'] > 0]
-            internet_by_age = [row['has_internet'] for row in analysis_data if row['age'] > 0]
-            
-            if ages and internet_by_age:
-                ax1.scatter(ages, internet_by_age, alpha=0.6, color='#4ECDC4')
-                ax1.set_xlabel('Idade')
-                ax1.set_ylabel('Tem Internet (0=Não, 1=Sim)')
-                ax1.set_title('Relação entre Idade e Acesso à Internet')
-                ax1.grid(True, alpha=0.3)
-            
-            canvas1 = FigureCanvasTkAgg(fig1, self.correlation_chart_frame)
-            canvas1.draw()
-            canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            # Gráfico de tendências
-            fig2, ax2 = plt.subplots(figsize=(6, 5))
-            
-            # Análise de faixas etárias vs acesso digital
-            age_ranges = {'0-17': [], '18-29': [], '30-49': [], '50-64': [], '65+': []}
-            
-            for row in analysis_data:
-                age = row['age']
-                internet = row['has_internet']
-                
-                if age < 18:
-                    age_ranges['0-17'].append(internet)
-                elif age < 30:
-                    age_ranges['18-29'].append(internet)
-                elif age < 50:
-                    age_ranges['30-49'].append(internet)
-                elif age < 65:
-                    age_ranges['50-64'].append(internet)
-                else:
-                    age_ranges['65+'].append(internet)
-            
-            # Calcular percentuais de acesso à internet por faixa etária
-            internet_percentages = []
-            labels = []
-            
-            for age_range, internet_list in age_ranges.items():
-                if internet_list:
-                    percentage = (sum(internet_list) / len(internet_list)) * 100
-                    internet_percentages.append(percentage)
-                    labels.append(age_range)
-            
-            if internet_percentages:
-                bars = ax2.bar(labels, internet_percentages, color='#45B7D1')
-                ax2.set_xlabel('Faixa Etária')
-                ax2.set_ylabel('% com Acesso à Internet')
-                ax2.set_title('Acesso à Internet por Faixa Etária')
-                ax2.set_ylim(0, 100)
-                
-                # Adicionar valores nas barras
-                for bar, percentage in zip(bars, internet_percentages):
-                    ax2.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 1,
-                           f'{percentage:.1f}%', ha='center', va='bottom')
-            
-            canvas2 = FigureCanvasTkAgg(fig2, self.trends_chart_frame)
-            canvas2.draw()
-            canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self._render_chart('correlation', self.correlation_chart_frame, (6, 5), series)
+            self._render_chart('trends', self.trends_chart_frame, (6, 5), series)
             
         except Exception as e:
             self.logger.error(f"Erro ao gerar análise de correlação: {e}")
-    
+
     def export_excel_report(self):
-        """Exporta dados em Excel com tratamento robusto de erros"""
-        if not self.data:
+        """Exporta dados em Excel em segundo plano, com progresso e cancelamento"""
+        if not self._has_data():
             self.logger.warning("Tentativa de exportar Excel sem dados")
             messagebox.showwarning("Aviso", "Nenhum dado disponível para exportar.")
             return
         
+        if self._excel_job is not None and not self._excel_job.done():
+            messagebox.showinfo("Aviso", "Já existe uma exportação de Excel em andamento.")
+            return
+        
         try:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
@@ -2097,7 +1528,6 @@ Verifique os logs para mais detalhes."""
                 return
             
             # Verificar se o diretório de destino existe e é gravável
-            import os
             dest_dir = os.path.dirname(filename)
             if not os.path.exists(dest_dir):
                 self.logger.error(f"Diretório de destino não existe: {dest_dir}")
@@ -2109,121 +1539,51 @@ Verifique os logs para mais detalhes."""
                 messagebox.showerror("Erro", f"Sem permissão de escrita no diretório: {dest_dir}")
                 return
             
-            # Preparar dados para exportação
-            export_data = []
-            errors_count = 0
-            
-            for individual in self.data:
-                try:
-                    # Processar dados do indivíduo
-                    if isinstance(individual, dict):
-                        # Dados já processados (dicionário)
-                        individual_id = individual.get('id', 'N/A')
-                        age = individual.get('age', 'N/A')
-                        gender = individual.get('gender', 'N/A')
-                        has_disability = individual.get('has_disability', False)
-                        
-                        household_data = individual.get('household', {})
-                        region_name = household_data.get('region_name', 'N/A')
-                        income_range = household_data.get('income_range', 'N/A')
-                        has_internet = household_data.get('has_internet', False)
-                        devices = household_data.get('devices', 'Nenhum')
-                        
-                    else:
-                        # Objeto SQLAlchemy
-                        individual_id = getattr(individual, 'id', 'N/A')
-                        age = getattr(individual, 'age', 'N/A')
-                        gender = getattr(individual, 'gender', 'N/A')
-                        has_disability = getattr(individual, 'has_disability', False)
-                        
-                        # Dados do domicílio
-                        household = getattr(individual, 'household', None)
-                        if household:
-                            region = getattr(household, 'region', None)
-                            region_name = getattr(region, 'name', 'N/A') if region else 'N/A'
-                            income_range = getattr(household, 'income_range', 'N/A')
-                            has_internet = getattr(household, 'has_internet', False)
-                            
-                            # Dispositivos do indivíduo
-                            device_usage = getattr(individual, 'device_usage', [])
-                            if device_usage:
-                                try:
-                                    device_list = [getattr(d, 'device_type', 'Desconhecido') for d in device_usage]
-                                    devices = ', '.join(device_list) if device_list else 'Nenhum'
-                                except Exception:
-                                    devices = 'Erro ao processar'
-                            else:
-                                devices = 'Nenhum'
-                        else:
-                            region_name = 'N/A'
-                            income_range = 'N/A'
-                            has_internet = False
-                            devices = 'Nenhum'
-                    
-                    # Validar e formatar dados
-                    export_row = {
-                        'ID': str(individual_id) if individual_id is not None else 'N/A',
-                        'Região': str(region_name) if region_name else 'N/A',
-                        'Idade': str(age) if age is not None else 'N/A',
-                        'Gênero': str(gender) if gender else 'N/A',
-                        'Renda': str(income_range) if income_range else 'N/A',
-                        'Deficiência': 'Sim' if has_disability else 'Não',
-                        'Internet': 'Sim' if has_internet else 'Não',
-                        'Dispositivos': str(devices) if devices else 'Nenhum'
-                    }
-                    
-                    export_data.append(export_row)
-                    
-                except Exception as process_error:
-                    self.logger.error(f"Erro ao processar registro para Excel: {process_error}")
-                    errors_count += 1
-                    # Adicionar registro com erro
-                    export_data.append({
-                        'ID': 'ERRO',
-                        'Região': 'Erro no processamento',
-                        'Idade': 'N/A',
-                        'Gênero': 'N/A',
-                        'Renda': 'N/A',
-                        'Deficiência': 'N/A',
-                        'Internet': 'N/A',
-                        'Dispositivos': 'N/A'
-                    })
-            
-            if not export_data:
-                self.logger.error("Nenhum dado válido para exportar")
-                messagebox.showerror("Erro", "Nenhum dado válido encontrado para exportar.")
+            from ..modules.streaming_export import write_xlsx, xlsx_available
+            if not xlsx_available():
+                self.logger.error("Biblioteca openpyxl não encontrada")
+                messagebox.showerror("Erro", "Bibliotecas necessárias para Excel não estão disponíveis.\nInstale: pip install openpyxl")
                 return
             
-            try:
-                # Criar DataFrame e salvar
-                import pandas as pd
-                df = pd.DataFrame(export_data)
+            total = int(self.aggregates.get('total') or 0)
+            
+            def export(job: BackgroundJob) -> int:
+                def progress(written: int):
+                    job.check_cancelled()
+                    job.report(written, total, f"{written:,} de {total:,} registros")
                 
-                # Salvar com tratamento de erros
-                df.to_excel(filename, index=False, sheet_name='Dados DAC', engine='openpyxl')
+                def before_save(workbook):
+                    job.check_cancelled()
+                    job.report(total, total, "Adicionando gráficos...")
+                    self._add_chart_sheet(workbook)
+                    job.check_cancelled()
                 
-                # Verificar se o arquivo foi criado com sucesso
-                if os.path.exists(filename) and os.path.getsize(filename) > 0:
-                    success_msg = f"Dados exportados com sucesso para:\n{filename}\n\nRegistros exportados: {len(export_data)}"
-                    if errors_count > 0:
-                        success_msg += f"\nRegistros com problemas: {errors_count}"
-                    
-                    self.logger.info(f"Excel exportado com sucesso: {len(export_data)} registros, {errors_count} erros")
-                    messagebox.showinfo("Sucesso", success_msg)
-                else:
-                    self.logger.error("Arquivo Excel não foi criado corretamente")
-                    messagebox.showerror("Erro", "Arquivo Excel não foi criado corretamente.")
-                    
-            except ImportError as import_error:
-                self.logger.error(f"Erro de importação para Excel: {import_error}")
-                messagebox.showerror("Erro", "Bibliotecas necessárias para Excel não estão disponíveis.\nInstale: pip install openpyxl")
-            except PermissionError as perm_error:
-                self.logger.error(f"Erro de permissão ao salvar Excel: {perm_error}")
-                messagebox.showerror("Erro", f"Sem permissão para salvar o arquivo:\n{filename}\n\nVerifique se o arquivo não está aberto em outro programa.")
-            except Exception as excel_error:
-                self.logger.error(f"Erro específico ao gerar Excel: {excel_error}")
-                messagebox.showerror("Erro", f"Erro ao gerar Excel: {excel_error}")
+                # Linhas gravadas em fluxo (abas divididas no limite do Excel)
+                return write_xlsx(filename, EXPORT_COLUMNS, self._iter_export_rows(), sheet_name='Dados DAC',
+                                  progress=progress, before_save=before_save)
+            
+            self._excel_job = BackgroundJob(export, name="exportar-excel").start()
+            dialog = ProgressDialog(self.window, "Exportando Excel...", on_cancel=self._excel_job.cancel)
+            self._poll_job(self._excel_job, dialog, lambda job: self._finish_excel_job(job, filename))
                 
         except Exception as e:
             self.logger.error(f"Erro geral ao exportar Excel: {e}")
-            messagebox.showerror("Erro", f"Erro ao exportar Excel: {e}")
\ No newline at end of file
+            messagebox.showerror("Erro", f"Erro ao exportar Excel: {e}")
+    
+    def _finish_excel_job(self, job: BackgroundJob, filename: str):
+        """Resultado da exportação de Excel"""
+        if job.status == BackgroundJob.CANCELLED:
+            self.logger.info("Exportação de Excel cancelada durante a geração")
+        elif job.status == BackgroundJob.FAILED:
+            if isinstance(job.error, PermissionError):
+                self.logger.error(f"Erro de permissão ao salvar Excel: {job.error}")
+                messagebox.showerror("Erro", f"Sem permissão para salvar o arquivo:\n{filename}\n\nVerifique se o arquivo não está aberto em outro programa.")
+            else:
+                self.logger.error(f"Erro específico ao gerar Excel: {job.error}")
+                messagebox.showerror("Erro", f"Erro ao gerar Excel: {job.error}")
+        elif job.result == 0:
+            self.logger.error("Nenhum dado válido para exportar")
+            messagebox.showerror("Erro", "Nenhum dado válido encontrado para exportar.")
+        else:
+            self.logger.info(f"Excel exportado com sucesso: {job.result} registros")
+            messagebox.showinfo("Sucesso", f"Dados exportados com sucesso para:\n{filename}\n\nRegistros exportados: {job.result}")
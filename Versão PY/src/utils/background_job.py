@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Tarefas em segundo plano com progresso e cancelamento
+
+A tarefa executa em uma thread própria e publica o progresso de forma
+thread-safe; a interface consulta o estado periodicamente (ex.: com
+`after` do Tkinter) em vez de ser chamada pela thread de trabalho.
+"""
+
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+try:
+    from .logger import get_logger
+except ImportError:
+    import logging
+
+    def get_logger(name):
+        return logging.getLogger(name)
+
+
+class JobCancelled(Exception):
+    """Levantada dentro da tarefa quando o cancelamento foi solicitado"""
+
+
+class BackgroundJob:
+    """Executa `target(job)` em uma thread, com progresso e cancelamento cooperativo"""
+
+    PENDING, RUNNING, DONE, FAILED, CANCELLED = 'pending', 'running', 'done', 'failed', 'cancelled'
+
+    def __init__(self, target: Callable[['BackgroundJob'], Any], name: str = "tarefa"):
+        self.target = target
+        self.name = name
+        self.logger = get_logger(__name__)
+        self.status = self.PENDING
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._progress: Tuple[int, int, str] = (0, 0, "")
+        self._cancel_event = threading.Event()
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'BackgroundJob':
+        """Inicia a tarefa em uma thread daemon"""
+        self.status = self.RUNNING
+        self._thread = threading.Thread(target=self._run, name=f"job-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self.target(self)
+            self.status = self.DONE
+        except JobCancelled:
+            self.status = self.CANCELLED
+            self.logger.info(f"Tarefa '{self.name}' cancelada")
+        except Exception as e:
+            self.error = e
+            self.status = self.FAILED
+            self.logger.error(f"Erro na tarefa '{self.name}': {e}")
+        finally:
+            self._finished.set()
+
+    def cancel(self) -> None:
+        """Solicita o cancelamento (atendido no próximo `check_cancelled`)"""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        """Chamado pela tarefa em pontos seguros; levanta JobCancelled se cancelada"""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def report(self, done: int, total: int, message: str = "") -> None:
+        """Publica o progresso (chamado pela tarefa)"""
+        with self._lock:
+            self._progress = (done, total, message)
+
+    @property
+    def progress(self) -> Tuple[int, int, str]:
+        """(concluído, total, mensagem)"""
+        with self._lock:
+            return self._progress
+
+    @property
+    def percent(self) -> float:
+        done, total, _ = self.progress
+        return min(100.0, done * 100.0 / total) if total else 0.0
+
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda o término; retorna True se a tarefa terminou"""
+        return self._finished.wait(timeout)
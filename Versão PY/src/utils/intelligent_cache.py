@@ -95,9 +95,22 @@ class IntelligentCache:
             'total_requests': total_requests
         }
 
-# Cache global
+# Cache global (por processo; pode ser trocado por um backend compartilhado)
 _global_cache = IntelligentCache()
 
+def set_global_cache(cache) -> None:
+    """Define o backend do cache global (ex.: SharedCache para múltiplos workers)
+
+    O backend precisa oferecer get/set/clear/get_stats com a mesma assinatura
+    de IntelligentCache.
+    """
+    global _global_cache
+    _global_cache = cache
+
+def get_global_cache():
+    """Retorna o backend atual do cache global"""
+    return _global_cache
+
 def cached(ttl: int = 3600, key_func: Optional[Callable] = None):
     """Decorator para cache automático"""
     def decorator(func):
@@ -107,7 +120,7 @@ def cached(ttl: int = 3600, key_func: Optional[Callable] = None):
             if key_func:
                 cache_key = key_func(*args, **kwargs)
             else:
-                key_data = f"{func.__name__}:{str(args)}:{str(sorted(kwargs.items()))}"
+                key_data = f"{func.__module__}.{func.__qualname__}:{str(args)}:{str(sorted(kwargs.items()))}"
                 cache_key = hashlib.md5(key_data.encode()).hexdigest()
             
             # Tentar recuperar do cache
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Cache compartilhado entre processos para o DAC
+
+Armazena os valores em um arquivo SQLite local (modo WAL), de forma que
+vários workers do uvicorn no mesmo host enxerguem o mesmo conteúdo. A
+publicação de cada entrada é atômica (um único INSERT OR REPLACE) e
+`get_or_set` garante que apenas um processo calcule um valor ausente
+enquanto os demais aguardam o resultado publicado.
+"""
+
+import os
+import time
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+class SharedCache:
+    """Cache com TTL persistido em SQLite e compartilhado entre processos"""
+
+    # Intervalo (em escritas) entre limpezas de entradas expiradas
+    _PURGE_EVERY = 200
+
+    def __init__(self, path: Optional[str] = None, default_ttl: int = 3600,
+                 max_entries: int = 5000, busy_timeout: float = 10.0):
+        if path is None:
+            path = Path(__file__).parent.parent.parent / "data" / "cache" / "shared_cache.db"
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Retorna conexão própria da thread atual"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self) -> None:
+        """Cria tabelas de entradas e de travas de cálculo"""
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+            " created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_locks ("
+            " key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries(expires_at)")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Recupera item do cache"""
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or row[1] < time.time():
+            self._count(hit=False)
+            return None
+
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            # Entrada corrompida ou de versão incompatível: tratar como ausente
+            self.delete(key)
+            self._count(hit=False)
+            return None
+
+        self._count(hit=True)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Publica item no cache de forma atômica"""
+        now = time.time()
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, sqlite3.Binary(payload), now, now + (ttl or self.default_ttl))
+        )
+
+        with self._stats_lock:
+            self._writes += 1
+            purge = self._writes % self._PURGE_EVERY == 0
+        if purge:
+            self._purge()
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], ttl: Optional[int] = None,
+                   lock_timeout: float = 60.0, poll_interval: float = 0.05) -> Any:
+        """Retorna o valor em cache ou calcula uma única vez entre todos os processos.
+
+        O primeiro processo a registrar a trava calcula e publica o valor;
+        os demais aguardam a publicação até `lock_timeout` segundos e, se a
+        trava expirar sem resultado, calculam por conta própria.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        deadline = time.time() + lock_timeout
+        while True:
+            if self._acquire_lock(key, lock_timeout):
+                try:
+                    # Outro processo pode ter publicado entre a leitura e a trava
+                    value = self.get(key)
+                    if value is None:
+                        value = compute()
+                        if value is not None:
+                            self.set(key, value, ttl)
+                    return value
+                finally:
+                    self._release_lock(key)
+
+            time.sleep(poll_interval)
+            value = self.get(key)
+            if value is not None:
+                return value
+            if time.time() >= deadline:
+                return compute()
+
+    def _acquire_lock(self, key: str, lock_timeout: float) -> bool:
+        """Tenta registrar a trava de cálculo para a chave"""
+        now = time.time()
+        conn = self._connect()
+        conn.execute("DELETE FROM cache_locks WHERE key = ? AND expires_at < ?", (key, now))
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO cache_locks (key, owner, expires_at) VALUES (?, ?, ?)",
+            (key, self._owner_id(), now + lock_timeout)
+        )
+        return cursor.rowcount == 1
+
+    def _release_lock(self, key: str) -> None:
+        """Libera a trava de cálculo mantida por este processo/thread"""
+        try:
+            self._connect().execute(
+                "DELETE FROM cache_locks WHERE key = ? AND owner = ?", (key, self._owner_id())
+            )
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _owner_id() -> str:
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def _purge(self) -> None:
+        """Remove entradas expiradas e as mais antigas acima do limite"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                " SELECT key FROM cache_entries ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        except sqlite3.Error:
+            pass
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def delete(self, key: str) -> None:
+        """Remove item do cache"""
+        self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Limpa todo o cache (para todos os processos)"""
+        conn = self._connect()
+        conn.execute("DELETE FROM cache_entries")
+        conn.execute("DELETE FROM cache_locks")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas do cache (acertos/erros são do processo atual)"""
+        size = self._connect().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        total_requests = self.hits + self.misses
+        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            'size': size,
+            'max_size': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': hit_rate,
+            'total_requests': total_requests,
+            'backend': 'shared',
+            'path': self.path
+        }
+
+    def close(self) -> None:
+        """Fecha a conexão da thread atual"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -63,4 +63,81 @@ def test_individuos_paginacao_total_matches_db():
     assert body["pagination"]["total"] == total_individuos
     # Consistência de totalPages
     tp = body["pagination"]["totalPages"]
-    assert tp == (total_individuos + 5 - 1) // 5
\ No newline at end of file
+    assert tp == (total_individuos + 5 - 1) // 5
+
+def test_individuos_consulta_unica_por_pagina():
+    from sqlalchemy import event
+    from web.backend.app.services.db import get_async_db, get_db_manager
+
+    # Engine (síncrono ou o sync_engine do AsyncEngine) usado pelas rotas
+    engine = get_async_db(get_db_manager()).sync_engine
+    statements = []
+
+    def contar(conn, cursor, statement, parameters, context, executemany):
+        # Ignorar o "SELECT 1" do pool_pre_ping
+        if statement != "SELECT 1":
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        r = client.get("/api/individuos", params={"page": 1, "limit": 50})
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+    assert r.status_code == 200
+    # Contagem + página, independentemente do número de linhas
+    assert len(statements) == 2
+
+
+def test_estatisticas_resumo_etag_304():
+    r = client.get("/api/estatisticas/resumo")
+    etag = r.headers["etag"]
+    assert "last-modified" in r.headers
+
+    r = client.get("/api/estatisticas/resumo", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+
+
+def test_individuos_export_ndjson_csv():
+    import json
+    from web.backend.app.services.db import get_db_manager
+
+    total_individuos = get_db_manager().count_records("Individual")
+
+    r = client.get("/api/individuos/export")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    linhas = [json.loads(linha) for linha in r.text.splitlines()]
+    assert len(linhas) == total_individuos
+    assert [linha["id"] for linha in linhas] == sorted(linha["id"] for linha in linhas)
+
+    r = client.get("/api/individuos/export", params={"formato": "csv"})
+    assert r.status_code == 200
+    assert r.text.lstrip("﻿").startswith("ID,Região,Idade")
+    assert len(r.text.splitlines()) == total_individuos + 1
+
+    assert client.get("/api/individuos/export", params={"formato": "xml"}).status_code == 422
+
+
+def test_estatisticas_crosstab():
+    r = client.get("/api/estatisticas/crosstab", params={"rows": "genero", "cols": "regiao"})
+    assert r.status_code == 200
+    body = r.json()
+    resumo = client.get("/api/estatisticas/resumo").json()
+    assert body["total"] == resumo["individuos"]
+    assert sum(body["row_totals"]) == body["total"]
+    assert len(body["cells"]) == len(body["row_keys"])
+
+    # Mesmo cubo (ordem das dimensões e medida não importam); origem no Server-Timing
+    r = client.get("/api/estatisticas/crosstab",
+                   params={"rows": "regiao", "cols": "genero", "measure": "internet_rate"})
+    assert 'crosstab;' in r.headers["server-timing"]
+    assert 'desc="cache"' in r.headers["server-timing"]
+    assert "fonte" not in r.json()
+
+    # Resposta repetida vem do cache HTTP: a rota não executa e não há medição do cubo
+    r = client.get("/api/estatisticas/crosstab", params={"rows": "genero", "cols": "regiao"})
+    assert r.status_code == 200
+    assert "crosstab;" not in r.headers["server-timing"]
+
+    assert client.get("/api/estatisticas/crosstab", params={"rows": "cor"}).status_code == 422
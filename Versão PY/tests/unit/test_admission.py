@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para a coalescência de requisições e o controle de admissão
+"""
+
+import asyncio
+import unittest
+
+from web.backend.app.services.admission import AdmissionLimiter, Overloaded, SingleFlight
+
+
+class TestAdmission(unittest.TestCase):
+    """Testes para SingleFlight e AdmissionLimiter"""
+
+    def test_identical_requests_share_one_computation(self):
+        """Chaves iguais em andamento aguardam a mesma tarefa"""
+        flights = SingleFlight()
+        calls = []
+
+        async def compute(key):
+            calls.append(key)
+            await asyncio.sleep(0.05)
+            return {"key": key}
+
+        async def cenario():
+            results = await asyncio.gather(*(flights.run(key, lambda key=key: compute(key))
+                                             for key in ("a", "a", "a", "b")))
+            # Depois de concluída, a chave volta a calcular
+            await flights.run("a", lambda: compute("a"))
+            return results
+
+        results = asyncio.run(cenario())
+        self.assertEqual(results, [{"key": "a"}] * 3 + [{"key": "b"}])
+        self.assertEqual(calls, ["a", "b", "a"])
+        self.assertEqual(flights.coalesced, 2)
+
+    def test_limiter_queue_timeout_and_full_queue(self):
+        """Acima do limite a requisição espera; depois do prazo ou com a fila cheia, 503"""
+        limiter = AdmissionLimiter("teste", limit=1, queue_timeout=0.05, max_queue=1, retry_after=3)
+
+        async def ocupar(tempo):
+            async with limiter.slot():
+                await asyncio.sleep(tempo)
+            return "ok"
+
+        async def cenario():
+            return await asyncio.gather(ocupar(0.2), ocupar(0), ocupar(0), return_exceptions=True)
+
+        first, queued, rejected = asyncio.run(cenario())
+        self.assertEqual(first, "ok")
+        for result in (queued, rejected):
+            self.assertIsInstance(result, Overloaded)
+            self.assertEqual(result.status_code, 503)
+            self.assertEqual(result.headers["Retry-After"], "3")
+        self.assertEqual(limiter.stats(), {"limit": 1, "active": 0, "waiting": 0, "admitted": 1, "rejected": 2})
+
+        # Dentro do prazo da fila, a requisição é atendida
+        limiter.queue_timeout = 1.0
+
+        async def dentro_do_prazo():
+            return await asyncio.gather(ocupar(0.05), ocupar(0))
+
+        self.assertEqual(asyncio.run(dentro_do_prazo()), ["ok", "ok"])
+
+    def test_cancel_racing_acquire_does_not_leak(self):
+        """Vaga liberada no mesmo instante em que quem espera desiste volta ao semáforo"""
+        limiter = AdmissionLimiter("corrida", limit=1, queue_timeout=5.0)
+
+        async def ocupar():
+            async with limiter.slot():
+                return "ok"
+
+        async def cenario():
+            semaphore = limiter._get_semaphore()
+            await semaphore.acquire()
+            waiter = asyncio.ensure_future(ocupar())
+            await asyncio.sleep(0.01)
+            self.assertEqual(limiter.waiting, 1)
+            # A vaga passa para a espera e, antes que ela rode, a requisição é cancelada
+            semaphore.release()
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            await asyncio.sleep(0)
+            self.assertFalse(semaphore.locked())
+            return await asyncio.wait_for(ocupar(), 0.5)
+
+        self.assertEqual(asyncio.run(cenario()), "ok")
+        self.assertEqual(limiter.stats()["active"], 0)
+        self.assertEqual(limiter.stats()["waiting"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
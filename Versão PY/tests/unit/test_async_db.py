@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para a camada de acesso assíncrono da API web
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import anyio
+from sqlalchemy import func, select
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import Region
+from web.backend.app.services.async_db import AsyncDatabase, to_async_url
+
+
+class TestAsyncDatabase(unittest.TestCase):
+    """Testes para AsyncDatabase e to_async_url"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.temp_dir, "test.db"))
+        self.db.initialize_database()
+        self.adb = AsyncDatabase.from_db_manager(self.db, pool_size=2, max_overflow=1)
+
+    def tearDown(self):
+        anyio.run(self.adb.dispose)
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_to_async_url(self):
+        """URLs síncronas ganham o driver assíncrono do dialeto"""
+        self.assertEqual(to_async_url("sqlite:///data/x.db"), "sqlite+aiosqlite:///data/x.db")
+        self.assertEqual(to_async_url("postgresql+psycopg2://u:p@host/db"), "postgresql+asyncpg://u:p@host/db")
+        with self.assertRaises(ValueError):
+            to_async_url("oracle://u:p@host/db")
+
+    def test_queries(self):
+        """scalar/all/mappings retornam o mesmo que o DatabaseManager"""
+        async def consultar():
+            total = await self.adb.scalar(select(func.count()).select_from(Region))
+            rows = await self.adb.all(select(Region.name).order_by(Region.id))
+            mapped = await self.adb.mappings(select(Region.name.label("nome")).order_by(Region.id).limit(1))
+            return total, rows, mapped
+
+        total, rows, mapped = anyio.run(consultar)
+        self.assertEqual(total, self.db.count_records("Region"))
+        self.assertEqual(len(rows), total)
+        self.assertEqual(mapped[0]["nome"], rows[0][0])
+
+    def test_stream_batches(self):
+        """stream entrega o resultado completo em lotes de até batch_size linhas"""
+        async def consultar():
+            return [batch async for batch in self.adb.stream(select(Region.id).order_by(Region.id), batch_size=2)]
+
+        batches = anyio.run(consultar)
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertEqual(sum(len(batch) for batch in batches), self.db.count_records("Region"))
+
+    def test_snapshot_is_consistent(self):
+        """Consultas do mesmo snapshot não enxergam escritas feitas no meio dele"""
+        count = select(func.count()).select_from(Region)
+
+        def inserir():
+            with self.db.get_session() as session:
+                session.add(Region(code="ZZ", name="Teste", state="Teste", macro_region="Teste"))
+                session.commit()
+
+        async def consultar():
+            async with self.adb.snapshot() as snapshot:
+                antes = await snapshot.scalar(count)
+                await self.adb.run_sync(inserir)
+                depois = await snapshot.scalar(count)
+            return antes, depois, await self.adb.scalar(count)
+
+        antes, depois, atual = anyio.run(consultar)
+        self.assertEqual(antes, depois)
+        self.assertEqual(atual, antes + 1)
+
+    def test_run_sync_bounded_by_pool(self):
+        """Código síncrono roda em no máximo pool_size + max_overflow threads"""
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def trabalho():
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+
+        async def disparar():
+            async with anyio.create_task_group() as tg:
+                for _ in range(12):
+                    tg.start_soon(self.adb.run_sync, trabalho)
+
+        anyio.run(disparar)
+        self.assertLessEqual(state["peak"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para o endpoint de consultas em lote da API web
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.database.database_manager import DatabaseManager
+from web.backend.app.main import app
+from web.backend.app.services.db import get_db_manager
+
+
+class TestBatchApi(unittest.TestCase):
+    """Testes para POST /api/batch"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.temp_dir, "test.db"))
+        self.db.initialize_database()
+        app.dependency_overrides[get_db_manager] = lambda: self.db
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_results_match_individual_routes(self):
+        """Cada consulta do lote devolve o mesmo corpo da rota equivalente"""
+        response = self.client.post("/api/batch", json={"consultas": {
+            "saude": {"op": "health"},
+            "resumo": {"op": "resumo"},
+            "pagina": {"op": "individuos", "page": 1, "limit": 5},
+            "status": {"op": "db_status"},
+        }})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["data_version"], self.db.get_data_version())
+
+        resultados = body["resultados"]
+        self.assertEqual(list(resultados), ["saude", "resumo", "pagina", "status"])
+        self.assertTrue(all(r["status"] == 200 for r in resultados.values()))
+        self.assertEqual(resultados["saude"]["data"], {"status": "ok"})
+        self.assertEqual(resultados["resumo"]["data"], self.client.get("/api/estatisticas/resumo").json())
+        self.assertEqual(resultados["pagina"]["data"],
+                         self.client.get("/api/individuos", params={"page": 1, "limit": 5}).json())
+        self.assertTrue(resultados["status"]["data"]["connected"])
+
+    def test_invalid_batches_rejected(self):
+        """Operação desconhecida, parâmetros inválidos ou lote vazio/grande demais: 422"""
+        for consultas in ({"x": {"op": "desconhecida"}},
+                          {"x": {"op": "individuos", "limit": 1000}},
+                          {},
+                          {str(i): {"op": "health"} for i in range(11)}):
+            response = self.client.post("/api/batch", json={"consultas": consultas})
+            self.assertEqual(response.status_code, 422, consultas)
+
+
+if __name__ == '__main__':
+    unittest.main()
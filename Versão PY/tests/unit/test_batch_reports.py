@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para a geração de relatórios em lote
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import Region, Household, Individual
+from src.modules.batch_reports import BatchReportRunner, safe_filename, unique_filename
+
+
+class TestBatchReports(unittest.TestCase):
+    """Testes para BatchReportRunner"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(str(Path(self.temp_dir) / "test_dac.db"))
+        self.db_manager.initialize_database()
+
+        with self.db_manager.get_session() as session:
+            for code, name, state in (('N1', 'Norte', 'AM'), ('S1', 'Sul', 'RS')):
+                region = Region(code=code, name=name, state=state, macro_region=name)
+                session.add(region)
+                session.flush()
+                household = Household(region_id=region.id, city='A', area_type='urbana',
+                                      income_range='1-2 SM', has_internet=True)
+                session.add(household)
+                session.flush()
+                session.add(Individual(household_id=household.id, age=30, gender='F', has_disability=False))
+            session.commit()
+
+    def tearDown(self):
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reports_per_state(self):
+        """Relatório geral e um por estado, com tempos por etapa"""
+        output = Path(self.temp_dir) / 'relatorios'
+        runner = BatchReportRunner(self.db_manager, str(output), by='state', formats=['xlsx'], workers=1)
+        results = runner.run()
+
+        self.assertEqual([result['name'] for result in results], ['Geral', 'AM', 'RS'])
+        self.assertEqual(sorted(p.name for p in output.iterdir()), ['AM.xlsx', 'Geral.xlsx', 'RS.xlsx'])
+        self.assertIn('agregações por segmento', runner.timing_report())
+        self.assertIn('xlsx', runner.worker_timings)
+
+    def test_safe_filename(self):
+        """Nomes de segmento viram nomes de arquivo válidos"""
+        self.assertEqual(safe_filename('São Paulo / Capital'), 'São_Paulo_Capital')
+        self.assertEqual(safe_filename('  '), 'sem_nome')
+
+    def test_unique_filenames(self):
+        """Segmentos com o mesmo nome de arquivo (ou chamados "Geral") recebem sufixo numérico"""
+        with self.db_manager.get_session() as session:
+            for code, name in (('G1', 'Geral'), ('N2', 'Norte!')):
+                region = Region(code=code, name=name, state='XX', macro_region=name)
+                session.add(region)
+                session.flush()
+                household = Household(region_id=region.id, city='B', area_type='rural',
+                                      income_range='1-2 SM', has_internet=False)
+                session.add(household)
+                session.flush()
+                session.add(Individual(household_id=household.id, age=40, gender='M', has_disability=False))
+            session.commit()
+
+        output = Path(self.temp_dir) / 'relatorios'
+        runner = BatchReportRunner(self.db_manager, str(output), formats=['xlsx'], workers=1)
+        results = runner.run()
+
+        self.assertEqual([result['name'] for result in results], ['Geral', 'Geral', 'Norte', 'Norte!', 'Sul'])
+        self.assertEqual(sorted(p.name for p in output.iterdir()),
+                         ['Geral.xlsx', 'Geral_2.xlsx', 'Norte.xlsx', 'Norte_2.xlsx', 'Sul.xlsx'])
+
+        used = set()
+        self.assertEqual([unique_filename(name, used) for name in ('a/b', 'a b', 'A_B', 'a_b_2')],
+                         ['a_b', 'a_b_2', 'A_B_3', 'a_b_2_2'])
+
+    def test_only_filters_before_aggregating(self):
+        """--only restringe as agregações por segmento aos segmentos pedidos"""
+        runner = BatchReportRunner(self.db_manager, self.temp_dir, formats=['xlsx'], only=['Sul'])
+        tasks = runner.prepare_tasks()
+        self.assertEqual([task.name for task in tasks], ['Geral', 'Sul'])
+        self.assertEqual(tasks[1].aggregates['total'], 1)
+        self.assertEqual(tasks[0].aggregates['total'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
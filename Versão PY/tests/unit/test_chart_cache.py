@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para ChartCache
+"""
+
+import unittest
+
+from src.ui.chart_cache import ChartCache
+
+
+class TestChartCache(unittest.TestCase):
+    """Testes para ChartCache"""
+
+    def setUp(self):
+        self.cache = ChartCache()
+
+    def test_series_computed_once_per_version(self):
+        """Série é calculada uma vez por versão do conjunto de dados"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {'counts': {'Sul': 3}}
+
+        self.assertEqual(self.cache.get_series('regional', 'v1', compute), {'counts': {'Sul': 3}})
+        self.cache.get_series('regional', 'v1', compute)
+        self.assertEqual(len(calls), 1)
+
+        self.cache.get_series('regional', 'v2', compute)
+        self.assertEqual(len(calls), 2)
+
+    def test_size_bucket(self):
+        """Pequenas variações de tamanho caem na mesma faixa"""
+        self.assertEqual(ChartCache.size_bucket((8.1, 6.05)), ChartCache.size_bucket((7.9, 5.95)))
+        self.assertNotEqual(ChartCache.size_bucket((8.0, 6.0)), ChartCache.size_bucket((10.0, 6.0)))
+
+    def test_bitmap_key_includes_palette(self):
+        """Paletas diferentes geram bitmaps distintos"""
+        key_a = ChartCache.bitmap_key('gender', 'v1', (8, 6), ['#000'])
+        key_b = ChartCache.bitmap_key('gender', 'v1', (8, 6), ['#fff'])
+        self.assertNotEqual(key_a, key_b)
+
+        png_header = b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\rIHDR' + (2).to_bytes(4, 'big') + (3).to_bytes(4, 'big')
+        self.cache.set_bitmap(key_a, png_header)
+        self.assertEqual(self.cache.get_bitmap(key_a)['width'], 2)
+        self.assertIsNone(self.cache.get_bitmap(key_b))
+        self.assertEqual(self.cache.get_bitmap(ChartCache.bitmap_key('gender', 'v1', (8.1, 6), ['#000']))['height'], 3)
+        # Outro tamanho não reaproveita a imagem
+        self.assertIsNone(self.cache.get_bitmap(ChartCache.bitmap_key('gender', 'v1', (4, 3), ['#000'])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para o serviço de renderização de gráficos
+"""
+
+import unittest
+
+from src.ui.chart_renderer import ChartRenderService, render_chart_png
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+class TestChartRenderer(unittest.TestCase):
+    """Testes para render_chart_png e ChartRenderService"""
+
+    def test_render_png(self):
+        """Gráfico é desenhado com Agg e devolvido como PNG"""
+        png = render_chart_png('gender', {'counts': {'Feminino': 3, 'Masculino': 2}}, (4, 3), dpi=50)
+        self.assertTrue(png.startswith(PNG_SIGNATURE))
+        self.assertEqual(int.from_bytes(png[16:20], 'big'), 200)
+
+    def test_render_many_in_threads(self):
+        """Vários gráficos renderizados em paralelo, na ordem pedida"""
+        service = ChartRenderService(max_workers=2, use_processes=False)
+        try:
+            images = service.render_many([
+                ('internet', {'counts': {'Com Internet': 5, 'Sem Internet': 1}}),
+                ('regional', {'counts': {'Sul': 4, 'Norte': 2}}),
+                ('unknown', {}),
+            ], (4, 3), dpi=50)
+        finally:
+            service.shutdown(wait=True)
+
+        self.assertEqual([chart for chart, _ in images], ['internet', 'regional', 'unknown'])
+        self.assertTrue(images[0][1].startswith(PNG_SIGNATURE))
+        self.assertTrue(images[1][1].startswith(PNG_SIGNATURE))
+        self.assertIsNone(images[2][1])
+
+    def test_drawing_errors_do_not_fall_back(self):
+        """Erro no desenho vai para o Future, sem trocar o pool de processos por threads"""
+        service = ChartRenderService(max_workers=1, use_processes=True)
+        try:
+            future = service.submit('gender', {'counts': ['Feminino']}, (4, 3), dpi=50)
+            with self.assertRaises(AttributeError):
+                future.result(timeout=60)
+            self.assertTrue(service.use_processes)
+        finally:
+            service.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
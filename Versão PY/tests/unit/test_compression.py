@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para a compressão e a serialização das respostas da API web
+"""
+
+import gzip
+import unittest
+
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from web.backend.app.middleware.compression import CompressionMiddleware, choose_encoding
+from web.backend.app.services.serialization import FastJSONResponse
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+    """Testes para CompressionMiddleware e FastJSONResponse"""
+
+    def setUp(self):
+        app = FastAPI(default_response_class=FastJSONResponse)
+
+        @app.get("/grande")
+        def grande():
+            return {"linhas": [{"id": i, "nome": f"Indivíduo {i}"} for i in range(200)]}
+
+        @app.get("/pequeno")
+        def pequeno():
+            return {"ok": True}
+
+        @app.get("/imagem")
+        def imagem():
+            return Response(b"\x89PNG" + b"0" * 4096, media_type="image/png")
+
+        @app.get("/fluxo")
+        def fluxo():
+            return StreamingResponse((f'{{"id": {i}}}\n' for i in range(500)), media_type="application/x-ndjson")
+
+        self.falhar = True
+
+        @app.get("/versionado")
+        def versionado():
+            # Mesmo ETag nas duas respostas: só o status as distingue
+            if self.falhar:
+                return FastJSONResponse({"erro": "x" * 2048}, status_code=422, headers={"ETag": '"v1"'})
+            return FastJSONResponse({"ok": "y" * 2048}, headers={"ETag": '"v1"'})
+
+        app.add_middleware(CompressionMiddleware, minimum_size=1024)
+        self.client = TestClient(app)
+
+    def _raw(self, path, encoding="gzip"):
+        with self.client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+            return response, b"".join(response.iter_raw())
+
+    def test_large_json_compressed(self):
+        """JSON acima do limiar é comprimido e continua válido"""
+        response, raw = self._raw("/grande")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(int(response.headers["content-length"]), len(raw))
+        self.assertIn("Accept-Encoding", response.headers["vary"])
+        self.assertEqual(len(self.client.get("/grande").json()["linhas"]), 200)
+
+    def test_small_and_binary_untouched(self):
+        """Respostas pequenas e imagens não são comprimidas"""
+        self.assertNotIn("content-encoding", self._raw("/pequeno")[0].headers)
+        self.assertNotIn("content-encoding", self._raw("/imagem")[0].headers)
+        self.assertNotIn("content-encoding", self._raw("/grande", encoding="identity")[0].headers)
+
+    def test_streaming_compressed(self):
+        """Respostas em fluxo são comprimidas bloco a bloco"""
+        response, raw = self._raw("/fluxo")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(gzip.decompress(raw).decode().count("\n"), 500)
+
+    def test_error_response_not_cached(self):
+        """Um erro com ETag não é reaproveitado na resposta de sucesso da mesma URL"""
+        response = self.client.get("/versionado?q=1")
+        self.assertEqual(response.status_code, 422)
+        self.falhar = False
+        response, raw = self._raw("/versionado?q=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'"ok"', gzip.decompress(raw))
+
+    def test_choose_encoding(self):
+        """Negociação respeita q=0"""
+        self.assertEqual(choose_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(choose_encoding("gzip;q=0"))
+        self.assertIsNone(choose_encoding(""))
+
+    def test_fast_json_accepts_bytes(self):
+        """Conteúdo pré-serializado é enviado como está"""
+        self.assertEqual(FastJSONResponse(b'{"a":1}').body, b'{"a":1}')
+        self.assertEqual(FastJSONResponse({"a": "ç"}).body, '{"a":"ç"}'.encode())
+
+
+if __name__ == '__main__':
+    unittest.main()
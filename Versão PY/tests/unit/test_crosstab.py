@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para as tabelas cruzadas
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import Region, Household, Individual, DeviceUsage
+from src.modules.crosstab import build_cube, pivot, validate_dimensions
+from src.modules.query_engine import QueryEngine
+
+
+class TestCrosstab(unittest.TestCase):
+    """Testes para o cubo (GROUP BY único) e a montagem da tabela"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(str(Path(self.temp_dir) / "test_dac.db"))
+        self.db_manager.initialize_database()
+
+        with self.db_manager.get_session() as session:
+            region = Region(code='TST', name='Teste', state='TS', macro_region='Sul')
+            session.add(region)
+            session.flush()
+            with_internet = Household(region_id=region.id, city='A', area_type='urbana',
+                                      income_range='1-2 SM', has_internet=True)
+            without_internet = Household(region_id=region.id, city='B', area_type='rural',
+                                         income_range=None, has_internet=False)
+            session.add_all([with_internet, without_internet])
+            session.flush()
+            people = [
+                Individual(household_id=with_internet.id, age=25, gender='F', has_disability=False),
+                Individual(household_id=with_internet.id, age=71, gender='masculino', has_disability=True),
+                Individual(household_id=without_internet.id, age=40, gender='Masculino', has_disability=False),
+            ]
+            session.add_all(people)
+            session.flush()
+            session.add(DeviceUsage(individual_id=people[0].id, device_type='Celular', has_device=True))
+            session.commit()
+
+    def tearDown(self):
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _cube(self, dimensions, filters=None):
+        statement = QueryEngine(self.db_manager).crosstab_statement(dimensions, filters or {})
+        with self.db_manager.get_session() as session:
+            return build_cube(dimensions, session.execute(statement).all())
+
+    def test_measures_and_totals(self):
+        """Células, totais e medidas saem do mesmo cubo"""
+        dimensions = ['genero', 'renda']
+        cube = self._cube(dimensions)
+
+        table = pivot(dimensions, cube, ['genero'], ['renda'], 'contagem')
+        # 'masculino' e 'Masculino' caem na mesma linha
+        self.assertEqual(table['row_keys'], [['Masculino'], ['Feminino']])
+        self.assertEqual(table['col_keys'], [['1-2 SM'], ['Não Informado']])
+        self.assertEqual(table['cells'], [[1, 1], [1, None]])
+        self.assertEqual(table['row_totals'], [2, 1])
+        self.assertEqual(table['col_totals'], [2, 1])
+        self.assertEqual(table['total'], 3)
+
+        internet = pivot(dimensions, cube, ['renda'], [], 'internet_rate')
+        self.assertEqual(internet['cells'], [[1.0], [0.0]])
+        self.assertEqual(internet['total'], round(2 / 3, 4))
+        self.assertEqual(pivot(dimensions, cube, ['genero'], [], 'dispositivo_rate')['cells'], [[0.0], [1.0]])
+        self.assertEqual(pivot(dimensions, cube, ['genero'], [], 'idade_media')['row_totals'], [55.5, 25.0])
+
+    def test_filters(self):
+        """Filtros da janela de consultas restringem o cubo"""
+        table = pivot(['faixa_etaria'], self._cube(['faixa_etaria'], {'internet': 'Sim'}),
+                      ['faixa_etaria'], [], 'contagem')
+        self.assertEqual(table['row_keys'], [['18-29'], ['65+']])
+        self.assertEqual(table['n'], 2)
+
+    def test_validate_dimensions(self):
+        """Entre 1 e 3 dimensões conhecidas e distintas"""
+        validate_dimensions(['regiao'], ['renda', 'genero'])
+        for rows, cols in ((['regiao'], ['renda', 'genero', 'area']), ([], ['renda']),
+                           (['regiao'], ['regiao']), (['cor'], [])):
+            with self.assertRaises(ValueError):
+                validate_dimensions(rows, cols)
+
+
+if __name__ == '__main__':
+    unittest.main()
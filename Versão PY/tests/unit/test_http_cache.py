@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para o cache HTTP da API web (ETag / 304 por versão dos dados)
+"""
+
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from web.backend.app.middleware.http_cache import HTTPCacheMiddleware
+
+
+class _VersionedDb:
+    """Versão e data de modificação controladas pelo teste"""
+
+    def __init__(self):
+        self.version = "v1"
+        self.modified = 1_700_000_000.0
+
+    def get_data_version(self):
+        return self.version
+
+    def get_data_modified(self):
+        return self.modified
+
+
+class TestHTTPCacheMiddleware(unittest.TestCase):
+    """Testes para HTTPCacheMiddleware"""
+
+    def setUp(self):
+        self.db = _VersionedDb()
+        self.calls = 0
+        app = FastAPI()
+
+        @app.get("/api/dados")
+        def dados(page: int = 1):
+            self.calls += 1
+            return {"page": page, "calls": self.calls}
+
+        @app.get("/api/health")
+        def health():
+            return {"status": "ok"}
+
+        app.add_middleware(HTTPCacheMiddleware, db_provider=lambda: self.db)
+        self.client = TestClient(app)
+
+    def test_validators_and_not_modified(self):
+        """Resposta traz ETag/Last-Modified; If-None-Match válido recebe 304 sem executar a rota"""
+        r = self.client.get("/api/dados")
+        self.assertEqual(r.headers["etag"], 'W/"v1"')
+        self.assertEqual(r.headers["last-modified"], "Tue, 14 Nov 2023 22:13:20 GMT")
+        self.assertEqual(r.headers["cache-control"], "no-cache")
+
+        r = self.client.get("/api/dados", headers={"If-None-Match": 'W/"v1"'})
+        self.assertEqual(r.status_code, 304)
+        self.assertEqual(r.content, b"")
+        r = self.client.get("/api/dados", headers={"If-Modified-Since": "Tue, 14 Nov 2023 22:13:20 GMT"})
+        self.assertEqual(r.status_code, 304)
+        self.assertEqual(self.calls, 1)
+
+    def test_body_cached_per_version(self):
+        """Corpos reaproveitados por URL até a versão dos dados mudar"""
+        self.assertEqual(self.client.get("/api/dados").json()["calls"], 1)
+        self.assertEqual(self.client.get("/api/dados").json()["calls"], 1)
+        self.assertEqual(self.client.get("/api/dados?page=2").json()["calls"], 2)
+
+        self.db.version = "v2"
+        r = self.client.get("/api/dados", headers={"If-None-Match": 'W/"v1"'})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()["calls"], 3)
+        self.assertEqual(r.headers["etag"], 'W/"v2"')
+
+    def test_excluded_routes(self):
+        """Rotas que não dependem dos dados não recebem validadores"""
+        r = self.client.get("/api/health")
+        self.assertNotIn("etag", r.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
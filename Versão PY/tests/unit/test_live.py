@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para o coletor de atualizações ao vivo (SSE)
+"""
+
+import asyncio
+import unittest
+
+from web.backend.app.services.live import Channel, LiveHub, delta, format_event
+
+
+class TestLiveHub(unittest.TestCase):
+    """Testes para LiveHub e o formato dos eventos"""
+
+    def setUp(self):
+        self.version = "v1"
+        self.count = 0
+
+    async def _compute(self):
+        self.count += 1
+        return {"versao": self.version, "fixo": 1}
+
+    def _hub(self):
+        return LiveHub([Channel("estatisticas", self._compute, 0.01, version=lambda: self.version)])
+
+    def test_one_computation_for_many_subscribers(self):
+        """Vários inscritos recebem o mesmo cálculo; a versão controla o recálculo"""
+        async def cenario():
+            hub = self._hub()
+            async with hub.subscription() as a, hub.subscription() as b:
+                first = [await asyncio.wait_for(s.queue.get(), 1) for s in (a, b)]
+                await asyncio.sleep(0.05)
+                self.assertEqual(self.count, 1)
+
+                self.version = "v2"
+                changed = await asyncio.wait_for(a.queue.get(), 1)
+                # Inscrito tardio recebe o estado completo
+                async with hub.subscription() as c:
+                    late = c.queue.get_nowait()
+            await hub.close()
+            return first, changed, late
+
+        first, changed, late = asyncio.run(cenario())
+        self.assertEqual(first[0], ("estatisticas", {"versao": "v1", "fixo": 1}))
+        self.assertEqual(first[0], first[1])
+        self.assertEqual(changed, ("estatisticas", {"versao": "v2"}))
+        self.assertEqual(late, ("estatisticas", {"versao": "v2", "fixo": 1}))
+        self.assertEqual(self.count, 2)
+
+    def test_slow_subscriber_resynced(self):
+        """Fila cheia é trocada pelo estado completo"""
+        async def cenario():
+            hub = LiveHub([Channel("c", self._compute, 60)])
+            async with hub.subscription() as subscriber:
+                for i in range(40):
+                    hub.publish("c", {"i": i, "fixo": 1})
+                items = []
+                while not subscriber.queue.empty():
+                    items.append(subscriber.queue.get_nowait())
+            await hub.close()
+            return items
+
+        items = asyncio.run(cenario())
+        self.assertLessEqual(len(items), 16)
+        self.assertEqual(items[-1], ("c", {"i": 39}))
+        self.assertIn(("c", {"i": 39 - len(items) + 1, "fixo": 1}), items)
+
+    def test_format(self):
+        """Eventos no formato text/event-stream"""
+        self.assertEqual(format_event("db-status", {"a": 1}, 3), 'event: db-status\nid: 3\ndata: {"a":1}\n\n')
+        self.assertEqual(delta({"a": 1, "b": 2}, {"a": 1, "b": 3}), {"b": 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para o coletor de métricas em segundo plano
+"""
+
+import unittest
+import tempfile
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from src.database.database_manager import DatabaseManager
+from src.database.metrics_collector import MetricsCollector, SqliteSampler
+from src.database.models import Region
+
+
+class TestMetricsCollector(unittest.TestCase):
+    """Testes para o buffer circular e o amostrador do SQLite"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(str(Path(self.temp_dir) / "test_dac.db"))
+        self.db_manager.initialize_database()
+
+    def tearDown(self):
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_ring_buffer(self):
+        """Histórico limitado à capacidade; latest é a última amostra"""
+        counter = iter(range(100))
+        collector = MetricsCollector(lambda: {'metrics': {'n': next(counter)}}, capacity=5)
+        self.assertIsNone(collector.latest())
+        for _ in range(8):
+            collector.sample_now()
+        self.assertEqual(collector.history('n'), [3, 4, 5, 6, 7])
+        self.assertEqual(collector.history('n', limit=2), [6, 7])
+        self.assertEqual(collector.latest()['metrics']['n'], 7)
+        self.assertEqual(len(collector.history('sample_ms')), 5)
+
+    def test_background_thread(self):
+        """A thread coleta ao ser adquirida e para quando o último leitor sai"""
+        collector = MetricsCollector(lambda: {'metrics': {}}, interval=60)
+        collector.acquire()
+        collector.acquire()
+        self.assertIsNotNone(collector.wait(5))
+        collector.refresh()
+        collector.release()
+        self.assertTrue(collector.running)
+        collector.release()
+        collector.stop(5)
+        self.assertFalse(collector.running)
+
+    def test_release_does_not_block_and_reacquire_keeps_running(self):
+        """Soltar o último leitor não espera a amostra em andamento; um novo leitor logo depois mantém a coleta"""
+        gate = threading.Event()
+        calls = []
+
+        def sampler():
+            calls.append(1)
+            gate.wait(5)
+            return {'metrics': {}}
+
+        collector = MetricsCollector(sampler, interval=60)
+        collector.acquire()
+        while not calls:
+            time.sleep(0.01)
+        stopping = collector._thread
+
+        started = time.perf_counter()
+        collector.release()
+        self.assertLess(time.perf_counter() - started, 1)
+
+        collector.acquire()
+        gate.set()
+        stopping.join(5)
+        self.assertFalse(stopping.is_alive())
+        self.assertTrue(collector.running)
+        self.assertIsNotNone(collector.wait(5))
+
+        collector.release()
+        collector.stop(5)
+        self.assertFalse(collector.running)
+
+    def test_sqlite_recount_on_version_change(self):
+        """COUNT(*) por tabela só é refeito quando os dados mudam"""
+        sampler = SqliteSampler(self.db_manager)
+        first = sampler()
+        sampler()
+        self.assertEqual(sampler.recounts, 1)
+        self.assertTrue(first['connected'])
+        self.assertGreater(first['metrics']['database_size_bytes'], 0)
+
+        with self.db_manager.get_session() as session:
+            session.add(Region(code='TST', name='Teste', state='TS', macro_region='Sul'))
+            session.commit()
+        second = sampler()
+        self.assertEqual(sampler.recounts, 2)
+        self.assertEqual(second['metrics']['total_rows'], first['metrics']['total_rows'] + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para ReportDataset
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import Region, Household, Individual, DeviceUsage
+from src.database.report_queries import ReportAggregator
+from src.modules.query_engine import QueryEngine
+from src.modules.report_dataset import ReportDataset
+
+
+class TestReportDataset(unittest.TestCase):
+    """Testes para ReportDataset"""
+
+    def setUp(self):
+        self.records = [
+            {'id': 1, 'age': 25, 'gender': 'F', 'education_level': 'Superior', 'has_disability': False,
+             'household': {'income_range': '1-2 SM', 'has_internet': True,
+                           'region_name': 'Sul', 'devices': ['Celular', 'Computador']}},
+            {'id': 2, 'age': 71, 'gender': 'masculino', 'has_disability': True,
+             'household': {'income_range': None, 'has_internet': False,
+                           'region_name': 'Norte', 'devices': []}},
+            {'id': 3, 'age': None, 'gender': None, 'has_disability': None,
+             'household': {'income_range': '1-2 SM', 'has_internet': None,
+                           'region_name': None, 'devices': None}},
+        ]
+        self.dataset = ReportDataset.from_records(self.records)
+
+    def test_aggregates(self):
+        """Agregações vetorizadas"""
+        aggregates = self.dataset.aggregates()
+
+        self.assertEqual(aggregates['total'], 3)
+        self.assertEqual(aggregates['gender'], {'Feminino': 1, 'Masculino': 1, 'Não Informado': 1})
+        self.assertEqual(aggregates['age']['bands']['18-29'], 1)
+        self.assertEqual(aggregates['age']['bands']['65+'], 1)
+        self.assertEqual(aggregates['age']['invalid'], 1)
+        self.assertAlmostEqual(aggregates['age']['average'], 48.0)
+        self.assertEqual(aggregates['internet'], {'Com Internet': 1, 'Sem Internet': 1, 'Não Informado': 1})
+        self.assertEqual(aggregates['regions'], {'Sul': 1, 'Norte': 1, 'Não informado': 1})
+        self.assertEqual(aggregates['devices'], {'Celular': 1, 'Computador': 1,
+                                                 'Nenhum Dispositivo': 1, 'Não Informado': 1})
+        self.assertEqual(aggregates['internet_by_age_band']['18-29'], {'total': 1, 'with_internet': 1})
+
+    def test_statistics(self):
+        """Estatísticas resumidas no formato do QueryEngine"""
+        stats = self.dataset.statistics()
+
+        self.assertEqual(stats['total_individuals'], 3)
+        self.assertEqual(stats['age_distribution'], {'20-29': 1, '70-79': 1})
+        self.assertEqual(stats['gender_distribution'], {'F': 1, 'masculino': 1})
+        self.assertEqual(stats['education_distribution'], {'Superior': 1})
+        self.assertEqual(stats['disability_count'], 1)
+        self.assertEqual(stats['internet_access_count'], 1)
+
+    def test_iter_records_round_trip(self):
+        """Registros reconstruídos preservam os valores"""
+        records = list(self.dataset.iter_records())
+
+        self.assertEqual([r['id'] for r in records], [1, 2, 3])
+        self.assertEqual(records[0]['household']['devices'], ['Celular', 'Computador'])
+        self.assertIsNone(records[2]['age'])
+        self.assertEqual(ReportDataset.from_records(records[:2]).aggregates(),
+                         ReportDataset.from_records(self.records[:2]).aggregates())
+
+
+class TestQueryEngineReportDataset(unittest.TestCase):
+    """Conjunto colunar montado diretamente do banco"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(str(Path(self.temp_dir) / "test_dac.db"))
+        self.db_manager.initialize_database()
+
+        with self.db_manager.get_session() as session:
+            region = Region(code='TST', name='Teste', state='TS', macro_region='Sul')
+            session.add(region)
+            session.flush()
+            household = Household(region_id=region.id, city='A', area_type='urbana',
+                                  income_range='1-2 SM', has_internet=True)
+            session.add(household)
+            session.flush()
+            for age in (10, 35, 80):
+                person = Individual(household_id=household.id, age=age, gender='F', has_disability=False)
+                session.add(person)
+                session.flush()
+                session.add(DeviceUsage(individual_id=person.id, device_type='Celular', has_device=True))
+            session.commit()
+
+    def tearDown(self):
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_matches_sql_aggregates(self):
+        """Sem filtros, o conjunto colunar agrega igual às consultas agrupadas"""
+        dataset = QueryEngine(self.db_manager).get_report_dataset({})
+
+        self.assertEqual(len(dataset), 3)
+        self.assertEqual(dataset.aggregates(),
+                         ReportAggregator(self.db_manager).get_aggregates(use_cache=False))
+
+    def test_filters(self):
+        """Filtros do QueryEngine se aplicam ao conjunto colunar"""
+        dataset = QueryEngine(self.db_manager).get_report_dataset({'age_min': 30})
+
+        self.assertEqual(len(dataset), 2)
+        self.assertEqual(dataset.aggregates()['devices'], {'Celular': 2})
+
+    def test_from_orm_and_query_engine_records(self):
+        """Dispositivos lidos do indivíduo, nos objetos ORM e nos dicionários do QueryEngine"""
+        from sqlalchemy.orm import joinedload
+
+        expected = ReportAggregator(self.db_manager).get_aggregates(use_cache=False)
+        with self.db_manager.get_session() as session:
+            individuals = session.query(Individual).options(
+                joinedload(Individual.household).joinedload(Household.region),
+                joinedload(Individual.device_usage),
+            ).all()
+            orm_aggregates = ReportDataset.from_records(individuals).aggregates()
+        self.assertEqual(orm_aggregates['devices'], {'Celular': 3})
+        self.assertEqual(orm_aggregates, expected)
+
+        records = QueryEngine(self.db_manager).execute_query({})
+        self.assertEqual(ReportDataset.from_records(records).aggregates(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para a exportação de PDF em segundo plano
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from src.database.report_queries import build_aggregates, new_groups
+from src.modules.report_pdf import build_report_pdf
+from src.utils.background_job import BackgroundJob
+
+
+def _regions(count):
+    for i in range(count):
+        groups = new_groups()
+        groups['person'][('F', 30 + i % 40, False, True)] += 10
+        groups['region'][f'Região {i}'] = 10
+        yield f'Região {i:03d}', build_aggregates(groups)
+
+
+class TestReportPdf(unittest.TestCase):
+    """Testes para build_report_pdf com BackgroundJob"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = str(Path(self.temp_dir) / 'relatorio.pdf')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_background_export(self):
+        """PDF gerado em segundo plano com uma página por região"""
+        job = BackgroundJob(lambda job: build_report_pdf(
+            self.filename, 'TOTAL DE REGISTROS: 10', regions=_regions(30), region_count=30, job=job
+        )).start()
+        self.assertTrue(job.wait(60))
+
+        self.assertEqual(job.status, BackgroundJob.DONE)
+        self.assertGreaterEqual(job.result, 31)
+        self.assertEqual(job.percent, 100.0)
+        self.assertTrue(Path(self.filename).read_bytes().startswith(b'%PDF'))
+
+    def test_cancel(self):
+        """Cancelamento interrompe a geração sem deixar arquivo no destino"""
+        def build(job):
+            job.cancel()
+            return build_report_pdf(self.filename, 'x', regions=_regions(50), region_count=50, job=job)
+
+        job = BackgroundJob(build).start()
+        self.assertTrue(job.wait(60))
+
+        self.assertEqual(job.status, BackgroundJob.CANCELLED)
+        self.assertEqual(list(Path(self.temp_dir).iterdir()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para as agregações dos relatórios
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import Region, Household, Individual, DeviceUsage
+from src.database.report_queries import ReportAggregator, bin_age_internet, wilson_interval
+from src.modules.report_dataset import ReportDataset
+
+
+class TestReportAggregator(unittest.TestCase):
+    """Testes para ReportAggregator"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(str(Path(self.temp_dir) / "test_dac.db"))
+        self.db_manager.initialize_database()
+
+        with self.db_manager.get_session() as session:
+            region = Region(code='TST', name='Teste', state='TS', macro_region='Sul')
+            session.add(region)
+            session.flush()
+            with_internet = Household(region_id=region.id, city='A', area_type='urbana',
+                                      income_range='1-2 SM', has_internet=True)
+            without_internet = Household(region_id=region.id, city='B', area_type='rural',
+                                         income_range=None, has_internet=False)
+            session.add_all([with_internet, without_internet])
+            session.flush()
+            people = [
+                Individual(household_id=with_internet.id, age=25, gender='F', has_disability=False),
+                Individual(household_id=with_internet.id, age=70, gender='masculino', has_disability=True),
+                Individual(household_id=without_internet.id, age=None, gender=None, has_disability=False),
+            ]
+            session.add_all(people)
+            session.flush()
+            session.add(DeviceUsage(individual_id=people[0].id, device_type='Celular', has_device=True))
+            session.commit()
+
+    def tearDown(self):
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_grouped_counts(self):
+        """Contagens agrupadas calculadas no banco"""
+        aggregates = ReportAggregator(self.db_manager).get_aggregates(use_cache=False)
+
+        self.assertEqual(aggregates['total'], 3)
+        self.assertEqual(aggregates['gender'], {'Feminino': 1, 'Masculino': 1, 'Não Informado': 1})
+        self.assertEqual(aggregates['age']['valid'], 2)
+        self.assertEqual(aggregates['age']['bands']['18-29'], 1)
+        self.assertEqual(aggregates['age']['bands']['65+'], 1)
+        self.assertEqual(aggregates['internet'], {'Com Internet': 2, 'Sem Internet': 1})
+        self.assertEqual(aggregates['income'], {'1-2 SM': 2, 'Não Informado': 1})
+        self.assertEqual(aggregates['regions'], {'Teste': 3})
+        self.assertEqual(aggregates['devices'], {'Nenhum Dispositivo': 2, 'Celular': 1})
+        self.assertEqual(aggregates['disability']['Sim'], 1)
+
+    def test_records_match_database(self):
+        """Agregação colunar de registros em memória produz o mesmo resultado"""
+        records = [
+            {'age': 25, 'gender': 'F', 'has_disability': False,
+             'household': {'income_range': '1-2 SM', 'has_internet': True,
+                           'region_name': 'Teste', 'devices': ['Celular']}},
+            {'age': 70, 'gender': 'masculino', 'has_disability': True,
+             'household': {'income_range': '1-2 SM', 'has_internet': True,
+                           'region_name': 'Teste', 'devices': []}},
+            {'age': None, 'gender': None, 'has_disability': False,
+             'household': {'income_range': None, 'has_internet': False,
+                           'region_name': 'Teste', 'devices': []}},
+        ]
+        expected = ReportAggregator(self.db_manager).get_aggregates(use_cache=False)
+        self.assertEqual(ReportDataset.from_records(records).aggregates(), expected)
+
+    def test_region_aggregates(self):
+        """Agregações por região (banco e colunar) somam ao total"""
+        regions = list(ReportAggregator(self.db_manager).iter_region_aggregates())
+        self.assertEqual([name for name, _ in regions], ['Teste'])
+        self.assertEqual(regions[0][1], ReportAggregator(self.db_manager).get_aggregates(use_cache=False))
+
+        records = [
+            {'age': 25, 'gender': 'F', 'household': {'region_name': 'Sul', 'devices': ['Celular']}},
+            {'age': 40, 'gender': 'M', 'household': {'region_name': 'Norte', 'devices': []}},
+            {'age': 50, 'gender': 'M', 'household': {'region_name': 'Sul', 'devices': ['PC', 'Tablet']}},
+        ]
+        by_region = dict(ReportDataset.from_records(records).iter_region_aggregates())
+        self.assertEqual(list(by_region), ['Norte', 'Sul'])
+        self.assertEqual(by_region['Sul']['total'], 2)
+        self.assertEqual(by_region['Sul']['devices'], {'Celular': 1, 'PC': 1, 'Tablet': 1})
+        self.assertEqual(by_region['Norte']['devices'], {'Nenhum Dispositivo': 1})
+
+
+class TestAgeInternetBins(unittest.TestCase):
+    """Testes para o agrupamento idade x internet"""
+
+    def test_wilson_interval(self):
+        """Intervalo contém a proporção e fica dentro de 0-100%"""
+        lower, upper = wilson_interval([50, 0], [100, 10])
+        self.assertLess(lower[0], 50)
+        self.assertGreater(upper[0], 50)
+        self.assertAlmostEqual(lower[0], 40.38, places=1)
+        self.assertEqual(lower[1], 0)
+        self.assertGreater(upper[1], 0)
+
+    def test_bins_independent_of_population(self):
+        """Faixas agregam os pontos (idade, internet, n) com tamanho fixo"""
+        bins = bin_age_internet([(20, 1, 3000), (21, 0, 1000), (34, 1, 10)], bin_width=5)
+
+        self.assertEqual(bins['edges'], [20, 25, 30, 35])
+        self.assertEqual(bins['totals'], [4000, 0, 10])
+        self.assertEqual(bins['with_internet'], [3000, 0, 10])
+        self.assertAlmostEqual(bins['rate'][0], 75.0)
+        self.assertLessEqual(bins['lower'][0], 75.0)
+        self.assertGreaterEqual(bins['upper'][0], 75.0)
+
+    def test_empty_points(self):
+        """Sem pontos, nenhuma faixa"""
+        self.assertEqual(bin_age_internet([])['totals'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para os snapshots dos relatórios padrão
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import Region, Household, Individual
+from src.database.report_queries import ReportAggregator
+from src.modules.report_snapshots import ReportSnapshotStore, REPORT_SETS
+
+
+class TestReportSnapshots(unittest.TestCase):
+    """Testes para ReportSnapshotStore"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = str(Path(self.temp_dir) / "test_dac.db")
+        self.db_manager = DatabaseManager(self.db_path)
+        self.db_manager.initialize_database()
+        self._add_individual('N1', 'Norte', 30, 'F')
+        self.store = ReportSnapshotStore.for_database(self.db_manager)
+
+    def tearDown(self):
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _add_individual(self, code, name, age, gender):
+        with self.db_manager.get_session() as session:
+            region = Region(code=code, name=name, state='AM', macro_region=name)
+            session.add(region)
+            session.flush()
+            household = Household(region_id=region.id, city='A', area_type='urbana',
+                                  income_range='1-2 SM', has_internet=True)
+            session.add(household)
+            session.flush()
+            session.add(Individual(household_id=household.id, age=age, gender=gender, has_disability=False))
+            session.commit()
+
+    def test_build_and_load(self):
+        """O snapshot guarda agregações, regiões e gráficos da versão atual"""
+        snapshot = self.store.build(self.db_manager, dpi=40)
+
+        self.assertEqual(snapshot.version, self.db_manager.get_data_version())
+        live = ReportAggregator(self.db_manager).get_aggregates(use_cache=False)
+        self.assertEqual(snapshot.aggregates, live)
+        self.assertEqual(list(snapshot.segments), ['Norte'])
+        self.assertTrue(snapshot.chart_png('gender').startswith(b'\x89PNG'))
+        for name in REPORT_SETS:
+            self.assertEqual(snapshot.report(name)['total'], 1)
+
+        # Outra loja (ex.: outro processo) lê o mesmo snapshot do disco
+        reloaded = ReportSnapshotStore.for_database(self.db_manager).current(self.db_manager)
+        self.assertEqual(reloaded.aggregates, live)
+
+    def test_version_survives_restart(self):
+        """A versão registrada continua válida ao reabrir o banco"""
+        snapshot = self.store.build(self.db_manager, dpi=40)
+        self.db_manager.close()
+
+        self.db_manager = DatabaseManager(self.db_path)
+        self.db_manager.initialize_database()
+        self.assertIsNotNone(self.store.current(self.db_manager))
+        self.assertEqual(self.db_manager.get_data_version(), snapshot.version)
+
+    def test_new_data_invalidates_snapshot(self):
+        """Uma nova importação muda a versão e exige novo snapshot"""
+        first = self.store.build(self.db_manager, dpi=40)
+        self._add_individual('S1', 'Sul', 70, 'M')
+
+        self.assertIsNone(self.store.current(self.db_manager))
+        second = self.store.build(self.db_manager, dpi=40)
+        self.assertNotEqual(second.version, first.version)
+        self.assertEqual(second.aggregates['total'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
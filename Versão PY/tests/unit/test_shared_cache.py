@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para SharedCache
+"""
+
+import unittest
+import tempfile
+import shutil
+import time
+import multiprocessing
+from pathlib import Path
+
+from src.utils.shared_cache import SharedCache
+
+
+def _compute_in_worker(cache_path, log_path):
+    """Executado em processo separado: calcula via get_or_set e registra execução"""
+    cache = SharedCache(path=cache_path)
+
+    def compute():
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write('computed\n')
+        time.sleep(0.3)
+        return {'total': 42}
+
+    return cache.get_or_set('agregado', compute)['total']
+
+
+class TestSharedCache(unittest.TestCase):
+    """Testes para SharedCache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = str(Path(self.temp_dir) / "shared_cache.db")
+        self.cache = SharedCache(path=self.cache_path)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_set_and_get(self):
+        """Valores publicados são lidos de volta"""
+        self.cache.set('chave', {'regioes': 5})
+        self.assertEqual(self.cache.get('chave'), {'regioes': 5})
+        self.assertIsNone(self.cache.get('inexistente'))
+
+    def test_ttl_expiration(self):
+        """Entradas expiradas não são retornadas"""
+        self.cache.set('curta', 1, ttl=1)
+        self.cache._connect().execute("UPDATE cache_entries SET expires_at = 0 WHERE key = 'curta'")
+        self.assertIsNone(self.cache.get('curta'))
+
+    def test_visible_across_instances(self):
+        """Outra instância (outro worker) enxerga a mesma entrada"""
+        self.cache.set('compartilhada', [1, 2, 3])
+        other = SharedCache(path=self.cache_path)
+        try:
+            self.assertEqual(other.get('compartilhada'), [1, 2, 3])
+        finally:
+            other.close()
+
+    def test_get_or_set_computes_once_across_processes(self):
+        """Apenas um processo calcula o valor; os demais reutilizam"""
+        log_path = str(Path(self.temp_dir) / "compute.log")
+        with multiprocessing.Pool(4) as pool:
+            results = pool.starmap(_compute_in_worker, [(self.cache_path, log_path)] * 4)
+
+        self.assertEqual(results, [42, 42, 42, 42])
+        with open(log_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_clear(self):
+        """Limpeza remove todas as entradas"""
+        self.cache.set('a', 1)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get_stats()['size'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para a subida da API com vários workers
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.database.database_manager import DatabaseManager
+from src.utils.file_lock import FileLock, FileLockTimeout
+from src.utils.intelligent_cache import get_global_cache
+from src.utils.shared_cache import SharedCache
+from web.backend.app.main import app
+from web.backend.app.services.db import get_db_manager
+
+
+class TestStartup(unittest.TestCase):
+    """Testes para FileLock, initialize_database_once e /api/ready"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "test.db")
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_file_lock_is_exclusive(self):
+        """Uma segunda trava sobre o mesmo arquivo espera até o tempo limite"""
+        path = os.path.join(self.temp_dir, "x.lock")
+        with FileLock(path):
+            with self.assertRaises(FileLockTimeout):
+                FileLock(path, timeout=0.1).acquire()
+        with FileLock(path, timeout=0.1):
+            pass
+
+    def test_maintenance_runs_once(self):
+        """O primeiro processo cria o esquema; os seguintes só abrem o banco"""
+        first = DatabaseManager(self.db_path)
+        self.assertTrue(first.initialize_database_once())
+        second = DatabaseManager(self.db_path)
+        self.assertFalse(second.initialize_database_once())
+        self.assertGreater(second.count_records("Region"), 0)
+
+        # Registro vencido (ou de outro esquema) volta a executar a manutenção
+        third = DatabaseManager(self.db_path)
+        self.assertTrue(third.initialize_database_once(max_age=0))
+        for db in (first, second, third):
+            db.close()
+
+    def test_ready_after_startup(self):
+        """/api/ready só responde 200 depois do aquecimento do lifespan"""
+        db = DatabaseManager(self.db_path)
+        db.initialize_database_once()
+        app.dependency_overrides[get_db_manager] = lambda: db
+        self.assertFalse(getattr(app.state, "ready", False))
+        # Importar a aplicação não troca o cache global do processo
+        self.assertNotIsInstance(get_global_cache(), SharedCache)
+        with TestClient(app) as client:
+            self.assertIsInstance(get_global_cache(), SharedCache)
+            response = client.get("/api/ready")
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertEqual(body["status"], "ready")
+            self.assertEqual(set(body["startup"]), {"database", "pool", "resumo", "individuos", "db_status"})
+            self.assertFalse(any("error" in step for step in body["startup"].values()))
+            self.assertEqual(client.get("/api/health").json(), {"status": "ok"})
+        self.assertFalse(app.state.ready)
+        self.assertNotIsInstance(get_global_cache(), SharedCache)
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para a exportação em fluxo (CSV/XLSX)
+"""
+
+import csv
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+from src.database.database_manager import DatabaseManager
+from src.database.models import Region, Household, Individual, DeviceUsage
+from src.modules.query_engine import QueryEngine, EXPORT_COLUMNS
+from src.modules.streaming_export import write_csv, write_xlsx, write_rows, parquet_available
+from src.utils.background_job import BackgroundJob
+
+
+class TestStreamingWriters(unittest.TestCase):
+    """Testes para write_csv e write_xlsx"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_csv(self):
+        """Linhas gravadas a partir de um gerador"""
+        path = str(self.temp_dir / 'dados.csv')
+        rows = ((i, f'nome {i}') for i in range(12))
+        self.assertEqual(write_csv(path, ['ID', 'Nome'], rows), 12)
+
+        with open(path, encoding='utf-8-sig', newline='') as handle:
+            lines = list(csv.reader(handle))
+        self.assertEqual(lines[0], ['ID', 'Nome'])
+        self.assertEqual(lines[-1], ['11', 'nome 11'])
+
+    def test_xlsx_sheet_split(self):
+        """Nova aba ao atingir o limite de linhas (cabeçalho incluído)"""
+        path = str(self.temp_dir / 'dados.xlsx')
+        written = write_xlsx(path, ['ID'], ((i,) for i in range(10)), max_rows=4)
+        self.assertEqual(written, 10)
+
+        workbook = load_workbook(path, read_only=True)
+        self.assertEqual(workbook.sheetnames, ['Dados', 'Dados (2)', 'Dados (3)', 'Dados (4)'])
+        self.assertEqual([row[0] for row in workbook['Dados (4)'].values], ['ID', 9])
+        workbook.close()
+
+    def test_interrupted_write_leaves_no_file(self):
+        """Exceção no progresso (cancelamento) descarta o arquivo parcial"""
+        def progress(written):
+            raise RuntimeError('cancelado')
+
+        with self.assertRaises(RuntimeError):
+            write_csv(str(self.temp_dir / 'dados.csv'), ['ID'], ((i,) for i in range(3)), progress=progress)
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+
+class TestExportRows(unittest.TestCase):
+    """Testes para QueryEngine.iter_export_rows"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(str(Path(self.temp_dir) / "test_dac.db"))
+        self.db_manager.initialize_database()
+
+        with self.db_manager.get_session() as session:
+            region = Region(code='TST', name='Teste', state='TS', macro_region='Sul')
+            session.add(region)
+            session.flush()
+            household = Household(region_id=region.id, city='A', area_type='urbana',
+                                  income_range='1-2 SM', has_internet=True)
+            session.add(household)
+            session.flush()
+            people = [
+                Individual(household_id=household.id, age=25, gender='F', has_disability=False),
+                Individual(household_id=household.id, age=None, gender=None, has_disability=True),
+            ]
+            session.add_all(people)
+            session.flush()
+            session.add(DeviceUsage(individual_id=people[0].id, device_type='Celular', has_device=True))
+            session.commit()
+
+    def tearDown(self):
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_rows(self):
+        """Linhas formatadas com dispositivos agregados no banco"""
+        engine = QueryEngine(self.db_manager)
+        rows = list(engine.iter_export_rows({}, batch_size=1))
+
+        self.assertEqual(len(rows[0]), len(EXPORT_COLUMNS))
+        self.assertEqual(rows[0][1:], ('Teste', 25, 'F', '1-2 SM', 'Não', 'Sim', 'Celular'))
+        self.assertEqual(rows[1][1:], ('Teste', 'N/A', 'N/A', '1-2 SM', 'Sim', 'Sim', 'Nenhum'))
+
+        dataset = engine.get_report_dataset({})
+        self.assertEqual(list(dataset.iter_export_rows()), rows)
+        self.assertEqual(list(engine.iter_export_rows({}, ids=[rows[1][0]])), rows[1:])
+
+    def test_export_all_matches_in_background(self):
+        """Todos os registros filtrados exportados em segundo plano, com progresso"""
+        engine = QueryEngine(self.db_manager)
+        path = str(Path(self.temp_dir) / 'todos.csv')
+        filters = {'disability': 'Sim'}
+
+        def export(job):
+            total = engine.count_results(filters)
+            return write_rows(path, EXPORT_COLUMNS, engine.iter_export_rows(filters),
+                              progress=lambda n: job.report(n, total))
+
+        job = BackgroundJob(export).start()
+        self.assertTrue(job.wait(30))
+        self.assertEqual(job.status, BackgroundJob.DONE)
+        self.assertEqual(job.result, 1)
+        self.assertEqual(job.progress[:2], (1, 1))
+
+    @unittest.skipUnless(parquet_available(), "pyarrow não instalado")
+    def test_parquet(self):
+        """Exportação em Parquet (opcional)"""
+        import pyarrow.parquet as pq
+
+        path = str(Path(self.temp_dir) / 'dados.parquet')
+        written = write_rows(path, EXPORT_COLUMNS, QueryEngine(self.db_manager).iter_export_rows({}))
+        self.assertEqual(written, 2)
+        self.assertEqual(pq.read_table(path).column_names, EXPORT_COLUMNS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Testes unitários para a medição de desempenho por requisição
+"""
+
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from web.backend.app.middleware.tracing import TracingMiddleware
+from web.backend.app.services.tracing import MetricsRegistry, instrument_engine, percentile, record_timing
+
+
+class TestTracing(unittest.TestCase):
+    """Testes para Server-Timing, contagem de SQL e percentis por rota"""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        instrument_engine(self.engine)
+        instrument_engine(self.engine)
+        self.registry = MetricsRegistry(window=100)
+
+        app = FastAPI()
+
+        @app.get("/api/itens/{item}")
+        def item(item: int):
+            with self.engine.connect() as conn:
+                for _ in range(item):
+                    conn.execute(text("SELECT 1"))
+            return {"item": item}
+
+        @app.get("/api/medido")
+        def medido():
+            record_timing("calculo", 12.5, "cache")
+            return {}
+
+        app.add_middleware(TracingMiddleware, registry=self.registry)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_server_timing_and_sql_count(self):
+        """Cabeçalho com tempo total e SQL da requisição (rotas síncronas em threads)"""
+        response = self.client.get("/api/itens/3")
+        timing = response.headers["server-timing"]
+        self.assertTrue(timing.startswith("app;dur="))
+        self.assertIn('desc="3 SQL"', timing)
+        self.assertIn("db-max;dur=", timing)
+
+        routes = self.registry.snapshot()["routes"]
+        self.assertEqual(list(routes), ["GET /api/itens/{item}"])
+        self.assertEqual(routes["GET /api/itens/{item}"]["sql_statements_avg"], 3)
+
+        # Medições registradas pela rota entram no mesmo cabeçalho
+        timing = self.client.get("/api/medido").headers["server-timing"]
+        self.assertIn('calculo;dur=12.5;desc="cache"', timing)
+
+    def test_percentiles(self):
+        """Percentil por posição mais próxima e janela por rota"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+
+        for item in (1, 2, 1):
+            self.client.get(f"/api/itens/{item}")
+        self.client.get("/api/inexistente")
+        routes = self.registry.snapshot()["routes"]
+        self.assertEqual(routes["GET /api/itens/{item}"]["count"], 3)
+        self.assertIn("GET (sem rota)", routes)
+
+
+if __name__ == '__main__':
+    unittest.main()
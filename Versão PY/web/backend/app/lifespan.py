@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Inicialização e encerramento da API (lifespan do FastAPI).
+
+Na subida de cada worker, antes de aceitar requisições:
+  1. abre o banco; esquema e manutenção rodam uma única vez entre os
+     workers (`DatabaseManager.initialize_database_once`, com trava em arquivo);
+  2. instala o cache compartilhado entre workers como backend do `@cached`
+     (restaurado no encerramento);
+  3. abre conexões do pool da camada assíncrona;
+  4. aquece o cache do resumo, a primeira página de indivíduos e a primeira
+     amostra do coletor de status.
+
+Só depois disso `/api/ready` responde 200; `/api/health` apenas indica que o
+processo está no ar. Falhas no aquecimento são registradas e não impedem a
+subida; falhas ao abrir o banco, sim.
+"""
+
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict
+
+from anyio import to_thread
+from fastapi import FastAPI
+
+from .routers.db_status import FIRST_SAMPLE_TIMEOUT, get_status_collector
+from .routers.estatisticas import coletar_resumo
+from .routers.stream import close_live_hubs
+from .services.db import get_async_db, get_db_manager, get_shared_cache
+from .services.individuos import pagina_individuos
+from src.utils.intelligent_cache import get_global_cache, set_global_cache  # type: ignore
+from src.utils.logger import get_logger  # type: ignore
+
+logger = get_logger(__name__)
+
+# Conexões abertas no pool de cada worker durante a subida
+WARM_CONNECTIONS = 4
+
+
+def _db_provider(app: FastAPI) -> Callable:
+    """`get_db_manager` da aplicação (respeita dependency_overrides de testes e benchmarks)"""
+    return app.dependency_overrides.get(get_db_manager, get_db_manager)
+
+
+async def _etapa(steps: Dict[str, Any], name: str, func: Callable[[], Awaitable[Any]],
+                 required: bool = False) -> Any:
+    """Executa uma etapa da subida registrando a duração (ms) ou o erro"""
+    start = time.perf_counter()
+    try:
+        result = await func()
+    except Exception as e:
+        steps[name] = {"ms": round((time.perf_counter() - start) * 1000, 1), "error": str(e)}
+        if required:
+            raise
+        logger.warning(f"Aquecimento '{name}' falhou: {e}")
+        return None
+    steps[name] = {"ms": round((time.perf_counter() - start) * 1000, 1)}
+    return result
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.startup = steps = {}
+    start = time.perf_counter()
+
+    # DatabaseManager em thread: a primeira inicialização pode aguardar a trava de outro worker
+    db = await _etapa(steps, "database", lambda: to_thread.run_sync(_db_provider(app)), required=True)
+    adb = get_async_db(db)
+    cache = get_shared_cache()
+    # Agregados calculados via @cached passam a ser compartilhados entre workers
+    previous_cache = get_global_cache()
+    set_global_cache(cache)
+    await _etapa(steps, "pool", lambda: adb.warm(WARM_CONNECTIONS))
+    await _etapa(steps, "resumo", lambda: coletar_resumo(db, adb, cache))
+    await _etapa(steps, "individuos", lambda: pagina_individuos(adb, 1, 10, None, None, None))
+    collector = get_status_collector(db)
+    await _etapa(steps, "db_status", lambda: adb.run_sync(collector.wait, FIRST_SAMPLE_TIMEOUT))
+
+    app.state.startup_ms = round((time.perf_counter() - start) * 1000, 1)
+    app.state.ready = True
+    logger.log_with_context(logging.INFO, f"API pronta em {app.state.startup_ms} ms",
+                            context={"startup": steps})
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        await close_live_hubs()
+        collector.stop(timeout=2.0)
+        await adb.dispose()
+        set_global_cache(previous_cache)
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 """Aplicação FastAPI principal do DAC Web v0.
 
-Inicializa a aplicação, configura CORS e registra rotas de API.
+Inicializa a aplicação, configura medição de desempenho, CORS, cache HTTP e
+compressão e registra rotas de API. A subida de cada worker (esquema uma vez
+entre os workers, pool e caches aquecidos) fica em `lifespan`; `/api/ready`
+só responde 200 depois dela.
 """
 
 from fastapi import FastAPI
@@ -11,8 +14,29 @@ from .routers.health import router as health_router
 from .routers.estatisticas import router as estatisticas_router
 from .routers.individuos import router as individuos_router
 from .routers.db_status import router as db_status_router
+from .routers.relatorios import router as relatorios_router
+from .routers.stream import router as stream_router
+from .routers.metrics import router as metrics_router
+from .routers.batch import router as batch_router
+from .middleware.http_cache import HTTPCacheMiddleware
+from .middleware.compression import CompressionMiddleware
+from .middleware.tracing import TracingMiddleware
+from .lifespan import lifespan
+from .services.db import get_db_manager
+from .services.serialization import FastJSONResponse
 
-app = FastAPI(title="DAC Web v0", version="0.1.0")
+app = FastAPI(title="DAC Web v0", version="0.1.0", default_response_class=FastJSONResponse,
+              lifespan=lifespan)
+
+
+def _current_db_manager():
+    """DatabaseManager da aplicação (respeita dependency_overrides de testes e benchmarks)"""
+    return app.dependency_overrides.get(get_db_manager, get_db_manager)()
+
+
+# ETag/Last-Modified pela versão dos dados, 304 e corpos em memória
+# (registrado antes do CORS para que as respostas 304 também recebam seus cabeçalhos)
+app.add_middleware(HTTPCacheMiddleware, db_provider=_current_db_manager)
 
 # CORS para permitir acesso do frontend Next.js
 app.add_middleware(
@@ -23,8 +47,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compressão (brotli se instalado, senão gzip) de respostas a partir de 1 KB
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+# Server-Timing, log estruturado e percentis por rota (mais externo: mede o tempo total)
+app.add_middleware(TracingMiddleware)
+
 # Registrar rotas
 app.include_router(health_router, prefix="/api", tags=["health"])
 app.include_router(estatisticas_router, prefix="/api/estatisticas", tags=["estatisticas"])
 app.include_router(individuos_router, prefix="/api", tags=["individuos"])
-app.include_router(db_status_router, prefix="/api", tags=["db"])
\ No newline at end of file
+app.include_router(db_status_router, prefix="/api", tags=["db"])
+app.include_router(relatorios_router, prefix="/api/relatorios", tags=["relatorios"])
+app.include_router(stream_router, prefix="/api", tags=["stream"])
+app.include_router(metrics_router, prefix="/api", tags=["metrics"])
+app.include_router(batch_router, prefix="/api", tags=["batch"])
@@ -0,0 +1 @@
+"""Middlewares da API do DAC Web v0."""
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""Compressão das respostas da API (brotli quando disponível, senão gzip).
+
+Apenas conteúdos textuais acima de `minimum_size` bytes são comprimidos;
+imagens e `text/event-stream` passam direto. Respostas com ETag (versão dos
+dados) guardam o corpo já comprimido, e respostas em fluxo são comprimidas
+bloco a bloco, com flush, para que cada linha chegue ao cliente sem atraso.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/", "application/javascript",
+                      "image/svg+xml")
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Escolhe 'br' ou 'gzip' conforme Accept-Encoding (respeitando q=0)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", accepted.get("*", 0)) > 0:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    """Compressor incremental com a mesma interface para gzip e brotli"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._impl = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._impl = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        if self.encoding == "br":
+            out = self._impl.process(data)
+            return out + self._impl.flush() if flush else out
+        out = self._impl.compress(data)
+        return out + self._impl.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        return self._impl.finish() if self.encoding == "br" else self._impl.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Middleware ASGI de compressão com limiar de tamanho e cache de corpos comprimidos"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 max_cached: int = 128):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.max_cached = max_cached
+        self._cached: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        encoding = None
+        if scope["type"] == "http":
+            encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self, scope, encoding)(receive, send)
+
+    def compress(self, key: Optional[tuple], encoding: str, body: bytes) -> bytes:
+        """Comprime o corpo inteiro, reaproveitando o resultado de respostas com ETag"""
+        if key is not None:
+            with self._lock:
+                cached = self._cached.get(key)
+                if cached is not None:
+                    self._cached.move_to_end(key)
+                    return cached
+        compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+        compressed = compressor.compress(body) + compressor.finish()
+        if key is not None:
+            with self._lock:
+                self._cached[key] = compressed
+                while len(self._cached) > self.max_cached:
+                    self._cached.popitem(last=False)
+        return compressed
+
+
+class _CompressionResponder:
+    """Estado de uma resposta em compressão"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.start_message = None
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+        self.cache_key: Optional[tuple] = None
+
+    async def __call__(self, receive, send):
+        self.send = send
+        await self.middleware.app(self.scope, receive, self.send_compressed)
+
+    def _set_headers(self, streaming: bool, length: int = 0):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        if streaming:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+        headers.add_vary_header("Accept-Encoding")
+
+    async def send_compressed(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = {**message, "headers": list(message.get("headers", []))}
+            headers = Headers(raw=self.start_message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = ("content-encoding" in headers
+                                or content_type.startswith(EXCLUDED_TYPES)
+                                or not content_type.startswith(COMPRESSIBLE_TYPES))
+            if self.passthrough:
+                await self.send(self.start_message)
+            elif message["status"] == 200 and headers.get("etag"):
+                # Só respostas de sucesso: um erro com o mesmo ETag não pode ser reaproveitado
+                self.cache_key = (self.scope["path"], self.scope.get("query_string", b""),
+                                  headers["etag"], self.encoding)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None and self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body:
+                if len(body) < self.middleware.minimum_size:
+                    await self.send(start)
+                    await self.send(message)
+                    return
+                self.start_message = start
+                body = self.middleware.compress(self.cache_key, self.encoding, body)
+                self._set_headers(streaming=False, length=len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            # Resposta em fluxo
+            self.start_message = start
+            self._set_headers(streaming=True)
+            await self.send(self.start_message)
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level,
+                                          self.middleware.brotli_quality)
+
+        if more_body:
+            await self.send({"type": "http.response.body", "body": self.compressor.compress(body, flush=True),
+                             "more_body": True})
+        else:
+            await self.send({"type": "http.response.body",
+                             "body": self.compressor.compress(body) + self.compressor.finish()})
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Cache HTTP das rotas de leitura, validado pela versão dos dados.
+
+Toda resposta GET de `/api` recebe `ETag` (versão dos dados) e
+`Last-Modified` (última escrita no banco), ambos obtidos apenas com `stat`
+dos arquivos do SQLite. Requisições com `If-None-Match` / `If-Modified-Since`
+ainda válidos recebem 304 sem executar a rota, e os corpos das respostas 200
+(já serializados) ficam em memória até a versão dos dados mudar.
+"""
+
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+
+# Rotas que não dependem (só) dos dados: saúde, status do servidor, eventos ao vivo e métricas
+DEFAULT_EXCLUDE = ("/api/health", "/api/ready", "/api/db/status", "/api/stream", "/api/metrics")
+
+
+def _if_none_match(value: str, etag: str) -> bool:
+    """Compara If-None-Match com a ETag (comparação fraca, aceita lista e *)"""
+    if value.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in value.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _not_modified_since(value: str, modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # Last-Modified tem resolução de segundos
+    return int(modified) <= since
+
+
+class HTTPCacheMiddleware:
+    """Middleware ASGI com validadores por versão dos dados e cache de corpos em memória"""
+
+    def __init__(self, app, db_provider: Callable, prefix: str = "/api",
+                 exclude: Iterable[str] = DEFAULT_EXCLUDE, max_entries: int = 256,
+                 max_body: int = 2 * 1024 * 1024):
+        self.app = app
+        self.db_provider = db_provider
+        self.prefix = prefix
+        self.exclude = tuple(exclude)
+        self.max_entries = max_entries
+        self.max_body = max_body
+        self._entries: "OrderedDict[Tuple, Tuple[int, List, bytes]]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.not_modified = 0
+
+    def _cacheable(self, scope) -> bool:
+        if scope["type"] != "http":
+            return False
+        path = scope["path"]
+        return (scope["method"] == "GET"
+                and path.startswith(self.prefix) and not path.startswith(self.exclude))
+
+    def _get(self, key: Tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def _store(self, key: Tuple, entry: Tuple[int, List, bytes]) -> None:
+        with self._lock:
+            # Corpos de versões anteriores nunca mais serão servidos
+            if key[0] != self._version:
+                self._entries.clear()
+                self._version = key[0]
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def __call__(self, scope, receive, send):
+        if not self._cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        db = self.db_provider()
+        version = db.get_data_version()
+        modified = db.get_data_modified()
+        validators = [
+            (b"etag", f'W/"{version}"'.encode()),
+            (b"last-modified", formatdate(modified, usegmt=True).encode()),
+            (b"cache-control", b"no-cache"),
+        ]
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        if_modified_since = request_headers.get("if-modified-since")
+        if (if_none_match is not None and _if_none_match(if_none_match, f'W/"{version}"')) or (
+                if_none_match is None and if_modified_since and _not_modified_since(if_modified_since, modified)):
+            self.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        key = (version, scope["path"], scope.get("query_string", b""))
+        # "Cache-Control: no-cache" na requisição força a execução da rota
+        entry = None if "no-cache" in request_headers.get("cache-control", "") else self._get(key)
+        if entry is not None:
+            status, headers, body = entry
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        captured = {"status": 0, "headers": [], "chunks": [], "size": 0, "store": False}
+
+        async def send_with_validators(message):
+            if message["type"] == "http.response.start":
+                headers = [(name, value) for name, value in message.get("headers", [])
+                           if name.lower() not in (b"etag", b"last-modified", b"cache-control")]
+                response_headers = Headers(raw=message.get("headers", []))
+                streaming = response_headers.get("content-type", "").startswith("text/event-stream")
+                no_store = "no-store" in response_headers.get("cache-control", "")
+                if not streaming and not no_store:
+                    headers += validators
+                else:
+                    headers = list(message.get("headers", []))
+                captured.update(status=message["status"], headers=headers,
+                                store=message["status"] == 200 and not streaming and not no_store
+                                and "set-cookie" not in response_headers)
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body" and captured["store"]:
+                captured["size"] += len(message.get("body", b""))
+                if captured["size"] > self.max_body:
+                    captured.update(store=False, chunks=[])
+                else:
+                    captured["chunks"].append(message.get("body", b""))
+                if not message.get("more_body", False) and captured["store"]:
+                    self._store(key, (captured["status"], captured["headers"], b"".join(captured["chunks"])))
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Medição de desempenho de cada requisição da API.
+
+Registrado como middleware mais externo: mede o tempo total (inclusive
+cache HTTP e compressão), envia `Server-Timing` com o tempo até os
+cabeçalhos, o tempo total de SQL e o comando mais lento, grava uma linha de
+log estruturada ao fim da resposta e alimenta os percentis por rota de
+`/api/metrics`.
+"""
+
+import logging
+from typing import Iterable
+
+from src.utils.logger import get_logger  # type: ignore
+
+from ..services.tracing import MetricsRegistry, RequestTrace, current_trace, metrics_registry
+
+logger = get_logger(__name__)
+
+# Conexões longas (SSE) e a própria rota de métricas não entram nos percentis
+DEFAULT_EXCLUDE = ("/api/stream", "/api/metrics", "/api/ready")
+# Requisições a partir deste tempo são registradas como aviso
+SLOW_REQUEST_MS = 1000.0
+
+
+def _route_name(scope, status: int) -> str:
+    """Rota com parâmetros ("GET /api/relatorios/{tipo}"), sem caminhos arbitrários"""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if path is None:
+        # Respostas do cache HTTP não chegam ao roteador; só caminhos válidos ficam em cache
+        path = scope["path"] if status < 400 else "(sem rota)"
+    return f"{scope['method']} {path}"
+
+
+class TracingMiddleware:
+    """Middleware ASGI com Server-Timing, log estruturado e percentis por rota"""
+
+    def __init__(self, app, prefix: str = "/api", exclude: Iterable[str] = DEFAULT_EXCLUDE,
+                 registry: MetricsRegistry = metrics_registry, slow_ms: float = SLOW_REQUEST_MS):
+        self.app = app
+        self.prefix = prefix
+        self.exclude = tuple(exclude)
+        self.registry = registry
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith(self.prefix) or path.startswith(self.exclude):
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = current_trace.set(trace)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_trace.reset(token)
+            duration_ms = trace.elapsed_ms()
+            route = _route_name(scope, status)
+            self.registry.record(route, duration_ms, trace, status)
+            logger.log_with_context(
+                logging.WARNING if duration_ms >= self.slow_ms else logging.INFO,
+                f"{route} {status} {duration_ms:.1f}ms ({trace.statements} SQL, {trace.sql_ms:.1f}ms)",
+                context={
+                    "route": route,
+                    "path": path,
+                    "status": status,
+                    "duration_ms": round(duration_ms, 2),
+                    "sql_statements": trace.statements,
+                    "sql_ms": round(trace.sql_ms, 2),
+                    "sql_slowest_ms": round(trace.slowest_ms, 2),
+                    "sql_slowest": trace.slowest_sql,
+                },
+            )
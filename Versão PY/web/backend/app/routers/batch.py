@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Várias consultas do frontend numa única requisição.
+
+`POST /api/batch` recebe consultas nomeadas e devolve o resultado de cada uma
+no mesmo formato da rota equivalente:
+
+    {"consultas": {"resumo": {"op": "resumo"},
+                   "pagina": {"op": "individuos", "page": 1, "limit": 10}}}
+
+As consultas ao banco compartilham uma conexão com uma única transação de
+leitura (mesmo snapshot dos dados), sem passar pelo cache compartilhado
+nem por cálculos em andamento de outras requisições; o restante (health,
+status do coletor) roda em paralelo. O erro de uma consulta não derruba as demais: cada
+resultado traz o próprio `status`.
+"""
+
+import asyncio
+from typing import Annotated, Dict, Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+
+from ..services.db import get_async_db, get_db_manager
+from ..services.individuos import pagina_individuos
+from .db_status import coletar_status, get_status_collector
+from .estatisticas import resumo_snapshot
+from src.utils.logger import get_logger  # type: ignore
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+# Consultas aceitas por lote
+MAX_CONSULTAS = 10
+
+
+class ConsultaSimples(BaseModel):
+    op: Literal["health", "resumo", "db_status"]
+
+
+class ConsultaIndividuos(BaseModel):
+    op: Literal["individuos"]
+    page: int = Field(1, ge=1)
+    limit: int = Field(10, ge=1, le=200)
+    idade: Optional[int] = Field(None, ge=0)
+    genero: Optional[str] = None
+    regiao_id: Optional[int] = Field(None, ge=1)
+
+
+Consulta = Annotated[Union[ConsultaSimples, ConsultaIndividuos], Field(discriminator="op")]
+
+
+class Lote(BaseModel):
+    consultas: Dict[str, Consulta] = Field(..., min_length=1, max_length=MAX_CONSULTAS)
+
+
+async def _executar(consulta, db, snapshot, adb) -> dict:
+    if consulta.op == "health":
+        return {"status": "ok"}
+    if consulta.op == "resumo":
+        return await resumo_snapshot(snapshot)
+    if consulta.op == "db_status":
+        return await coletar_status(get_status_collector(db), adb)
+    return await pagina_individuos(snapshot, consulta.page, consulta.limit, consulta.idade,
+                                   consulta.genero, consulta.regiao_id)
+
+
+async def _resultado(nome: str, consulta, db, snapshot, adb) -> dict:
+    try:
+        return {"status": 200, "data": await _executar(consulta, db, snapshot, adb)}
+    except HTTPException as e:
+        return {"status": e.status_code, "detail": e.detail}
+    except Exception as e:
+        logger.error(f"Consulta '{nome}' ({consulta.op}) do lote falhou: {e}")
+        return {"status": 500, "detail": str(e)}
+
+
+@router.post("/batch")
+async def batch(lote: Lote, db = Depends(get_db_manager), adb = Depends(get_async_db)):
+    data_version = db.get_data_version()
+    async with adb.snapshot() as snapshot:
+        resultados = await asyncio.gather(*(_resultado(nome, consulta, db, snapshot, adb)
+                                            for nome, consulta in lote.consultas.items()))
+    return {"data_version": data_version, "resultados": dict(zip(lote.consultas, resultados))}
@@ -1,103 +1,152 @@
 # -*- coding: utf-8 -*-
 """Endpoint de status do banco para consumo pelo frontend.
 
-Tenta usar conexão universal (Postgres/MySQL/SQLite) e, na ausência,
-mantém o comportamento anterior com DatabaseManager (SQLite).
+As métricas são amostradas em segundo plano por um coletor único
+(`src.database.metrics_collector`); a rota só lê a amostra mais recente e o
+histórico para os gráficos. Com `DATABASE_URL` apontando para Postgres, o
+coletor usa a conexão universal; caso contrário, o DatabaseManager (SQLite).
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from pathlib import Path
 from datetime import datetime
 
-from ..services.db import get_db_manager, get_sqlalchemy_universal
+from ..services.admission import SingleFlight
+from ..services.db import get_async_db, get_db_manager, get_sqlalchemy_universal
+from src.database.metrics_collector import get_metrics_collector, get_sqlite_collector  # type: ignore
+from src.database.universal import resolve_database_url  # type: ignore
 from sqlalchemy import text
 
 router = APIRouter()
 
+# Séries devolvidas em `historico` (últimas HISTORY_POINTS amostras)
+HISTORY_SERIES = ("database_size_bytes", "total_rows", "wal_bytes", "sample_ms")
+HISTORY_POINTS = 60
+# Espera máxima pela primeira amostra (s)
+FIRST_SAMPLE_TIMEOUT = 10.0
+
+# Requisições da partida a frio aguardam a primeira amostra numa única thread
+_primeiras_amostras = SingleFlight()
+
+
+def _postgres_sampler(engine):
+    def sample():
+        try:
+            return _postgres_sample(engine)
+        except Exception as e:
+            error = f"Falha ao obter status do banco: {e}"
+            return {"connected": False, "payload": {"connected": False, "error": error}, "metrics": {}}
+    return sample
+
+
+def _postgres_sample(engine):
+    """Consultas de catálogo do Postgres (executadas na thread do coletor)"""
+    with engine.connect() as conn:
+        basic = conn.execute(text("""
+            select version(), current_user as user, current_database() as database, now() as server_time,
+                   to_char(date_trunc('second', now() - pg_postmaster_start_time()), 'DD "d" HH24:MI:SS') as uptime
+        """)).first()
+        tables = conn.execute(text("""
+            select count(*)::int from information_schema.tables where table_schema='public' and table_type='BASE TABLE'
+        """)).scalar()
+        indexes = conn.execute(text("""
+            select count(*)::int from pg_indexes where schemaname='public'
+        """)).scalar()
+        conns = conn.execute(text("""
+            select count(*)::int from pg_stat_activity where datname = current_database()
+        """)).scalar()
+        sizes = conn.execute(text("""
+            select pg_database_size(current_database())::bigint as db_bytes,
+                   coalesce(sum(pg_total_relation_size(format('%I.%I', n.nspname, c.relname))),0)::bigint as tables_bytes
+            from pg_class c
+            join pg_namespace n on n.oid = c.relnamespace
+            where n.nspname = 'public' and c.relkind='r'
+        """)).first()
+        top = conn.execute(text("""
+            select c.relname as name, pg_total_relation_size(format('%I.%I', n.nspname, c.relname))::bigint as total_bytes
+            from pg_class c
+            join pg_namespace n on n.oid = c.relnamespace
+            where n.nspname='public' and c.relkind='r'
+            order by total_bytes desc
+            limit 5
+        """)).mappings().all()
+
+    payload = {
+        "connected": True,
+        "version": basic[0],
+        "user": basic[1],
+        "database": basic[2],
+        "server_time": str(basic[3]),
+        "uptime": basic[4],
+        "totals": {
+            "tables": int(tables or 0),
+            "indexes": int(indexes or 0),
+            "connections": int(conns or 0),
+            "db_bytes": int(sizes[0] or 0),
+            "tables_bytes": int(sizes[1] or 0),
+        },
+        "top_tables": [{"name": t["name"], "total_bytes": int(t["total_bytes"] or 0)} for t in top],
+    }
+    return {
+        "connected": True,
+        "payload": payload,
+        "metrics": {"database_size_bytes": payload["totals"]["db_bytes"],
+                    "connections": payload["totals"]["connections"]},
+    }
+
+
+def _sqlite_payload(sample) -> dict:
+    server = sample.get("status") or {}
+    perf = sample.get("performance") or {}
+    return {
+        "connected": bool(sample.get("connected")),
+        "version": f"SQLite {server.get('sqlite_version')}",
+        "user": "sqlite",
+        "database": Path(server.get("database_path") or "dac_database.db").name,
+        "server_time": server.get("server_time") or datetime.now().isoformat(timespec="seconds"),
+        "uptime": server.get("uptime_human") or "0s",
+        "totals": {
+            "tables": int(server.get("tables_count") or 0),
+            "indexes": int(server.get("indexes_count") or 0),
+            "connections": 1,
+            "db_bytes": int(perf.get("database_size_bytes") or 0),
+            "tables_bytes": int(perf.get("database_size_bytes") or 0),
+        },
+        "top_tables": [{"name": t["name"], "total_bytes": int(t.get("rows") or 0)}
+                       for t in (sample.get("top_tables") or [])],
+    }
+
+
+def get_status_collector(db = Depends(get_db_manager)):
+    """Coletor em segundo plano do banco em uso (iniciado no primeiro acesso)"""
+    url = resolve_database_url()
+    if url.startswith("postgresql"):
+        collector = get_metrics_collector(url, lambda: _postgres_sampler(get_sqlalchemy_universal().engine))
+    else:
+        collector = get_sqlite_collector(db)
+    return collector.start()
+
+
+async def coletar_status(collector, adb) -> dict:
+    sample = collector.latest()
+    if sample is None:
+        # Primeiro acesso: aguarda a amostra inicial sem bloquear o loop
+        sample = await _primeiras_amostras.run(
+            id(collector), lambda: adb.run_sync(collector.wait, FIRST_SAMPLE_TIMEOUT))
+    if sample is None:
+        return {"connected": False, "error": "Métricas do banco ainda não coletadas"}
 
-@router.get("/db/status")
-def db_status():
-    # Primeiro tenta conexão universal (Postgres/MySQL/SQLite)
-    try:
-        udb = get_sqlalchemy_universal()
-        st = udb.status()
-        if st.get("connected"):
-            dialect = st.get("dialect")
-            if dialect == "postgresql":
-                with udb.engine.connect() as conn:
-                    basic = conn.execute(text("""
-                        select version(), current_user as user, current_database() as database, now() as server_time,
-                               to_char(date_trunc('second', now() - pg_postmaster_start_time()), 'DD "d" HH24:MI:SS') as uptime
-                    """)) .first()
-                    tables = conn.execute(text("""
-                        select count(*)::int from information_schema.tables where table_schema='public' and table_type='BASE TABLE'
-                    """)).scalar()
-                    indexes = conn.execute(text("""
-                        select count(*)::int from pg_indexes where schemaname='public'
-                    """)).scalar()
-                    conns = conn.execute(text("""
-                        select count(*)::int from pg_stat_activity where datname = current_database()
-                    """)).scalar()
-                    sizes = conn.execute(text("""
-                        select pg_database_size(current_database())::bigint as db_bytes,
-                               coalesce(sum(pg_total_relation_size(format('%I.%I', n.nspname, c.relname))),0)::bigint as tables_bytes
-                        from pg_class c
-                        join pg_namespace n on n.oid = c.relnamespace
-                        where n.nspname = 'public' and c.relkind='r'
-                    """)).first()
-                    top = conn.execute(text("""
-                        select c.relname as name, pg_total_relation_size(format('%I.%I', n.nspname, c.relname))::bigint as total_bytes
-                        from pg_class c
-                        join pg_namespace n on n.oid = c.relnamespace
-                        where n.nspname='public' and c.relkind='r'
-                        order by total_bytes desc
-                        limit 5
-                    """)) .mappings().all()
-
-                return {
-                    "connected": True,
-                    "version": basic[0],
-                    "user": basic[1],
-                    "database": basic[2],
-                    "server_time": str(basic[3]),
-                    "uptime": basic[4],
-                    "totals": {
-                        "tables": int(tables or 0),
-                        "indexes": int(indexes or 0),
-                        "connections": int(conns or 0),
-                        "db_bytes": int(sizes[0] or 0),
-                        "tables_bytes": int(sizes[1] or 0),
-                    },
-                    "top_tables": [{"name": t["name"], "total_bytes": int(t["total_bytes"] or 0)} for t in top],
-                }
-
-            # Para SQLite/MySQL, retorna status simplificado via DatabaseManager
-    except Exception:
-        pass
-
-    # Fallback para SQLite via DatabaseManager
-    db = get_db_manager()
     try:
-        server = db.get_server_status()
-        perf = db.get_performance_metrics()
-        top = db.get_top_tables_by_rows(limit=5)
-
-        data = {
-            "connected": bool(server.get("connected")),
-            "version": f"SQLite {server.get('sqlite_version')}",
-            "user": "sqlite",
-            "database": Path(server.get("database_path") or "dac_database.db").name,
-            "server_time": server.get("server_time") or datetime.now().isoformat(timespec="seconds"),
-            "uptime": server.get("uptime_human") or "0s",
-            "totals": {
-                "tables": int(server.get("tables_count") or 0),
-                "indexes": int(server.get("indexes_count") or 0),
-                "connections": 1,
-                "db_bytes": int(perf.get("database_size_bytes") or 0),
-                "tables_bytes": int(perf.get("database_size_bytes") or 0),
-            },
-            "top_tables": [{"name": t["name"], "total_bytes": int(t.get("rows") or 0)} for t in (top or [])],
-        }
-        return data
+        data = sample["payload"] if "payload" in sample else _sqlite_payload(sample)
     except Exception as e:
-        return {"connected": False, "error": f"Falha ao obter status do banco: {e}"}
\ No newline at end of file
+        return {"connected": False, "error": f"Falha ao obter status do banco: {e}"}
+    return {
+        **data,
+        "sampled_at": datetime.fromtimestamp(sample["timestamp"]).isoformat(timespec="seconds"),
+        "history": {name: collector.history(name, HISTORY_POINTS) for name in HISTORY_SERIES},
+    }
+
+
+@router.get("/db/status")
+async def db_status(collector = Depends(get_status_collector), adb = Depends(get_async_db)):
+    return await coletar_status(collector, adb)
@@ -1,13 +1,47 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+import time
+from typing import List, Optional
 
-from ..services.db import get_db_manager
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+
+from ..services.admission import SingleFlight, get_limiter
+from ..services.db import get_async_db, get_db_manager, get_shared_cache
+from ..services.filters import filtros_consulta
+from ..services.tracing import record_timing
 
 router = APIRouter()
 
-@router.get("/resumo")
-def estatisticas_resumo(db = Depends(get_db_manager)):
-    stats = db.get_database_stats(use_cache=False) or {}
+# Tempo máximo (s) de espera pelo cálculo de uma tabela cruzada; depois disso
+# o cálculo continua em segundo plano e o cliente recebe 503 + Retry-After
+CROSSTAB_BUDGET = 2.0
+# Cubos calculados ao mesmo tempo (GROUP BY sobre toda a base)
+CROSSTAB_CONCURRENCY = 2
+
+# Cálculos em andamento (requisições iguais aguardam o mesmo)
+_resumos = SingleFlight()
+_cubos = SingleFlight()
+
+
+def _contagens():
+    """Contagens das cinco tabelas numa única consulta"""
+    from src.database.models import Region, Household, Individual, DeviceUsage, InternetUsage
+
+    return select(*(
+        select(func.count()).select_from(model).scalar_subquery().label(nome)
+        for nome, model in (
+            ("regions", Region),
+            ("households", Household),
+            ("individuals", Individual),
+            ("device_usage_records", DeviceUsage),
+            ("internet_usage_records", InternetUsage),
+        )
+    ))
+
+
+def _resumo(stats: dict) -> dict:
     # Mapear para nomes em português conforme especificação
     return {
         "regioes": stats.get("regions", 0),
@@ -23,4 +57,97 @@ def estatisticas_resumo(db = Depends(get_db_manager)):
             "dispositivos": 0,
             "internet": 0,
         },
-    }
\ No newline at end of file
+    }
+
+
+async def coletar_resumo(db, adb, cache) -> dict:
+    """Contagens do painel, por versão dos dados (reaproveitadas pelos demais workers)"""
+    key = f"estatisticas:resumo:{db.get_data_version()}"
+    stats = cache.get(key)
+    if stats is None:
+        stats = await _resumos.run(key, lambda: _calcular_resumo(key, adb, cache))
+    return _resumo(stats)
+
+
+async def resumo_snapshot(snapshot) -> dict:
+    """Contagens do painel lidas no snapshot de um lote (sem cache nem cálculo compartilhado)"""
+    row = await snapshot.mappings(_contagens())
+    return _resumo(row[0] if row else {})
+
+
+async def _calcular_resumo(key, adb, cache) -> dict:
+    row = await adb.mappings(_contagens())
+    stats = row[0] if row else {}
+    cache.set(key, stats, ttl=300)
+    return stats
+
+
+@router.get("/resumo")
+async def estatisticas_resumo(db = Depends(get_db_manager), adb = Depends(get_async_db),
+                              cache = Depends(get_shared_cache)):
+    return await coletar_resumo(db, adb, cache)
+
+
+def _dimensoes(valor: Optional[str]) -> List[str]:
+    return [nome.strip() for nome in (valor or "").split(",") if nome.strip()]
+
+
+async def _calcular_cubo(key, dimensoes, filters, db, adb, cache):
+    from src.modules.crosstab import build_cube  # type: ignore
+    from src.modules.query_engine import QueryEngine  # type: ignore
+
+    # Na fila, o tempo de espera conta para o CROSSTAB_BUDGET de quem aguarda
+    async with get_limiter("crosstab", CROSSTAB_CONCURRENCY, queue_timeout=30.0).slot():
+        rows = await adb.all(QueryEngine(db).crosstab_statement(dimensoes, filters))
+    cube = build_cube(dimensoes, rows)
+    cache.set(key, cube, ttl=300)
+    return cube
+
+
+@router.get("/crosstab")
+async def estatisticas_crosstab(
+    rows: str = Query(..., description="Dimensões das linhas, separadas por vírgula"),
+    cols: Optional[str] = Query(None, description="Dimensões das colunas, separadas por vírgula"),
+    measure: str = Query("contagem"),
+    filters = Depends(filtros_consulta),
+    db = Depends(get_db_manager),
+    adb = Depends(get_async_db),
+    cache = Depends(get_shared_cache),
+):
+    from src.modules.crosstab import DIMENSIONS, MEASURES, pivot, validate_dimensions  # type: ignore
+
+    linhas, colunas = _dimensoes(rows), _dimensoes(cols)
+    try:
+        validate_dimensions(linhas, colunas)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if measure not in MEASURES:
+        raise HTTPException(status_code=422, detail=f"Medida desconhecida: {measure}")
+
+    inicio = time.perf_counter()
+    versao = db.get_data_version()
+    # Cubo independente da medida e da ordem das dimensões
+    dimensoes = sorted(linhas + colunas)
+    key = f"estatisticas:crosstab:{versao}:{','.join(dimensoes)}:{json.dumps(filters, sort_keys=True)}"
+    cube, fonte = cache.get(key), "cache"
+    if cube is None:
+        fonte = "consulta"
+        task = _cubos.task(key, lambda: _calcular_cubo(key, dimensoes, filters, db, adb, cache))
+        try:
+            cube = await asyncio.wait_for(asyncio.shield(task), CROSSTAB_BUDGET)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Tabela cruzada em cálculo; tente novamente",
+                                headers={"Retry-After": "2", "Cache-Control": "no-store"})
+
+    tabela = pivot(dimensoes, cube, linhas, colunas, measure)
+    # Origem e tempo do cubo vão no Server-Timing: o corpo é reaproveitado pelo cache HTTP
+    record_timing("crosstab", (time.perf_counter() - inicio) * 1000, fonte)
+    return {
+        "rows": linhas,
+        "cols": colunas,
+        "measure": measure,
+        "titulos": {nome: DIMENSIONS[nome][0] for nome in linhas + colunas} | {measure: MEASURES[measure][0]},
+        "versao": versao,
+        "filtros": filters,
+        **tabela,
+    }
@@ -1,8 +1,21 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter
+import os
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
 @router.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready(request: Request):
+    """Pronto para receber tráfego: banco aberto e caches aquecidos na subida"""
+    state = request.app.state
+    if not getattr(state, "ready", False):
+        return JSONResponse({"status": "starting", "pid": os.getpid()}, status_code=503,
+                            headers={"Retry-After": "1", "Cache-Control": "no-store"})
+    return {"status": "ready", "pid": os.getpid(), "startup_ms": state.startup_ms, "startup": state.startup}
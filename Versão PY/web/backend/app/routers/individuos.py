@@ -1,98 +1,86 @@
 # -*- coding: utf-8 -*-
+import csv
+import io
+
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
-from ..services.db import get_db_manager
+from ..services.admission import SingleFlight
+from ..services.db import get_async_db, get_db_manager
+from ..services.filters import filtros_consulta
+from ..services.individuos import pagina_individuos
+from ..services.serialization import FastJSONResponse, dumps
 
 router = APIRouter()
 
+_paginas = SingleFlight()
+
+
 @router.get("/individuos")
-def listar_individuos(
+async def listar_individuos(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=200),
     idade: Optional[int] = Query(None, ge=0),
     genero: Optional[str] = Query(None),
     regiao_id: Optional[int] = Query(None, ge=1),
+    adb = Depends(get_async_db),
+):
+    # Requisições idênticas em andamento compartilham o mesmo cálculo
+    key = (adb.url, page, limit, idade, genero, regiao_id)
+    payload = await _paginas.run(key, lambda: pagina_individuos(adb, page, limit, idade, genero, regiao_id))
+    # Resposta já no formato JSON, sem passar pelo jsonable_encoder
+    return FastJSONResponse(payload)
+
+
+# Formatos da exportação completa e chaves dos registros NDJSON
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+NDJSON_KEYS = ("id", "regiao", "idade", "genero", "renda", "deficiencia", "internet", "dispositivos")
+
+
+def _registro(row) -> dict:
+    """Linha de QueryEngine.export_statement como registro NDJSON (valores tipados)"""
+    registro = dict(zip(NDJSON_KEYS, row))
+    registro["deficiencia"] = bool(registro["deficiencia"])
+    dispositivos = registro["dispositivos"]
+    registro["dispositivos"] = dispositivos.split(", ") if dispositivos else []
+    return registro
+
+
+async def _export_chunks(adb, statement, formato: str, batch_size: int):
+    """Um bloco de bytes por lote do cursor"""
+    if formato == "csv":
+        from src.modules.query_engine import EXPORT_COLUMNS, format_export_row  # type: ignore
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        # BOM como nas exportações da versão desktop (abre corretamente no Excel)
+        yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+        async for batch in adb.stream(statement, batch_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(format_export_row(row) for row in batch)
+            yield buffer.getvalue().encode("utf-8")
+        return
+
+    async for batch in adb.stream(statement, batch_size):
+        yield b"".join(dumps(_registro(row)) + b"\n" for row in batch)
+
+
+@router.get("/individuos/export")
+async def exportar_individuos(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters = Depends(filtros_consulta),
     db = Depends(get_db_manager),
+    adb = Depends(get_async_db),
 ):
-    # Importar modelos aqui para evitar ciclos de import
-    from src.database.models import Individual, Household, Region, DeviceUsage, InternetUsage
-
-    # Construir filtros compatíveis com DatabaseManager
-    filters = {}
-    if idade is not None:
-        filters["age"] = idade
-    if genero:
-        filters["gender"] = genero
-    # Filtrar por região via join com Household
-    session = db.get_session()
-    try:
-        query = session.query(Individual)
-        if regiao_id is not None:
-            query = query.join(Household).filter(Household.region_id == regiao_id)
-        if idade is not None:
-            query = query.filter(Individual.age == idade)
-        if genero:
-            query = query.filter(Individual.gender == genero)
-
-        total = query.count()
-        offset = (page - 1) * limit
-        # Carregar domicílios associados para enriquecer dados
-        items = query.offset(offset).limit(limit).all()
-
-        data = []
-        for i in items:
-            # Obter informações do domicílio e região
-            household = session.query(Household).get(i.household_id)
-            regiao_nome = None
-            domicilio_info = None
-            internet_bool = None
-            if household:
-                domicilio_info = household.city
-                internet_bool = household.has_internet
-                regiao = session.query(Region).get(household.region_id)
-                regiao_nome = regiao.name if regiao else None
-
-            # Contar dispositivos usados pelo indivíduo (has_device = True)
-            dispositivos_count = (
-                session.query(DeviceUsage)
-                .filter(DeviceUsage.individual_id == i.id, DeviceUsage.has_device == True)
-                .count()
-            )
-
-            # Verificar uso de internet individual se existir
-            iu = (
-                session.query(InternetUsage)
-                .filter(InternetUsage.individual_id == i.id)
-                .first()
-            )
-            if iu is not None:
-                internet_bool = bool(iu.uses_internet)
-
-            data.append(
-                {
-                    "id": i.id,
-                    # Fallback de nome até existir campo apropriado no modelo
-                    "nome": f"Indivíduo {i.id}",
-                    "idade": i.age,
-                    "regiao": regiao_nome,
-                    "domicilio": domicilio_info,
-                    "dispositivos": dispositivos_count,
-                    "internet": bool(internet_bool) if internet_bool is not None else False,
-                    "genero": i.gender,
-                    "household_id": i.household_id,
-                    "created_at": i.created_at.isoformat() if i.created_at else None,
-                }
-            )
-
-        return {
-            "data": data,
-            "pagination": {
-                "page": page,
-                "limit": limit,
-                "total": total,
-                "totalPages": (total + limit - 1) // limit,
-            },
-        }
-    finally:
-        session.close()
\ No newline at end of file
+    """Conjunto filtrado completo, em fluxo (lido do banco em lotes, sem limite de linhas)"""
+    from src.modules.query_engine import QueryEngine  # type: ignore
+
+    statement = QueryEngine(db).export_statement(filters)
+    return StreamingResponse(
+        _export_chunks(adb, statement, formato, batch_size=2000),
+        media_type=EXPORT_MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="individuos.{formato}"'},
+    )
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""Percentis de latência por rota (TracingMiddleware) e ocupação dos limitadores de admissão."""
+
+from fastapi import APIRouter
+
+from ..services.admission import admission_stats
+from ..services.tracing import metrics_registry
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def metrics():
+    return {**metrics_registry.snapshot(), "admission": admission_stats()}
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Relatórios padrão (visão geral, demografia, acesso digital e regional).
+
+Sem filtros, a resposta vem do snapshot pré-calculado para a versão atual
+dos dados; se ele ainda não existir, os dados são calculados na hora e o
+snapshot é gerado em segundo plano. Com filtros, o cálculo é sempre feito na
+hora (compartilhado entre workers pelo cache).
+"""
+
+import json
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import Response
+
+from ..services.db import get_db_manager, get_shared_cache
+from ..services.filters import filtros_consulta
+from ..services.serialization import FastJSONResponse
+
+router = APIRouter()
+
+
+def _schedule_snapshot(background_tasks: BackgroundTasks, store, db) -> None:
+    if not store.is_building():
+        background_tasks.add_task(store.build, db)
+
+
+@router.get("")
+def listar_relatorios(db = Depends(get_db_manager)):
+    from src.modules.report_snapshots import REPORT_SETS, get_snapshot_store  # type: ignore
+
+    versao = db.get_data_version()
+    snapshot = get_snapshot_store(db).load(versao)
+    return FastJSONResponse({
+        "versao": versao,
+        "snapshot": snapshot.created_at if snapshot else None,
+        "relatorios": [{"tipo": tipo, "titulo": info["titulo"]} for tipo, info in REPORT_SETS.items()],
+    }, headers=None if snapshot else {"Cache-Control": "no-store"})
+
+
+@router.get("/graficos/{grafico}.png")
+def grafico_relatorio(grafico: str, background_tasks: BackgroundTasks, db = Depends(get_db_manager)):
+    from src.modules.report_snapshots import (  # type: ignore
+        SNAPSHOT_CHARTS, SNAPSHOT_FIGSIZE, SNAPSHOT_PALETTE, get_snapshot_store
+    )
+    from src.database.report_queries import ReportAggregator  # type: ignore
+    from src.ui.chart_drawing import chart_series  # type: ignore
+    from src.ui.chart_renderer import dark_style, render_chart_png  # type: ignore
+
+    if grafico not in SNAPSHOT_CHARTS:
+        raise HTTPException(status_code=404, detail="Gráfico não encontrado")
+
+    store = get_snapshot_store(db)
+    versao = db.get_data_version()
+    snapshot = store.load(versao)
+    png = snapshot.chart_png(grafico) if snapshot else None
+    headers = {"X-Data-Version": versao}
+    if png is None:
+        headers["Cache-Control"] = "no-store"
+        _schedule_snapshot(background_tasks, store, db)
+        aggregates = ReportAggregator(db).get_aggregates()
+        if not aggregates["total"]:
+            raise HTTPException(status_code=404, detail="Sem dados para o gráfico")
+        png = render_chart_png(grafico, chart_series(grafico, aggregates), SNAPSHOT_FIGSIZE,
+                               dpi=100, palette=SNAPSHOT_PALETTE, style=dark_style())
+    return Response(content=png, media_type="image/png", headers=headers)
+
+
+@router.get("/{tipo}")
+def relatorio(
+    tipo: str,
+    background_tasks: BackgroundTasks,
+    filters = Depends(filtros_consulta),
+    db = Depends(get_db_manager),
+    cache = Depends(get_shared_cache),
+):
+    from src.modules.report_snapshots import REPORT_SETS, get_snapshot_store, report_data  # type: ignore
+    from src.database.report_queries import ReportAggregator  # type: ignore
+
+    if tipo not in REPORT_SETS:
+        raise HTTPException(status_code=404, detail="Relatório não encontrado")
+
+    versao = db.get_data_version()
+    info = REPORT_SETS[tipo]
+    body = {"tipo": tipo, "titulo": info["titulo"], "versao": versao, "filtros": filters}
+
+    if filters:
+        # Consulta ad hoc: cálculo na hora, sem gráficos pré-renderizados
+        from src.modules.query_engine import QueryEngine  # type: ignore
+
+        def compute():
+            dataset = QueryEngine(db).get_report_dataset(filters)
+            return dataset.aggregates() if dataset is not None else None
+
+        key = f"relatorios:filtrado:{versao}:{json.dumps(filters, sort_keys=True)}"
+        aggregates = cache.get_or_set(key, compute, ttl=300)
+        if aggregates is None:
+            raise HTTPException(status_code=500, detail="Erro ao calcular relatório")
+        return FastJSONResponse({**body, "fonte": "ao_vivo", "gerado_em": None,
+                                 "dados": report_data(tipo, aggregates), "graficos": []})
+
+    store = get_snapshot_store(db)
+    snapshot = store.load(versao)
+    graficos = [f"/api/relatorios/graficos/{grafico}.png" for grafico in info["graficos"]]
+    if snapshot is not None:
+        return FastJSONResponse({**body, "fonte": "snapshot", "gerado_em": snapshot.created_at,
+                                 "dados": snapshot.report(tipo), "graficos": graficos})
+
+    # Snapshot ainda não gerado para esta versão: calcular agora e gerar em segundo plano
+    # (resposta provisória, fora do cache HTTP, até o snapshot ficar pronto)
+    _schedule_snapshot(background_tasks, store, db)
+    aggregates = cache.get_or_set(f"relatorios:geral:{versao}",
+                                  lambda: ReportAggregator(db).get_aggregates(), ttl=300)
+    return FastJSONResponse({**body, "fonte": "ao_vivo", "gerado_em": None,
+                             "dados": report_data(tipo, aggregates), "graficos": graficos},
+                            headers={"Cache-Control": "no-store"})
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Canal de atualizações ao vivo (server-sent events) dos painéis.
+
+`GET /api/stream` envia o estado completo de cada canal ao conectar e depois
+só as chaves alteradas:
+  - `estatisticas`: contagens de /api/estatisticas/resumo, recalculadas só
+    quando a versão dos dados muda;
+  - `db-status`: o mesmo conteúdo de /api/db/status, a cada nova amostra do
+    coletor de métricas.
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from ..services.db import get_async_db, get_db_manager, get_shared_cache
+from ..services.live import Channel, LiveHub, format_event
+from .db_status import coletar_status, get_status_collector
+from .estatisticas import coletar_resumo
+
+router = APIRouter()
+
+# Intervalo (s) de verificação da versão dos dados e de novas amostras de status
+VERSION_INTERVAL = 1.0
+# Comentário periódico para manter a conexão aberta em proxies
+HEARTBEAT = 15.0
+
+_hubs: Dict[str, LiveHub] = {}
+_hubs_lock = threading.Lock()
+
+
+def _sample_time(collector):
+    sample = collector.latest()
+    return sample and sample["timestamp"]
+
+
+def get_live_hub(db = Depends(get_db_manager), adb = Depends(get_async_db),
+                 cache = Depends(get_shared_cache), collector = Depends(get_status_collector)) -> LiveHub:
+    """Coletor único do processo para o banco em uso"""
+    with _hubs_lock:
+        hub = _hubs.get(db.db_path)
+        if hub is None:
+            hub = _hubs[db.db_path] = LiveHub([
+                Channel("estatisticas", lambda: coletar_resumo(db, adb, cache), VERSION_INTERVAL,
+                        version=db.get_data_version),
+                Channel("db-status", lambda: coletar_status(collector, adb), VERSION_INTERVAL,
+                        version=lambda: _sample_time(collector)),
+            ])
+        return hub
+
+
+async def close_live_hubs() -> None:
+    """Encerra os coletores ao vivo (desligamento da aplicação)"""
+    with _hubs_lock:
+        hubs = list(_hubs.values())
+        _hubs.clear()
+    for hub in hubs:
+        await hub.close()
+
+
+async def _eventos(hub: LiveHub, canais: Optional[str]):
+    channels = [nome.strip() for nome in canais.split(",")] if canais else None
+    async with hub.subscription(channels) as subscriber:
+        # Reconexão automática do EventSource após 5 s
+        yield "retry: 5000\n\n"
+        event_id = 0
+        while True:
+            try:
+                name, data = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            event_id += 1
+            yield format_event(name, data, event_id)
+
+
+@router.get("/stream")
+async def stream(canais: Optional[str] = Query(None, description="Canais separados por vírgula"),
+                 hub = Depends(get_live_hub)):
+    return StreamingResponse(
+        _eventos(hub, canais),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
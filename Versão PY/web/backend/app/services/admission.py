@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Coalescência de requisições e controle de admissão das rotas caras.
+
+- `SingleFlight`: requisições idênticas em andamento aguardam o mesmo
+  cálculo (uma tarefa por chave, protegida com `shield`: o cálculo termina
+  mesmo se quem o iniciou desistir).
+- `AdmissionLimiter`: no máximo `limit` cálculos simultâneos por rota; os
+  demais esperam na fila até `queue_timeout` segundos (ou são recusados de
+  imediato se `max_queue` já estiver cheia) e recebem 503 com Retry-After. Assim o SQLite
+  não recebe todas as consultas de uma vez e a latência cresce aos poucos.
+"""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+class Overloaded(HTTPException):
+    """503 com Retry-After quando a rota está no limite de cálculos simultâneos"""
+
+    def __init__(self, route: str, retry_after: int):
+        super().__init__(status_code=503, detail=f"Servidor ocupado ({route}); tente novamente",
+                         headers={"Retry-After": str(retry_after), "Cache-Control": "no-store"})
+
+
+class SingleFlight:
+    """Uma tarefa por chave enquanto houver cálculo em andamento"""
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    def task(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Tarefa em andamento para `key`, ou uma nova criada com `factory()`"""
+        task = self._tasks.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            return task
+        task = asyncio.ensure_future(factory())
+        self._tasks[key] = task
+        task.add_done_callback(lambda done: self._finished(key, done))
+        return task
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        return await asyncio.shield(self.task(key, factory))
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # Erro já entregue a quem aguardava; evita aviso de exceção não lida
+
+
+def _abandon(acquire: asyncio.Future, semaphore: asyncio.Semaphore) -> None:
+    """Desiste de uma espera pelo semáforo; se a vaga já tiver sido obtida, ela é devolvida"""
+    def release_if_acquired(task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is None:
+            semaphore.release()
+
+    acquire.add_done_callback(release_if_acquired)
+    acquire.cancel()
+
+
+class AdmissionLimiter:
+    """Semáforo por rota com fila limitada e tempo máximo de espera"""
+
+    def __init__(self, name: str, limit: int, queue_timeout: float, max_queue: Optional[int] = None,
+                 retry_after: int = 1):
+        self.name = name
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Um semáforo por event loop (testes e benchmarks criam loops novos)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore[0] is not loop:
+            self._semaphore = (loop, asyncio.Semaphore(self.limit))
+        return self._semaphore[1]
+
+    def _reject(self) -> Overloaded:
+        self.rejected += 1
+        return Overloaded(self.name, self.retry_after)
+
+    async def _acquire_queued(self, semaphore: asyncio.Semaphore) -> None:
+        # Sem wait_for: até o Python 3.11 a vaga obtida junto com o timeout (ou o
+        # cancelamento) podia ficar presa; aqui ela sempre volta ao semáforo
+        acquire = asyncio.ensure_future(semaphore.acquire())
+        try:
+            done, _ = await asyncio.wait({acquire}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            _abandon(acquire, semaphore)
+            raise
+        if not done:
+            _abandon(acquire, semaphore)
+            raise self._reject()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Reserva uma vaga (ou levanta Overloaded) enquanto o bloco executa"""
+        semaphore = self._get_semaphore()
+        if semaphore.locked():
+            if self.max_queue is not None and self.waiting >= self.max_queue:
+                raise self._reject()
+            self.waiting += 1
+            try:
+                await self._acquire_queued(semaphore)
+            finally:
+                self.waiting -= 1
+        else:
+            await semaphore.acquire()
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting,
+                "admitted": self.admitted, "rejected": self.rejected}
+
+
+_limiters: Dict[str, AdmissionLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str, limit: int, queue_timeout: float, **kwargs) -> AdmissionLimiter:
+    """Limitador único do processo para a rota `name`"""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = AdmissionLimiter(name, limit, queue_timeout, **kwargs)
+        return limiter
+
+
+def admission_stats() -> Dict[str, Dict[str, Any]]:
+    """Ocupação e recusas de cada limitador (exposto em /api/metrics)"""
+    with _limiters_lock:
+        return {name: limiter.stats() for name, limiter in sorted(_limiters.items())}
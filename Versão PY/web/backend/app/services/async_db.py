@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""Acesso assíncrono ao banco para as rotas da API.
+
+Com os drivers assíncronos instalados (aiosqlite para SQLite, asyncpg para
+Postgres, ambos com greenlet), as consultas rodam num `AsyncEngine` com pool
+limitado e não ocupam threads enquanto esperam o banco. Sem eles, a mesma
+interface executa as consultas num engine síncrono com pool próprio, em
+threads limitadas ao tamanho do pool (`pool_size + max_overflow`), sem
+esgotar o threadpool do servidor.
+"""
+
+import asyncio
+import importlib.util
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from anyio import CapacityLimiter, to_thread
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from src.utils.logger import get_logger  # type: ignore
+
+logger = get_logger(__name__)
+
+# Driver assíncrono equivalente a cada dialeto
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Converte a URL para o driver assíncrono do mesmo dialeto"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"Dialeto sem driver assíncrono conhecido: {backend}")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def async_driver_available(url: str) -> bool:
+    """Indica se o driver assíncrono da URL (e o greenlet do SQLAlchemy) estão instalados"""
+    driver = ASYNC_DRIVERS.get(make_url(url).get_backend_name())
+    return bool(driver) and all(importlib.util.find_spec(name) is not None for name in (driver, "greenlet"))
+
+
+class _Queries(ABC):
+    """Atalhos de leitura sobre `_execute` (comuns ao pool e aos snapshots)"""
+
+    @abstractmethod
+    async def _execute(self, statement, params: Optional[Dict], fetch: Callable) -> Any:
+        """Executa `statement` e devolve `fetch(result)`"""
+
+    async def all(self, statement, params: Optional[Dict] = None) -> List:
+        """Todas as linhas do resultado"""
+        return await self._execute(statement, params, lambda result: result.all())
+
+    async def first(self, statement, params: Optional[Dict] = None):
+        """Primeira linha do resultado (ou None)"""
+        return await self._execute(statement, params, lambda result: result.first())
+
+    async def scalar(self, statement, params: Optional[Dict] = None) -> Any:
+        """Primeira coluna da primeira linha"""
+        return await self._execute(statement, params, lambda result: result.scalar())
+
+    async def mappings(self, statement, params: Optional[Dict] = None) -> List[Dict]:
+        """Linhas como dicionários"""
+        return await self._execute(statement, params, lambda result: [dict(row) for row in result.mappings()])
+
+
+class SnapshotDatabase(_Queries):
+    """Consultas de um lote numa única conexão e transação de leitura.
+
+    Todas enxergam o mesmo estado do banco; como uma conexão não executa duas
+    consultas ao mesmo tempo, elas se revezam (código fora do banco continua
+    concorrente).
+    """
+
+    def __init__(self, adb: "AsyncDatabase", conn):
+        self.url = adb.url
+        self.is_async = adb.is_async
+        self._adb = adb
+        self._conn = conn
+        self._lock = asyncio.Lock()
+
+    async def run_sync(self, func: Callable, *args, **kwargs) -> Any:
+        return await self._adb.run_sync(func, *args, **kwargs)
+
+    async def _execute(self, statement, params: Optional[Dict], fetch: Callable) -> Any:
+        async with self._lock:
+            if self.is_async:
+                return fetch(await self._conn.execute(statement, params))
+            return await self._adb.run_sync(lambda: fetch(self._conn.execute(statement, params)))
+
+
+class AsyncDatabase(_Queries):
+    """Consultas `await`-áveis com pool de conexões limitado"""
+
+    def __init__(self, url: str, pool_size: int = 10, max_overflow: int = 10, pool_timeout: float = 30.0,
+                 use_async: Optional[bool] = None):
+        self.url = url
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self._limiter: Optional[CapacityLimiter] = None
+        self.is_async = async_driver_available(url) if use_async is None else use_async
+
+        pool_args = dict(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout,
+                         pool_pre_ping=True)
+        connect_args = {"timeout": 30} if make_url(url).get_backend_name() == "sqlite" else {}
+        if self.is_async:
+            from sqlalchemy.ext.asyncio import create_async_engine
+            from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+            self.engine = create_async_engine(to_async_url(url), poolclass=AsyncAdaptedQueuePool,
+                                              connect_args=connect_args, **pool_args)
+            self.sync_engine = self.engine.sync_engine
+        else:
+            from sqlalchemy.pool import QueuePool
+
+            if connect_args:
+                connect_args["check_same_thread"] = False
+            self.engine = None
+            self.sync_engine = create_engine(url, poolclass=QueuePool, connect_args=connect_args, **pool_args)
+        logger.info(f"Acesso ao banco da API: {'assíncrono' if self.is_async else 'threads'} "
+                    f"(pool {pool_size}+{max_overflow})")
+
+    @classmethod
+    def from_db_manager(cls, db, **kwargs) -> "AsyncDatabase":
+        """Camada assíncrona sobre o mesmo arquivo SQLite do DatabaseManager"""
+        return cls(f"sqlite:///{db.db_path}", **kwargs)
+
+    @property
+    def limiter(self) -> CapacityLimiter:
+        # Criado sob demanda: precisa de um event loop em execução
+        if self._limiter is None:
+            self._limiter = CapacityLimiter(self.pool_size + self.max_overflow)
+        return self._limiter
+
+    async def run_sync(self, func: Callable, *args, **kwargs) -> Any:
+        """Executa código síncrono (ex.: DatabaseManager) numa thread limitada pelo pool"""
+        return await to_thread.run_sync(partial(func, *args, **kwargs), limiter=self.limiter)
+
+    async def _execute(self, statement, params: Optional[Dict], fetch: Callable) -> Any:
+        if self.is_async:
+            async with self.engine.connect() as conn:
+                return fetch(await conn.execute(statement, params))
+
+        def execute():
+            with self.sync_engine.connect() as conn:
+                return fetch(conn.execute(statement, params))
+
+        return await self.run_sync(execute)
+
+    @asynccontextmanager
+    async def snapshot(self) -> AsyncIterator[SnapshotDatabase]:
+        """Conexão do pool com uma transação de leitura (snapshot) aberta no bloco"""
+        sqlite = make_url(self.url).get_backend_name() == "sqlite"
+        if self.is_async:
+            async with self.engine.connect() as conn:
+                if sqlite:
+                    await conn.exec_driver_sql("BEGIN")
+                else:
+                    conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+                yield SnapshotDatabase(self, conn)
+            return
+
+        def begin():
+            conn = self.sync_engine.connect()
+            if sqlite:
+                # O driver sqlite3 não abre transação antes de SELECT; sem BEGIN cada consulta veria um estado
+                conn.exec_driver_sql("BEGIN")
+            else:
+                conn = conn.execution_options(isolation_level="REPEATABLE READ")
+            return conn
+
+        conn = await self.run_sync(begin)
+        try:
+            yield SnapshotDatabase(self, conn)
+        finally:
+            # Fechar desfaz a transação de leitura e devolve a conexão ao pool
+            conn.close()
+
+    async def stream(self, statement, batch_size: int = 2000,
+                     params: Optional[Dict] = None) -> AsyncIterator[List]:
+        """Lotes de até `batch_size` linhas lidos de um cursor no servidor.
+
+        O próximo lote só é buscado quando o consumidor pede, então um cliente
+        lento segura a leitura do banco em vez de acumular linhas em memória.
+        """
+        statement = statement.execution_options(yield_per=batch_size)
+        if self.is_async:
+            async with self.engine.connect() as conn:
+                result = await conn.stream(statement, params)
+                async for batch in result.partitions(batch_size):
+                    yield batch
+            return
+
+        conn = await self.run_sync(self.sync_engine.connect)
+        try:
+            partitions = (await self.run_sync(conn.execute, statement, params)).partitions(batch_size)
+            while True:
+                batch = await self.run_sync(next, partitions, None)
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            # Síncrono de propósito: também roda quando o cliente desconecta (escopo cancelado)
+            conn.close()
+
+    async def warm(self, connections: int = 2) -> int:
+        """Abre `connections` conexões do pool (limitado ao pool fixo) e as devolve prontas"""
+        connections = max(1, min(connections, self.pool_size))
+        if self.is_async:
+            from contextlib import AsyncExitStack
+
+            # Mantém todas abertas ao mesmo tempo, senão o pool reaproveita a mesma conexão
+            async with AsyncExitStack() as stack:
+                for _ in range(connections):
+                    conn = await stack.enter_async_context(self.engine.connect())
+                    await conn.execute(text("SELECT 1"))
+            return connections
+
+        def open_all():
+            opened = [self.sync_engine.connect() for _ in range(connections)]
+            try:
+                for conn in opened:
+                    conn.execute(text("SELECT 1"))
+            finally:
+                for conn in opened:
+                    conn.close()
+            return len(opened)
+
+        return await self.run_sync(open_all)
+
+    async def dispose(self) -> None:
+        if self.engine is not None:
+            await self.engine.dispose()
+        else:
+            self.sync_engine.dispose()
@@ -3,7 +3,11 @@
 
 from pathlib import Path
 import sys
+import threading
 from functools import lru_cache
+from typing import Dict
+
+from fastapi import Depends
 
 
 def _add_project_root_to_path():
@@ -24,27 +28,41 @@ project_root = _add_project_root_to_path()
 
 from src.database.database_manager import DatabaseManager  # type: ignore
 from src.utils.logger import get_logger  # type: ignore
-from src.database.universal import get_universal_db  # type: ignore
+from src.database.universal import get_universal_db, resolve_database_url  # type: ignore
+from src.utils.shared_cache import SharedCache  # type: ignore
+
+from .async_db import AsyncDatabase
+from .tracing import instrument_engine
 
 logger = get_logger(__name__)
 
 
 @lru_cache(maxsize=1)
 def get_db_manager() -> DatabaseManager:
-    """Retorna instância única de DatabaseManager inicializada."""
-    # Usar caminho estável dentro da raiz do projeto (Versão PY/data)
-    # Isso evita falhas quando a pasta "Banco de dados" não existe
-    base_root = project_root or Path(__file__).resolve().parents[4]
-    data_dir = Path(base_root) / "data"
-    try:
-        data_dir.mkdir(parents=True, exist_ok=True)
-    except Exception:
-        # Se não conseguir criar, ainda tenta seguir com o caminho
-        pass
-    db_path = data_dir / "dac_database.db"
+    """Retorna instância única de DatabaseManager inicializada.
+
+    Usa `DAC_DATABASE_PATH` se definido (ex.: banco sintético do teste de
+    carga); caso contrário, `data/dac_database.db` na raiz do projeto.
+    """
+    import os
+
+    db_path = os.getenv("DAC_DATABASE_PATH")
+    if not db_path:
+        # Usar caminho estável dentro da raiz do projeto (Versão PY/data)
+        # Isso evita falhas quando a pasta "Banco de dados" não existe
+        base_root = project_root or Path(__file__).resolve().parents[4]
+        data_dir = Path(base_root) / "data"
+        try:
+            data_dir.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            # Se não conseguir criar, ainda tenta seguir com o caminho
+            pass
+        db_path = data_dir / "dac_database.db"
 
     db = DatabaseManager(db_path=str(db_path))
-    db.initialize_database()
+    # Esquema e manutenção só uma vez entre os workers (trava + carimbo no disco)
+    db.initialize_database_once()
+    instrument_engine(db.engine)
     logger.info(f"DatabaseManager inicializado para Web API usando: {db_path}")
     return db
 
@@ -55,4 +73,52 @@ def get_sqlalchemy_universal():
     Não substitui o DatabaseManager, mas pode ser usada em serviços que precisem
     de transações e pooling multi‑SGBD.
     """
-    return get_universal_db()
+    universal = get_universal_db()
+    instrument_engine(universal.engine)
+    return universal
+
+
+_async_dbs: Dict[str, AsyncDatabase] = {}
+_async_dbs_lock = threading.Lock()
+
+
+def get_async_db(db: DatabaseManager = Depends(get_db_manager)) -> AsyncDatabase:
+    """Camada assíncrona (pool limitado) sobre o banco do DatabaseManager em uso.
+
+    Depende de `get_db_manager`, então overrides de testes e benchmarks valem
+    também para as rotas assíncronas.
+    """
+    with _async_dbs_lock:
+        adb = _async_dbs.get(db.db_path)
+        if adb is None:
+            adb = _async_dbs[db.db_path] = AsyncDatabase.from_db_manager(db)
+            # Engines do DatabaseManager em uso (inclusive os de testes) e da camada assíncrona
+            instrument_engine(db.engine)
+            instrument_engine(adb.sync_engine)
+        return adb
+
+
+@lru_cache(maxsize=1)
+def get_async_universal():
+    """Camada assíncrona sobre `DATABASE_URL` (Postgres/MySQL/SQLite), com pool pequeno."""
+    adb = AsyncDatabase(resolve_database_url(), pool_size=2, max_overflow=2)
+    instrument_engine(adb.sync_engine)
+    return adb
+
+
+@lru_cache(maxsize=1)
+def get_shared_cache() -> SharedCache:
+    """Retorna o cache compartilhado entre os workers do mesmo host.
+
+    Usa `DAC_SHARED_CACHE_PATH` se definido; caso contrário, grava em
+    `data/cache/shared_cache.db` na raiz do projeto.
+    """
+    import os
+
+    path = os.getenv("DAC_SHARED_CACHE_PATH")
+    if not path:
+        base_root = project_root or Path(__file__).resolve().parents[4]
+        path = str(Path(base_root) / "data" / "cache" / "shared_cache.db")
+    cache = SharedCache(path=path)
+    logger.info(f"Cache compartilhado entre workers em: {path}")
+    return cache
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Filtros de consulta comuns às rotas (mesmos nomes da janela de consultas)."""
+
+from typing import Any, Dict, Optional
+
+from fastapi import Query
+
+
+def filtros_consulta(
+    regiao: Optional[str] = Query(None),
+    genero: Optional[str] = Query(None),
+    idade_min: Optional[int] = Query(None, ge=0),
+    idade_max: Optional[int] = Query(None, ge=0),
+    renda: Optional[str] = Query(None),
+    internet: Optional[str] = Query(None),
+    deficiencia: Optional[str] = Query(None),
+) -> Dict[str, Any]:
+    """Filtros informados, com as chaves usadas por QueryEngine"""
+    return {key: value for key, value in {
+        "region": regiao, "gender": genero, "age_min": idade_min, "age_max": idade_max,
+        "income": renda, "internet": internet, "disability": deficiencia,
+    }.items() if value is not None}
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Consulta paginada de indivíduos.
+
+Usada por `GET /api/individuos`, pelas consultas em lote (`POST /api/batch`)
+e pelo aquecimento na subida da API.
+"""
+
+from typing import Optional
+
+from .admission import get_limiter
+
+# Páginas calculadas ao mesmo tempo; as demais aguardam até PAGE_QUEUE_TIMEOUT s
+# na fila (de no máximo PAGE_MAX_QUEUE) e depois recebem 503 + Retry-After
+PAGE_CONCURRENCY = 4
+PAGE_QUEUE_TIMEOUT = 5.0
+PAGE_MAX_QUEUE = 64
+
+
+def consultas_individuos(page: int, limit: int, idade: Optional[int], genero: Optional[str],
+                         regiao_id: Optional[int]):
+    """Consultas de contagem e da página (projeção única, sem N+1)"""
+    # Importar modelos aqui para evitar ciclos de import
+    from sqlalchemy import select, func, true
+    from src.database.models import Individual, Household, Region, DeviceUsage, InternetUsage
+
+    # Dispositivos (has_device = True) e uso de internet individual como
+    # subconsultas correlacionadas: uma única consulta por página
+    dispositivos_count = (
+        select(func.count())
+        .where(DeviceUsage.individual_id == Individual.id, DeviceUsage.has_device == true())
+        .correlate(Individual)
+        .scalar_subquery()
+    )
+    uso_internet = (
+        select(InternetUsage.uses_internet)
+        .where(InternetUsage.individual_id == Individual.id)
+        .order_by(InternetUsage.id)
+        .limit(1)
+        .correlate(Individual)
+        .scalar_subquery()
+    )
+
+    # Filtros comuns à contagem e à página
+    conditions = []
+    if regiao_id is not None:
+        conditions.append(Household.region_id == regiao_id)
+    if idade is not None:
+        conditions.append(Individual.age == idade)
+    if genero:
+        conditions.append(Individual.gender == genero)
+
+    count_query = select(func.count()).select_from(Individual)
+    if regiao_id is not None:
+        count_query = count_query.join(Household, Individual.household_id == Household.id)
+
+    page_query = (
+        select(
+            Individual.id,
+            Individual.age,
+            Individual.gender,
+            Individual.household_id,
+            Individual.created_at,
+            Region.name,
+            Household.city,
+            # Uso individual prevalece sobre o acesso do domicílio
+            func.coalesce(uso_internet, Household.has_internet),
+            dispositivos_count,
+        )
+        .select_from(Individual)
+        .outerjoin(Household, Individual.household_id == Household.id)
+        .outerjoin(Region, Household.region_id == Region.id)
+        .where(*conditions)
+        .order_by(Individual.id)
+        .offset((page - 1) * limit)
+        .limit(limit)
+    )
+    return count_query.where(*conditions), page_query
+
+
+async def pagina_individuos(adb, page: int, limit: int, idade: Optional[int], genero: Optional[str],
+                           regiao_id: Optional[int]) -> dict:
+    """Página de /api/individuos (dados + paginação), com vaga no limitador da rota"""
+    count_query, page_query = consultas_individuos(page, limit, idade, genero, regiao_id)
+    async with get_limiter("individuos", PAGE_CONCURRENCY, PAGE_QUEUE_TIMEOUT,
+                           max_queue=PAGE_MAX_QUEUE).slot():
+        total = await adb.scalar(count_query) or 0
+        rows = await adb.all(page_query)
+
+    data = [
+        {
+            "id": individuo_id,
+            # Fallback de nome até existir campo apropriado no modelo
+            "nome": f"Indivíduo {individuo_id}",
+            "idade": idade_valor,
+            "regiao": regiao_nome,
+            "domicilio": cidade,
+            "dispositivos": dispositivos or 0,
+            "internet": bool(internet_bool) if internet_bool is not None else False,
+            "genero": genero_valor,
+            "household_id": household_id,
+            "created_at": created_at.isoformat() if created_at else None,
+        }
+        for (individuo_id, idade_valor, genero_valor, household_id, created_at,
+             regiao_nome, cidade, internet_bool, dispositivos) in rows
+    ]
+
+    return {
+        "data": data,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "totalPages": (total + limit - 1) // limit,
+        },
+    }
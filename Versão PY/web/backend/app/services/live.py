@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Atualizações ao vivo (server-sent events) para os painéis do frontend.
+
+Um único coletor por processo calcula cada canal e distribui o resultado a
+todas as conexões abertas: N abas abertas custam um cálculo. Canais com
+`version` só são recalculados quando a versão muda (ex.: versão dos dados,
+obtida com `stat`); os demais, a cada `interval` segundos. Cada conexão
+recebe o estado completo ao se inscrever e, depois, apenas as chaves que
+mudaram. O coletor só roda enquanto houver inscritos.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from src.utils.logger import get_logger  # type: ignore
+
+from .serialization import dumps
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Channel:
+    """Canal de eventos: `compute()` produz o estado completo (dict)"""
+
+    name: str
+    compute: Callable[[], Awaitable[Dict[str, Any]]]
+    interval: float
+    version: Optional[Callable[[], Any]] = None
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """Conexão inscrita: fila limitada de (canal, dados)"""
+
+    channels: Set[str]
+    queue: "asyncio.Queue[Tuple[str, Dict[str, Any]]]" = field(default_factory=lambda: asyncio.Queue(16))
+
+
+def format_event(name: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Mensagem no formato text/event-stream"""
+    lines = [f"event: {name}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {dumps(data).decode('utf-8')}")
+    return "\n".join(lines) + "\n\n"
+
+
+def delta(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Chaves de `current` que mudaram em relação a `previous`"""
+    previous = previous or {}
+    return {key: value for key, value in current.items() if previous.get(key) != value}
+
+
+class LiveHub:
+    """Coletor compartilhado e distribuição dos eventos aos inscritos"""
+
+    def __init__(self, channels: Iterable[Channel], tick: Optional[float] = None):
+        self.channels: Dict[str, Channel] = {channel.name: channel for channel in channels}
+        self.tick = tick or min(channel.interval for channel in self.channels.values())
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.subscribers: Set[Subscriber] = set()
+        self.computations = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscription(self, channels: Optional[Iterable[str]] = None):
+        """Inscreve uma conexão enquanto o bloco estiver aberto"""
+        subscriber = Subscriber(set(channels or self.channels) & set(self.channels))
+        for name in subscriber.channels:
+            if name in self.state:
+                subscriber.queue.put_nowait((name, self.state[name]))
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        try:
+            yield subscriber
+        finally:
+            self.subscribers.discard(subscriber)
+
+    def _resync(self, subscriber: Subscriber) -> None:
+        """Cliente lento: descarta os deltas pendentes e reenvia o estado completo"""
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        for name in subscriber.channels:
+            if name in self.state:
+                subscriber.queue.put_nowait((name, self.state[name]))
+
+    def publish(self, name: str, payload: Dict[str, Any]) -> None:
+        changes = delta(self.state.get(name), payload)
+        self.state[name] = payload
+        if not changes:
+            return
+        for subscriber in list(self.subscribers):
+            if name not in subscriber.channels:
+                continue
+            try:
+                subscriber.queue.put_nowait((name, changes))
+            except asyncio.QueueFull:
+                self._resync(subscriber)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_run = dict.fromkeys(self.channels, 0.0)
+        versions: Dict[str, Any] = {}
+        while self.subscribers:
+            now = loop.time()
+            for channel in self.channels.values():
+                if now < next_run[channel.name]:
+                    continue
+                next_run[channel.name] = now + channel.interval
+                if channel.version is not None:
+                    version = channel.version()
+                    if channel.name in versions and versions[channel.name] == version:
+                        continue
+                    versions[channel.name] = version
+                try:
+                    payload = await channel.compute()
+                except Exception as e:
+                    logger.warning(f"Falha ao atualizar o canal ao vivo '{channel.name}': {e}")
+                    versions.pop(channel.name, None)
+                    continue
+                self.computations += 1
+                self.publish(channel.name, payload)
+            await asyncio.sleep(self.tick)
+
+    async def close(self) -> None:
+        self.subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Serialização JSON rápida para as respostas da API.
+
+Usa orjson quando instalado (opcional) e recai para o `json` da biblioteca
+padrão. Rotas com respostas grandes devolvem `FastJSONResponse` diretamente,
+evitando a passagem pelo `jsonable_encoder` do FastAPI; conteúdo já
+serializado (bytes) é enviado sem nova serialização.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+
+def dumps(content: Any) -> bytes:
+    """Serializa para JSON (UTF-8, sem espaços)"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serializada com orjson (ou json), aceitando bytes pré-serializados"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
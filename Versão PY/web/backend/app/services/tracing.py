@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""Rastreamento de desempenho por requisição.
+
+Cada requisição da API abre um `RequestTrace` (em uma ContextVar, que chega
+também às threads de `run_sync`/threadpool). Eventos do SQLAlchemy nos
+engines instrumentados somam a ele o número de comandos SQL, o tempo total e
+o comando mais lento; as rotas podem acrescentar medições próprias
+(`record_timing`), enviadas em `Server-Timing` sem entrar no corpo (que o
+cache HTTP reaproveita entre requisições). Ao final, a duração é guardada por rota em janelas
+limitadas (`RouteStats`), das quais saem p50/p95/p99 para `/api/metrics`.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+# Últimas N requisições por rota usadas nos percentis
+WINDOW = 2048
+# Limite de rotas distintas (protege contra caminhos arbitrários)
+MAX_ROUTES = 200
+# Tamanho máximo do SQL guardado como "mais lento"
+STATEMENT_PREVIEW = 200
+
+
+@dataclass
+class RequestTrace:
+    """Medições de uma requisição"""
+
+    started: float = field(default_factory=time.perf_counter)
+    statements: int = 0
+    sql_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_sql: Optional[str] = None
+    extra: List[Tuple[str, float, Optional[str]]] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add_statement(self, statement: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.statements += 1
+            self.sql_ms += elapsed_ms
+            if elapsed_ms >= self.slowest_ms:
+                self.slowest_ms = elapsed_ms
+                self.slowest_sql = statement
+
+    def add_metric(self, name: str, elapsed_ms: float, desc: Optional[str] = None) -> None:
+        with self._lock:
+            self.extra.append((name, elapsed_ms, desc))
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        """Valor do cabeçalho Server-Timing (tempo até o envio dos cabeçalhos)"""
+        parts = [f"app;dur={self.elapsed_ms():.1f}",
+                 f'db;dur={self.sql_ms:.1f};desc="{self.statements} SQL"']
+        if self.statements:
+            parts.append(f"db-max;dur={self.slowest_ms:.1f}")
+        for name, elapsed_ms, desc in self.extra:
+            parts.append(f'{name};dur={elapsed_ms:.1f}' + (f';desc="{desc}"' if desc else ""))
+        return ", ".join(parts)
+
+
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+
+def record_timing(name: str, elapsed_ms: float, desc: Optional[str] = None) -> None:
+    """Acrescenta uma medição ao Server-Timing da requisição atual (se rastreada)"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add_metric(name, elapsed_ms, desc)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_trace.get() is not None:
+        context._dac_trace_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = current_trace.get()
+    started = getattr(context, "_dac_trace_started", None)
+    if trace is not None and started is not None:
+        trace.add_statement(" ".join(statement.split())[:STATEMENT_PREVIEW],
+                            (time.perf_counter() - started) * 1000)
+
+
+_instrumented_lock = threading.Lock()
+
+
+def instrument_engine(engine) -> None:
+    """Registra os eventos de medição no engine (idempotente; aceita AsyncEngine)"""
+    engine = getattr(engine, "sync_engine", engine)
+    if engine is None:
+        return
+    with _instrumented_lock:
+        if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+            return
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Percentil por posição mais próxima sobre valores já ordenados"""
+    if not values:
+        return None
+    rank = math.ceil(p / 100 * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+class RouteStats:
+    """Janela das últimas requisições de uma rota"""
+
+    def __init__(self, window: int = WINDOW):
+        self.count = 0
+        self.errors = 0
+        self.durations: deque = deque(maxlen=window)
+        self.sql_ms: deque = deque(maxlen=window)
+        self.statements: deque = deque(maxlen=window)
+
+    def add(self, duration_ms: float, trace: RequestTrace, status: int) -> None:
+        self.count += 1
+        if status >= 500:
+            self.errors += 1
+        self.durations.append(duration_ms)
+        self.sql_ms.append(trace.sql_ms)
+        self.statements.append(trace.statements)
+
+    def summary(self) -> Dict[str, Any]:
+        durations = sorted(self.durations)
+        sql = sorted(self.sql_ms)
+        statements = list(self.statements)
+
+        def ms(value):
+            return None if value is None else round(value, 2)
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "p50_ms": ms(percentile(durations, 50)),
+            "p95_ms": ms(percentile(durations, 95)),
+            "p99_ms": ms(percentile(durations, 99)),
+            "max_ms": ms(durations[-1] if durations else None),
+            "sql_p95_ms": ms(percentile(sql, 95)),
+            "sql_statements_avg": round(sum(statements) / len(statements), 2) if statements else 0,
+        }
+
+
+class MetricsRegistry:
+    """Agregados por rota ("MÉTODO /caminho/{param}") do processo"""
+
+    def __init__(self, window: int = WINDOW, max_routes: int = MAX_ROUTES):
+        self.window = window
+        self.max_routes = max_routes
+        self.started = time.time()
+        self._routes: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, duration_ms: float, trace: RequestTrace, status: int) -> None:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                if len(self._routes) >= self.max_routes:
+                    route = "(outras)"
+                    stats = self._routes.get(route)
+                if stats is None:
+                    stats = self._routes[route] = RouteStats(self.window)
+            stats.add(duration_ms, trace, status)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = {route: stats.summary() for route, stats in sorted(self._routes.items())}
+        return {"uptime_s": round(time.time() - self.started, 1), "window": self.window, "routes": routes}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+metrics_registry = MetricsRegistry()
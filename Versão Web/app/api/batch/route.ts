@@ -0,0 +1,5 @@
+import { proxyPostJson } from "@/lib/backend"
+
+export async function POST(request: Request) {
+  return proxyPostJson("/api/batch", request)
+}
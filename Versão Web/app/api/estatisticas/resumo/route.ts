@@ -1,12 +1,5 @@
-import { NextResponse } from "next/server"
+import { proxyGet } from "@/lib/backend"
 
-export async function GET() {
-  const baseUrl = process.env.NEXT_PUBLIC_DAC_API_URL || "http://localhost:8000"
-  try {
-    const res = await fetch(`${baseUrl}/api/estatisticas/resumo`, { cache: "no-store" })
-    const data = await res.json()
-    return NextResponse.json(data)
-  } catch (e) {
-    return NextResponse.json({ message: "Backend indisponível" }, { status: 503 })
-  }
+export async function GET(request: Request) {
+  return proxyGet("/api/estatisticas/resumo", request)
 }
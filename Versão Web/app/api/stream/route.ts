@@ -0,0 +1,9 @@
+import { proxyEventStream } from "@/lib/backend"
+
+// Fluxo contínuo: nunca pré-renderizar nem guardar em cache
+export const dynamic = "force-dynamic"
+
+export async function GET(request: Request) {
+  const { search } = new URL(request.url)
+  return proxyEventStream(`/api/stream${search}`, request)
+}
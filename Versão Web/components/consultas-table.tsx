@@ -5,6 +5,7 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table"
 import { Button } from "@/components/ui/button"
 import { ChevronLeft, ChevronRight, CheckCircle2, XCircle } from "lucide-react"
+import { batchQuery } from "@/lib/batch"
 
 interface Individuo {
   id: number
@@ -24,8 +25,7 @@ export function ConsultasTable() {
 
   useEffect(() => {
     setLoading(true)
-    fetch(`/api/individuos?page=${page}&limit=10`)
-      .then((res) => res.json())
+    batchQuery<any>("individuos", { page, limit: 10 })
       .then((result) => {
         const rows = Array.isArray(result?.data) ? result.data : []
         const total = result?.pagination?.totalPages ?? 1
@@ -33,6 +33,10 @@ export function ConsultasTable() {
         setTotalPages(total)
         setLoading(false)
       })
+      .catch(() => {
+        setData([])
+        setLoading(false)
+      })
   }, [page])
 
   if (loading) {
@@ -4,6 +4,8 @@ import { useEffect, useState } from 'react'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
 import { Activity, Database, Server, Users, Table as TableIcon, Layers, HardDrive, Clock } from 'lucide-react'
+import { useLiveChannel } from '@/hooks/use-live-channel'
+import { batchQuery } from '@/lib/batch'
 
 interface DbStatus {
   connected: boolean
@@ -20,9 +22,18 @@ interface DbStatus {
     tables_bytes: number
   }
   top_tables?: { name: string; total_bytes: number }[]
+  sampled_at?: string
+  history?: Record<string, (number | null)[]>
   error?: string
 }
 
+const HISTORY_SERIES: { key: string; label: string; format: (n?: number) => string }[] = [
+  { key: 'database_size_bytes', label: 'Tamanho do banco', format: formatBytes },
+  { key: 'total_rows', label: 'Registros', format: (n) => (n ?? 0).toLocaleString('pt-BR') },
+  { key: 'wal_bytes', label: 'WAL', format: formatBytes },
+  { key: 'sample_ms', label: 'Tempo de coleta', format: (n) => `${(n ?? 0).toFixed(1)} ms` },
+]
+
 function formatBytes(n?: number) {
   if (!n && n !== 0) return '—'
   const units = ['B', 'KB', 'MB', 'GB', 'TB']
@@ -35,18 +46,36 @@ function formatBytes(n?: number) {
   return `${v.toFixed(1)} ${units[i]}`
 }
 
+function Sparkline({ values, width = 160, height = 32 }: { values: number[]; width?: number; height?: number }) {
+  if (values.length < 2) return <div style={{ width, height }} />
+  const min = Math.min(...values)
+  const span = Math.max(...values) - min || 1
+  const step = (width - 4) / (values.length - 1)
+  const points = values.map((v, i) => `${2 + i * step},${height - 2 - ((v - min) / span) * (height - 4)}`).join(' ')
+  return (
+    <svg width={width} height={height} className="text-primary" aria-hidden>
+      <polyline points={points} fill="none" stroke="currentColor" strokeWidth={2} strokeLinejoin="round" />
+    </svg>
+  )
+}
+
 export function DbStatusDashboard() {
   const [status, setStatus] = useState<DbStatus | null>(null)
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
-    fetch('/api/db/status', { cache: 'no-store' })
-      .then((r) => (r.ok ? r.json() : Promise.reject(r)))
-      .then((data: DbStatus) => setStatus(data))
+    batchQuery<DbStatus>('db_status')
+      .then((data) => setStatus(data))
       .catch(() => setStatus({ connected: false, error: 'Não foi possível obter status' }))
       .finally(() => setLoading(false))
   }, [])
 
+  // Status atualizado pelo coletor do servidor (um cálculo para todas as abas abertas)
+  useLiveChannel<DbStatus>('db-status', (changes) => {
+    setStatus((prev) => ({ ...(prev || { connected: false }), ...changes }))
+    setLoading(false)
+  })
+
   if (loading) {
     return (
       <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-4">
@@ -142,6 +171,24 @@ export function DbStatusDashboard() {
         </Card>
       </div>
 
+      {status.history && (
+        <Card>
+          <CardHeader className="pb-2"><CardTitle className="text-sm text-muted-foreground flex items-center gap-2"><Activity className="h-4 w-4"/>Histórico</CardTitle></CardHeader>
+          <CardContent className="grid gap-4 md:grid-cols-2 lg:grid-cols-4">
+            {HISTORY_SERIES.filter(({ key }) => status.history?.[key]).map(({ key, label, format }) => {
+              const values = (status.history?.[key] || []).filter((v): v is number => v !== null)
+              return (
+                <div key={key} className="space-y-1">
+                  <div className="text-sm text-muted-foreground">{label}</div>
+                  <div className="text-lg font-semibold">{format(values[values.length - 1])}</div>
+                  <Sparkline values={values} />
+                </div>
+              )
+            })}
+          </CardContent>
+        </Card>
+      )}
+
       {!ok && status.error && (
         <div className="text-sm text-destructive">{status.error}</div>
       )}
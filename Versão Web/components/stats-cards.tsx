@@ -3,6 +3,8 @@
 import { useEffect, useState } from "react"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { MapPin, Home, Users, Smartphone, Wifi, TrendingUp, TrendingDown } from "lucide-react"
+import { useLiveChannel } from "@/hooks/use-live-channel"
+import { batchQuery } from "@/lib/batch"
 
 interface Stats {
   regioes: number
@@ -41,8 +43,7 @@ export function StatsCards() {
   const formatNumber = (n: unknown) => (typeof n === "number" ? n.toLocaleString("pt-BR") : "0")
 
   useEffect(() => {
-    fetch("/api/estatisticas/resumo")
-      .then((res) => (res.ok ? res.json() : Promise.reject(res)))
+    batchQuery<Partial<Stats>>("resumo")
       .then((data) => {
         // Sanitizar e mesclar com valores padrão para evitar undefined
         const partial = (data || {}) as Partial<Stats>
@@ -63,6 +64,19 @@ export function StatsCards() {
       })
   }, [])
 
+  // Atualizações empurradas pelo servidor quando a versão dos dados muda
+  useLiveChannel<Stats>("estatisticas", (changes) => {
+    setStats((prev) => {
+      const base = prev || defaultStats
+      return {
+        ...base,
+        ...changes,
+        crescimento: { ...base.crescimento, ...(changes.crescimento || {}) },
+      }
+    })
+    setLoading(false)
+  })
+
   if (loading) {
     return (
       <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-5">
@@ -0,0 +1,28 @@
+import * as React from 'react'
+
+/**
+ * Assina um canal de /api/stream (server-sent events). O primeiro evento traz o
+ * estado completo do canal; os seguintes, apenas as chaves que mudaram.
+ * O EventSource reconecta sozinho se a conexão cair.
+ */
+export function useLiveChannel<T>(channel: string, onUpdate: (changes: Partial<T>) => void) {
+  const onUpdateRef = React.useRef(onUpdate)
+  onUpdateRef.current = onUpdate
+
+  React.useEffect(() => {
+    if (typeof EventSource === 'undefined') return
+    const source = new EventSource(`/api/stream?canais=${encodeURIComponent(channel)}`)
+    const onMessage = (event: MessageEvent) => {
+      try {
+        onUpdateRef.current(JSON.parse(event.data) as Partial<T>)
+      } catch {
+        // Evento malformado: aguardar o próximo
+      }
+    }
+    source.addEventListener(channel, onMessage as EventListener)
+    return () => {
+      source.removeEventListener(channel, onMessage as EventListener)
+      source.close()
+    }
+  }, [channel])
+}
@@ -0,0 +1,81 @@
+import { NextResponse } from "next/server"
+
+export const backendUrl = process.env.NEXT_PUBLIC_DAC_API_URL || "http://localhost:8000"
+
+// Cabeçalhos de validação repassados entre navegador e backend
+const CONDITIONAL_HEADERS = ["if-none-match", "if-modified-since"]
+const VALIDATOR_HEADERS = ["etag", "last-modified", "cache-control"]
+
+/**
+ * Encaminha um GET ao backend Python repassando If-None-Match/If-Modified-Since.
+ * Um 304 do backend (versão dos dados inalterada) é devolvido ao navegador sem corpo.
+ */
+export async function proxyGet(path: string | URL, request: Request) {
+  const url = typeof path === "string" ? `${backendUrl}${path}` : path
+  const headers = new Headers()
+  for (const name of CONDITIONAL_HEADERS) {
+    const value = request.headers.get(name)
+    if (value) headers.set(name, value)
+  }
+
+  try {
+    // O cache fica a cargo do navegador, revalidado pela ETag
+    const res = await fetch(url, { cache: "no-store", headers })
+    const responseHeaders = new Headers()
+    for (const name of VALIDATOR_HEADERS) {
+      const value = res.headers.get(name)
+      if (value) responseHeaders.set(name, value)
+    }
+    if (res.status === 304) {
+      return new NextResponse(null, { status: 304, headers: responseHeaders })
+    }
+    const data = await res.json()
+    return NextResponse.json(data, { status: res.status, headers: responseHeaders })
+  } catch (e) {
+    return NextResponse.json({ message: "Backend indisponível" }, { status: 503 })
+  }
+}
+
+/**
+ * Encaminha um POST com corpo JSON ao backend Python (ex.: /api/batch).
+ */
+export async function proxyPostJson(path: string, request: Request) {
+  try {
+    const res = await fetch(`${backendUrl}${path}`, {
+      method: "POST",
+      cache: "no-store",
+      headers: { "content-type": "application/json" },
+      body: await request.text(),
+    })
+    const data = await res.json()
+    return NextResponse.json(data, { status: res.status, headers: { "cache-control": "no-store" } })
+  } catch (e) {
+    return NextResponse.json({ message: "Backend indisponível" }, { status: 503 })
+  }
+}
+
+/**
+ * Repassa um fluxo text/event-stream do backend sem bufferizar; a conexão com o
+ * backend é encerrada quando o navegador fecha o EventSource.
+ */
+export async function proxyEventStream(path: string, request: Request) {
+  try {
+    const res = await fetch(`${backendUrl}${path}`, {
+      cache: "no-store",
+      signal: request.signal,
+      headers: { accept: "text/event-stream" },
+    })
+    if (!res.ok || !res.body) {
+      return NextResponse.json({ message: "Backend indisponível" }, { status: 503 })
+    }
+    return new Response(res.body, {
+      headers: {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-store",
+        "X-Accel-Buffering": "no",
+      },
+    })
+  } catch (e) {
+    return NextResponse.json({ message: "Backend indisponível" }, { status: 503 })
+  }
+}
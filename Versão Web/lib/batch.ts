@@ -0,0 +1,55 @@
+/**
+ * Agrupa as consultas iniciais dos painéis numa única chamada a /api/batch.
+ *
+ * Componentes montados juntos chamam `batchQuery` no mesmo ciclo; as chamadas
+ * são acumuladas até o fim do ciclo e enviadas numa só requisição, lida pelo
+ * backend num único snapshot do banco. Cada promessa recebe o resultado da
+ * sua consulta (ou é rejeitada com o status dela).
+ */
+
+export type BatchOp = "health" | "resumo" | "db_status" | "individuos"
+
+interface Pending {
+  query: { op: BatchOp } & Record<string, unknown>
+  resolve: (data: any) => void
+  reject: (error: Error) => void
+}
+
+let pending: Record<string, Pending> = {}
+let scheduled = false
+let counter = 0
+
+async function flush() {
+  const batch = pending
+  pending = {}
+  scheduled = false
+  const consultas = Object.fromEntries(Object.entries(batch).map(([name, item]) => [name, item.query]))
+  try {
+    const res = await fetch("/api/batch", {
+      method: "POST",
+      cache: "no-store",
+      headers: { "content-type": "application/json" },
+      body: JSON.stringify({ consultas }),
+    })
+    if (!res.ok) throw new Error(`Lote recusado (${res.status})`)
+    const { resultados } = await res.json()
+    for (const [name, item] of Object.entries(batch)) {
+      const result = resultados?.[name]
+      if (result?.status === 200) item.resolve(result.data)
+      else item.reject(new Error(result?.detail || `Consulta ${item.query.op} falhou`))
+    }
+  } catch (e) {
+    const error = e instanceof Error ? e : new Error(String(e))
+    for (const item of Object.values(batch)) item.reject(error)
+  }
+}
+
+export function batchQuery<T>(op: BatchOp, params: Record<string, unknown> = {}): Promise<T> {
+  return new Promise<T>((resolve, reject) => {
+    pending[`${op}-${++counter}`] = { query: { ...params, op }, resolve, reject }
+    if (!scheduled) {
+      scheduled = true
+      setTimeout(flush, 0)
+    }
+  })
+}